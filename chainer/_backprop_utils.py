@@ -1,13 +1,96 @@
+import contextlib
+from multiprocessing import pool
+import threading
+
+import numpy
 import six
 
 import chainer
+from chainer import backend
+from chainer.backends import cuda
+from chainer import configuration
+
+
+_thread_local = threading.local()
+
+# Thread pools for parallel backprop keyed by the number of workers.
+_thread_pools = {}
+_thread_pools_lock = threading.Lock()
+
+
+def get_avoided_allocations():
+    """Returns the number of gradient allocations avoided in the last backprop.
+
+    The count is of the gradient accumulations done in place by the last
+    :meth:`Variable.backward() <chainer.Variable.backward>` or
+    :func:`chainer.grad` call with ``enable_double_backprop=False`` in the
+    current thread.
+
+    """
+    return getattr(_thread_local, 'avoided_allocations', 0)
+
+
+def is_sparse_grad_enabled():
+    """Returns whether functions may accumulate row-sparse gradients.
+
+    It is ``True`` during the backprop of :meth:`Variable.backward()
+    <chainer.Variable.backward>` with ``enable_double_backprop=False``, in
+    which functions like :func:`~chainer.functions.embed_id` may accumulate
+    gradients w.r.t. parameters to :attr:`chainer.Parameter.sparse_grad` by
+    :func:`add_sparse_grad` instead of returning them. It is ``False``
+    otherwise, e.g. in :func:`chainer.grad`, which has to return the
+    gradients.
+
+    """
+    return _get_sparse_grad_mode()[0]
+
+
+def add_sparse_grad(param, grad):
+    """Accumulates a row-sparse gradient to a parameter in the backprop.
+
+    The loss scale of the backprop is recorded to the parameter as done for
+    dense gradients, so that the gradient is unscaled before the update.
+
+    Args:
+        param (~chainer.Parameter): Parameter.
+        grad (~chainer.utils.RowSparseArray): Gradient to accumulate.
+
+    """
+    loss_scale = _get_sparse_grad_mode()[1]
+    pending = getattr(_thread_local, 'pending_sparse_grads', None)
+    if pending is not None:
+        # In a worker thread of parallel backprop, the gradient is added by
+        # the thread that started the backprop to avoid races.
+        pending.append((param, grad, loss_scale))
+        return
+    param.add_sparse_grad(grad)
+    param._loss_scale = loss_scale
+
+
+def _get_sparse_grad_mode():
+    # Returns a tuple (enabled, loss_scale) of the current thread.
+    return getattr(_thread_local, 'sparse_grad_mode', (False, None))
+
+
+@contextlib.contextmanager
+def sparse_grad_mode(enabled, loss_scale=None):
+    # Sets the mode returned by _get_sparse_grad_mode in the current thread.
+    old = _get_sparse_grad_mode()
+    _thread_local.sparse_grad_mode = enabled, loss_scale
+    try:
+        yield
+    finally:
+        _thread_local.sparse_grad_mode = old
 
 
 def _reduce(grad_list):
     if not grad_list:
         return None
     if len(grad_list) >= 2:
-        grad_list[:] = [chainer.functions.add(*grad_list)]
+        if isinstance(grad_list, _InplaceGradList):
+            grad_list.reduce()
+        else:
+            grad_list[:] = [chainer.functions.add(*grad_list)]
     return grad_list[0]
 
 
@@ -15,6 +98,59 @@ def _pure(grad):
     return [] if grad is None else [grad]
 
 
+class _InplaceGradList(list):
+
+    """List of gradients which are summed up in place.
+
+    The first accumulation allocates a buffer owned by the list (i.e. by the
+    corresponding node), and the subsequent accumulations add the gradients
+    to the buffer in place. The resulting gradient does not have the
+    computational history, so it is only used if the backprop is not
+    differentiable.
+
+    """
+
+    __slots__ = ('_table', '_buffer')
+
+    def __init__(self, table, grads):
+        super(_InplaceGradList, self).__init__(grads)
+        self._table = table
+        self._buffer = None
+
+    def reduce(self):
+        buf = self._buffer
+        if buf is None or self[0] is not buf:
+            # The first gradient may be shared with other variables, e.g.
+            # gradients of outputs passed through by backward() or the
+            # gradient of a leaf variable set by the user.
+            buf = None
+            arr = self[0].array
+            rest = self[1:]
+        else:
+            arr = buf.array
+            rest = self[1:]
+
+        if not (isinstance(arr, (numpy.ndarray, cuda.ndarray))
+                and all([type(g.array) is type(arr)
+                         and g.shape == arr.shape
+                         and g.dtype == arr.dtype for g in rest])):
+            self[:] = [chainer.functions.add(*self)]
+            self._buffer = None
+            return
+
+        xp = backend.get_array_module(arr)
+        if buf is None:
+            arr = chainer.utils.force_array(arr + rest[0].array)
+            buf = chainer.Variable(arr, requires_grad=any(
+                [g.requires_grad for g in self]))
+            rest = rest[1:]
+            self._buffer = buf
+        for g in rest:
+            xp.add(arr, g.array, out=arr)
+        self._table.avoided_allocations += len(rest)
+        self[:] = [buf]
+
+
 def _pop_or_none(grad_list):
     return grad_list.pop() if grad_list else None
 
@@ -28,19 +164,34 @@ class GradTable(object):
     strict accumulation of gradients. Leave them to accumulate gradients
     lazily.
 
+    If ``inplace`` is ``True``, the gradients of each node are summed up in
+    place into a buffer owned by the node, instead of being added by
+    :func:`chainer.functions.add`. The number of gradient arrays whose
+    allocations are avoided in this way is counted by
+    ``avoided_allocations``.
+
     Args:
         load_if_new (bool): read ``grad_var`` of node when the node has not
             been added.
+        inplace (bool): accumulate gradients in place. It must be ``False``
+            if the backprop is differentiable.
 
     """
 
-    def __init__(self, load_if_new=False):
+    def __init__(self, load_if_new=False, inplace=False):
         self.grads = {}
         self._load_if_new = load_if_new
+        self._inplace = inplace
+        self.avoided_allocations = 0
 
     def __setitem__(self, node, grad):
         assert node is not None
-        self.grads[node] = _pure(grad)
+        self.grads[node] = self._make_list(_pure(grad))
+
+    def _make_list(self, grads):
+        if self._inplace:
+            return _InplaceGradList(self, grads)
+        return grads
 
     def get_as_list(self, node):
         assert node is not None
@@ -49,9 +200,9 @@ class GradTable(object):
             if self._load_if_new and node.creator_node is None:
                 node._check_old_style_gradient()
                 # accumulate the gradient only if the node is a leaf
-                grads[node] = _pure(node.grad_var)
+                grads[node] = self._make_list(_pure(node.grad_var))
             else:
-                grads[node] = []
+                grads[node] = self._make_list([])
         return grads[node]
 
     def pop(self, node):
@@ -69,6 +220,10 @@ class GradTable(object):
         for gx in self.grads.values():
             assert gx == []
 
+    def record_stats(self):
+        """Records the statistics for :func:`get_avoided_allocations`."""
+        _thread_local.avoided_allocations = self.avoided_allocations
+
 
 def backprop_step(
         func, target_input_indexes, grad_outputs, grad_inputs):
@@ -95,9 +250,7 @@ def backprop_step(
         assert isinstance(target_input_indexes, tuple)
         assert target_input_indexes == tuple(sorted(target_input_indexes))
         assert isinstance(grad_outputs, tuple)
-    if func.backward_accumulate.__code__ \
-            is not chainer.FunctionNode.backward_accumulate.__code__:
-        # backward_accumulate is overridden
+    if _overrides_backward_accumulate(func):
         grad_inputs_tuple = tuple([
             _pop_or_none(grad_inputs[func.inputs[i]])
             for i in target_input_indexes
@@ -105,32 +258,51 @@ def backprop_step(
         gxs = func.backward_accumulate(
             target_input_indexes, grad_outputs, grad_inputs_tuple)
     else:  # otherwise, backward should be overridden
-        gxs = func.backward(
-            target_input_indexes, grad_outputs)
+        gxs = _call_backward(
+            func, target_input_indexes, grad_outputs, is_debug)
 
-        if is_debug:
-            for gx in gxs:
-                if not (gx is None or isinstance(gx, chainer.Variable)):
-                    raise ValueError(func._get_error_message(
-                        'type of gradients returned from backward is '
-                        'incorrect: '
-                        '{} != expected {}'.format(
-                            type(gx), chainer.Variable)))
-
-        len_gxs = len(gxs)
-        if len_gxs == len(func.inputs):
-            gxs = tuple([gxs[i] for i in target_input_indexes])
-        elif len_gxs != len(target_input_indexes):
-            msg = 'number of gradients returned from backward is incorrect: '
-            if len(func.inputs) == len(target_input_indexes):
-                msg += (
-                    '%s != expected %s' % (len_gxs, len(func.inputs)))
-            else:
-                msg += (
-                    '%s != expected %s or %s'
-                    % (len_gxs, len(func.inputs), len(target_input_indexes)))
-            raise ValueError(func._get_error_message(msg))
+    _accumulate_grads(
+        func, target_input_indexes, gxs, grad_inputs, is_debug)
+
+
+def _overrides_backward_accumulate(func):
+    return (func.backward_accumulate.__code__
+            is not chainer.FunctionNode.backward_accumulate.__code__)
+
+
+def _call_backward(func, target_input_indexes, grad_outputs, is_debug):
+    # Calls FunctionNode.backward and returns the gradients w.r.t. the
+    # target inputs.
+    gxs = func.backward(target_input_indexes, grad_outputs)
+
+    if is_debug:
+        for gx in gxs:
+            if not (gx is None or isinstance(gx, chainer.Variable)):
+                raise ValueError(func._get_error_message(
+                    'type of gradients returned from backward is '
+                    'incorrect: '
+                    '{} != expected {}'.format(
+                        type(gx), chainer.Variable)))
 
+    len_gxs = len(gxs)
+    if len_gxs == len(func.inputs):
+        gxs = tuple([gxs[i] for i in target_input_indexes])
+    elif len_gxs != len(target_input_indexes):
+        msg = 'number of gradients returned from backward is incorrect: '
+        if len(func.inputs) == len(target_input_indexes):
+            msg += (
+                '%s != expected %s' % (len_gxs, len(func.inputs)))
+        else:
+            msg += (
+                '%s != expected %s or %s'
+                % (len_gxs, len(func.inputs), len(target_input_indexes)))
+        raise ValueError(func._get_error_message(msg))
+    return gxs
+
+
+def _accumulate_grads(func, target_input_indexes, gxs, grad_inputs, is_debug):
+    # Adds the gradients returned by backward to the lists of gradients
+    # w.r.t. the inputs.
     for i, gx in six.moves.zip(target_input_indexes, gxs):
         if gx is not None:
             grad_inputs[func.inputs[i]].append(gx)
@@ -177,3 +349,166 @@ def backprop_step(
     if not func.lazy_grad_sum:
         for gx in grad_inputs.values():
             _reduce(gx)
+
+
+def _get_thread_pool(n_workers):
+    with _thread_pools_lock:
+        thread_pool = _thread_pools.get(n_workers)
+        if thread_pool is None:
+            thread_pool = pool.ThreadPool(n_workers)
+            _thread_pools[n_workers] = thread_pool
+    return thread_pool
+
+
+def _apply_config(config_items):
+    # Reproduces the thread-local configuration of the thread that started
+    # the backprop in a worker thread, once per backprop. The entries are
+    # written directly to the thread-local storage, since setting them via
+    # chainer.config updates the configuration version and invalidates the
+    # caches derived from the configuration in all threads.
+    if getattr(_thread_local, 'config_items', None) is config_items:
+        return
+    local = configuration.config._local.__dict__
+    local.clear()
+    local.update(config_items)
+    _thread_local.config_items = config_items
+    # Only the cache of this worker thread has to be invalidated.
+    chainer.function_node._thread_local.apply_config = None
+
+
+def _run_backward(func, target_input_indexes, grad_outputs, config_items,
+                  sparse_grad_mode):
+    # Runs in a worker thread.
+    # Returns the gradients and the row-sparse gradients accumulated by
+    # add_sparse_grad.
+    _apply_config(config_items)
+    _thread_local.sparse_grad_mode = sparse_grad_mode
+    _thread_local.pending_sparse_grads = sparse_grads = []
+    try:
+        in_data = tuple([x.data for x in func.inputs])
+        with cuda.get_device_from_array(*in_data):
+            gxs = _call_backward(
+                func, target_input_indexes, grad_outputs, False)
+    finally:
+        _thread_local.pending_sparse_grads = None
+    return gxs, sparse_grads
+
+
+class ParallelBackward(object):
+
+    """Runs backward computations of function nodes on a thread pool.
+
+    A function node is scheduled onto the thread pool as soon as the
+    gradients w.r.t. all of its outputs are complete, i.e., once all the
+    function nodes that may give gradients to its outputs have been
+    processed. The backprop loop still visits the function nodes in the
+    serial order and accumulates the gradients in that order, so the results
+    are identical to those of the serial backprop.
+
+    The loop has to call :meth:`push` whenever it adds a function node to the
+    candidates, :meth:`get` instead of retrieving the output gradients and
+    calling :meth:`FunctionNode.backward` by itself, and :meth:`done` after
+    accumulating the gradients of a function node.
+
+    Function nodes overriding :meth:`FunctionNode.backward_accumulate` are not
+    computed on the thread pool, since they read the gradients being
+    accumulated. Neither are function nodes with local function hooks, whose
+    :meth:`~chainer.FunctionHook.backward_preprocess` has to be called before
+    the backward computation. The caller must not use this class if global
+    function hooks are registered.
+
+    Args:
+        n_workers (int): Number of worker threads.
+        root_funcs (list of FunctionNode): Function nodes from which the
+            backprop starts.
+        is_target (callable): Predicate telling whether the gradient w.r.t.
+            the given input node is computed.
+        prepare (callable): Function called with a function node when it is
+            ready. It must return a tuple ``(target_input_indexes,
+            grad_outputs, state)``, where ``state`` is an arbitrary value
+            returned by :meth:`get`.
+
+    """
+
+    def __init__(self, n_workers, root_funcs, is_target, prepare):
+        self._pool = _get_thread_pool(n_workers)
+        self._prepare = prepare
+        # Backprops nested in backward computations (e.g. that of
+        # F.forget) run serially in the worker threads, since a worker
+        # waiting for other tasks on the same thread pool may deadlock.
+        config = dict(configuration.config._local.__dict__)
+        config['backward_workers'] = 1
+        self._config_items = tuple(config.items())
+        self._sparse_grad_mode = _get_sparse_grad_mode()
+
+        # Enumerate the function nodes reachable from the roots and count the
+        # function nodes that may give gradients to the outputs of each node.
+        self._creators = {}
+        self._n_pending = dict.fromkeys(root_funcs, 0)
+        stack = list(root_funcs)
+        while stack:
+            func = stack.pop()
+            if func in self._creators:
+                continue
+            creators = set([
+                x.creator_node for x in func.inputs
+                if is_target(x) and x.creator_node is not None])
+            self._creators[func] = creators
+            for creator in creators:
+                self._n_pending[creator] = self._n_pending.get(creator, 0) + 1
+                stack.append(creator)
+
+        self._pushed = set()
+        self._results = {}
+
+    def push(self, func):
+        """Notifies that a function node is added to the candidates."""
+        self._pushed.add(func)
+        if self._n_pending[func] == 0:
+            self._submit(func)
+
+    def get(self, func):
+        """Returns the prepared state and the gradients of a function node.
+
+        The gradients are ``None`` if they were not computed on the thread
+        pool. In that case, the caller has to compute them by itself.
+
+        """
+        prepared, result = self._results.pop(func)
+        target_input_indexes, grad_outputs, state = prepared
+        if result is None:
+            gxs = None
+        else:
+            gxs, sparse_grads = result.get()
+            # Row-sparse gradients are accumulated in the serial order.
+            for param, grad, loss_scale in sparse_grads:
+                param.add_sparse_grad(grad)
+                param._loss_scale = loss_scale
+        return target_input_indexes, grad_outputs, state, gxs
+
+    def done(self, func):
+        """Notifies that the gradients of a function node are accumulated."""
+        stack = [func]
+        while stack:
+            for creator in self._creators.pop(stack.pop()):
+                self._n_pending[creator] -= 1
+                if self._n_pending[creator] == 0:
+                    if creator in self._pushed:
+                        self._submit(creator)
+                    else:
+                        # No gradients will be given to this node.
+                        stack.append(creator)
+
+    def _submit(self, func):
+        prepared = self._prepare(func)
+        target_input_indexes, grad_outputs, _ = prepared
+        if (target_input_indexes
+                and func._n_local_function_hooks == 0
+                and not _overrides_backward_accumulate(func)):
+            result = self._pool.apply_async(
+                _run_backward,
+                (func, target_input_indexes, grad_outputs,
+                 self._config_items, self._sparse_grad_mode))
+        else:
+            result = None
+        self._results[func] = prepared, result
@@ -3,10 +3,28 @@ import sys
 import threading
 
 
+# Counter incremented on every change of the global or thread-local
+# configuration. It is used to cache values derived from the configuration.
+_version = 0
+
+
+def _update_version():
+    global _version
+    _version += 1
+
+
 class GlobalConfig(object):
 
     """The plain object that represents the global configuration of Chainer."""
 
+    def __delattr__(self, name):
+        super(GlobalConfig, self).__delattr__(name)
+        _update_version()
+
+    def __setattr__(self, name, value):
+        super(GlobalConfig, self).__setattr__(name, value)
+        _update_version()
+
     def show(self, file=sys.stdout):
         """show(file=sys.stdout)
 
@@ -39,6 +57,7 @@ class LocalConfig(object):
 
     def __delattr__(self, name):
         delattr(self._local, name)
+        _update_version()
 
     def __getattr__(self, name):
         if hasattr(self._local, name):
@@ -47,6 +66,7 @@ class LocalConfig(object):
 
     def __setattr__(self, name, value):
         setattr(self._local, name, value)
+        _update_version()
 
     def show(self, file=sys.stdout):
         """show(file=sys.stdout)
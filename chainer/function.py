@@ -1,3 +1,4 @@
+import contextlib
 import warnings
 import weakref
 
@@ -42,6 +43,39 @@ def no_backprop_mode():
     return configuration.using_config('enable_backprop', False)
 
 
+@contextlib.contextmanager
+def inference_mode():
+    """Make a context manager for fast inference on raw arrays.
+
+    In this context, backprop is disabled and the ``train`` configuration is
+    set to ``False``. In addition, the raw array mode is enabled:
+    :meth:`FunctionNode.apply() <chainer.FunctionNode.apply>` returns the
+    output arrays instead of wrapping them with :class:`~chainer.Variable`
+    when all inputs are :class:`numpy.ndarray` or variables holding them.
+    Functions then run directly on arrays, skipping the creation of variables
+    and graph objects, which is significant for small layers. Inputs on other
+    devices or with function hooks registered are processed as usual.
+
+    Code that runs in this context must accept arrays where variables are
+    usually given, e.g., it must not access
+    :attr:`Variable.array <chainer.Variable.array>` of the outputs of
+    functions.
+    :meth:`Link.inference() <chainer.Link.inference>` runs a link in this
+    context and converts its outputs to arrays.
+
+    >>> x = np.array([-1, 1], np.float32)
+    >>> with chainer.inference_mode():
+    ...     y = F.relu(x)
+    >>> y
+    array([0., 1.], dtype=float32)
+
+    """
+    with configuration.using_config('enable_backprop', False), \
+            configuration.using_config('train', False), \
+            configuration.using_config('raw_array_mode', True):
+        yield
+
+
 def force_backprop_mode():
     """Make a context manager which enables back-propagation.
 
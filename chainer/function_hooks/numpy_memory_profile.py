@@ -0,0 +1,235 @@
+import collections
+import sys
+import weakref
+
+from chainer import function_hook
+
+
+try:
+    import tracemalloc
+    tracemalloc_available = True
+except ImportError as e:
+    _resolution_error = e
+    tracemalloc_available = False
+
+
+class NumpyMemoryProfileHook(function_hook.FunctionHook):
+    """Function hook for measuring host memory usage of functions.
+
+    This hook measures the host memory allocated in the forward and backward
+    computations of functions with :mod:`tracemalloc`, which NumPy reports
+    its allocations to. It also tracks the bytes of arrays retained by the
+    computational graph for backpropagation, i.e., arrays kept by
+    :meth:`~chainer.FunctionNode.retain_inputs` and
+    :meth:`~chainer.FunctionNode.retain_outputs` of living function nodes.
+    An array retained by more than one function node is counted once.
+
+    :mod:`tracemalloc` is started when the hook is registered if it is not
+    already tracing, and is stopped when the hook is unregistered.
+
+    Example:
+        Code example::
+
+            from chainer.function_hooks import NumpyMemoryProfileHook
+            hook = NumpyMemoryProfileHook()
+            with hook:
+                trainer.run()
+            hook.print_report()
+
+        Output example::
+
+                   FunctionName  UsedBytes  RetainedBytes  Occurrence
+                 LinearFunction   306.83MB       103.52MB        3900
+                           ReLU    91.41MB        45.70MB        2600
+            SoftmaxCrossEntropy     1.12MB        15.23KB        1300
+                       Accuracy    65.08KB          0.00B         700
+
+        where *FunctionName* is the name of function that calls the hook, and
+        *UsedBytes* is the peak host memory bytes the function allocated
+        on top of the memory already allocated when it was called, and
+        *RetainedBytes* is the bytes of arrays the function newly retained for
+        backpropagation, and *Occurrence* is the number of calls.
+    Attributes:
+        call_history: List of measurement results. It consists of the name of
+            the function that calls this hook, the peak memory bytes the
+            function allocated, the bytes of arrays it newly retained, and
+            the depth of the nested call.
+    """
+
+    name = 'NumpyMemoryProfileHook'
+
+    def __init__(self):
+        if not tracemalloc_available:
+            msg = 'tracemalloc is required. %s' % str(_resolution_error)
+            raise RuntimeError(msg)
+        self.call_history = []
+        self._running_stack = []
+        self._started_tracing = False
+        self._total_used_bytes = 0
+        # Function nodes whose retained arrays are not counted yet. They are
+        # counted after the graph is connected.
+        self._pending = []
+        # Maps the ids of retained arrays to their bytes and reference counts.
+        self._retained = {}
+        self._node_refs = {}
+        self._retained_bytes = 0
+        self._peak_retained_bytes = 0
+
+    def added(self, function=None):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def deleted(self, function=None):
+        self._flush()
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def _preprocess(self):
+        self._flush()
+        current, peak = tracemalloc.get_traced_memory()
+        # Without reset_peak (Python < 3.9), the peak of each call cannot be
+        # measured and the net increase of the allocated bytes is used.
+        if hasattr(tracemalloc, 'reset_peak'):
+            if self._running_stack:
+                outer = self._running_stack[-1]
+                outer[1] = max(outer[1], peak)
+            tracemalloc.reset_peak()
+        self._running_stack.append([current, current])
+
+    def forward_preprocess(self, function, in_data):
+        self._preprocess()
+
+    def backward_preprocess(self, function, in_data, out_grad):
+        self._preprocess()
+
+    def _postprocess(self, function, retained_bytes):
+        current, peak = tracemalloc.get_traced_memory()
+        start_bytes, max_peak = self._running_stack.pop()
+        if not hasattr(tracemalloc, 'reset_peak'):
+            peak = current
+        peak = max(peak, max_peak)
+        used_bytes = max(peak - start_bytes, 0)
+        depth = len(self._running_stack)
+        if depth > 0:
+            outer = self._running_stack[-1]
+            outer[1] = max(outer[1], peak)
+        self.call_history.append(
+            (function._impl_name, used_bytes, retained_bytes, depth))
+        if depth == 0:
+            self._total_used_bytes += used_bytes
+        return len(self.call_history) - 1
+
+    def forward_postprocess(self, function, in_data):
+        index = self._postprocess(function, 0)
+        # The graph is connected after this callback.
+        self._pending.append((weakref.ref(function), index))
+
+    def backward_postprocess(self, function, in_data, out_grad):
+        self._postprocess(function, 0)
+
+    def _flush(self):
+        pending = self._pending
+        if not pending:
+            return
+        self._pending = []
+        for node_ref, index in pending:
+            node = node_ref()
+            if node is None or node.inputs is None:
+                continue
+            ids = []
+            new_bytes = 0
+            for array in node._get_retained_arrays():
+                key = id(array)
+                entry = self._retained.get(key)
+                if entry is None:
+                    entry = [array.nbytes, 0]
+                    self._retained[key] = entry
+                    new_bytes += array.nbytes
+                entry[1] += 1
+                ids.append(key)
+            if not ids:
+                continue
+            self._node_refs[weakref.ref(node, self._release)] = ids
+            self._retained_bytes += new_bytes
+            name, used_bytes, _, depth = self.call_history[index]
+            self.call_history[index] = (name, used_bytes, new_bytes, depth)
+        self._peak_retained_bytes = max(
+            self._peak_retained_bytes, self._retained_bytes)
+
+    def _release(self, node_ref):
+        for key in self._node_refs.pop(node_ref, ()):
+            entry = self._retained[key]
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._retained[key]
+                self._retained_bytes -= entry[0]
+
+    def total_used_bytes(self):
+        """Returns total bytes that functions allocated at peak."""
+        return self._total_used_bytes
+
+    def retained_bytes(self):
+        """Returns bytes of arrays currently retained by the graph."""
+        self._flush()
+        return self._retained_bytes
+
+    def peak_retained_bytes(self):
+        """Returns the peak bytes of arrays retained by the graph."""
+        self._flush()
+        return self._peak_retained_bytes
+
+    def summary(self):
+        """Returns a summary of memory profiling in functions.
+
+        Returns:
+            A summarized dictionary whose keys are function names and
+            values are dictionaries of
+            ``used_bytes``, ``retained_bytes``, and ``occurrrence``.
+        """
+        self._flush()
+        summary = collections.OrderedDict()
+        for func_name, used_bytes, retained_bytes, depth in self.call_history:
+            if func_name not in summary:
+                summary[func_name] = {'used_bytes': 0,
+                                      'retained_bytes': 0, 'occurrence': 0}
+            record = summary[func_name]
+            record['used_bytes'] += used_bytes
+            record['retained_bytes'] += retained_bytes
+            record['occurrence'] += 1
+        return summary
+
+    def _humanized_size(self, size):
+        """Returns a human redable bytes string."""
+        for unit in ['', 'K', 'M', 'G', 'T', 'P', 'E']:
+            if size < 1024.0:
+                return '%3.2f%sB' % (size, unit)
+            size /= 1024.0
+        return '%.2f%sB' % (size, 'Z')
+
+    def print_report(self, file=sys.stdout):
+        """Prints a summary report of memory profiling in functions."""
+        entries = [[
+            'FunctionName', 'UsedBytes', 'RetainedBytes', 'Occurrence']]
+        for function_name, record in self.summary().items():
+            used_bytes = self._humanized_size(record['used_bytes'])
+            retained_bytes = self._humanized_size(record['retained_bytes'])
+            occurrence = str(record['occurrence'])
+            entries.append(
+                [function_name, used_bytes, retained_bytes, occurrence])
+        entry_widths = []
+        entry_widths.append(max(len(f) for f, _, _, _ in entries))
+        entry_widths.append(max(len(u) for _, u, _, _ in entries))
+        entry_widths.append(max(len(r) for _, _, r, _ in entries))
+        entry_widths.append(max(len(o) for _, _, _, o in entries))
+        template = '  '.join('{:>%d}' % w for w in entry_widths)
+        for function_name, used_bytes, retained_bytes, occurrence in entries:
+            line = template.format(
+                function_name, used_bytes, retained_bytes, occurrence)
+            file.write(line)
+            file.write('\n')
+        file.write('Retained bytes: %s (peak: %s)\n' % (
+            self._humanized_size(self._retained_bytes),
+            self._humanized_size(self._peak_retained_bytes)))
+        file.flush()
@@ -0,0 +1,274 @@
+import collections
+import contextlib
+import json
+import os
+import threading
+import time
+
+import six
+
+import chainer
+from chainer import function_hook
+from chainer import link_hook
+
+
+_clock = getattr(time, 'perf_counter', time.time)
+
+
+def _open(file):
+    if isinstance(file, six.string_types):
+        return open(file, 'w')
+    return _NoClose(file)
+
+
+class _NoClose(object):
+
+    def __init__(self, file):
+        self.file = file
+
+    def __enter__(self):
+        return self.file
+
+    def __exit__(self, *_):
+        self.file.flush()
+
+
+@contextlib.contextmanager
+def phase(name, iteration=None):
+    """Marks a phase of the training loop for :class:`TraceHook`.
+
+    The phase is recorded by all :class:`TraceHook` objects registered with
+    the ``with`` statement in the current thread. It does nothing if there
+    is no such hook.
+
+    Args:
+        name (str): Name of the phase.
+        iteration (int): Iteration index that starts at this phase. If it
+            is given, the hooks decide whether to record the iteration
+            according to their ``sample_interval``.
+
+    """
+    hooks = [hook for hook in six.itervalues(chainer.get_function_hooks())
+             if isinstance(hook, TraceHook)]
+    for hook in hooks:
+        if iteration is not None:
+            hook._recording = iteration % hook.sample_interval == 0
+        hook._begin(name, 'phase')
+    try:
+        yield
+    finally:
+        for hook in reversed(hooks):
+            hook._end()
+
+
+class _TraceLinkHook(link_hook.LinkHook):
+
+    def __init__(self, trace_hook):
+        self.name = trace_hook.name
+        self.trace_hook = trace_hook
+
+    def forward_preprocess(self, args):
+        link = args.link
+        name = type(link).__name__
+        if link.name is not None:
+            name = '%s(%s)' % (name, link.name)
+        self.trace_hook._begin(name, 'link')
+
+    def forward_postprocess(self, args):
+        self.trace_hook._end()
+
+
+class TraceHook(function_hook.FunctionHook):
+    """Function hook recording a timeline of function and link calls.
+
+    This hook records the begin and end timestamps of the forward and
+    backward computations of functions together with the id of the thread
+    calling them. When it is registered with the ``with`` statement, it
+    also records the forward calls of links, so that functions are nested
+    under the links calling them, and the phases of the training loop marked
+    by :func:`chainer.function_hooks.trace.phase`.
+    :class:`~chainer.training.updaters.StandardUpdater`,
+    :class:`~chainer.GradientMethod` and :class:`~chainer.training.Trainer`
+    mark the ``update``, ``iterator``, ``converter``, ``forward``,
+    ``backward`` and ``optimizer`` phases and the calls of extensions.
+
+    The records can be exported in the Chrome trace event format, which can
+    be viewed with ``chrome://tracing``, and as folded stacks, which can be
+    rendered by flamegraph tools.
+
+    The records are kept in a ring buffer, so only the latest
+    ``max_events`` records are kept. The hook can be kept enabled in
+    long-running jobs by recording only every ``sample_interval``-th
+    iteration.
+
+    Example:
+        Code example::
+
+            from chainer.function_hooks import TraceHook
+            hook = TraceHook(sample_interval=100)
+            with hook:
+                trainer.run()
+            hook.save_chrome_trace('trace.json')
+            hook.save_folded_stacks('trace.folded')
+
+    .. note::
+       The timestamps are taken on the host. Since GPU kernels run
+       asynchronously, the recorded durations of functions on GPU do not
+       include their execution time.
+
+    Args:
+        max_events (int): Maximum number of records to keep.
+        sample_interval (int): Interval of iterations to record.
+
+    Attributes:
+        events: Ring buffer of records. Each record is a tuple of the name,
+            the category (``'forward'``, ``'backward'``, ``'link'`` or
+            ``'phase'``), the thread id, the begin and end timestamps in
+            seconds and the stack of names of the enclosing records
+            including itself.
+
+    """
+
+    name = 'TraceHook'
+
+    def __init__(self, max_events=100000, sample_interval=1):
+        if max_events <= 0:
+            raise ValueError('max_events must be positive')
+        if sample_interval <= 0:
+            raise ValueError('sample_interval must be positive')
+        self.max_events = max_events
+        self.sample_interval = sample_interval
+        self.events = collections.deque(maxlen=max_events)
+        self._recording = True
+        self._local = threading.local()
+        self._link_hook = _TraceLinkHook(self)
+        self._origin = _clock()
+
+    def __enter__(self):
+        super(TraceHook, self).__enter__()
+        try:
+            self._link_hook.__enter__()
+        except Exception:
+            super(TraceHook, self).__exit__()
+            raise
+        return self
+
+    def __exit__(self, *args):
+        self._link_hook.__exit__(*args)
+        super(TraceHook, self).__exit__(*args)
+
+    def _get_stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = []
+            self._local.stack = stack
+        return stack
+
+    def _begin(self, name, category):
+        stack = self._get_stack()
+        if not self._recording:
+            stack.append(None)
+            return
+        if stack and stack[-1] is not None:
+            path = stack[-1][3] + (name,)
+        else:
+            path = (name,)
+        stack.append((name, category, _clock(), path))
+
+    def _end(self):
+        end = _clock()
+        record = self._get_stack().pop()
+        if record is None:
+            return
+        name, category, begin, path = record
+        self.events.append((name, category, threading.current_thread().ident,
+                            begin, end, path))
+
+    def forward_preprocess(self, function, in_data):
+        self._begin(function._impl_name, 'forward')
+
+    def forward_postprocess(self, function, in_data):
+        self._end()
+
+    def backward_preprocess(self, function, in_data, out_grad):
+        self._begin(function._impl_name, 'backward')
+
+    def backward_postprocess(self, function, in_data, out_grad):
+        self._end()
+
+    def clear(self):
+        """Discards all records."""
+        self.events.clear()
+
+    def chrome_trace(self):
+        """Returns the records in the Chrome trace event format.
+
+        Returns:
+            dict: A dictionary that can be serialized to JSON.
+
+        """
+        pid = os.getpid()
+        trace_events = []
+        threads = set()
+        for name, category, tid, begin, end, _ in list(self.events):
+            threads.add(tid)
+            trace_events.append({
+                'name': name, 'cat': category, 'ph': 'X',
+                'ts': (begin - self._origin) * 1e6,
+                'dur': (end - begin) * 1e6,
+                'pid': pid, 'tid': tid})
+        for thread in threading.enumerate():
+            if thread.ident in threads:
+                trace_events.append({
+                    'name': 'thread_name', 'ph': 'M', 'pid': pid,
+                    'tid': thread.ident, 'args': {'name': thread.name}})
+        return {'traceEvents': trace_events, 'displayTimeUnit': 'ms'}
+
+    def save_chrome_trace(self, file):
+        """Saves the records in the Chrome trace event format.
+
+        Args:
+            file (str or file-like): Path or file object to write to.
+
+        """
+        with _open(file) as f:
+            json.dump(self.chrome_trace(), f)
+
+    def folded_stacks(self):
+        """Returns the records as folded stacks.
+
+        Each stack is weighted by its self time, i.e., the time spent in the
+        innermost record excluding its children, in microseconds.
+
+        Returns:
+            list of str: Lines of stacks separated by ``;`` followed by
+            their weights.
+
+        """
+        total = collections.OrderedDict()
+        children = collections.defaultdict(float)
+        for _, _, _, begin, end, path in list(self.events):
+            elapsed = end - begin
+            total[path] = total.get(path, 0.) + elapsed
+            if len(path) > 1:
+                children[path[:-1]] += elapsed
+        lines = []
+        for path, elapsed in six.iteritems(total):
+            self_time = int(round(max(elapsed - children[path], 0.) * 1e6))
+            if self_time > 0:
+                lines.append('%s %d' % (';'.join(path), self_time))
+        return lines
+
+    def save_folded_stacks(self, file):
+        """Saves the records as folded stacks.
+
+        See :meth:`folded_stacks` for the format.
+
+        Args:
+            file (str or file-like): Path or file object to write to.
+
+        """
+        with _open(file) as f:
+            for line in self.folded_stacks():
+                f.write(line)
+                f.write('\n')
@@ -1,5 +1,6 @@
 import collections
 import heapq
+import threading
 import traceback
 import weakref
 
@@ -20,6 +21,9 @@ from chainer import variable
 import chainerx
 
 
+_thread_local = threading.local()
+
+
 def _to_variable_with_chainerx_fallback_array(chainerx_array, fallback_array):
     # chainerx_array can be None.
     var = variable.Variable(
@@ -135,20 +139,36 @@ class FunctionNode(object):
 
     """
 
-    inputs = None
-    outputs = None
-    _output_count = None
-    rank = 0
-    stack = None
-    _input_indexes_to_retain = None
-    _output_indexes_to_retain = None
-    _retained_output_data = None
-    _local_function_hooks = None
+    # Graph attributes are stored in slots. ``__dict__`` is kept since
+    # concrete function nodes store their own parameters as attributes.
+    __slots__ = (
+        'inputs', 'outputs', '_output_count', 'rank', 'stack',
+        '_input_indexes_to_retain', '_output_indexes_to_retain',
+        '_retained_output_data', '_local_function_hooks', '_is_chainerx',
+        '_chainerx_retained_inputs', '_chainerx_retained_outputs',
+        'lazy_grad_sum', '__dict__', '__weakref__',
+    )
+
     _supports_static_optimizations = False
-    _is_chainerx = None
-    _chainerx_retained_inputs = None
-    _chainerx_retained_outputs = None
-    lazy_grad_sum = False
+
+    def __new__(cls, *args, **kwargs):
+        # Subclasses do not necessarily call FunctionNode.__init__, so the
+        # slots are initialized here.
+        self = super(FunctionNode, cls).__new__(cls)
+        self.inputs = None
+        self.outputs = None
+        self._output_count = None
+        self.rank = 0
+        self.stack = None
+        self._input_indexes_to_retain = None
+        self._output_indexes_to_retain = None
+        self._retained_output_data = None
+        self._local_function_hooks = None
+        self._is_chainerx = None
+        self._chainerx_retained_inputs = None
+        self._chainerx_retained_outputs = None
+        self.lazy_grad_sum = False
+        return self
 
     @property
     def local_function_hooks(self):
@@ -244,9 +264,22 @@ Use apply() method instead.\
                 automatically wrapped with :class:`~chainer.Variable`.
 
         Returns:
-            A tuple of output :class:`~chainer.Variable` objects.
+            A tuple of output :class:`~chainer.Variable` objects. In the raw
+            array mode (see :func:`chainer.inference_mode`), the output
+            arrays are returned instead when all inputs are NumPy arrays or
+            variables holding them.
 
         """
+        _, fast, enable_backprop, lazy_grad_sum, raw = _get_apply_config()
+        if ((fast or raw) and not self._local_function_hooks
+                and not chainer.get_function_hooks()):
+            in_data = _extract_apply_in_data_fast(inputs)
+            if in_data is not None:
+                if raw:
+                    return self._apply_raw(in_data)
+                return self._apply_fast(
+                    inputs, in_data, enable_backprop, lazy_grad_sum)
+
         chainerx_in_data = None
         self._is_chainerx, in_data = _extract_apply_in_data(inputs)
 
@@ -342,40 +375,116 @@ Use apply() method instead.\
                  for y in outputs])
 
             if configuration.config.enable_backprop:
-                # Topological ordering
-                self.rank = max(
-                    [x.rank for x in input_vars]) if input_vars else 0
-                # Add backward edges
-                for y in ret:
-                    y.creator_node = self
-                self.inputs = tuple([x.node for x in input_vars])
-                # Add forward edges (must be weak references)
-                self.outputs = tuple([weakref.ref(y.node) for y in ret])
-
-                if self._input_indexes_to_retain is not None:
-                    for index in self._input_indexes_to_retain:
-                        input_vars[index].retain_data()
-
-                if self._output_indexes_to_retain is not None:
-                    retained_data = []
-                    for index in self._output_indexes_to_retain:
-                        ret[index].retain_data()
-                        retained_data.append(outputs[index])
-                    self._retained_output_data = tuple(retained_data)
-
-                self.lazy_grad_sum = configuration.config.lazy_grad_sum
+                self._connect_graph(
+                    input_vars, outputs, ret,
+                    configuration.config.lazy_grad_sum)
 
         return ret
 
+    def _apply_fast(self, inputs, in_data, enable_backprop, lazy_grad_sum):
+        # Fast path of apply(). It is used when no function hooks are
+        # registered, debug mode, type checking and static graph
+        # optimizations are disabled, and no inputs are ChainerX arrays.
+        self._is_chainerx = False
+        self._input_indexes_to_retain = None
+        self._output_indexes_to_retain = None
+        if cuda.available:
+            with cuda.get_device_from_array(*in_data):
+                outputs = self.forward(in_data)
+        else:
+            outputs = self.forward(in_data)
+
+        if not isinstance(outputs, tuple):
+            raise TypeError(
+                'forward output must be a tuple ({})\n'
+                'Actual: {}'.format(self.label, type(outputs)))
+
+        self._output_count = len(outputs)
+
+        input_vars = [chainer.as_variable(x) for x in inputs]
+        requires_grad = False
+        for x in input_vars:
+            if x._requires_grad:
+                requires_grad = True
+                break
+
+        ret = tuple(
+            [variable.Variable(y, requires_grad=requires_grad)
+             for y in outputs])
+
+        if enable_backprop:
+            self._connect_graph(input_vars, outputs, ret, lazy_grad_sum)
+
+        return ret
+
+    def _apply_raw(self, in_data):
+        # Raw array mode of apply(). It is used under the same conditions as
+        # the fast path, except that type checking may be enabled, when
+        # backprop is disabled. The output arrays are returned as they are,
+        # so no variables or graph objects are created.
+        if configuration.config.type_check:
+            self._check_data_type_forward(in_data)
+        self._is_chainerx = False
+        self._input_indexes_to_retain = None
+        self._output_indexes_to_retain = None
+        if cuda.available:
+            with cuda.get_device_from_array(*in_data):
+                outputs = self.forward(in_data)
+        else:
+            outputs = self.forward(in_data)
+
+        if not isinstance(outputs, tuple):
+            raise TypeError(
+                'forward output must be a tuple ({})\n'
+                'Actual: {}'.format(self.label, type(outputs)))
+
+        self._output_count = len(outputs)
+        return outputs
+
+    def _connect_graph(self, input_vars, outputs, ret, lazy_grad_sum):
+        # Adds the edges of the computational graph. Since the variables are
+        # not of ChainerX, their nodes are accessed directly.
+        input_nodes = tuple([x._node for x in input_vars])
+        # Topological ordering
+        self.rank = max([x._rank for x in input_nodes]) if input_nodes else 0
+        # Add backward edges
+        for y in ret:
+            y._node.creator_node = self
+        self.inputs = input_nodes
+        # Add forward edges (must be weak references)
+        self.outputs = tuple([weakref.ref(y._node) for y in ret])
+
+        if self._input_indexes_to_retain is not None:
+            for index in self._input_indexes_to_retain:
+                input_vars[index].retain_data()
+
+        if self._output_indexes_to_retain is not None:
+            retained_data = []
+            for index in self._output_indexes_to_retain:
+                ret[index].retain_data()
+                retained_data.append(outputs[index])
+            self._retained_output_data = tuple(retained_data)
+
+        self.lazy_grad_sum = lazy_grad_sum
+
     def _check_data_type_forward(self, in_data):
+        # Skip the check if the same signature has already passed it.
+        cache = type_check.signature_cache
+        key = cache.get_key(self, in_data)
+        if key is not None and cache.is_verified(self, key):
+            return
+
         in_type = type_check.get_light_types(in_data)
         try:
             with type_check.light_mode:
                 self.check_type_forward(in_type)
-            return
         except type_check.InvalidType:
             # Ignore errors on first run
             pass
+        else:
+            if key is not None:
+                cache.add(self, key)
+            return
 
         in_type = type_check.get_types(in_data, 'in_types', False)
         with type_check.get_function_check_context(self):
@@ -833,6 +942,20 @@ Use apply() method instead.\
 
         return tuple(ret)
 
+    def _get_retained_arrays(self):
+        # Returns the arrays retained by retain_inputs() and retain_outputs()
+        # for backprop, without creating new variables.
+        arrays = []
+        if self._input_indexes_to_retain is not None and \
+                self.inputs is not None:
+            for index in self._input_indexes_to_retain:
+                data = self.inputs[index].data
+                if data is not None:
+                    arrays.append(data)
+        if self._retained_output_data is not None:
+            arrays.extend(self._retained_output_data)
+        return arrays
+
     def unchain(self):
         """Purges in/out nodes and this function node itself from the graph."""
         for y in self.outputs:
@@ -1007,7 +1130,7 @@ def grad(outputs, inputs, grad_outputs=None, grad_inputs=None, set_grad=False,
     # 3. Backpropagation: the backpropagation is executed along the
     #    (sub-)subgraph. It uses the topological order of the subgraph which is
     #    induced by the reversed order of function applications ("rank").
-    grads = _backprop_utils.GradTable()
+    grads = _backprop_utils.GradTable(inplace=not enable_double_backprop)
 
     # Initialize the gradient mapping.
     if grad_outputs is None:
@@ -1031,10 +1154,13 @@ def grad(outputs, inputs, grad_outputs=None, grad_inputs=None, set_grad=False,
 
     # Backprop implementation. It edits grads which will only contain the
     # gradients w.r.t. the inputs.
-    with chainer.using_config('enable_backprop', enable_double_backprop):
+    with chainer.using_config('enable_backprop', enable_double_backprop), \
+            _backprop_utils.sparse_grad_mode(False):
         ret_dict = _backprop(
             outputs, inputs, grad_required, retain_grad, grads, loss_scale)
 
+    grads.record_stats()
+
     # Extract the gradients w.r.t. the inputs and return them.
     ret = [ret_dict[x.node] for x in inputs]
     if set_grad:
@@ -1045,7 +1171,26 @@ def grad(outputs, inputs, grad_outputs=None, grad_inputs=None, set_grad=False,
 
 
 def _backprop(outputs, inputs, grad_required, retain_grad, grads, loss_scale):
-    candidate_funcs, push_candidate, pop_candidate = _get_ordered_func_heap()
+    def prepare(func):
+        input_indexes = tuple([
+            i for i, x in enumerate(func.inputs) if x in grad_required])
+        ys = [y() for y in func.outputs]  # access via weak ref
+        gys = tuple([grads.pop(y) for y in ys])
+        return input_indexes, gys, ys
+
+    parallel = None
+    n_workers = chainer.config.backward_workers
+    if (n_workers > 1
+            and not chainer.config.enable_backprop
+            and not chainer.is_debug()
+            and not chainer.get_function_hooks()):
+        root_funcs = set([
+            y.creator_node for y in outputs if y.creator_node is not None])
+        parallel = _backprop_utils.ParallelBackward(
+            n_workers, root_funcs, lambda x: x in grad_required, prepare)
+
+    candidate_funcs, push_candidate, pop_candidate = _get_ordered_func_heap(
+        parallel)
 
     for y in outputs:
         creator = y.creator_node
@@ -1059,8 +1204,11 @@ def _backprop(outputs, inputs, grad_required, retain_grad, grads, loss_scale):
         func = pop_candidate()
 
         # Collect the gradients w.r.t. the outputs
-        ys = [y() for y in func.outputs]  # access via weak ref
-        gys = tuple([grads.pop(y) for y in ys])
+        if parallel is None:
+            input_indexes, gys, ys = prepare(func)
+            gxs = None
+        else:
+            input_indexes, gys, ys, gxs = parallel.get(func)
 
         for node, gy in six.moves.zip(ys, gys):
             if node is not None:
@@ -1074,17 +1222,15 @@ def _backprop(outputs, inputs, grad_required, retain_grad, grads, loss_scale):
                         y._loss_scale = loss_scale
 
         # Collect the gradients w.r.t. the inputs
-        input_indexes = []
+        if not input_indexes:
+            if parallel is not None:
+                parallel.done(func)
+            continue
         x_grads = collections.OrderedDict()
-        for i, x in enumerate(func.inputs):
-            if x not in grad_required:
-                continue
-            input_indexes.append(i)
+        for i in input_indexes:
+            x = func.inputs[i]
             if x not in x_grads:
                 x_grads[x] = grads.get_as_list(x)
-        if not input_indexes:
-            continue
-        input_indexes = tuple(input_indexes)
 
         # Do backward
 
@@ -1103,7 +1249,13 @@ def _backprop(outputs, inputs, grad_required, retain_grad, grads, loss_scale):
             for hook in hooks:
                 hook.backward_preprocess(func, in_data, out_grad_data)
 
-            _backprop_utils.backprop_step(func, input_indexes, gys, x_grads)
+            if gxs is None:
+                _backprop_utils.backprop_step(
+                    func, input_indexes, gys, x_grads)
+            else:
+                _backprop_utils._accumulate_grads(
+                    func, input_indexes, gxs, x_grads, False)
+                del gxs  # to reduce memory usage
 
             # Call post-backward hooks
             for hook in hooks:
@@ -1118,6 +1270,9 @@ def _backprop(outputs, inputs, grad_required, retain_grad, grads, loss_scale):
             if creator is not None:
                 push_candidate(creator)
 
+        if parallel is not None:
+            parallel.done(func)
+
     for x in input_nodes:
         if x not in ret_dict:
             ret_dict[x] = grads.pop(x)
@@ -1151,7 +1306,53 @@ def _extract_apply_in_data(inputs):
     return False, tuple(arrays)
 
 
-def _get_ordered_func_heap():
+def _extract_apply_in_data_fast(inputs):
+    # Extracts arrays from FunctionNode.apply() inputs for the fast path.
+    #
+    # Returns None if any of the inputs is a ChainerX array or an object
+    # other than Variable and numpy.ndarray, in which case
+    # _extract_apply_in_data() and the input checks of the regular path must
+    # be used instead.
+    arrays = []
+    for x in inputs:
+        if isinstance(x, variable.Variable):
+            x = x._data[0]
+        elif not isinstance(x, numpy.ndarray):
+            return None
+        arrays.append(x)
+    if chainerx.is_available():
+        for arr in arrays:
+            if isinstance(arr, chainerx.ndarray):
+                return None
+    return tuple(arrays)
+
+
+def _get_apply_config():
+    # Returns a tuple ``(version, fast, enable_backprop, lazy_grad_sum, raw)``
+    # derived from the current configuration. ``fast`` indicates whether
+    # FunctionNode.apply() can take the fast path, and ``raw`` whether it
+    # can return raw arrays. The tuple is cached per thread and recomputed
+    # only when the configuration has been changed.
+    version = configuration._version
+    cache = getattr(_thread_local, 'apply_config', None)
+    if cache is not None and cache[0] == version:
+        return cache
+
+    config = configuration.config
+    fast = (not config.debug
+            and not config.type_check
+            and config.schedule_func is None)
+    raw = (config.raw_array_mode
+           and not config.enable_backprop
+           and not config.debug
+           and config.schedule_func is None)
+    cache = (version, fast, config.enable_backprop, config.lazy_grad_sum,
+             raw)
+    _thread_local.apply_config = cache
+    return cache
+
+
+def _get_ordered_func_heap(parallel=None):
     heap = []
     visited_funcs = set()
 
@@ -1162,6 +1363,8 @@ def _get_ordered_func_heap():
             ordered_func = -func.rank, len(visited_funcs), func
             visited_funcs.add(func)
             heapq.heappush(heap, ordered_func)
+            if parallel is not None:
+                parallel.push(func)
 
     def pop_heap():
         _, _, func = heapq.heappop(heap)
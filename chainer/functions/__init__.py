@@ -85,6 +85,7 @@ from chainer.functions.connection.n_step_lstm import n_step_bilstm  # NOQA
 from chainer.functions.connection.n_step_lstm import n_step_lstm  # NOQA
 from chainer.functions.connection.n_step_rnn import n_step_birnn  # NOQA
 from chainer.functions.connection.n_step_rnn import n_step_rnn  # NOQA
+from chainer.functions.connection.scaled_dot_product_attention import scaled_dot_product_attention  # NOQA
 from chainer.functions.connection.shift import shift  # NOQA
 
 from chainer.functions.evaluation.accuracy import accuracy  # NOQA
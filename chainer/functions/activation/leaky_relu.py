@@ -1,6 +1,8 @@
+import chainer
 from chainer.backends import cuda
 from chainer.backends import intel64
 from chainer import function_node
+from chainer.utils import array
 from chainer.utils import type_check
 
 
@@ -20,6 +22,8 @@ class LeakyReLU(function_node.FunctionNode):
 
     """Leaky rectifier unit."""
 
+    _packed_mask = None
+
     def __init__(self, slope=0.2):
         self.slope = slope
 
@@ -36,7 +40,13 @@ class LeakyReLU(function_node.FunctionNode):
         x, = inputs
         y = x.copy()
         y[x < 0] *= self.slope
-        if self.slope >= 0:
+        if chainer.config.pack_masks:
+            # Only the signs used by backward are kept.
+            if self.slope >= 0:
+                self._packed_mask = array._pack_mask(y < 0)
+            else:
+                self._packed_mask = array._pack_mask(x < 0)
+        elif self.slope >= 0:
             self.retain_outputs((0,))
         else:
             self.retain_inputs((0,))
@@ -63,6 +73,10 @@ class LeakyReLU(function_node.FunctionNode):
         return y,
 
     def backward(self, indexes, grad_outputs):
+        if self._packed_mask is not None:
+            neg = array._unpack_mask(self._packed_mask)
+            return _LeakyReLUGrad(None, None, self.slope, neg).apply(
+                grad_outputs)
         if self.slope >= 0:
             x = None
             y = self.get_retained_outputs()[0].data
@@ -74,19 +88,25 @@ class LeakyReLU(function_node.FunctionNode):
 
 class _LeakyReLUGrad(function_node.FunctionNode):
 
-    def __init__(self, x, y, slope):
+    def __init__(self, x, y, slope, neg=None):
+        # neg is a boolean mask of the elements to be scaled by the slope,
+        # which is given instead of x and y when it is kept as packed bits.
         self.slope = slope
         self.x = x
         self.y = y
+        self.neg = neg
 
     def forward_cpu(self, inputs):
-        if (intel64.should_use_ideep('>=auto')
+        if (self.neg is None
+                and intel64.should_use_ideep('>=auto')
                 and intel64.inputs_all_ready(inputs)):
             return self.forward_ideep(inputs)
 
         gy, = inputs
         gy = gy.copy()
-        if self.slope >= 0:
+        if self.neg is not None:
+            gy[self.neg] *= self.slope
+        elif self.slope >= 0:
             gy[self.y < 0] *= self.slope
         else:
             gy[self.x < 0] *= self.slope
@@ -114,7 +134,8 @@ class _LeakyReLUGrad(function_node.FunctionNode):
         return gy,
 
     def backward(self, indexes, grad_outputs):
-        return _LeakyReLUGrad(self.x, self.y, self.slope).apply(grad_outputs)
+        return _LeakyReLUGrad(
+            self.x, self.y, self.slope, self.neg).apply(grad_outputs)
 
 
 def leaky_relu(x, slope=0.2):
@@ -141,6 +162,12 @@ def leaky_relu(x, slope=0.2):
         ~chainer.Variable: Output variable. A
         :math:`(s_1, s_2, ..., s_N)`-shaped float array.
 
+    .. note::
+
+       If ``chainer.config.pack_masks`` is ``True``, the signs of the output
+       (or the input if ``slope`` is negative) computed on CPU are kept as
+       packed bits for backward instead of the array itself.
+
     .. admonition:: Example
 
         >>> x = np.array([[-1, 0], [2, -3], [-2, 1]], np.float32)
@@ -6,6 +6,7 @@ from chainer.backends import cuda
 from chainer.backends import intel64
 from chainer import function_node
 from chainer import utils
+from chainer.utils import array
 from chainer.utils import type_check
 import chainerx
 
@@ -25,6 +26,7 @@ class ReLU(function_node.FunctionNode):
 
     _use_cudnn = False
     _use_ideep = False
+    _packed_mask = None
 
     def check_type_forward(self, in_types):
         type_check._argname(in_types, ('x',))
@@ -42,8 +44,13 @@ class ReLU(function_node.FunctionNode):
             return self.forward_ideep(inputs)
 
         x, = inputs
-        self.retain_outputs((0,))
-        return utils.force_array(numpy.maximum(x, 0, dtype=x.dtype)),
+        y = utils.force_array(numpy.maximum(x, 0, dtype=x.dtype))
+        if chainer.config.pack_masks:
+            # Only the signs of the output are kept for backward.
+            self._packed_mask = array._pack_mask(y > 0)
+        else:
+            self.retain_outputs((0,))
+        return y,
 
     def forward_ideep(self, inputs):
         x, = inputs
@@ -68,6 +75,9 @@ class ReLU(function_node.FunctionNode):
 
     def backward(self, indexes, grad_outputs):
         gy, = grad_outputs
+        if self._packed_mask is not None:
+            mask = array._unpack_mask(self._packed_mask)
+            return ReLUGrad2(chainer.Variable(mask)).apply((gy,))
         y, = self.get_retained_outputs()
         if self._use_ideep:
             # iDeep implementation
@@ -170,6 +180,12 @@ def relu(x):
         ~chainer.Variable: Output variable. A
         :math:`(s_1, s_2, ..., s_N)`-shaped float array.
 
+    .. note::
+
+       If ``chainer.config.pack_masks`` is ``True``, the signs of the output
+       computed on CPU are kept as packed bits for backward instead of the
+       output itself.
+
     .. admonition:: Example
 
         >>> x = np.array([[-1, 0], [2, -3], [-2, 1]], np.float32)
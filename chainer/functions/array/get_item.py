@@ -57,7 +57,7 @@ class GetItemGrad(function_node.FunctionNode):
         gx = xp.zeros(self._in_shape, gy.dtype)
         if xp is numpy:
             try:
-                numpy.add.at(gx, self.slices, gy)
+                utils.scatter_add(gx, self.slices, gy)
             except IndexError:
                 done = False
                 # In numpy<1.13, 0-dim boolean index is not supported in
@@ -66,15 +66,16 @@ class GetItemGrad(function_node.FunctionNode):
                 if not _numpy_supports_0d_bool_index and len(self.slices) == 1:
                     idx = numpy.asanyarray(self.slices[0])
                     if idx.dtype == numpy.dtype(bool):
-                        # Convert the array and the mask to 1-dim.
-                        # numpy.add.at with them is supported in older numpy.
-                        numpy.add.at(gx[None], idx[None], gy)
+                        # Convert the array and the mask to 1-dim, which
+                        # are supported in older numpy.
+                        utils.scatter_add(gx[None], idx[None], gy)
                         done = True
 
                 if not done:
                     msg = '''
 GetItem does not support backward for this slices. The slices argument is not
-supported by numpy.add.at, while it is supported by numpy.ndarray.__getitem__.
+supported by chainer.utils.scatter_add, while it is supported by
+numpy.ndarray.__getitem__.
 
 Please report this error to the issue tracker with the stack trace,
 the information of your environment, and your script:
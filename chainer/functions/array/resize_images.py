@@ -3,6 +3,7 @@ import numpy
 from chainer import backend
 from chainer.backends import cuda
 from chainer import function_node
+from chainer import utils
 from chainer.utils import type_check
 
 
@@ -113,7 +114,7 @@ class ResizeImagesGrad(function_node.FunctionNode):
 
         # --- gx
         if xp is numpy:
-            scatter_add = numpy.add.at
+            scatter_add = utils.scatter_add
         else:
             scatter_add = cuda.cupyx.scatter_add
 
@@ -4,6 +4,7 @@ import chainer
 from chainer import backend
 from chainer.backends import cuda
 from chainer import function_node
+from chainer import utils
 from chainer.utils import type_check
 
 
@@ -43,9 +44,9 @@ class ScatterAdd(function_node.FunctionNode):
                 'Chainer does not support automatic broadcasting '
                 'of variables.')
         if xp is numpy:
-            numpy.add.at(y, self.slices, b),
+            utils.scatter_add(y, self.slices, b)
         else:
-            cuda.cupyx.scatter_add(y, self.slices, b),
+            cuda.cupyx.scatter_add(y, self.slices, b)
         return y,
 
     def backward(self, indexes, grad_outputs):
@@ -4,6 +4,7 @@ import chainer
 from chainer import backend
 from chainer.backends import cuda
 from chainer import function
+from chainer import utils
 from chainer.utils import argument
 from chainer.utils import type_check
 
@@ -232,7 +233,7 @@ class SpatialTransformerSampler(function.Function):
 
         # --- gx
         if xp is numpy:
-            scatter_add = numpy.add.at
+            scatter_add = utils.scatter_add
         else:
             scatter_add = cuda.cupyx.scatter_add
         gx = xp.zeros_like(x_pad)
@@ -9,6 +9,7 @@ from chainer import function_node
 import chainer.functions
 from chainer.utils import argument
 from chainer.utils import conv
+from chainer.utils import conv_cpu
 from chainer.utils import type_check
 import chainerx
 
@@ -126,17 +127,31 @@ class Convolution2DFunction(function_node.FunctionNode):
         if self._use_ideep:
             return self._forward_ideep(x, W, b)
 
-        kh, kw = W.shape[2:]
-        col = conv.im2col_cpu(
-            x, kh, kw, self.sy, self.sx, self.ph, self.pw,
-            cover_all=self.cover_all, dy=self.dy, dx=self.dx)
-        y = numpy.tensordot(
-            col, W, ((1, 2, 3), (1, 2, 3))).astype(x.dtype, copy=False)
+        if conv_cpu.is_supported(
+                (x.dtype, W.dtype), (self.sy, self.sx), (self.dy, self.dx)):
+            # Winograd or FFT algorithm
+            y = conv_cpu.convolution_forward(
+                x, W, self.ph, self.pw, self._forward_im2col)
+        else:
+            y = self._forward_im2col(x, W)
         if b is not None:
-            y += b
-        y = numpy.rollaxis(y, 3, 1)
+            y += b.reshape((1, b.size, 1, 1))
         return y,
 
+    def _forward_im2col(self, x, W):
+        out_c, _, kh, kw = W.shape
+        # The patches are copied chunk by chunk within the workspace.
+        col = conv.im2col_cpu(
+            x, kh, kw, self.sy, self.sx, self.ph, self.pw,
+            cover_all=self.cover_all, dy=self.dy, dx=self.dx, copy=False)
+        n, c, _, _, out_h, out_w = col.shape
+        y = numpy.empty((n, out_h, out_w, out_c), dtype=x.dtype)
+        for ns, hs in conv.iter_im2col_chunks(
+                n, out_h, c * kh * kw * out_w * x.itemsize):
+            y[ns, hs] = numpy.tensordot(
+                col[ns, :, :, :, hs], W, ((1, 2, 3), (1, 2, 3)))
+        return numpy.rollaxis(y, 3, 1)
+
     def _forward_ideep(self, x, W, b):
         out_c, input_c, kh, kw = W.shape
         n, c, h, w = x.shape
@@ -297,6 +312,17 @@ class Convolution2DGradW(function_node.FunctionNode):
         if self._use_ideep:
             return self._forward_ideep(x, gy)
 
+        if conv_cpu.is_supported(
+                (x.dtype, gy.dtype, self.W_dtype), (self.sy, self.sx),
+                (self.dy, self.dx)):
+            # Winograd or FFT algorithm
+            gW = conv_cpu.convolution_backward_filter(
+                x, gy, self.kh, self.kw, self.ph, self.pw,
+                self._forward_im2col)
+            return gW,
+        return self._forward_im2col(x, gy),
+
+    def _forward_im2col(self, x, gy):
         # NumPy raises an error when the array is not contiguous.
         # See: https://github.com/chainer/chainer/issues/2744
         # TODO(niboshi): Remove this code when NumPy is fixed.
@@ -304,12 +330,19 @@ class Convolution2DGradW(function_node.FunctionNode):
                 1 in gy.shape):
             gy = numpy.ascontiguousarray(gy)
 
+        # The patches are copied chunk by chunk within the workspace.
         col = conv.im2col_cpu(
             x, self.kh, self.kw, self.sy, self.sx, self.ph, self.pw,
-            cover_all=self.cover_all, dy=self.dy, dx=self.dx)
-        gW = numpy.tensordot(gy, col, ((0, 2, 3), (0, 4, 5))
-                             ).astype(self.W_dtype, copy=False)
-        return gW,
+            cover_all=self.cover_all, dy=self.dy, dx=self.dx, copy=False)
+        n, c, kh, kw, out_h, out_w = col.shape
+        # Half-precision chunks are accumulated in single precision.
+        gW = numpy.zeros((gy.shape[1], c, kh, kw),
+                         dtype=numpy.result_type(x, gy, numpy.float32))
+        for ns, hs in conv.iter_im2col_chunks(
+                n, out_h, c * kh * kw * out_w * x.itemsize):
+            gW += numpy.tensordot(
+                gy[ns, :, hs], col[ns, :, :, :, hs], ((0, 2, 3), (0, 4, 5)))
+        return gW.astype(self.W_dtype, copy=False)
 
     def _forward_ideep(self, x, gy):
         n, input_c, h, w = x.shape
@@ -139,17 +139,28 @@ class ConvolutionND(function_node.FunctionNode):
         pad = self.pad
         dilate = self.dilate
 
-        # Make patch array.
+        axes = tuple(moves.range(1, ndim + 2))  # (1, 2, ..., N+1)
         if xp is numpy:
+            # Make a view of patches, which are copied chunk by chunk within
+            # the workspace.
             col = conv_nd.im2col_nd_cpu(
-                x, ksize, stride, pad, cover_all=self.cover_all, dilate=dilate)
+                x, ksize, stride, pad, cover_all=self.cover_all,
+                dilate=dilate, copy=False)
+            n, c = col.shape[:2]
+            outs = col.shape[ndim + 2:]
+            y = numpy.empty((n,) + outs + (W.shape[0],), dtype=x.dtype)
+            for ns, hs in conv.iter_im2col_chunks(
+                    n, outs[0],
+                    c * _prod(ksize) * _prod(outs[1:]) * x.itemsize):
+                col_index = (ns,) + (slice(None),) * (ndim + 1) + (hs,)
+                y[ns, hs] = numpy.tensordot(col[col_index], W, (axes, axes))
         else:
+            # Make patch array.
             col = conv_nd.im2col_nd_gpu(
                 x, ksize, stride, pad, cover_all=self.cover_all, dilate=dilate)
 
-        # Compute correlation.
-        axes = tuple(moves.range(1, ndim + 2))  # (1, 2, ..., N+1)
-        y = xp.tensordot(col, W, (axes, axes)).astype(x.dtype, copy=False)
+            # Compute correlation.
+            y = xp.tensordot(col, W, (axes, axes)).astype(x.dtype, copy=False)
 
         # Apply bias if given.
         if b is not None:
@@ -309,16 +320,28 @@ class ConvolutionNDGradW(function_node.FunctionNode):
             gy = numpy.ascontiguousarray(gy)
 
         if xp is numpy:
+            # Make a view of patches, which are copied chunk by chunk within
+            # the workspace.
             col = conv_nd.im2col_nd_cpu(
                 x, self.ksize, self.stride, self.pad,
-                cover_all=self.cover_all, dilate=self.dilate)
+                cover_all=self.cover_all, dilate=self.dilate, copy=False)
+            n, c = col.shape[:2]
+            outs = col.shape[self.ndim + 2:]
+            # Half-precision chunks are accumulated in single precision.
+            gW = numpy.zeros((gy.shape[1], c) + self.ksize,
+                             dtype=numpy.result_type(x, gy, numpy.float32))
+            for ns, hs in conv.iter_im2col_chunks(
+                    n, outs[0],
+                    c * _prod(self.ksize) * _prod(outs[1:]) * x.itemsize):
+                col_index = (ns,) + (slice(None),) * (self.ndim + 1) + (hs,)
+                gW += numpy.tensordot(
+                    gy[ns, :, hs], col[col_index], (out_axes, col_axes))
         else:
             col = conv_nd.im2col_nd_gpu(
                 x, self.ksize, self.stride, self.pad,
                 cover_all=self.cover_all, dilate=self.dilate)
-        gW = xp.tensordot(gy, col, (out_axes, col_axes)).astype(
-            self.W_dtype, copy=False)
-        return gW,
+            gW = xp.tensordot(gy, col, (out_axes, col_axes))
+        return gW.astype(self.W_dtype, copy=False),
 
     def _forward_cudnn(self, x, gy):
         # Make empty arrays for result.
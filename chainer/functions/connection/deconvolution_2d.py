@@ -9,6 +9,7 @@ import chainer.functions
 from chainer.functions.connection import convolution_2d
 from chainer.utils import argument
 from chainer.utils import conv
+from chainer.utils import conv_cpu
 from chainer.utils import type_check
 import chainerx
 
@@ -138,16 +139,38 @@ class Deconvolution2DFunction(function_node.FunctionNode):
         if self._use_ideep:
             return self._forward_ideep(x, W, b)
 
-        gcol = numpy.tensordot(W, x, (0, 1)).astype(x.dtype, copy=False)
-        gcol = numpy.rollaxis(gcol, 3)
-        y = conv.col2im_cpu(
-            gcol, self.sy, self.sx, self.ph, self.pw, self.outh, self.outw,
-            dy=self.dy, dx=self.dx)
+        kh, kw = W.shape[2:]
+        if (conv_cpu.is_supported(
+                (x.dtype, W.dtype), (self.sy, self.sx), (self.dy, self.dx))
+                and self.ph < kh and self.pw < kw):
+            # Deconvolution with unit stride is the convolution with the
+            # flipped filter, which Winograd or FFT algorithm can compute.
+            y = conv_cpu.convolution_forward(
+                x, W.transpose(1, 0, 2, 3)[:, :, ::-1, ::-1],
+                kh - 1 - self.ph, kw - 1 - self.pw,
+                lambda x, _: self._forward_col2im(x, W))
+        else:
+            y = self._forward_col2im(x, W)
         # b, k, h, w
         if b is not None:
             y += b.reshape((1, b.size, 1, 1))
         return y,
 
+    def _forward_col2im(self, x, W):
+        n, _, h, w = x.shape
+        _, c, kh, kw = W.shape
+        # The columns are reduced chunk by chunk of samples within the
+        # workspace.
+        y = numpy.empty((n, c, self.outh, self.outw), dtype=x.dtype)
+        for ns, _ in conv.iter_im2col_chunks(
+                n, 1, c * kh * kw * h * w * x.itemsize):
+            gcol = numpy.tensordot(W, x[ns], (0, 1))
+            gcol = numpy.rollaxis(gcol, 3)
+            y[ns] = conv.col2im_cpu(
+                gcol, self.sy, self.sx, self.ph, self.pw, self.outh,
+                self.outw, dy=self.dy, dx=self.dx)
+        return y
+
     def _forward_ideep(self, x, W, b):
         _, in_c, kh, kw = W.shape
         n, _, in_h, in_w = x.shape
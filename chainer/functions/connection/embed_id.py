@@ -1,17 +1,19 @@
 import numpy
-import six
 
 import chainer
+from chainer import _backprop_utils
 from chainer import backend
 from chainer.backends import cuda
 from chainer import function_node
+from chainer import utils
 from chainer.utils import type_check
 
 
 class EmbedIDFunction(function_node.FunctionNode):
 
-    def __init__(self, ignore_label=None):
+    def __init__(self, ignore_label=None, sparse_grad=False):
         self.ignore_label = ignore_label
+        self.sparse_grad = sparse_grad
 
     def check_type_forward(self, in_types):
         type_check.expect(in_types.size() == 2)
@@ -47,6 +49,19 @@ class EmbedIDFunction(function_node.FunctionNode):
 
     def backward(self, indexes, grad_outputs):
         inputs = self.get_retained_inputs()
+        if self.sparse_grad and _backprop_utils.is_sparse_grad_enabled():
+            W = self.inputs[1].get_variable_or_none()
+            if isinstance(W, chainer.Parameter) and W.creator_node is None:
+                # Accumulates the row-sparse gradient to the parameter
+                # directly instead of returning a dense gradient.
+                x = inputs[0].array.ravel()
+                gy = grad_outputs[0].array.reshape(-1, self._w_shape[1])
+                if self.ignore_label is not None:
+                    mask = x != self.ignore_label
+                    x, gy = x[mask], gy[mask]
+                _backprop_utils.add_sparse_grad(
+                    W, utils.RowSparseArray(x, gy, self._w_shape))
+                return None, None
         gW = EmbedIDGrad(
             self._w_shape, self.ignore_label).apply(inputs + grad_outputs)[0]
         return None, gW
@@ -66,13 +81,10 @@ class EmbedIDGrad(function_node.FunctionNode):
         gW = xp.zeros(self.w_shape, dtype=gy.dtype)
 
         if xp is numpy:
-            # It is equivalent to `numpy.add.at(gW, x, gy)` but ufunc.at is
-            # too slow.
-            for ix, igy in six.moves.zip(x.ravel(),
-                                         gy.reshape(x.size, -1)):
-                if ix == self.ignore_label:
-                    continue
-                gW[ix] += igy
+            if self.ignore_label is not None:
+                mask = x != self.ignore_label
+                x, gy = x[mask], gy[mask]
+            utils.scatter_add(gW, x, gy)
         else:
             if self.ignore_label is None:
                 cuda.elementwise(
@@ -116,7 +128,7 @@ class EmbedIDGrad(function_node.FunctionNode):
         return None, ggy
 
 
-def embed_id(x, W, ignore_label=None):
+def embed_id(x, W, ignore_label=None, sparse_grad=False):
     """Efficient linear function for one-hot input.
 
     This function implements so called *word embeddings*. It takes two
@@ -137,6 +149,16 @@ def embed_id(x, W, ignore_label=None):
         ignore_label (:class:`int` or :class:`None`):
             If ``ignore_label`` is an int value, ``i``-th column of return
             value is filled with ``0``.
+        sparse_grad (bool): If ``True`` and ``W`` is a
+            :class:`~chainer.Parameter`, the gradient of ``W`` is accumulated
+            to :attr:`~chainer.Parameter.sparse_grad` as a
+            :class:`~chainer.utils.RowSparseArray` instead of
+            :attr:`~chainer.Variable.grad`. It avoids computing the dense
+            gradient of the whole matrix, and optimizers can update only the
+            referenced rows. It only takes effect in
+            :meth:`Variable.backward() <chainer.Variable.backward>` without
+            double backprop. :func:`chainer.grad` and differentiable backprop
+            compute the dense gradient.
 
     Returns:
         ~chainer.Variable: Output variable.
@@ -163,4 +185,5 @@ def embed_id(x, W, ignore_label=None):
                [0., 0., 0.]], dtype=float32)
 
     """
-    return EmbedIDFunction(ignore_label=ignore_label).apply((x, W))[0]
+    return EmbedIDFunction(
+        ignore_label=ignore_label, sparse_grad=sparse_grad).apply((x, W))[0]
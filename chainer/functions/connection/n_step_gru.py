@@ -35,7 +35,7 @@ class NStepBiGRU(n_step_rnn.BaseNStepRNN):
 
 def n_step_gru(
         n_layers, dropout_ratio, hx, ws, bs, xs, **kwargs):
-    """n_step_gru(n_layers, dropout_ratio, hx, ws, bs, xs)
+    """n_step_gru(n_layers, dropout_ratio, hx, ws, bs, xs, *, enable_double_backprop=False)
 
     Stacked Uni-directional Gated Recurrent Unit function.
 
@@ -100,6 +100,11 @@ def n_step_gru(
             of :func:`~chainer.Variable` holding sequence.
             So ``xs`` needs to satisfy
             ``xs[t].shape[0] >= xs[t + 1].shape[0]``.
+        enable_double_backprop (bool): If ``True``, this function uses the
+            implementation composed of functions of each time step, which
+            supports higher order differentiation. If ``False``, it uses
+            cuDNN on GPU and the fused implementation on CPU when they are
+            available, which do not support higher order differentiation.
 
     Returns:
         tuple: This function returns a tuple containing three elements,
@@ -112,7 +117,7 @@ def n_step_gru(
           mini-batch size for time ``t``, and ``N`` is size of hidden
           units. Note that ``B_t`` is the same value as ``xs[t]``.
 
-    """
+    """  # NOQA
 
     return n_step_gru_base(n_layers, dropout_ratio, hx, ws, bs, xs,
                            use_bi_direction=False, **kwargs)
@@ -120,7 +125,7 @@ def n_step_gru(
 
 def n_step_bigru(
         n_layers, dropout_ratio, hx, ws, bs, xs, **kwargs):
-    """n_step_bigru(n_layers, dropout_ratio, hx, ws, bs, xs)
+    """n_step_bigru(n_layers, dropout_ratio, hx, ws, bs, xs, *, enable_double_backprop=False)
 
     Stacked Bi-directional Gated Recurrent Unit function.
 
@@ -203,6 +208,11 @@ def n_step_bigru(
             ``xs[t].shape[0] >= xs[t + 1].shape[0]``.
         use_bi_direction (bool): If ``True``, this function uses
             Bi-direction GRU.
+        enable_double_backprop (bool): If ``True``, this function uses the
+            implementation composed of functions of each time step, which
+            supports higher order differentiation. If ``False``, it uses
+            cuDNN on GPU and the fused implementation on CPU when they are
+            available, which do not support higher order differentiation.
 
     Returns:
         tuple: This function returns a tuple containing three elements,
@@ -215,7 +225,7 @@ def n_step_bigru(
           mini-batch size for time ``t``, and ``N`` is size of hidden
           units. Note that ``B_t`` is the same value as ``xs[t]``.
 
-    """
+    """  # NOQA
 
     return n_step_gru_base(n_layers, dropout_ratio, hx, ws, bs, xs,
                            use_bi_direction=True, **kwargs)
@@ -223,7 +233,7 @@ def n_step_bigru(
 
 def n_step_gru_base(n_layers, dropout_ratio, hx, ws, bs, xs,
                     use_bi_direction, **kwargs):
-    """n_step_gru_base(n_layers, dropout_ratio, hx, ws, bs, xs, use_bi_direction)
+    """n_step_gru_base(n_layers, dropout_ratio, hx, ws, bs, xs, use_bi_direction, *, enable_double_backprop=False)
 
     Base function for Stack GRU/BiGRU functions.
 
@@ -275,23 +285,28 @@ def n_step_gru_base(n_layers, dropout_ratio, hx, ws, bs, xs,
             Please select ``tanh`` or ``relu``.
         use_bi_direction (bool): If ``True``, this function uses
             Bi-direction GRU.
+        enable_double_backprop (bool): If ``True``, this function uses the
+            implementation composed of functions of each time step, which
+            supports higher order differentiation. If ``False``, it uses
+            cuDNN on GPU and the fused implementation on CPU when they are
+            available, which do not support higher order differentiation.
 
     .. seealso::
        :func:`chainer.functions.n_step_rnn`
        :func:`chainer.functions.n_step_birnn`
 
     """  # NOQA
-    if kwargs:
-        argument.check_unexpected_kwargs(
-            kwargs, train='train argument is not supported anymore. '
-            'Use chainer.using_config',
-            use_cudnn='use_cudnn argument is not supported anymore. '
-            'Use chainer.using_config')
-        argument.assert_kwargs_empty(kwargs)
+    enable_double_backprop, = argument.parse_kwargs(
+        kwargs, ('enable_double_backprop', False),
+        train='train argument is not supported anymore. '
+        'Use chainer.using_config',
+        use_cudnn='use_cudnn argument is not supported anymore. '
+        'Use chainer.using_config')
 
     xp = backend.get_array_module(hx, hx.data)
 
-    if xp is not numpy and chainer.should_use_cudnn('>=auto', 5000):
+    if (xp is not numpy and not enable_double_backprop
+            and chainer.should_use_cudnn('>=auto', 5000)):
         states = cuda.get_cudnn_dropout_states()
         states.set_dropout_ratio(dropout_ratio)
         lengths = [len(x) for x in xs]
@@ -313,7 +328,8 @@ def n_step_gru_base(n_layers, dropout_ratio, hx, ws, bs, xs,
     else:
         hy, _, ys = n_step_rnn.n_step_rnn_impl(
             _gru, n_layers, dropout_ratio, hx, None, ws, bs, xs,
-            use_bi_direction)
+            use_bi_direction, rnn_mode='gru',
+            enable_double_backprop=enable_double_backprop)
         return hy, ys
 
 
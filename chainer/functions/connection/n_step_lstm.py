@@ -41,7 +41,7 @@ class NStepBiLSTM(n_step_rnn.BaseNStepRNN):
 
 def n_step_lstm(
         n_layers, dropout_ratio, hx, cx, ws, bs, xs, **kwargs):
-    """n_step_lstm(n_layers, dropout_ratio, hx, cx, ws, bs, xs)
+    """n_step_lstm(n_layers, dropout_ratio, hx, cx, ws, bs, xs, *, enable_double_backprop=False)
 
     Stacked Uni-directional Long Short-Term Memory function.
 
@@ -113,6 +113,11 @@ def n_step_lstm(
             sorted in descending order of their lengths before transposing.
             So ``xs`` needs to satisfy
             ``xs[t].shape[0] >= xs[t + 1].shape[0]``.
+        enable_double_backprop (bool): If ``True``, this function uses the
+            implementation composed of functions of each time step, which
+            supports higher order differentiation. If ``False``, it uses
+            cuDNN on GPU and the fused implementation on CPU when they are
+            available, which do not support higher order differentiation.
 
     Returns:
         tuple: This function returns a tuple containing three elements,
@@ -173,7 +178,7 @@ for _ in range(8)])
         >>> [y.shape for y in ys]
         [(3, 2), (2, 2), (1, 2)]
 
-    """
+    """  # NOQA
 
     return n_step_lstm_base(n_layers, dropout_ratio, hx, cx, ws, bs, xs,
                             use_bi_direction=False, **kwargs)
@@ -181,7 +186,7 @@ for _ in range(8)])
 
 def n_step_bilstm(
         n_layers, dropout_ratio, hx, cx, ws, bs, xs, **kwargs):
-    """n_step_bilstm(n_layers, dropout_ratio, hx, cx, ws, bs, xs)
+    """n_step_bilstm(n_layers, dropout_ratio, hx, cx, ws, bs, xs, *, enable_double_backprop=False)
 
     Stacked Bi-directional Long Short-Term Memory function.
 
@@ -280,6 +285,11 @@ def n_step_bilstm(
             sorted in descending order of their lengths before transposing.
             So ``xs`` needs to satisfy
             ``xs[t].shape[0] >= xs[t + 1].shape[0]``.
+        enable_double_backprop (bool): If ``True``, this function uses the
+            implementation composed of functions of each time step, which
+            supports higher order differentiation. If ``False``, it uses
+            cuDNN on GPU and the fused implementation on CPU when they are
+            available, which do not support higher order differentiation.
 
     Returns:
         tuple: This function returns a tuple containing three elements,
@@ -340,7 +350,7 @@ for _ in range(8)])
         >>> [y.shape for y in ys]
         [(3, 4), (2, 4), (1, 4)]
 
-    """
+    """  # NOQA
     return n_step_lstm_base(n_layers, dropout_ratio, hx, cx, ws, bs, xs,
                             use_bi_direction=True, **kwargs)
 
@@ -391,6 +401,11 @@ def n_step_lstm_base(
             ``xs[t].shape[0] >= xs[t + 1].shape[0]``.
         use_bi_direction (bool): If ``True``, this function uses Bi-directional
             LSTM.
+        enable_double_backprop (bool): If ``True``, this function uses the
+            implementation composed of functions of each time step, which
+            supports higher order differentiation. If ``False``, it uses
+            cuDNN on GPU and the fused implementation on CPU when they are
+            available, which do not support higher order differentiation.
 
     Returns:
         tuple: This function returns a tuple containing three elements,
@@ -412,17 +427,17 @@ def n_step_lstm_base(
        :func:`chainer.functions.n_step_bilstm`
 
     """
-    if kwargs:
-        argument.check_unexpected_kwargs(
-            kwargs, train='train argument is not supported anymore. '
-            'Use chainer.using_config',
-            use_cudnn='use_cudnn argument is not supported anymore. '
-            'Use chainer.using_config')
-        argument.assert_kwargs_empty(kwargs)
+    enable_double_backprop, = argument.parse_kwargs(
+        kwargs, ('enable_double_backprop', False),
+        train='train argument is not supported anymore. '
+        'Use chainer.using_config',
+        use_cudnn='use_cudnn argument is not supported anymore. '
+        'Use chainer.using_config')
 
     xp = backend.get_array_module(hx, hx.data)
 
-    if xp is not numpy and chainer.should_use_cudnn('>=auto', 5000):
+    if (xp is not numpy and not enable_double_backprop
+            and chainer.should_use_cudnn('>=auto', 5000)):
         states = cuda.get_cudnn_dropout_states()
         states.set_dropout_ratio(dropout_ratio)
         lengths = [len(x) for x in xs]
@@ -444,7 +459,8 @@ def n_step_lstm_base(
     else:
         return n_step_rnn.n_step_rnn_impl(
             _lstm, n_layers, dropout_ratio, hx, cx, ws, bs, xs,
-            use_bi_direction)
+            use_bi_direction, rnn_mode='lstm',
+            enable_double_backprop=enable_double_backprop)
 
 
 def _lstm(x, h, c, w, b):
@@ -506,9 +506,264 @@ class NStepBiRNNReLU(BaseNStepRNN):
             rnn_dir='bi', rnn_mode='rnn_relu', **kwargs)
 
 
+# Order of the gates in the stacked weight matrices of the fused CPU
+# implementation. The gates applying sigmoid come first in LSTM so that
+# they can be computed at once.
+_cpu_gate_orders = {
+    'rnn_relu': (0,),
+    'rnn_tanh': (0,),
+    'gru': (0, 1, 2),
+    'lstm': (0, 1, 3, 2),
+}
+
+
+def _sigmoid_inplace(x):
+    numpy.tanh(x * 0.5, out=x)
+    x *= 0.5
+    x += 0.5
+
+
+class OneDirectionalRNN(function.Function):
+
+    """Fused recurrence of one layer in one direction of an RNN on CPU.
+
+    It computes the projection of the inputs of all time steps with one
+    matrix product and runs the recurrence in a loop over preallocated
+    buffers. The backward computation is done in one call as well.
+
+    The inputs are the concatenated input sequence, the initial hidden state,
+    the initial cell state (only for LSTM), the weight matrices and the bias
+    vectors in the format of :func:`~chainer.functions.n_step_rnn`,
+    :func:`~chainer.functions.n_step_gru` or
+    :func:`~chainer.functions.n_step_lstm`. The outputs are the concatenated
+    output sequence, the last hidden state and the last cell state (only for
+    LSTM).
+
+    Args:
+        rnn_mode (str): ``'rnn_tanh'``, ``'rnn_relu'``, ``'gru'`` or
+            ``'lstm'``.
+        lengths (list of int): Mini-batch sizes of the time steps.
+        reverse (bool): If ``True``, the sequence is processed from the
+            last time step.
+
+    """
+
+    def __init__(self, rnn_mode, lengths, reverse=False):
+        if rnn_mode not in _cpu_gate_orders:
+            candidate_list = ','.join(_cpu_gate_orders.keys())
+            raise ValueError('Invalid rnn_mode: "%s". Please select from [%s]'
+                             % (rnn_mode, candidate_list))
+        self.rnn_mode = rnn_mode
+        self.use_cell = rnn_mode == 'lstm'
+        self.gate_order = _cpu_gate_orders[rnn_mode]
+        self.lengths = lengths
+        self.reverse = reverse
+
+    def check_type_forward(self, in_types):
+        n_states = 2 if self.use_cell else 1
+        n_W = len(self.gate_order) * 2
+        type_check.expect(in_types.size() == 1 + n_states + n_W * 2)
+        x_type, h_type = in_types[:2]
+        type_check.expect(
+            x_type.dtype.kind == 'f',
+            x_type.ndim == 2,
+            x_type.shape[0] == sum(self.lengths),
+            h_type.dtype == x_type.dtype,
+            h_type.ndim == 2,
+        )
+        for t in in_types[2:]:
+            type_check.expect(t.dtype == x_type.dtype)
+
+    def _steps(self):
+        offsets = numpy.cumsum([0] + list(self.lengths[:-1]))
+        steps = list(six.moves.zip(offsets, self.lengths))
+        if self.reverse:
+            steps.reverse()
+        return steps
+
+    def _split_inputs(self, inputs):
+        n_states = 2 if self.use_cell else 1
+        x = inputs[0]
+        states = inputs[1:1 + n_states]
+        params = inputs[1 + n_states:]
+        n_W = len(params) // 2
+        return x, states, params[:n_W], params[n_W:]
+
+    def _stack(self, arrays):
+        n_gates = len(self.gate_order)
+        Wx = numpy.concatenate([arrays[k] for k in self.gate_order])
+        Wh = numpy.concatenate(
+            [arrays[n_gates + k] for k in self.gate_order])
+        return Wx, Wh
+
+    def forward_cpu(self, inputs):
+        x, states, ws, bs = self._split_inputs(inputs)
+        Wx, Wh = self._stack(ws)
+        bx, bh = self._stack(bs)
+        n_units = Wh.shape[1]
+        n_gates = len(self.gate_order)
+
+        # Projection of the inputs of all time steps, which is overwritten
+        # by the activated gates.
+        gates = x.dot(Wx.T)
+        gates += bx
+        ys = numpy.empty((len(x), n_units), dtype=x.dtype)
+        h_prevs = numpy.empty_like(ys)
+        h = states[0].copy()
+        if self.use_cell:
+            c = states[1].copy()
+            cs = numpy.empty_like(ys)
+            c_prevs = numpy.empty_like(ys)
+        elif self.rnn_mode == 'gru':
+            hus = numpy.empty_like(ys)
+        WhT = Wh.T
+
+        for offset, batch in self._steps():
+            rows = slice(offset, offset + batch)
+            h_prev = h[:batch]
+            h_prevs[rows] = h_prev
+            g = gates[rows]
+            hu = h_prev.dot(WhT)
+            hu += bh
+            if self.rnn_mode == 'lstm':
+                g += hu
+                _sigmoid_inplace(g[:, :3 * n_units])
+                numpy.tanh(g[:, 3 * n_units:], out=g[:, 3 * n_units:])
+                i, f, o, a = numpy.split(g, n_gates, axis=1)
+                c_prev = c[:batch]
+                c_prevs[rows] = c_prev
+                c_new = cs[rows]
+                numpy.multiply(f, c_prev, out=c_new)
+                c_new += i * a
+                c_prev[...] = c_new
+                y = ys[rows]
+                numpy.tanh(c_new, out=y)
+                y *= o
+            elif self.rnn_mode == 'gru':
+                g[:, :2 * n_units] += hu[:, :2 * n_units]
+                _sigmoid_inplace(g[:, :2 * n_units])
+                r, z, n = numpy.split(g, n_gates, axis=1)
+                hu_n = hu[:, 2 * n_units:]
+                hus[rows] = hu_n
+                n += r * hu_n
+                numpy.tanh(n, out=n)
+                y = ys[rows]
+                numpy.subtract(h_prev, n, out=y)
+                y *= z
+                y += n
+            else:
+                g += hu
+                y = ys[rows]
+                if self.rnn_mode == 'rnn_tanh':
+                    numpy.tanh(g, out=y)
+                else:
+                    numpy.maximum(g, 0, out=y)
+            h_prev[...] = y
+
+        self.retain_outputs(())
+        self.gates = gates
+        self.h_prevs = h_prevs
+        if self.use_cell:
+            self.cs = cs
+            self.c_prevs = c_prevs
+            return ys, h, c
+        if self.rnn_mode == 'gru':
+            self.hus = hus
+        else:
+            self.ys = ys
+        return ys, h
+
+    def backward_cpu(self, inputs, grad_outputs):
+        x, states, ws, bs = self._split_inputs(inputs)
+        Wx, Wh = self._stack(ws)
+        n_units = Wh.shape[1]
+        n_gates = len(self.gate_order)
+        gys = grad_outputs[0]
+        gates = self.gates
+
+        gh = grad_outputs[1]
+        gh = numpy.zeros_like(states[0]) if gh is None else gh.copy()
+        if self.use_cell:
+            gc = grad_outputs[2]
+            gc = numpy.zeros_like(states[1]) if gc is None else gc.copy()
+        g_gates = numpy.empty_like(gates)
+        if self.rnn_mode == 'gru':
+            # Gradients of the gates from the hidden state differ from the
+            # ones from the input only in the candidate gate.
+            g_gates_h = numpy.empty_like(gates)
+        else:
+            g_gates_h = g_gates
+
+        for offset, batch in reversed(self._steps()):
+            rows = slice(offset, offset + batch)
+            gy = gh[:batch]
+            if gys is not None:
+                gy += gys[rows]
+            gg = g_gates[rows]
+            if self.rnn_mode == 'lstm':
+                i, f, o, a = numpy.split(gates[rows], n_gates, axis=1)
+                gi, gf, go, ga = numpy.split(gg, n_gates, axis=1)
+                tanh_c = numpy.tanh(self.cs[rows])
+                numpy.multiply(gy, tanh_c, out=go)
+                gc_new = gc[:batch]
+                gc_new += gy * o * (1 - tanh_c * tanh_c)
+                numpy.multiply(gc_new, a, out=gi)
+                numpy.multiply(gc_new, self.c_prevs[rows], out=gf)
+                numpy.multiply(gc_new, i, out=ga)
+                gc_new *= f
+                sig = gates[rows, :3 * n_units]
+                gg[:, :3 * n_units] *= sig * (1 - sig)
+                ga *= 1 - a * a
+                h_direct = None
+            elif self.rnn_mode == 'gru':
+                r, z, n = numpy.split(gates[rows], n_gates, axis=1)
+                gr, gz, gn = numpy.split(gg, n_gates, axis=1)
+                h_prev = self.h_prevs[rows]
+                numpy.multiply(gy, h_prev - n, out=gz)
+                gz *= z * (1 - z)
+                numpy.multiply(gy, 1 - z, out=gn)
+                gn *= 1 - n * n
+                hu_n = self.hus[rows]
+                numpy.multiply(gn, hu_n, out=gr)
+                gr *= r * (1 - r)
+                ggh = g_gates_h[rows]
+                ggh[:, :2 * n_units] = gg[:, :2 * n_units]
+                numpy.multiply(gn, r, out=ggh[:, 2 * n_units:])
+                h_direct = gy * z
+                gg = ggh
+            else:
+                y = self.ys[rows]
+                if self.rnn_mode == 'rnn_tanh':
+                    numpy.multiply(gy, 1 - y * y, out=gg)
+                else:
+                    numpy.multiply(gy, y > 0, out=gg)
+                h_direct = None
+            gh_prev = gg.dot(Wh)
+            if h_direct is not None:
+                gh_prev += h_direct
+            gh[:batch] = gh_prev
+
+        gx = g_gates.dot(Wx)
+        gWx = g_gates.T.dot(x)
+        gbx = g_gates.sum(axis=0)
+        gWh = g_gates_h.T.dot(self.h_prevs)
+        gbh = g_gates_h.sum(axis=0)
+
+        gws = [None] * len(ws)
+        gbs = [None] * len(bs)
+        for j, k in enumerate(self.gate_order):
+            s = slice(j * n_units, (j + 1) * n_units)
+            gws[k] = gWx[s]
+            gws[n_gates + k] = gWh[s]
+            gbs[k] = gbx[s]
+            gbs[n_gates + k] = gbh[s]
+        g_states = (gh, gc) if self.use_cell else (gh,)
+        return (gx,) + g_states + tuple(gws) + tuple(gbs)
+
+
 def n_step_rnn(
         n_layers, dropout_ratio, hx, ws, bs, xs, activation='tanh', **kwargs):
-    """n_step_rnn(n_layers, dropout_ratio, hx, ws, bs, xs, activation='tanh')
+    """n_step_rnn(n_layers, dropout_ratio, hx, ws, bs, xs, activation='tanh', *, enable_double_backprop=False)
 
     Stacked Uni-directional RNN function for sequence inputs.
 
@@ -583,6 +838,11 @@ def n_step_rnn(
             ``xs[t].shape[0] >= xs[t + 1].shape[0]``.
         activation (str): Activation function name.
             Please select ``tanh`` or ``relu``.
+        enable_double_backprop (bool): If ``True``, this function uses the
+            implementation composed of functions of each time step, which
+            supports higher order differentiation. If ``False``, it uses
+            cuDNN on GPU and the fused implementation on CPU when they are
+            available, which do not support higher order differentiation.
 
     Returns:
         tuple: This function returns a tuple containing three elements,
@@ -595,14 +855,14 @@ def n_step_rnn(
           mini-batch size for time ``t``, and ``N`` is size of hidden
           units. Note that ``B_t`` is the same value as ``xs[t]``.
 
-    """
+    """  # NOQA
     return n_step_rnn_base(n_layers, dropout_ratio, hx, ws, bs, xs,
                            activation, use_bi_direction=False, **kwargs)
 
 
 def n_step_birnn(
         n_layers, dropout_ratio, hx, ws, bs, xs, activation='tanh', **kwargs):
-    """n_step_birnn(n_layers, dropout_ratio, hx, ws, bs, xs, activation='tanh')
+    """n_step_birnn(n_layers, dropout_ratio, hx, ws, bs, xs, activation='tanh', *, enable_double_backprop=False)
 
     Stacked Bi-directional RNN function for sequence inputs.
 
@@ -693,6 +953,11 @@ def n_step_birnn(
             ``xs[t].shape[0] >= xs[t + 1].shape[0]``.
         activation (str): Activation function name.
             Please select ``tanh`` or ``relu``.
+        enable_double_backprop (bool): If ``True``, this function uses the
+            implementation composed of functions of each time step, which
+            supports higher order differentiation. If ``False``, it uses
+            cuDNN on GPU and the fused implementation on CPU when they are
+            available, which do not support higher order differentiation.
 
     Returns:
         tuple: This function returns a tuple containing three elements,
@@ -705,14 +970,14 @@ def n_step_birnn(
           is mini-batch size for time ``t``, and ``N`` is size of hidden
           units. Note that ``B_t`` is the same value as ``xs[t]``.
 
-    """
+    """  # NOQA
     return n_step_rnn_base(n_layers, dropout_ratio, hx, ws, bs, xs,
-                           activation, use_bi_direction=True)
+                           activation, use_bi_direction=True, **kwargs)
 
 
 def n_step_rnn_base(n_layers, dropout_ratio, hx, ws, bs, xs,
                     activation, use_bi_direction, **kwargs):
-    """n_step_rnn_base(n_layers, dropout_ratio, hx, ws, bs, xs, activation, use_bi_direction)
+    """n_step_rnn_base(n_layers, dropout_ratio, hx, ws, bs, xs, activation, use_bi_direction, *, enable_double_backprop=False)
 
     Base function for Stack RNN/BiRNN functions.
 
@@ -764,6 +1029,11 @@ def n_step_rnn_base(n_layers, dropout_ratio, hx, ws, bs, xs,
             Please select ``tanh`` or ``relu``.
         use_bi_direction (bool): If ``True``, this function uses
             Bi-directional RNN.
+        enable_double_backprop (bool): If ``True``, this function uses the
+            implementation composed of functions of each time step, which
+            supports higher order differentiation. If ``False``, it uses
+            cuDNN on GPU and the fused implementation on CPU when they are
+            available, which do not support higher order differentiation.
 
     Returns:
         tuple: This function returns a tuple containing three elements,
@@ -781,13 +1051,12 @@ def n_step_rnn_base(n_layers, dropout_ratio, hx, ws, bs, xs,
        :func:`chainer.functions.n_step_birnn`
 
     """  # NOQA
-    if kwargs:
-        argument.check_unexpected_kwargs(
-            kwargs, train='train argument is not supported anymore. '
-            'Use chainer.using_config',
-            use_cudnn='use_cudnn argument is not supported anymore. '
-            'Use chainer.using_config')
-        argument.assert_kwargs_empty(kwargs)
+    enable_double_backprop, = argument.parse_kwargs(
+        kwargs, ('enable_double_backprop', False),
+        train='train argument is not supported anymore. '
+        'Use chainer.using_config',
+        use_cudnn='use_cudnn argument is not supported anymore. '
+        'Use chainer.using_config')
 
     activation_list = ['tanh', 'relu']
     if activation not in activation_list:
@@ -797,7 +1066,8 @@ def n_step_rnn_base(n_layers, dropout_ratio, hx, ws, bs, xs,
 
     xp = backend.get_array_module(hx)
 
-    if xp is not numpy and chainer.should_use_cudnn('>=auto', 5000):
+    if (xp is not numpy and not enable_double_backprop
+            and chainer.should_use_cudnn('>=auto', 5000)):
         states = cuda.get_cudnn_dropout_states()
         states.set_dropout_ratio(dropout_ratio)
         lengths = [len(x) for x in xs]
@@ -837,12 +1107,30 @@ def n_step_rnn_base(n_layers, dropout_ratio, hx, ws, bs, xs,
                 return relu.relu(rnn_in), None
 
         hy, _, ys = n_step_rnn_impl(
-            f, n_layers, dropout_ratio, hx, None, ws, bs, xs, use_bi_direction)
+            f, n_layers, dropout_ratio, hx, None, ws, bs, xs, use_bi_direction,
+            rnn_mode='rnn_%s' % activation,
+            enable_double_backprop=enable_double_backprop)
         return hy, ys
 
 
+def _is_cpu_array(x):
+    if isinstance(x, chainer.Variable):
+        x = x.array
+    return isinstance(x, numpy.ndarray)
+
+
 def n_step_rnn_impl(
-        f, n_layers, dropout_ratio, hx, cx, ws, bs, xs, use_bi_direction):
+        f, n_layers, dropout_ratio, hx, cx, ws, bs, xs, use_bi_direction,
+        rnn_mode=None, enable_double_backprop=False):
+    # The fused CPU implementation does not support double backprop.
+    if (rnn_mode is not None and not enable_double_backprop and xs and all(
+            _is_cpu_array(x) for x in itertools.chain(
+                [hx, cx], xs, itertools.chain.from_iterable(ws),
+                itertools.chain.from_iterable(bs)) if x is not None)):
+        return _n_step_rnn_cpu(
+            rnn_mode, n_layers, dropout_ratio, hx, cx, ws, bs, xs,
+            use_bi_direction)
+
     direction = 2 if use_bi_direction else 1
     hx = chainer.functions.separate(hx)
     use_cell = cx is not None
@@ -895,6 +1183,50 @@ def n_step_rnn_impl(
     return hy, cy, tuple(ys)
 
 
+def _n_step_rnn_cpu(
+        rnn_mode, n_layers, dropout_ratio, hx, cx, ws, bs, xs,
+        use_bi_direction):
+    # Each layer in each direction is computed by one OneDirectionalRNN over
+    # the concatenated sequence instead of functions of each time step.
+    direction = 2 if use_bi_direction else 1
+    lengths = [len(x) for x in xs]
+    hx = chainer.functions.separate(hx)
+    use_cell = cx is not None
+    if use_cell:
+        cx = chainer.functions.separate(cx)
+
+    x_next = concat.concat(xs, axis=0)
+    hy = []
+    cy = []
+    for layer in six.moves.range(n_layers):
+        ys = []
+        for di in six.moves.range(direction):
+            if layer == 0:
+                x = x_next
+            else:
+                x = dropout.dropout(x_next, ratio=dropout_ratio)
+            idx = direction * layer + di
+            states = (hx[idx], cx[idx]) if use_cell else (hx[idx],)
+            outputs = OneDirectionalRNN(rnn_mode, lengths, di == 1)(
+                *((x,) + states + tuple(ws[idx]) + tuple(bs[idx])))
+            ys.append(outputs[0])
+            hy.append(outputs[1])
+            if use_cell:
+                cy.append(outputs[2])
+        if use_bi_direction:
+            x_next = concat.concat(ys, axis=1)
+        else:
+            x_next = ys[0]
+
+    ys = split_axis.split_axis(x_next, numpy.cumsum(lengths[:-1]), 0)
+    hy = stack.stack(hy)
+    if use_cell:
+        cy = stack.stack(cy)
+    else:
+        cy = None
+    return hy, cy, tuple(ys)
+
+
 def _one_directional_loop(f, xs, h, c, w, b):
     h_list = []
     for x in xs:
@@ -0,0 +1,265 @@
+import numpy
+import six
+
+from chainer import backend
+from chainer import function_node
+from chainer.functions.activation import softmax
+from chainer.functions.array import where
+from chainer.functions.math import matmul
+from chainer.utils import type_check
+
+
+def _swap(a):
+    return a.swapaxes(-1, -2)
+
+
+class ScaledDotProductAttention(function_node.FunctionNode):
+
+    """Scaled dot-product attention computed block by block.
+
+    The attention weights are computed for each pair of a query block and a
+    key block with the online softmax, which rescales the partial results
+    whenever the running maximum of the scores of each query changes. Only
+    the log of the normalizer of each query is kept for backward, and the
+    attention weights are recomputed there block by block.
+    """
+
+    def __init__(self, mask, causal, scale, block_size):
+        self.mask = mask
+        self.causal = causal
+        self.scale = scale
+        self.block_size = block_size
+
+    def check_type_forward(self, in_types):
+        type_check._argname(in_types, ('q', 'k', 'v'))
+        q_type, k_type, v_type = in_types
+
+        type_check.expect(
+            q_type.dtype.kind == 'f',
+            k_type.dtype == q_type.dtype,
+            v_type.dtype == q_type.dtype,
+            q_type.ndim >= 2,
+            k_type.ndim == q_type.ndim,
+            v_type.ndim == q_type.ndim,
+            k_type.shape[-1] == q_type.shape[-1],
+            v_type.shape[-2] == k_type.shape[-2],
+        )
+        for i in six.moves.range(type_check.eval(q_type.ndim) - 2):
+            type_check.expect(
+                k_type.shape[i] == q_type.shape[i],
+                v_type.shape[i] == q_type.shape[i],
+            )
+
+    def _blocks(self, lq, lk):
+        # Yields the ranges of pairs of query and key blocks. With the causal
+        # mask, the key blocks after the last query of a query block are
+        # skipped.
+        bs = self.block_size
+        for qs in six.moves.range(0, lq, bs):
+            qe = min(qs + bs, lq)
+            kend = min(qe, lk) if self.causal else lk
+            yield qs, qe, [(ks, min(ks + bs, kend))
+                           for ks in six.moves.range(0, kend, bs)]
+
+    def _scores(self, xp, q, k, qs, qe, ks, ke):
+        # Returns the scores of a block. Masked scores are set to -inf.
+        s = xp.matmul(q, _swap(k[..., ks:ke, :]))
+        mask = None
+        if self.mask is not None:
+            mask = self.mask[..., qs:qe, ks:ke]
+        if self.causal and ke - 1 > qs:
+            causal_mask = (xp.arange(qs, qe)[:, None] >=
+                           xp.arange(ks, ke)[None, :])
+            mask = causal_mask if mask is None else mask & causal_mask
+        if mask is not None:
+            s = xp.where(mask, s, s.dtype.type(-numpy.inf))
+        return s
+
+    def _compute_dtype(self, dtype):
+        # float16 is computed in float32 for the accuracy of the softmax.
+        if dtype == numpy.float16:
+            return numpy.dtype(numpy.float32)
+        return dtype
+
+    def forward(self, inputs):
+        self.retain_inputs((0, 1, 2))
+        self.retain_outputs((0,))
+        xp = backend.get_array_module(*inputs)
+        dtype = inputs[0].dtype
+        compute_dtype = self._compute_dtype(dtype)
+        q, k, v = [x.astype(compute_dtype, copy=False) for x in inputs]
+        lq, lk = q.shape[-2], k.shape[-2]
+        if self.mask is not None:
+            self.mask = xp.broadcast_to(
+                self.mask, q.shape[:-1] + (lk,)).astype(bool, copy=False)
+
+        y = xp.zeros(q.shape[:-1] + v.shape[-1:], dtype)
+        lse = xp.full(q.shape[:-1], numpy.inf, compute_dtype)
+        for qs, qe, key_blocks in self._blocks(lq, lk):
+            qb = q[..., qs:qe, :] * compute_dtype.type(self.scale)
+            m = xp.full(qb.shape[:-1], -numpy.inf, compute_dtype)
+            l = xp.zeros(qb.shape[:-1], compute_dtype)
+            acc = xp.zeros(qb.shape[:-1] + v.shape[-1:], compute_dtype)
+            for ks, ke in key_blocks:
+                s = self._scores(xp, qb, k, qs, qe, ks, ke)
+                m_new = xp.maximum(m, s.max(axis=-1))
+                # Queries all of whose keys so far are masked have the
+                # maximum -inf, which is replaced to avoid inf - inf.
+                m_new = xp.where(m_new == -numpy.inf, 0, m_new)
+                p = xp.exp(s - m_new[..., None])
+                alpha = xp.exp(m - m_new)
+                l *= alpha
+                l += p.sum(axis=-1)
+                acc *= alpha[..., None]
+                acc += xp.matmul(p, v[..., ks:ke, :])
+                m = m_new
+            # Queries whose keys are all masked have the output 0 and the
+            # normalizer inf, which makes their weights 0 in backward.
+            valid = l > 0
+            l = xp.where(valid, l, 1)
+            y[..., qs:qe, :] = acc / l[..., None]
+            lse[..., qs:qe] = xp.where(valid, m + xp.log(l), numpy.inf)
+        self.lse = lse
+        return y,
+
+    def backward(self, indexes, grad_outputs):
+        q, k, v = self.get_retained_inputs()
+        y, = self.get_retained_outputs()
+        gy, = grad_outputs
+        return ScaledDotProductAttentionGrad(self).apply((q, k, v, y, gy))
+
+
+class ScaledDotProductAttentionGrad(function_node.FunctionNode):
+    # A backward implementation which does not support double-backprop.
+
+    def __init__(self, attention):
+        self.attention = attention
+
+    def forward(self, inputs):
+        xp = backend.get_array_module(*inputs)
+        attention = self.attention
+        dtype = inputs[0].dtype
+        compute_dtype = attention._compute_dtype(dtype)
+        q, k, v, y, gy = [x.astype(compute_dtype, copy=False) for x in inputs]
+        lq, lk = q.shape[-2], k.shape[-2]
+        scale = compute_dtype.type(attention.scale)
+        lse = attention.lse
+        d = (gy * y).sum(axis=-1)
+
+        gq = xp.zeros_like(q)
+        gk = xp.zeros_like(k)
+        gv = xp.zeros_like(v)
+        for qs, qe, key_blocks in attention._blocks(lq, lk):
+            qb = q[..., qs:qe, :] * scale
+            gyb = gy[..., qs:qe, :]
+            lseb = lse[..., qs:qe, None]
+            db = d[..., qs:qe, None]
+            gqb = gq[..., qs:qe, :]
+            for ks, ke in key_blocks:
+                s = attention._scores(xp, qb, k, qs, qe, ks, ke)
+                p = xp.exp(s - lseb)
+                gv[..., ks:ke, :] += xp.matmul(_swap(p), gyb)
+                gs = xp.matmul(gyb, _swap(v[..., ks:ke, :]))
+                gs -= db
+                gs *= p
+                gqb += xp.matmul(gs, k[..., ks:ke, :])
+                gk[..., ks:ke, :] += xp.matmul(_swap(gs), qb)
+            gqb *= scale
+        return (gq.astype(dtype, copy=False), gk.astype(dtype, copy=False),
+                gv.astype(dtype, copy=False))
+
+    def backward(self, indexes, grad_outputs):
+        raise RuntimeError(
+            'F.scaled_dot_product_attention was called with '
+            '\'enable_double_backprop=False\' argument, but double-backprop '
+            'is actually being performed. Please specify '
+            '\'enable_double_backprop=True\' explicitly.')
+
+
+def _double_backward_scaled_dot_product_attention(q, k, v, mask, causal,
+                                                  scale):
+    xp = backend.get_array_module(q)
+    lq, lk = q.shape[-2], k.shape[-2]
+    s = matmul.matmul(q, k, transb=True) * scale
+    if causal:
+        causal_mask = xp.arange(lq)[:, None] >= xp.arange(lk)[None, :]
+        mask = causal_mask if mask is None else mask & causal_mask
+    if mask is None:
+        return matmul.matmul(softmax.softmax(s, axis=-1), v)
+
+    # A finite value is used for the masked scores so that the weights of the
+    # queries whose keys are all masked do not become nan.
+    fill = xp.full(s.shape, numpy.finfo(s.dtype).min, s.dtype)
+    p = softmax.softmax(where.where(mask, s, fill), axis=-1)
+    p = where.where(mask, p, xp.zeros(p.shape, p.dtype))
+    return matmul.matmul(p, v)
+
+
+def scaled_dot_product_attention(q, k, v, mask=None, causal=False,
+                                 scale=None, block_size=256,
+                                 enable_double_backprop=False):
+    """Scaled dot-product attention.
+
+    This function computes the attention
+
+    .. math::
+        y = \\mathrm{softmax}\\left(s \\cdot q k^\\top \\right) v
+
+    for each item of the leading axes of the inputs, where the softmax is
+    taken over the keys and :math:`s` is the scale, which is
+    :math:`1 / \\sqrt{d}` by default.
+
+    Unlike the composition of :func:`~chainer.functions.matmul` and
+    :func:`~chainer.functions.softmax`, the
+    :math:`L_q \\times L_k` attention weights are never stored as a whole.
+    They are computed for blocks of ``block_size`` queries and keys with
+    the online softmax, and only the normalizer of each query is kept for
+    backpropagation, where the weights are recomputed block by block.
+    The memory usage is therefore linear in the sequence lengths.
+
+    Args:
+        q (:class:`~chainer.Variable` or :ref:`ndarray`):
+            Queries of shape :math:`(..., L_q, d)`.
+        k (:class:`~chainer.Variable` or :ref:`ndarray`):
+            Keys of shape :math:`(..., L_k, d)`.
+        v (:class:`~chainer.Variable` or :ref:`ndarray`):
+            Values of shape :math:`(..., L_k, d_v)`. The leading axes of
+            ``q``, ``k`` and ``v`` must be the same, e.g.,
+            :math:`(B, H)` for the batch size :math:`B` and the number of
+            heads :math:`H`.
+        mask (:ref:`ndarray`): Boolean array broadcastable to
+            :math:`(..., L_q, L_k)`. The keys whose values are ``False`` are
+            not attended. The outputs of the queries whose keys are all
+            masked are 0.
+        causal (bool): If ``True``, the :math:`i`-th query does not attend
+            to the keys after the :math:`i`-th one. The key blocks that are
+            entirely masked by it are skipped.
+        scale (float): Scale of the scores. If it is ``None``,
+            :math:`1 / \\sqrt{d}` is used.
+        block_size (int): Number of queries and keys in a block.
+        enable_double_backprop (bool): If ``True``, this function uses
+            implementation that supports higher order differentiation,
+            which stores the whole attention weights.
+            If ``False``, it uses the blocked implementation, which does not
+            support higher order differentiation.
+
+    Returns:
+        ~chainer.Variable: Output of shape :math:`(..., L_q, d_v)`.
+
+    .. seealso::
+        `Attention Is All You Need <https://arxiv.org/abs/1706.03762>`_
+
+    """
+    if block_size <= 0:
+        raise ValueError('block_size must be positive')
+    if scale is None:
+        scale = 1. / numpy.sqrt(q.shape[-1])
+    if mask is not None:
+        mask = backend.get_array_module(mask).asarray(mask, dtype=bool)
+
+    if enable_double_backprop:
+        return _double_backward_scaled_dot_product_attention(
+            q, k, v, mask, causal, scale)
+    y, = ScaledDotProductAttention(
+        mask, causal, scale, block_size).apply((q, k, v))
+    return y
@@ -1,3 +1,8 @@
+import numpy
+import six
+
+from chainer import backend
+from chainer import function_node
 from chainer.functions.array import broadcast
 from chainer.functions.array import concat
 from chainer.functions.array import reshape
@@ -5,11 +10,198 @@ from chainer.functions.array import select_item
 from chainer.functions.array import split_axis
 from chainer.functions.connection import embed_id
 from chainer.functions.math import logsumexp
-from chainer.functions.math import minmax
 from chainer.functions.math import sum as _sum
+from chainer.utils import type_check
+from chainer import variable
+
+
+def _logsumexp(a, xp, axis):
+    vmax = a.max(axis=axis, keepdims=True)
+    ret = xp.log(xp.exp(a - vmax).sum(axis=axis, keepdims=True))
+    ret += vmax
+    return ret.squeeze(axis)
+
+
+class CRF1d(function_node.FunctionNode):
+
+    """Log-likelihood of linear-chain CRF.
+
+    It computes the scores of the label sequences ``ys`` and, if
+    ``normalize`` is ``True``, subtracts the log of the partition function
+    computed by the forward algorithm. The whole recursion is done in this
+    function node.
+    """
+
+    def __init__(self, ys, normalize=True):
+        self.ys = ys
+        self.normalize = normalize
+
+    def check_type_forward(self, in_types):
+        type_check.expect(in_types.size() > 1)
+        cost_type = in_types[0]
+        type_check.expect(
+            cost_type.dtype.kind == 'f',
+            cost_type.ndim == 2,
+            cost_type.shape[0] == cost_type.shape[1],
+        )
+        for i in six.moves.range(1, type_check.eval(in_types.size())):
+            type_check.expect(
+                in_types[i].dtype == cost_type.dtype,
+                in_types[i].ndim == 2,
+                in_types[i].shape[1] == cost_type.shape[0],
+            )
+            if i > 1:
+                type_check.expect(
+                    in_types[i].shape[0] <= in_types[i - 1].shape[0])
+
+    def forward(self, inputs):
+        xp = backend.get_array_module(*inputs)
+        cost = inputs[0]
+        xs = inputs[1:]
+        self._shapes = [x.shape for x in inputs]
+
+        score = xp.zeros(len(xs[0]), cost.dtype)
+        y_prev = None
+        for x, y in six.moves.zip(xs, self.ys):
+            batch = len(x)
+            score[:batch] += x[xp.arange(batch), y]
+            if y_prev is not None:
+                score[:batch] += cost[y_prev[:batch], y]
+            y_prev = y
+
+        self.alphas = None
+        self.logz = None
+        if self.normalize:
+            self.retain_inputs(tuple(six.moves.range(len(inputs))))
+            alpha = xs[0]
+            self.alphas = [alpha]
+            self.logz = xp.empty_like(score)
+            for x in xs[1:]:
+                batch = len(x)
+                if len(alpha) > batch:
+                    self.logz[batch:len(alpha)] = _logsumexp(
+                        alpha[batch:], xp, 1)
+                alpha = _logsumexp(alpha[:batch, :, None] + cost, xp, 1)
+                alpha += x
+                self.alphas.append(alpha)
+            self.logz[:len(alpha)] = _logsumexp(alpha, xp, 1)
+            score -= self.logz
+        return score,
+
+    def backward(self, indexes, grad_outputs):
+        inputs = self.get_retained_inputs()
+        return CRF1dGrad(
+            self.ys, self._shapes, self.alphas, self.logz).apply(
+                inputs + grad_outputs)
+
+
+class CRF1dGrad(function_node.FunctionNode):
+    # A backward implementation which does not support double-backprop.
+
+    def __init__(self, ys, shapes, alphas, logz):
+        self.ys = ys
+        self.shapes = shapes
+        self.alphas = alphas
+        self.logz = logz
+
+    def forward(self, inputs):
+        gy = inputs[-1]
+        xp = backend.get_array_module(gy)
+        n_label = self.shapes[0][0]
+
+        if self.alphas is None:
+            gcost = xp.zeros(self.shapes[0], gy.dtype)
+            gxs = [xp.zeros(shape, gy.dtype) for shape in self.shapes[1:]]
+        else:
+            # Computes the marginal probabilities with the backward
+            # algorithm.
+            cost = inputs[0]
+            xs = inputs[1:-1]
+            alphas = self.alphas
+            logz = self.logz
+            gcost = xp.zeros_like(cost)
+            gxs = [None] * len(xs)
+            beta = None
+            for i in six.moves.range(len(xs) - 1, -1, -1):
+                batch = len(xs[i])
+                if beta is None:
+                    beta = xp.zeros_like(xs[i])
+                else:
+                    next_batch = len(beta)
+                    # a[b, s, t] = c_{st} + x_{i+1,t} + beta_{i+1,t}
+                    a = (beta + xs[i + 1])[:, None, :] + cost
+                    beta = xp.zeros_like(xs[i])
+                    beta[:next_batch] = _logsumexp(a, xp, 2)
+                    a += alphas[i][:next_batch, :, None]
+                    a -= logz[:next_batch, None, None]
+                    gcost -= xp.tensordot(gy[:next_batch], xp.exp(a), 1)
+                gx = alphas[i] + beta
+                gx -= logz[:batch, None]
+                gxs[i] = -xp.exp(gx)
+                gxs[i] *= gy[:batch, None]
+
+        index = []
+        weight = []
+        y_prev = None
+        for gx, y in six.moves.zip(gxs, self.ys):
+            batch = len(gx)
+            gx[xp.arange(batch), y] += gy[:batch]
+            if y_prev is not None:
+                index.append(y_prev[:batch] * n_label + y)
+                weight.append(gy[:batch])
+            y_prev = y
+        if index:
+            gcost += xp.bincount(
+                xp.concatenate(index), xp.concatenate(weight),
+                n_label * n_label).reshape(gcost.shape).astype(
+                    gcost.dtype, copy=False)
+        return (gcost,) + tuple(gxs)
+
+    def backward(self, indexes, grad_outputs):
+        raise RuntimeError(
+            'F.crf1d was called with \'enable_double_backprop=False\' '
+            'argument, but double-backprop is actually being performed. '
+            'Please specify \'enable_double_backprop=True\' explicitly.')
+
+
+def _double_backward_crf1d(cost, xs, ys, n_batch):
+    alpha = xs[0]
+    alphas = []
+    for x in xs[1:]:
+        batch = x.shape[0]
+        if alpha.shape[0] > batch:
+            alpha, alpha_rest = split_axis.split_axis(alpha, [batch], axis=0)
+            alphas.append(alpha_rest)
+        b_alpha, b_cost = broadcast.broadcast(alpha[..., None], cost)
+        alpha = logsumexp.logsumexp(b_alpha + b_cost, axis=1) + x
+
+    if len(alphas) > 0:
+        alphas.append(alpha)
+        alpha = concat.concat(alphas[::-1], axis=0)
+
+    logz = logsumexp.logsumexp(alpha, axis=1)
+
+    n_label = cost.shape[0]
+    cost = reshape.reshape(cost, (cost.size, 1))
+    score = select_item.select_item(xs[0], ys[0])
+    scores = []
+    for x, y, y_prev in zip(xs[1:], ys[1:], ys[:-1]):
+        batch = x.shape[0]
+        if score.shape[0] > batch:
+            y_prev, _ = split_axis.split_axis(y_prev, [batch], axis=0)
+            score, score_rest = split_axis.split_axis(score, [batch], axis=0)
+            scores.append(score_rest)
+        score += (select_item.select_item(x, y) + reshape.reshape(
+            embed_id.embed_id(y_prev * n_label + y, cost), (batch,)))
 
+    if len(scores) > 0:
+        scores.append(score)
+        score = concat.concat(scores[::-1], axis=0)
+
+    return logz - score
 
-def crf1d(cost, xs, ys, reduce='mean'):
+
+def crf1d(cost, xs, ys, reduce='mean', enable_double_backprop=False):
     """Calculates negative log-likelihood of linear-chain CRF.
 
     It takes a transition cost matrix, a sequence of costs, and a sequence of
@@ -87,6 +279,12 @@ def crf1d(cost, xs, ys, reduce='mean'):
             ``ys[i].shape == xs[i].shape[0:1]`` for all ``i``.
         reduce (str): Reduction option. Its value must be either
             ``'mean'`` or ``'no'``. Otherwise, :class:`ValueError` is raised.
+        enable_double_backprop (bool): If ``True``, this function uses
+            implementation that supports higher order differentiation.
+            If ``False``, it uses the forward and backward algorithms over
+            the whole sequence in a single function, which is faster and
+            uses less memory, but does not support higher order
+            differentiation.
 
     Returns:
         ~chainer.Variable: A variable holding the average negative
@@ -106,42 +304,14 @@ def crf1d(cost, xs, ys, reduce='mean'):
 
     assert xs[0].shape[1] == cost.shape[0]
 
-    n_label = cost.shape[0]
     n_batch = xs[0].shape[0]
 
-    alpha = xs[0]
-    alphas = []
-    for x in xs[1:]:
-        batch = x.shape[0]
-        if alpha.shape[0] > batch:
-            alpha, alpha_rest = split_axis.split_axis(alpha, [batch], axis=0)
-            alphas.append(alpha_rest)
-        b_alpha, b_cost = broadcast.broadcast(alpha[..., None], cost)
-        alpha = logsumexp.logsumexp(b_alpha + b_cost, axis=1) + x
-
-    if len(alphas) > 0:
-        alphas.append(alpha)
-        alpha = concat.concat(alphas[::-1], axis=0)
-
-    logz = logsumexp.logsumexp(alpha, axis=1)
-
-    cost = reshape.reshape(cost, (cost.size, 1))
-    score = select_item.select_item(xs[0], ys[0])
-    scores = []
-    for x, y, y_prev in zip(xs[1:], ys[1:], ys[:-1]):
-        batch = x.shape[0]
-        if score.shape[0] > batch:
-            y_prev, _ = split_axis.split_axis(y_prev, [batch], axis=0)
-            score, score_rest = split_axis.split_axis(score, [batch], axis=0)
-            scores.append(score_rest)
-        score += (select_item.select_item(x, y) + reshape.reshape(
-            embed_id.embed_id(y_prev * n_label + y, cost), (batch,)))
-
-    if len(scores) > 0:
-        scores.append(score)
-        score = concat.concat(scores[::-1], axis=0)
+    if enable_double_backprop:
+        loss = _double_backward_crf1d(cost, xs, ys, n_batch)
+    else:
+        ys = [variable.as_array(y) for y in ys]
+        loss = -CRF1d(ys).apply((cost,) + tuple(xs))[0]
 
-    loss = logz - score
     if reduce == 'mean':
         return _sum.sum(loss) / n_batch
     else:
@@ -175,36 +345,37 @@ def argmax_crf1d(cost, xs):
         ``len(ps)`` is equal to ``len(xs)``, and shape of each ``ps[i]`` is
         the mini-batch size of the corresponding ``xs[i]``. That means,
         ``ps[i].shape == xs[i].shape[0:1]``.
+        All the elements of ``ps`` are views of a single array of shape
+        ``(len(xs), B)``.
     """
-    alpha = xs[0]
-    alphas = []
+    cost_data = variable.as_array(cost)
+    xs_data = [variable.as_array(x) for x in xs]
+    xp = backend.get_array_module(cost_data)
+    n_batch = len(xs_data[0])
+
+    alpha = xs_data[0]
     max_inds = []
-    for x in xs[1:]:
-        batch = x.shape[0]
-        if alpha.shape[0] > batch:
-            alpha, alpha_rest = split_axis.split_axis(alpha, [batch], axis=0)
-            alphas.append(alpha_rest)
-        else:
-            alphas.append(None)
-        b_alpha, b_cost = broadcast.broadcast(alpha[..., None], cost)
-        scores = b_alpha + b_cost
-        max_ind = minmax.argmax(scores, axis=1)
+    last = xp.empty((n_batch,), numpy.int32)
+    for x in xs_data[1:]:
+        batch = len(x)
+        if len(alpha) > batch:
+            last[batch:len(alpha)] = alpha[batch:].argmax(axis=1)
+        scores = alpha[:batch, :, None] + cost_data
+        max_ind = scores.argmax(axis=1)
         max_inds.append(max_ind)
-        alpha = minmax.max(scores, axis=1) + x
-
-    inds = minmax.argmax(alpha, axis=1)
-    path = [inds.data]
-    for m, a in zip(max_inds[::-1], alphas[::-1]):
-        inds = select_item.select_item(m, inds)
-        if a is not None:
-            inds = concat.concat([inds, minmax.argmax(a, axis=1)], axis=0)
-        path.append(inds.data)
-    path.reverse()
-
-    score = minmax.max(alpha, axis=1)
-    for a in alphas[::-1]:
-        if a is None:
-            continue
-        score = concat.concat([score, minmax.max(a, axis=1)], axis=0)
-
+        alpha = scores.max(axis=1) + x
+    last[:len(alpha)] = alpha.argmax(axis=1)
+
+    # Traces back the states from the end of each sequence.
+    paths = xp.empty((len(xs_data), n_batch), numpy.int32)
+    paths[-1, :len(alpha)] = last[:len(alpha)]
+    for i in six.moves.range(len(xs_data) - 1, 0, -1):
+        batch = len(xs_data[i])
+        paths[i - 1, :batch] = max_inds[i - 1][
+            xp.arange(batch), paths[i, :batch]]
+        paths[i - 1, batch:len(xs_data[i - 1])] = \
+            last[batch:len(xs_data[i - 1])]
+    path = [p[:len(x)] for p, x in six.moves.zip(paths, xs_data)]
+
+    score = CRF1d(path, normalize=False).apply((cost,) + tuple(xs))[0]
     return score, path
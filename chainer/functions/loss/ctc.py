@@ -1,3 +1,5 @@
+import math
+
 import numpy
 import six
 
@@ -30,6 +32,18 @@ def _softmax(x, xp):
     return val
 
 
+def _log_softmax(x):
+    y = x - numpy.amax(x, axis=2, keepdims=True)
+    y -= numpy.log(numpy.sum(numpy.exp(y), axis=2, keepdims=True))
+    return y
+
+
+def _logsumexp3(a, b, c):
+    vmax = numpy.maximum(numpy.maximum(a, b), c)
+    return vmax + numpy.log(
+        numpy.exp(a - vmax) + numpy.exp(b - vmax) + numpy.exp(c - vmax))
+
+
 def _label_to_path(labels, blank_symbol, xp):
     path = xp.full((len(labels), labels.shape[1] * 2 + 1),
                    blank_symbol, dtype=numpy.int32)
@@ -106,10 +120,16 @@ class ConnectionistTemporalClassification(function.Function):
     2. This class applies the softmax function to inputs. The Backward
     values of CTC loss is often overflows. This is avoided by computing
     backward values before the activation function is applied.
+
+    On CPU, the forward and backward variables are computed for all samples
+    in a mini-batch at once. If ``memory_efficient`` is ``True``, only the
+    forward variables at every ``ceil(sqrt(T))`` steps are kept and the
+    others are recomputed in the backward computation.
     """
 
-    def __init__(self, blank_symbol, reduce='mean'):
+    def __init__(self, blank_symbol, reduce='mean', memory_efficient=False):
         self.blank_symbol = blank_symbol
+        self.memory_efficient = memory_efficient
         # Lazily initialized in the first forward computation for dtype
         self.zero_padding = None
 
@@ -158,16 +178,19 @@ class ConnectionistTemporalClassification(function.Function):
         n_batch = len(path)
         dtype = multiply_seq.dtype
 
-        ret = xp.zeros((seq_length, n_batch, label_size), dtype)
         if xp == numpy:
-            for b in six.moves.range(len(path)):
-                target_path = path[b, :path_length[b]]
-                chars = {c for c in target_path}
-                for c in chars:
-                    ret[:, b, c] = xp.sum(
-                        multiply_seq[:, b, 0:path_length[b]]
-                        [:, target_path == c], axis=1)
+            max_path_length = path.shape[1]
+            inside = numpy.arange(max_path_length) < path_length[:, None]
+            index = (numpy.arange(n_batch)[:, None] * label_size + path +
+                     numpy.arange(seq_length)[:, None, None] *
+                     (n_batch * label_size))
+            ret = numpy.bincount(
+                index.ravel(), (multiply_seq * inside).ravel(),
+                seq_length * n_batch * label_size)
+            ret = ret.reshape(seq_length, n_batch, label_size).astype(
+                dtype, copy=False)
         else:
+            ret = xp.zeros((seq_length, n_batch, label_size), dtype)
             cuda.elementwise(
                 'T prob, I path, I path_length, I max_path_length',
                 'raw T cum_prob',
@@ -273,6 +296,128 @@ class ConnectionistTemporalClassification(function.Function):
 
         return _flip_path_probability(prob, input_length, path_length, xp)
 
+    def _prepare_cpu(self, t, label_length, dtype):
+        self.path = _label_to_path(t, self.blank_symbol, numpy)
+        self.path_length = 2 * label_length + 1
+        max_path_length = self.path.shape[1]
+        path_index = numpy.arange(max_path_length)
+        self._outside = path_index >= self.path_length[:, None]
+        # transition skipping a blank is disabled between the same symbols
+        skip = numpy.zeros(self.path.shape, dtype=bool)
+        skip[:, 2:] = self.path[:, 2:] != self.path[:, :-2]
+        self._skip_penalty = numpy.where(
+            skip, 0, self.zero_padding).astype(dtype)
+        # the last blank and the last label are the final states
+        self._final = numpy.where(
+            (path_index >= self.path_length[:, None] - 2) & ~self._outside,
+            0, self.zero_padding).astype(dtype)
+
+    def _path_log_prob(self, log_yseq):
+        batch_index = numpy.arange(len(self.path))[:, None]
+        return log_yseq[:, batch_index, self.path]
+
+    def _forward_steps(self, alpha, start, log_prob, out=None):
+        n_batch, max_path_length = alpha.shape
+        shifted = numpy.full(
+            (n_batch, max_path_length + 2), self.zero_padding, alpha.dtype)
+        for i in six.moves.range(start, start + len(log_prob)):
+            shifted[:, 2:] = alpha
+            new = _logsumexp3(
+                alpha, shifted[:, 1:-1],
+                shifted[:, :-2] + self._skip_penalty)
+            new += log_prob[i - start]
+            numpy.copyto(new, self.zero_padding, where=self._outside)
+            # samples whose inputs already end keep the last variables
+            numpy.copyto(new, alpha, where=(i >= self.input_length)[:, None])
+            alpha = new
+            if out is not None:
+                out[i - start] = alpha
+        return alpha
+
+    def _forward_cpu(self, xs, t, label_length):
+        dtype = numpy.promote_types(xs.dtype, numpy.float32)
+        log_yseq = _log_softmax(xs.astype(dtype, copy=False))
+        self._prepare_cpu(t, label_length, dtype)
+        log_prob = self._path_log_prob(log_yseq)
+
+        seq_length = len(xs)
+        alpha = numpy.full(self.path.shape, self.zero_padding, dtype)
+        alpha[:, 0] = 0
+        if self.memory_efficient:
+            self._interval = max(int(math.ceil(math.sqrt(seq_length))), 1)
+        else:
+            self._interval = max(seq_length, 1)
+        self._alpha = []
+        for start in six.moves.range(0, seq_length, self._interval):
+            stop = min(start + self._interval, seq_length)
+            if self.memory_efficient:
+                self._alpha.append(alpha)
+                alpha = self._forward_steps(
+                    alpha, start, log_prob[start:stop])
+            else:
+                out = numpy.empty((stop - start,) + alpha.shape, dtype)
+                alpha = self._forward_steps(
+                    alpha, start, log_prob[start:stop], out)
+                self._alpha.append(out)
+
+        self._log_z = _logsumexp(alpha + self._final, numpy, axis=1)
+        loss = -self._log_z
+        if self.reduce == 'mean':
+            loss = utils.force_array(numpy.mean(loss))
+        return loss.astype(xs.dtype, copy=False),
+
+    def _backward_cpu(self, xs, grad_output):
+        zero = self.zero_padding
+        seq_length, batch_size, n_unit = xs.shape
+        dtype = self._log_z.dtype
+        log_yseq = _log_softmax(xs.astype(dtype, copy=False))
+        log_prob = self._path_log_prob(log_yseq)
+        gx = numpy.exp(log_yseq, out=log_yseq)
+
+        beta = numpy.full(self.path.shape, zero, dtype)
+        n_batch, max_path_length = beta.shape
+        shifted = numpy.full((n_batch, max_path_length + 2), zero, dtype)
+        skip_penalty = numpy.zeros_like(self._skip_penalty)
+        skip_penalty[:, :-2] = self._skip_penalty[:, 2:]
+        next_log_prob = None
+        for j in six.moves.range(len(self._alpha) - 1, -1, -1):
+            start = j * self._interval
+            stop = min(start + self._interval, seq_length)
+            if self.memory_efficient:
+                alpha = numpy.empty((stop - start,) + beta.shape, dtype)
+                self._forward_steps(
+                    self._alpha[j], start, log_prob[start:stop], alpha)
+            else:
+                alpha = self._alpha[j]
+
+            gamma = numpy.empty_like(alpha)
+            for i in six.moves.range(stop - 1, start - 1, -1):
+                if next_log_prob is not None:
+                    numpy.add(beta, next_log_prob, out=shifted[:, :-2])
+                    beta = _logsumexp3(
+                        shifted[:, :-2], shifted[:, 1:-1],
+                        shifted[:, 2:] + skip_penalty)
+                    numpy.copyto(beta, zero, where=self._outside)
+                last = i == self.input_length - 1
+                numpy.copyto(beta, self._final, where=last[:, None])
+                numpy.copyto(
+                    beta, zero, where=(i >= self.input_length)[:, None])
+                gamma[i - start] = alpha[i - start] + beta
+                next_log_prob = log_prob[i]
+
+            gamma -= self._log_z[:, None]
+            numpy.exp(gamma, out=gamma)
+            gx[start:stop] -= self.label_probability(
+                n_unit, self.path, self.path_length, gamma, numpy)
+
+        if self.reduce == 'mean':
+            gx *= grad_output[0] / batch_size
+        else:
+            gx *= grad_output[0][..., None]
+        gx *= (numpy.arange(seq_length)[:, None] <
+               self.input_length)[..., None]
+        return None, None, None, gx.astype(xs.dtype, copy=False)
+
     def forward(self, inputs):
         xp = backend.get_array_module(inputs[0])
         self.input_length, label_length, t, xs = inputs
@@ -287,6 +432,9 @@ class ConnectionistTemporalClassification(function.Function):
             assert len(xs) >= xp.max(self.input_length)
             assert t.shape[1] >= xp.max(label_length)
 
+        if xp is numpy:
+            return self._forward_cpu(xs, t, label_length)
+
         self.path_length = 2 * label_length + 1
 
         self.yseq = _softmax(xs, xp)
@@ -303,6 +451,8 @@ class ConnectionistTemporalClassification(function.Function):
 
     def backward(self, inputs, grad_output):
         xp = backend.get_array_module(inputs[0])
+        if xp is numpy:
+            return self._backward_cpu(inputs[3], grad_output)
         batch_size = len(inputs[2])
 
         total_probability = _logsumexp(self.prob_trans[0], xp, axis=1)
@@ -322,7 +472,7 @@ class ConnectionistTemporalClassification(function.Function):
 
 def connectionist_temporal_classification(
         x, t, blank_symbol, input_length=None, label_length=None,
-        reduce='mean'):
+        reduce='mean', memory_efficient=False):
     """Connectionist Temporal Classification loss function.
 
     Connectionist Temporal Classification(CTC) [Graves2006]_ is a loss function
@@ -366,6 +516,13 @@ def connectionist_temporal_classification(
         reduce (str): Reduction option. Its value must be either
             ``'mean'`` or ``'no'``. Otherwise,
             :class:`ValueError` is raised.
+        memory_efficient (bool): If ``True``, the forward variables of the
+            CTC recursion are kept only at every ``ceil(sqrt(T))`` steps,
+            where ``T`` is the length of ``x``, and the others are
+            recomputed in the backward computation. It reduces the memory
+            kept for backpropagation from ``O(T)`` to ``O(sqrt(T))`` arrays
+            of shape ``(B, 2M + 1)`` at the cost of recomputing the forward
+            recursion once. It is only supported on CPU and ignored on GPU.
 
     Returns:
        ~chainer.Variable:
@@ -413,5 +570,6 @@ def connectionist_temporal_classification(
     if label_length is None:
         label_length = xp.full(len(t), t.shape[1], dtype=numpy.int32)
 
-    return ConnectionistTemporalClassification(blank_symbol, reduce)(
+    return ConnectionistTemporalClassification(
+        blank_symbol, reduce, memory_efficient)(
         input_length, label_length, t, chainer.functions.stack(x))
@@ -5,6 +5,7 @@ import chainer
 from chainer import backend
 from chainer.backends import cuda
 from chainer import function_node
+from chainer import utils
 from chainer.utils import argument
 from chainer.utils import type_check
 
@@ -19,7 +20,8 @@ class NegativeSamplingFunction(function_node.FunctionNode):
     ignore_label = -1
     samples = None
 
-    def __init__(self, sampler, sample_size, reduce='sum'):
+    def __init__(self, sampler, sample_size, reduce='sum',
+                 shared_negatives=False):
         if reduce not in ('sum', 'no'):
             raise ValueError(
                 "only 'sum' and 'no' are valid for 'reduce', but '%s' is "
@@ -28,12 +30,20 @@ class NegativeSamplingFunction(function_node.FunctionNode):
         self.sampler = sampler
         self.sample_size = sample_size
         self.reduce = reduce
+        self.shared_negatives = shared_negatives
         self.wx = None
 
     def _make_samples(self, t):
         size = int(t.shape[0])
         # first one is the positive, and others are sampled negatives
-        samples = self.sampler((size, self.sample_size + 1))
+        if self.shared_negatives:
+            negatives = self.sampler((self.sample_size,))
+            xp = backend.get_array_module(negatives)
+            samples = xp.empty(
+                (size, self.sample_size + 1), dtype=negatives.dtype)
+            samples[:, 1:] = negatives
+        else:
+            samples = self.sampler((size, self.sample_size + 1))
         samples[:, 0] = t
         return samples
 
@@ -58,18 +68,26 @@ class NegativeSamplingFunction(function_node.FunctionNode):
         self.ignore_mask = (t != self.ignore_label)
         samples = self._make_samples(t)
 
-        w = W[samples]
-        wx = numpy.einsum(
-            'ij,ikj->ik', x[self.ignore_mask], w[self.ignore_mask])
-        wx[:, 0] *= -1
-
-        loss = numpy.zeros(len(x), x.dtype)
-        loss[self.ignore_mask] = numpy.sum(numpy.logaddexp(wx, 0), axis=1)
+        if self.shared_negatives:
+            # The products with the shared negatives are computed by a
+            # single matrix multiplication.
+            wx = numpy.empty(samples.shape, x.dtype)
+            wx[:, 0] = numpy.einsum('ij,ij->i', x, W[samples[:, 0]])
+            wx[:, 1:] = x.dot(W[samples[0, 1:]].T)
+        else:
+            wx = numpy.matmul(W[samples], x[:, :, None])[:, :, 0]
+        wx[~self.ignore_mask] = 0
+
+        f = wx.copy()
+        f[:, 0] *= -1
+        loss = numpy.sum(numpy.logaddexp(f, 0), axis=1)
+        loss[~self.ignore_mask] = 0
 
         if self.reduce == 'sum':
             loss = numpy.array(loss.sum(), x.dtype)
 
         self.samples = samples
+        self.wx = wx
         return loss,
 
     def forward_gpu(self, inputs):
@@ -130,45 +148,51 @@ class NegativeSamplingFunction(function_node.FunctionNode):
         gy, = grad_outputs
         return NegativeSamplingFunctionGrad(
             self.reduce, self.ignore_mask, self.sample_size, self.samples,
-            self.wx).apply((x, W, gy))
+            self.wx, self.shared_negatives).apply((x, W, gy))
 
 
 class NegativeSamplingFunctionGrad(function_node.FunctionNode):
 
-    def __init__(self, reduce, ignore_mask, sample_size, samples, wx):
+    def __init__(self, reduce, ignore_mask, sample_size, samples, wx,
+                 shared_negatives=False):
         self.reduce = reduce
         self.ignore_mask = ignore_mask
         self.sample_size = sample_size
         self.samples = samples
         self.wx = wx
+        self.shared_negatives = shared_negatives
 
     def forward_cpu(self, inputs):
         self.retain_inputs((0, 1, 2))
         x, W, gloss = inputs
 
-        gx = numpy.zeros_like(x)
-        gW = numpy.zeros_like(W)
-
-        for i in numpy.arange(len(self.ignore_mask))[self.ignore_mask]:
-            ix = x[i]
-
-            k = self.samples[i]
-            if self.reduce == 'sum':
-                igy = gloss
-            else:
-                igy = gloss[i]
-
-            w = W[k]
-            f = w.dot(ix)
+        if self.reduce == 'no':
+            gloss = gloss[:, None]
 
-            # g == -y * gloss / (1 + exp(yf))
-            f[0] *= -1
-            g = igy / (1 + numpy.exp(-f))
-            g[0] *= -1
+        # g == -y * gloss / (1 + exp(y * wx)), where y is 1 for the positive
+        # and -1 for the negatives.
+        y = numpy.full(self.sample_size + 1, -1, x.dtype)
+        y[0] = 1
+        g = -y * gloss / (1 + numpy.exp(self.wx * y))
+        g[~self.ignore_mask] = 0
+        g = g.astype(x.dtype, copy=False)
 
-            gx[i] = g.dot(w)
-            for ik, ig in six.moves.zip(k, g):
-                gW[ik] += ig * ix
+        samples = self.samples
+        gW = numpy.zeros_like(W)
+        if self.shared_negatives:
+            positives = samples[:, 0]
+            negatives = samples[0, 1:]
+            gx = g[:, :1] * W[positives] + g[:, 1:].dot(W[negatives])
+            utils.scatter_add(
+                gW, positives[self.ignore_mask],
+                g[self.ignore_mask, :1] * x[self.ignore_mask])
+            utils.scatter_add(gW, negatives, g[:, 1:].T.dot(x))
+        else:
+            gx = numpy.matmul(g[:, None, :], W[samples])[:, 0, :]
+            utils.scatter_add(
+                gW, samples[self.ignore_mask],
+                g[self.ignore_mask][:, :, None] *
+                x[self.ignore_mask][:, None, :])
         return gx, None, gW
 
     def forward_gpu(self, inputs):
@@ -318,7 +342,7 @@ class NegativeSamplingFunctionGrad(function_node.FunctionNode):
 
 
 def negative_sampling(x, t, W, sampler, sample_size, reduce='sum', **kwargs):
-    """negative_sampling(x, t, W, sampler, sample_size, reduce='sum', *, return_samples=False)
+    """negative_sampling(x, t, W, sampler, sample_size, reduce='sum', *, return_samples=False, shared_negatives=False)
 
     Negative sampling loss function.
 
@@ -370,6 +394,13 @@ def negative_sampling(x, t, W, sampler, sample_size, reduce='sum', **kwargs):
             :math:`(\\text{batch_size}, \\text{sample_size} + 1)`-array of
             integers whose first column is fixed to the ground truth labels
             and the other columns are drawn from the ``sampler``.
+        shared_negatives (bool):
+            If ``True``, one set of ``sample_size`` negative samples is drawn
+            for the whole mini-batch and shared by all examples. The
+            ``sampler`` is called with the shape ``(sample_size,)``. On CPU,
+            the scores of the negatives are then computed by a single matrix
+            multiplication, which is much faster than gathering the weight
+            vectors for each example.
 
     Returns:
         ~chainer.Variable or tuple:
@@ -389,11 +420,14 @@ def negative_sampling(x, t, W, sampler, sample_size, reduce='sum', **kwargs):
 
     """  # NOQA
     return_samples = False
+    shared_negatives = False
     if kwargs:
-        return_samples, = argument.parse_kwargs(
-            kwargs, ('return_samples', return_samples))
+        return_samples, shared_negatives = argument.parse_kwargs(
+            kwargs, ('return_samples', return_samples),
+            ('shared_negatives', shared_negatives))
 
-    func = NegativeSamplingFunction(sampler, sample_size, reduce)
+    func = NegativeSamplingFunction(
+        sampler, sample_size, reduce, shared_negatives)
     out = func.apply((x, t, W))[0]
 
     if return_samples:
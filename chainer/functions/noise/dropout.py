@@ -6,6 +6,7 @@ from chainer.backends import intel64
 from chainer import configuration
 from chainer import function_node
 from chainer.utils import argument
+from chainer.utils import array
 from chainer.utils import type_check
 
 if cuda.cudnn_enabled:
@@ -16,6 +17,7 @@ class Dropout(function_node.FunctionNode):
 
     """Dropout regularization."""
     _use_cudnn = False
+    _packed_mask = None
 
     def __init__(self, dropout_ratio, mask=None):
         if not 0.0 <= dropout_ratio < 1.0:
@@ -23,6 +25,14 @@ class Dropout(function_node.FunctionNode):
         self.dropout_ratio = dropout_ratio
         self.mask = mask
 
+    def _get_mask(self):
+        # Returns the mask, which is unpacked if it is kept as packed bits.
+        if self._packed_mask is None:
+            return self.mask
+        bits, dtype = self._packed_mask
+        scale = dtype.type(1. / (1 - self.dropout_ratio))
+        return scale * array._unpack_mask(bits)
+
     def check_type_forward(self, in_types):
         type_check._argname(in_types, ('x',))
         type_check.expect(in_types[0].dtype.kind == 'f')
@@ -35,6 +45,14 @@ class Dropout(function_node.FunctionNode):
 
         if self.mask is not None:
             y = x[0] * self.mask
+        elif self._packed_mask is not None:
+            y = x[0] * self._get_mask()
+        elif configuration.config.pack_masks:
+            # Only the bits of the mask are kept for backward.
+            scale = x[0].dtype.type(1. / (1 - self.dropout_ratio))
+            flag = numpy.random.rand(*x[0].shape) >= self.dropout_ratio
+            self._packed_mask = array._pack_mask(flag), x[0].dtype
+            y = x[0] * scale * flag
         else:
             scale = x[0].dtype.type(1. / (1 - self.dropout_ratio))
             flag = numpy.random.rand(*x[0].shape) >= self.dropout_ratio
@@ -84,7 +102,7 @@ class Dropout(function_node.FunctionNode):
         if chainer.should_use_cudnn('==always', 5000) and self._use_cudnn:
             return DropoutGradCuDNN(self.states, self.dropout_ratio).apply(gy)
         else:
-            return DropoutGrad(self.mask).apply(gy)
+            return DropoutGrad(self._get_mask()).apply(gy)
 
 
 class DropoutGrad(function_node.FunctionNode):
@@ -173,6 +191,12 @@ def dropout(x, ratio=.5, **kwargs):
             The mask will become ``None`` when ``chainer.config.train`` is set
             to ``False``.
 
+    .. note::
+
+       If ``chainer.config.pack_masks`` is ``True``, the mask generated on
+       CPU is kept as packed bits for backward, which uses 1/32 of the memory
+       of the mask in float32.
+
     See the paper by G. Hinton: `Improving neural networks by preventing \
     co-adaptation of feature detectors <https://arxiv.org/abs/1207.0580>`_.
 
@@ -208,7 +232,7 @@ def dropout(x, ratio=.5, **kwargs):
     if configuration.config.train:
         func = Dropout(ratio, mask)
         out, = func.apply((x,))
-        mask = func.mask
+        mask = func._get_mask() if return_mask else func.mask
     else:
         out = chainer.as_variable(x)
         mask = None
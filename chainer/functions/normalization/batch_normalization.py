@@ -1,6 +1,7 @@
 import warnings
 
 import numpy
+import six
 
 import chainer
 from chainer import backend
@@ -277,6 +278,8 @@ class BatchNormalization(function_node.FunctionNode):
                                                  running_mean.nbytes)
                 self.running_var.data.copy_from(running_var.data,
                                                 running_var.nbytes)
+        elif _can_use_fused_cpu(xp, x):
+            y, var = self._forward_fused_cpu(x, gamma, beta)
         else:
             # Generic CPU and GPU implementation
 
@@ -291,6 +294,8 @@ class BatchNormalization(function_node.FunctionNode):
                 self.inv_std = cuda.cupyx.rsqrt(var + self.eps)
             y = _apply_bn_fwd(xp, x, self.mean[expander],
                               self.inv_std[expander], gamma, beta)
+
+        if not (self.use_ideep or self.use_cudnn):
             # Update running statistics
             m = x.size // gamma.size
             adjust = m / max(m - 1., 1.)  # unbiased estimation
@@ -311,6 +316,20 @@ class BatchNormalization(function_node.FunctionNode):
 
         return y,
 
+    def _forward_fused_cpu(self, x, gamma, beta):
+        # Computes the statistics with reductions that do not allocate
+        # temporaries and normalizes x in the output buffer.
+        expander = self.expander
+        inv_m = x.dtype.type(1. / (x.size // gamma.size))
+        self.mean = _sum_of_products(self.axis, x) * inv_m
+        y = x - self.mean[expander]
+        var = _sum_of_products(self.axis, y, y) * inv_m
+        self.inv_std = numpy.reciprocal(numpy.sqrt(
+            var + self.eps, dtype=x.dtype))
+        y *= (gamma * self.inv_std)[expander]
+        y += beta[expander]
+        return y, var
+
     def backward(self, indexes, grad_outputs):
         x, gamma = self.get_retained_inputs()
         gy, = grad_outputs
@@ -417,6 +436,17 @@ class BatchNormalizationGrad(function_node.FunctionNode):
             if dtype_param is not dtype:
                 ggamma = ggamma.astype(dtype)
                 gbeta = gbeta.astype(dtype)
+        elif _can_use_fused_cpu(xp, x):
+            # The gradient is computed in the buffer of x - mean with the
+            # saved mean and inverse of the standard deviation.
+            gbeta = _sum_of_products(self.axis, gy)
+            gx = x - self.mean[expander]
+            ggamma = _sum_of_products(self.axis, gy, gx)
+            ggamma *= self.inv_std
+            gx *= (-inv_m * self.inv_std * ggamma)[expander]
+            gx += gy
+            gx -= (inv_m * gbeta)[expander]
+            gx *= (gamma * self.inv_std)[expander]
         else:
             # CPU and GPU implementation
             gbeta = gy.sum(axis=self.axis)
@@ -625,13 +655,18 @@ class FixedBatchNormalization(function_node.FunctionNode):
                 mean.data.ptr, var.data.ptr, self.eps)
         else:
             # Generic CPU and GPU implementation
-            gamma = gamma[expander]
-            beta = beta[expander]
             var = var + self.eps
             self.inv_var = xp.reciprocal(var)
             self.inv_std = xp.sqrt(self.inv_var, dtype=self.inv_var.dtype)
-            y = _apply_bn_fwd(xp, x, mean[expander], self.inv_std[expander],
-                              gamma, beta)
+            if _can_use_fused_cpu(xp, x):
+                # Scales and shifts x in the output buffer.
+                scale = gamma * self.inv_std
+                y = x * scale[expander]
+                y += (beta - mean * scale)[expander]
+            else:
+                y = _apply_bn_fwd(
+                    xp, x, mean[expander], self.inv_std[expander],
+                    gamma[expander], beta[expander])
 
         return y,
 
@@ -764,6 +799,23 @@ def _as4darray(arr, mode):
         return arr.reshape(utils.size_of_shape(arr.shape[0:-1]), -1, 1, 1)
 
 
+def _can_use_fused_cpu(xp, x):
+    # The reductions of the fused CPU implementation accumulate in the dtype
+    # of x, so float16 is left to the generic implementation.
+    return xp is numpy and x.dtype != numpy.float16
+
+
+def _sum_of_products(axis, *operands):
+    # Sums the elementwise product of the NumPy arrays over the axes with
+    # einsum, which does not allocate the product.
+    subscripts = list(six.moves.range(operands[0].ndim))
+    args = []
+    for operand in operands:
+        args += [operand, subscripts]
+    args.append([i for i in subscripts if i not in axis])
+    return numpy.einsum(*args)
+
+
 def _x_hat(x, mean, inv_std):
     x_mu = x - mean
     x_mu *= inv_std
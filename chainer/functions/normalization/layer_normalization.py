@@ -1,3 +1,6 @@
+import numpy
+
+import chainer
 from chainer import backend
 from chainer import function_node
 import chainer.functions
@@ -21,6 +24,8 @@ class LayerNormalization(function_node.FunctionNode):
 
     def __init__(self, eps=1e-5):
         self.eps = eps
+        self.mean = None
+        self.inv_std = None
 
     def check_type_forward(self, in_types):
         type_check.expect(in_types.size() == 3)
@@ -51,16 +56,37 @@ class LayerNormalization(function_node.FunctionNode):
         self.retain_inputs((0, 1))
         xp = backend.get_array_module(*inputs)
         x, gamma, beta = inputs
+        if _can_use_fused_cpu(xp, x):
+            return self._forward_fused_cpu(x, gamma, beta),
         x_mu, var, inv_std, x_hat = self._compute(xp, x)
         scaled_x = x_hat * gamma[None, ]
         shifted_x = scaled_x + beta[None, ]
         return shifted_x,
 
+    def _forward_fused_cpu(self, x, gamma, beta):
+        # Computes the statistics with reductions that do not allocate
+        # temporaries and normalizes x in the output buffer. The mean and
+        # the inverse of the standard deviation are kept for backward.
+        inv_n = x.dtype.type(1. / x.shape[1])
+        self.mean = numpy.einsum('ij->i', x) * inv_n
+        y = x - self.mean[:, None]
+        var = numpy.einsum('ij,ij->i', y, y) * inv_n
+        self.inv_std = numpy.reciprocal(numpy.sqrt(
+            var + self.eps, dtype=x.dtype))
+        y *= self.inv_std[:, None]
+        y *= gamma
+        y += beta
+        return y
+
     def backward(self, indexes, grad_outputs):
         F = chainer.functions
         x, gamma = self.get_retained_inputs()
         gy, = grad_outputs
 
+        if self.inv_std is not None and not chainer.config.enable_backprop:
+            return LayerNormalizationGrad(self.mean, self.inv_std).apply(
+                (x, gamma, gy))
+
         x_mu, var, inv_std, x_hat = self._compute(F, x)
 
         g_beta = F.sum(gy, axis=0)
@@ -89,6 +115,41 @@ class LayerNormalization(function_node.FunctionNode):
         return g_x, g_gamma, g_beta,
 
 
+class LayerNormalizationGrad(function_node.FunctionNode):
+
+    # A fused CPU implementation of the gradient, which is used when double
+    # backprop is not required.
+
+    def __init__(self, mean, inv_std):
+        self.mean = mean
+        self.inv_std = inv_std
+
+    def forward(self, inputs):
+        x, gamma, gy = inputs
+        inv_n = x.dtype.type(1. / x.shape[1])
+        inv_std = self.inv_std[:, None]
+
+        gx = x - self.mean[:, None]
+        gx *= inv_std
+        g_gamma = numpy.einsum('ij,ij->j', gy, gx)
+        g_beta = numpy.einsum('ij->j', gy)
+
+        g_x_hat = gy * gamma
+        g_mean = numpy.einsum('ij->i', g_x_hat) * inv_n
+        g_var = numpy.einsum('ij,ij->i', g_x_hat, gx) * inv_n
+        gx *= -g_var[:, None]
+        gx += g_x_hat
+        gx -= g_mean[:, None]
+        gx *= inv_std
+        return gx, g_gamma, g_beta
+
+
+def _can_use_fused_cpu(xp, x):
+    # The reductions of the fused CPU implementation accumulate in the dtype
+    # of x, so float16 is left to the generic implementation.
+    return xp is numpy and x.dtype != numpy.float16
+
+
 def layer_normalization(x, gamma, beta, eps=1e-5):
     """Layer normalization.
 
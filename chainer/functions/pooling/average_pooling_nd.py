@@ -1,4 +1,5 @@
 import functools
+import itertools
 import operator
 
 import numpy
@@ -94,20 +95,28 @@ class AveragePoolingND(pooling_nd._PoolingND):
         self._in_shape = x.shape
         self._in_dtype = x.dtype
 
+        # The patches are summed up over their view without copying them.
         col = conv_nd.im2col_nd_cpu(
-            x, self.ksize, self.stride, self.pad, cover_all=self.cover_all)
+            x, self.ksize, self.stride, self.pad, cover_all=self.cover_all,
+            copy=False)
+
+        # sum along (_, _, k_1, k_2, ..., k_N, _, ..., _)
+        ndim = len(self.ksize)
+        y = numpy.zeros(col.shape[:2] + col.shape[2 + ndim:],
+                        dtype=numpy.promote_types(x.dtype, numpy.float32))
+        for kxs in itertools.product(
+                *[six.moves.range(k) for k in self.ksize]):
+            y += col[(slice(None), slice(None)) + kxs]
 
-        # mean along (_, _, k_1, k_2, ..., k_N, _, ..., _)
-        y_axis = tuple(six.moves.range(2, 2 + len(self.ksize)))
         if self.pad_value is None:
             dims = x.shape[2:]
             width = self._get_pooling_width(numpy, dims, x.dtype)
-            y = col.sum(axis=y_axis) / width
+            y /= width
         else:
             assert self.pad_value == 0
-            y = col.mean(axis=y_axis)
+            y /= functools.reduce(operator.mul, self.ksize)
 
-        return y,
+        return y.astype(x.dtype, copy=False),
 
     def forward_gpu(self, inputs):
         if chainer.should_use_cudnn('>=auto') and 2 <= self.ndim <= 3:
@@ -30,42 +30,70 @@ def _pair(x):
     return x, x
 
 
-def _get_bilinear_interp_params(y, x, height, width):
-    if y < -1 or y > height or x < -1 or x > width:
-        # out of range, so it is empty
-        return (None,) * 8
-
-    if y <= 0:
-        y = 0
-    if x <= 0:
-        x = 0
-
-    y_low = int(y)
-    x_low = int(x)
-
-    if y_low >= height - 1:
-        y_high = y_low = height - 1
-        y = float(y_low)
+def _get_linear_interp_params(y, size):
+    # Interpolation parameters of get_bilinear_interp_params in
+    # _GET_BILINEAR_INTERP_KERNEL along one axis for an array of coordinates.
+    # The bilinear weights are the products of those along the two axes.
+    valid = (y >= -1) & (y <= size)
+    y = numpy.maximum(y, 0)
+    low = y.astype(numpy.int64)
+    at_end = low >= size - 1
+    low = numpy.where(at_end, size - 1, low)
+    high = numpy.where(at_end, size - 1, low + 1)
+    ly = numpy.where(at_end, 0., y - low)
+    return low, high, 1. - ly, ly, valid
+
+
+def _get_roi_sampling_params(bottom_rois, spatial_scale, outh, outw,
+                             sampling_ratio):
+    # Returns the start coordinates, the bin sizes and the numbers of the
+    # sampling points in each bin of all the RoIs.
+    roi_start_h, roi_start_w, roi_end_h, roi_end_w = \
+        (bottom_rois.astype(numpy.float64) * spatial_scale).T
+    roi_height = numpy.maximum(roi_end_h - roi_start_h, 1.)
+    roi_width = numpy.maximum(roi_end_w - roi_start_w, 1.)
+    if sampling_ratio[0] is None:
+        roi_bin_grid_h = numpy.ceil(roi_height / outh)
     else:
-        y_high = y_low + 1
-
-    if x_low >= width - 1:
-        x_high = x_low = width - 1
-        x = float(x_low)
+        roi_bin_grid_h = numpy.full(len(bottom_rois), sampling_ratio[0], 'd')
+    if sampling_ratio[1] is None:
+        roi_bin_grid_w = numpy.ceil(roi_width / outw)
     else:
-        x_high = x_low + 1
+        roi_bin_grid_w = numpy.full(len(bottom_rois), sampling_ratio[1], 'd')
+    return (roi_start_h, roi_start_w, roi_height / outh, roi_width / outw,
+            roi_bin_grid_h.astype(numpy.int64),
+            roi_bin_grid_w.astype(numpy.int64))
+
+
+def _get_interp_matrix(start, bin_size, n_bins, grid, size, dtype):
+    """Returns the linear interpolation matrix of the sampling points.
 
-    ly = y - y_low
-    lx = x - x_low
-    hy = 1. - ly
-    hx = 1. - lx
+    The sampling points of a RoI along one axis are interpolated by a matrix
+    of shape ``(n_bins * grid, hi - lo)`` from the elements ``[lo, hi)`` of
+    the input. Bilinear interpolation is separable, so that all the points
+    of a RoI are interpolated by two matrix products. The rows of the points
+    out of the input are zero.
 
-    w1 = hy * hx
-    w2 = hy * lx
-    w3 = ly * hx
-    w4 = ly * lx
+    Returns:
+        tuple: The matrix, the slice ``lo:hi`` and the mask of the valid
+        sampling points. The matrix and the slice are ``None`` if there are
+        no valid points.
 
-    return y_low, x_low, y_high, x_high, w1, w2, w3, w4
+    """
+    bins = numpy.repeat(numpy.arange(n_bins), grid)
+    index = numpy.tile(numpy.arange(grid), n_bins)
+    y = start + bins * bin_size + (index + .5) * bin_size / grid
+    low, high, hy, ly, valid = _get_linear_interp_params(y, size)
+    if not valid.any():
+        return None, None, valid
+    lo = int(low[valid].min())
+    hi = int(high[valid].max()) + 1
+    matrix = numpy.zeros((len(y), hi - lo), dtype)
+    rows = numpy.arange(len(y))
+    matrix[rows, numpy.clip(low, lo, hi - 1) - lo] = numpy.where(valid, hy, 0)
+    matrix[rows, numpy.clip(high, lo, hi - 1) - lo] += numpy.where(
+        valid, ly, 0)
+    return matrix, slice(lo, hi), valid
 
 
 _GET_BILINEAR_INTERP_KERNEL = '''
@@ -173,74 +201,42 @@ class ROIAverageAlign2D(function.Function):
         bottom_data, bottom_rois, bottom_roi_indices = inputs
         channels, height, width = bottom_data.shape[1:]
         n_rois = bottom_rois.shape[0]
-        top_data = numpy.empty((n_rois, channels, self.outh,
+        top_data = numpy.zeros((n_rois, channels, self.outh,
                                 self.outw), dtype=bottom_data.dtype)
 
-        pooled_width, pooled_height = self.outw, self.outh
-        spatial_scale = self.spatial_scale
-
-        for i in six.moves.range(top_data.size):
-            pw = i % pooled_width
-            ph = int(i / pooled_width) % pooled_height
-            c = int(i / pooled_width / pooled_height) % channels
-            n = int(i / pooled_width / pooled_height / channels)
-
-            roi_batch_ind = int(bottom_roi_indices[n])
-            roi_start_h = bottom_rois[n, 0] * spatial_scale
-            roi_start_w = bottom_rois[n, 1] * spatial_scale
-            roi_end_h = bottom_rois[n, 2] * spatial_scale
-            roi_end_w = bottom_rois[n, 3] * spatial_scale
-
-            roi_height = max(roi_end_h - roi_start_h, 1.)
-            roi_width = max(roi_end_w - roi_start_w, 1.)
-            bin_size_h = roi_height / pooled_height
-            bin_size_w = roi_width / pooled_width
-
-            if self.sampling_ratio[0] is None:
-                roi_bin_grid_h = numpy.ceil(roi_height / pooled_height)
-            else:
-                roi_bin_grid_h = self.sampling_ratio[0]
-            if self.sampling_ratio[1] is None:
-                roi_bin_grid_w = numpy.ceil(roi_width / pooled_width)
-            else:
-                roi_bin_grid_w = self.sampling_ratio[1]
-
-            count = roi_bin_grid_h * roi_bin_grid_w
-
-            output_val = 0.
-            iy = 0
-            while iy < roi_bin_grid_h:
-                y = roi_start_h + ph * bin_size_h + \
-                    (iy + .5) * bin_size_h / roi_bin_grid_h
-                ix = 0
-                while ix < roi_bin_grid_w:
-                    x = roi_start_w + pw * bin_size_w + \
-                        (ix + .5) * bin_size_w / roi_bin_grid_w
-
-                    # bilinear interpolation {{
-
-                    y_low, x_low, y_high, x_high, w1, w2, w3, w4 = \
-                        _get_bilinear_interp_params(y, x, height, width)
-                    if y_low is None:
-                        continue
-
-                    v1 = bottom_data[roi_batch_ind, c, y_low, x_low]
-                    v2 = bottom_data[roi_batch_ind, c, y_low, x_high]
-                    v3 = bottom_data[roi_batch_ind, c, y_high, x_low]
-                    v4 = bottom_data[roi_batch_ind, c, y_high, x_high]
-
-                    output_val += w1 * v1 + w2 * v2 + w3 * v3 + w4 * v4
-
-                    # }}
-
-                    ix += 1
-                iy += 1
-
-            output_val /= count
-            top_data[n, c, ph, pw] = output_val
+        for i_roi, sliceh, slicew, Ah, Aw in self._get_average_matrices(
+                bottom_rois, height, width, bottom_data.dtype):
+            idx = int(bottom_roi_indices[i_roi])
+            roi_data = bottom_data[idx, :, sliceh, slicew]
+            # (channels, roi_height, outw) -> (outh, channels, outw)
+            roi_data = numpy.tensordot(
+                Ah, numpy.tensordot(roi_data, Aw, (2, 1)), (1, 1))
+            top_data[i_roi] = roi_data.transpose(1, 0, 2)
 
         return top_data,
 
+    def _get_average_matrices(self, bottom_rois, height, width, dtype):
+        # Yields the matrices averaging the interpolated sampling points of
+        # each bin over the rows and the columns of each RoI.
+        roi_start_h, roi_start_w, bin_size_h, bin_size_w, \
+            roi_bin_grid_h, roi_bin_grid_w = _get_roi_sampling_params(
+                bottom_rois, self.spatial_scale, self.outh, self.outw,
+                self.sampling_ratio)
+        for i_roi in six.moves.range(len(bottom_rois)):
+            grid_h = int(roi_bin_grid_h[i_roi])
+            grid_w = int(roi_bin_grid_w[i_roi])
+            Ah, sliceh, _ = _get_interp_matrix(
+                roi_start_h[i_roi], bin_size_h[i_roi], self.outh, grid_h,
+                height, dtype)
+            Aw, slicew, _ = _get_interp_matrix(
+                roi_start_w[i_roi], bin_size_w[i_roi], self.outw, grid_w,
+                width, dtype)
+            if Ah is None or Aw is None:
+                continue
+            Ah = Ah.reshape(self.outh, grid_h, -1).sum(axis=1) / grid_h
+            Aw = Aw.reshape(self.outw, grid_w, -1).sum(axis=1) / grid_w
+            yield i_roi, sliceh, slicew, Ah, Aw
+
     def forward_gpu(self, inputs):
         self.retain_inputs((1, 2))
         self._bottom_data_shape = inputs[0].shape
@@ -355,73 +351,13 @@ class ROIAverageAlign2D(function.Function):
         channels, height, width = self._bottom_data_shape[1:]
         bottom_diff = numpy.zeros(self._bottom_data_shape, gy[0].dtype)
 
-        spatial_scale = self.spatial_scale
-        pooled_height = self.outh
-        pooled_width = self.outw
-        top_diff = gy[0]
-
-        for i in six.moves.range(top_diff.size):
-            pw = i % pooled_width
-            ph = int(i / pooled_width) % pooled_height
-            c = int(i / pooled_width / pooled_height) % channels
-            n = int(i / pooled_width / pooled_height / channels)
-
-            roi_batch_ind = int(bottom_roi_indices[n])
-            roi_start_h = bottom_rois[n, 0] * spatial_scale
-            roi_start_w = bottom_rois[n, 1] * spatial_scale
-            roi_end_h = bottom_rois[n, 2] * spatial_scale
-            roi_end_w = bottom_rois[n, 3] * spatial_scale
-
-            roi_height = max(roi_end_h - roi_start_h, 1.)
-            roi_width = max(roi_end_w - roi_start_w, 1.)
-            bin_size_h = roi_height / pooled_height
-            bin_size_w = roi_width / pooled_width
-
-            top_diff_this_bin = top_diff[n, c, ph, pw]
-
-            if self.sampling_ratio[0] is None:
-                roi_bin_grid_h = numpy.ceil(roi_height / pooled_height)
-            else:
-                roi_bin_grid_h = self.sampling_ratio[0]
-            if self.sampling_ratio[1] is None:
-                roi_bin_grid_w = numpy.ceil(roi_width / pooled_width)
-            else:
-                roi_bin_grid_w = self.sampling_ratio[1]
-
-            count = roi_bin_grid_h * roi_bin_grid_w
-
-            iy = 0
-            while iy < roi_bin_grid_h:
-                y = roi_start_h + ph * bin_size_h + \
-                    (iy + .5) * bin_size_h / roi_bin_grid_h
-                ix = 0
-                while ix < roi_bin_grid_w:
-                    x = roi_start_w + pw * bin_size_w + \
-                        (ix + .5) * bin_size_w / roi_bin_grid_w
-
-                    # bilinear_interpolation_gradient {{
-
-                    y_low, x_low, y_high, x_high, w1, w2, w3, w4 = \
-                        _get_bilinear_interp_params(y, x, height, width)
-                    if y_low is None:
-                        continue
-
-                    g1 = top_diff_this_bin * w1 / count
-                    g2 = top_diff_this_bin * w2 / count
-                    g3 = top_diff_this_bin * w3 / count
-                    g4 = top_diff_this_bin * w4 / count
-
-                    if (x_low >= 0 and x_high >= 0 and
-                            y_low >= 0 and y_high >= 0):
-                        bottom_diff[roi_batch_ind, c, y_low, x_low] += g1
-                        bottom_diff[roi_batch_ind, c, y_low, x_high] += g2
-                        bottom_diff[roi_batch_ind, c, y_high, x_low] += g3
-                        bottom_diff[roi_batch_ind, c, y_high, x_high] += g4
-
-                    # }}
-
-                    ix += 1
-                iy += 1
+        for i_roi, sliceh, slicew, Ah, Aw in self._get_average_matrices(
+                bottom_rois, height, width, gy[0].dtype):
+            idx = int(bottom_roi_indices[i_roi])
+            # (channels, outh, roi_width) -> (roi_height, channels, roi_width)
+            diff = numpy.tensordot(
+                Ah, numpy.tensordot(gy[0][i_roi], Aw, (2, 0)), (0, 1))
+            bottom_diff[idx, :, sliceh, slicew] += diff.transpose(1, 0, 2)
 
         return bottom_diff, None, None
 
@@ -33,7 +33,7 @@ import six
 
 from chainer.backends import cuda
 from chainer import function
-from chainer.functions.pooling.roi_pooling_2d import _roi_pooling_slice
+from chainer.functions.pooling.roi_pooling_2d import _roi_pooling_bins
 from chainer.utils import collections_abc
 from chainer.utils import type_check
 
@@ -44,6 +44,35 @@ def _pair(x):
     return x, x
 
 
+def _roi_average_pooling_matrices(bottom_rois, spatial_scale, outh, outw,
+                                  height, width, dtype):
+    # Yields the averaging matrices over the rows and the columns of each RoI
+    # and the range of the input they cover. Average pooling over a bin is
+    # separable, so that it is computed by two matrix products.
+    ymin, xmin, ymax, xmax = numpy.round(
+        bottom_rois.astype(numpy.float64) * spatial_scale
+    ).astype(numpy.int64).T
+    roi_height = numpy.maximum(ymax - ymin, 1)
+    roi_width = numpy.maximum(xmax - xmin, 1)
+    for i_roi in six.moves.range(len(bottom_rois)):
+        hstart, hend = _roi_pooling_bins(
+            outh, roi_height[i_roi] / outh, height, ymin[i_roi])
+        wstart, wend = _roi_pooling_bins(
+            outw, roi_width[i_roi] / outw, width, xmin[i_roi])
+        hlo, hhi = int(hstart.min()), int(hend.max())
+        wlo, whi = int(wstart.min()), int(wend.max())
+        if hhi <= hlo or whi <= wlo:
+            continue
+        rows = numpy.arange(hlo, hhi)
+        cols = numpy.arange(wlo, whi)
+        Ah = (hstart[:, None] <= rows) & (rows < hend[:, None])
+        Aw = (wstart[:, None] <= cols) & (cols < wend[:, None])
+        Ah = Ah / numpy.maximum(hend - hstart, 1)[:, None].astype(dtype)
+        Aw = Aw / numpy.maximum(wend - wstart, 1)[:, None].astype(dtype)
+        yield (i_roi, slice(hlo, hhi), slice(wlo, whi),
+               Ah.astype(dtype, copy=False), Aw.astype(dtype, copy=False))
+
+
 class ROIAveragePooling2D(function.Function):
 
     """RoI average pooling over a set of 2d planes."""
@@ -93,32 +122,15 @@ class ROIAveragePooling2D(function.Function):
         top_data = numpy.zeros((n_rois, channels, self.outh, self.outw),
                                dtype=bottom_data.dtype)
 
-        for i_roi in six.moves.range(n_rois):
-            idx = bottom_roi_indices[i_roi]
-            ymin, xmin, ymax, xmax = bottom_rois[i_roi]
-            ymin = int(round(ymin * self.spatial_scale))
-            xmin = int(round(xmin * self.spatial_scale))
-            ymax = int(round(ymax * self.spatial_scale))
-            xmax = int(round(xmax * self.spatial_scale))
-            roi_height = max(ymax - ymin, 1)
-            roi_width = max(xmax - xmin, 1)
-            strideh = 1. * roi_height / self.outh
-            stridew = 1. * roi_width / self.outw
-
-            for outh in six.moves.range(self.outh):
-                sliceh, lenh = _roi_pooling_slice(
-                    outh, strideh, height, ymin)
-                if sliceh.stop <= sliceh.start:
-                    continue
-                for outw in six.moves.range(self.outw):
-                    slicew, lenw = _roi_pooling_slice(
-                        outw, stridew, width, xmin)
-                    if slicew.stop <= slicew.start:
-                        continue
-                    roi_data = bottom_data[int(idx), :, sliceh, slicew]\
-                        .reshape(channels, -1)
-                    top_data[i_roi, :, outh, outw] =\
-                        numpy.average(roi_data, axis=1)
+        for i_roi, sliceh, slicew, Ah, Aw in _roi_average_pooling_matrices(
+                bottom_rois, self.spatial_scale, self.outh, self.outw,
+                height, width, bottom_data.dtype):
+            idx = int(bottom_roi_indices[i_roi])
+            roi_data = bottom_data[idx, :, sliceh, slicew]
+            # (channels, roi_height, outw) -> (outh, channels, outw)
+            roi_data = numpy.tensordot(
+                Ah, numpy.tensordot(roi_data, Aw, (2, 1)), (1, 1))
+            top_data[i_roi] = roi_data.transpose(1, 0, 2)
 
         return top_data,
 
@@ -195,36 +207,16 @@ class ROIAveragePooling2D(function.Function):
     def backward_cpu(self, inputs, gy):
         bottom_rois, bottom_roi_indices = inputs[1:]
         channels, height, width = self._bottom_data_shape[1:]
-        n_rois = bottom_rois.shape[0]
         bottom_diff = numpy.zeros(self._bottom_data_shape, gy[0].dtype)
 
-        for i_roi in six.moves.range(n_rois):
-            idx = bottom_roi_indices[i_roi]
-            ymin, xmin, ymax, xmax = bottom_rois[i_roi]
-            ymin = int(round(ymin * self.spatial_scale))
-            xmin = int(round(xmin * self.spatial_scale))
-            ymax = int(round(ymax * self.spatial_scale))
-            xmax = int(round(xmax * self.spatial_scale))
-            roi_height = max(ymax - ymin, 1)
-            roi_width = max(xmax - xmin, 1)
-            strideh = 1. * roi_height / self.outh
-            stridew = 1. * roi_width / self.outw
-
-            for outh in six.moves.range(self.outh):
-                sliceh, lenh = _roi_pooling_slice(
-                    outh, strideh, height, ymin)
-                if sliceh.stop <= sliceh.start:
-                    continue
-                for outw in six.moves.range(self.outw):
-                    slicew, lenw = _roi_pooling_slice(
-                        outw, stridew, width, xmin)
-                    if slicew.stop <= slicew.start:
-                        continue
-                    diff_val = gy[0][i_roi, :, outh, outw]\
-                        .reshape(channels, 1, 1)
-                    diff_val = diff_val / lenh / lenw
-                    bottom_diff[int(idx), :, sliceh, slicew] \
-                        += diff_val
+        for i_roi, sliceh, slicew, Ah, Aw in _roi_average_pooling_matrices(
+                bottom_rois, self.spatial_scale, self.outh, self.outw,
+                height, width, gy[0].dtype):
+            idx = int(bottom_roi_indices[i_roi])
+            # (channels, outh, roi_width) -> (roi_height, channels, roi_width)
+            diff = numpy.tensordot(
+                Ah, numpy.tensordot(gy[0][i_roi], Aw, (2, 0)), (0, 1))
+            bottom_diff[idx, :, sliceh, slicew] += diff.transpose(1, 0, 2)
 
         return bottom_diff, None, None
 
@@ -24,7 +24,9 @@ from chainer import function
 from chainer.functions.pooling.roi_average_align_2d \
     import _GET_BILINEAR_INTERP_KERNEL
 from chainer.functions.pooling.roi_average_align_2d \
-    import _get_bilinear_interp_params
+    import _get_interp_matrix
+from chainer.functions.pooling.roi_average_align_2d \
+    import _get_roi_sampling_params
 from chainer.utils import type_check
 
 
@@ -87,78 +89,61 @@ class ROIMaxAlign2D(function.Function):
         bottom_data, bottom_rois, bottom_roi_indices = inputs
         channels, height, width = bottom_data.shape[1:]
         n_rois = bottom_rois.shape[0]
-        top_data = numpy.empty((n_rois, channels, self.outh,
-                                self.outw), dtype=bottom_data.dtype)
-        self.argmax_data = numpy.zeros(top_data.shape, numpy.int32)
-
-        pooled_width, pooled_height = self.outw, self.outh
-        spatial_scale = self.spatial_scale
-
-        for i in six.moves.range(top_data.size):
-            pw = i % pooled_width
-            ph = int(i / pooled_width) % pooled_height
-            c = int(i / pooled_width / pooled_height) % channels
-            n = int(i / pooled_width / pooled_height / channels)
-
-            roi_batch_ind = bottom_roi_indices[n]
-            roi_start_h = bottom_rois[n, 0] * spatial_scale
-            roi_start_w = bottom_rois[n, 1] * spatial_scale
-            roi_end_h = bottom_rois[n, 2] * spatial_scale
-            roi_end_w = bottom_rois[n, 3] * spatial_scale
-
-            roi_width = max(roi_end_w - roi_start_w, 1.)
-            roi_height = max(roi_end_h - roi_start_h, 1.)
-            bin_size_h = roi_height / pooled_height
-            bin_size_w = roi_width / pooled_width
-
-            if self.sampling_ratio[0] is None:
-                roi_bin_grid_h = numpy.ceil(roi_height / pooled_height)
-            else:
-                roi_bin_grid_h = self.sampling_ratio[0]
-            if self.sampling_ratio[1] is None:
-                roi_bin_grid_w = numpy.ceil(roi_width / pooled_width)
-            else:
-                roi_bin_grid_w = self.sampling_ratio[1]
-
-            max_val = None
-            max_index = None
-            iy = 0
-            while iy < roi_bin_grid_h:
-                y = roi_start_h + ph * bin_size_h + \
-                    (iy + .5) * bin_size_h / roi_bin_grid_h
-                ix = 0
-                while ix < roi_bin_grid_w:
-                    x = roi_start_w + pw * bin_size_w + \
-                        (ix + .5) * bin_size_w / roi_bin_grid_w
-
-                    # bilinear interpolation {{
-
-                    y_low, x_low, y_high, x_high, w1, w2, w3, w4 = \
-                        _get_bilinear_interp_params(y, x, height, width)
-                    if y_low is None:
-                        continue
-
-                    v1 = bottom_data[roi_batch_ind, c, y_low, x_low]
-                    v2 = bottom_data[roi_batch_ind, c, y_low, x_high]
-                    v3 = bottom_data[roi_batch_ind, c, y_high, x_low]
-                    v4 = bottom_data[roi_batch_ind, c, y_high, x_high]
-
-                    tmp_val = w1 * v1 + w2 * v2 + w3 * v3 + w4 * v4
-                    tmp_index = iy * roi_bin_grid_w + ix
-                    if max_val is None or max_index is None \
-                            or (tmp_val > max_val):
-                        max_val = tmp_val
-                        max_index = tmp_index
-
-                    # }}
-
-                    ix += 1
-                iy += 1
-
-            top_data[n, c, ph, pw] = max_val
-            self.argmax_data[n, c, ph, pw] = max_index
-
-        return top_data,
+        # Bins without valid sampling points are -1E20 as in forward_gpu.
+        top_data = numpy.full((n_rois, self.outh, channels, self.outw),
+                              -1E20, dtype=bottom_data.dtype)
+        argmax_data = numpy.full(top_data.shape, -1, numpy.int32)
+
+        for n, sliceh, slicew, Ah, Aw, valid_h, valid_w in \
+                self._get_interp_matrices(
+                    bottom_rois, height, width, bottom_data.dtype):
+            grid_h = valid_h.shape[1]
+            grid_w = valid_w.shape[1]
+            roi_data = bottom_data[int(bottom_roi_indices[n]), :,
+                                   sliceh, slicew]
+            # (outh, grid_h, channels, outw, grid_w)
+            samples = numpy.tensordot(
+                Ah, numpy.tensordot(roi_data, Aw, (2, 1)), (1, 1))
+            samples = samples.reshape(
+                self.outh, grid_h, channels, self.outw, grid_w)
+
+            # Take the maxima over the sampling points in a running manner.
+            top = top_data[n]
+            argmax = argmax_data[n]
+            update = numpy.empty(top.shape, bool)
+            for iy in six.moves.range(grid_h):
+                for ix in six.moves.range(grid_w):
+                    numpy.greater(samples[:, iy, :, :, ix], top, out=update)
+                    update &= (valid_h[:, iy, None, None]
+                               & valid_w[None, None, :, ix])
+                    numpy.copyto(top, samples[:, iy, :, :, ix], where=update)
+                    numpy.copyto(argmax, iy * grid_w + ix, where=update)
+
+        self.argmax_data = numpy.ascontiguousarray(
+            argmax_data.transpose(0, 2, 1, 3))
+        return numpy.ascontiguousarray(top_data.transpose(0, 2, 1, 3)),
+
+    def _get_interp_matrices(self, bottom_rois, height, width, dtype):
+        # Yields the interpolation matrices of the sampling points over the
+        # rows and the columns of each RoI and their validity.
+        roi_start_h, roi_start_w, bin_size_h, bin_size_w, \
+            roi_bin_grid_h, roi_bin_grid_w = _get_roi_sampling_params(
+                bottom_rois, self.spatial_scale, self.outh, self.outw,
+                self.sampling_ratio)
+        for n in six.moves.range(len(bottom_rois)):
+            grid_h = int(roi_bin_grid_h[n])
+            grid_w = int(roi_bin_grid_w[n])
+            Ah, sliceh, valid_h = _get_interp_matrix(
+                roi_start_h[n], bin_size_h[n], self.outh, grid_h, height,
+                dtype)
+            Aw, slicew, valid_w = _get_interp_matrix(
+                roi_start_w[n], bin_size_w[n], self.outw, grid_w, width,
+                dtype)
+            if Ah is None or Aw is None:
+                continue
+            yield (n, sliceh, slicew, Ah, Aw,
+                   valid_h.reshape(self.outh, grid_h),
+                   valid_w.reshape(self.outw, grid_w))
 
     def forward_gpu(self, inputs):
         self.retain_inputs((1, 2))
@@ -279,68 +264,27 @@ class ROIMaxAlign2D(function.Function):
         channels, height, width = self._bottom_data_shape[1:]
         bottom_diff = numpy.zeros(self._bottom_data_shape, gy[0].dtype)
 
-        spatial_scale = self.spatial_scale
-        pooled_height = self.outh
-        pooled_width = self.outw
-        top_diff = gy[0]
-
-        for i in six.moves.range(top_diff.size):
-            pw = i % pooled_width
-            ph = int(i / pooled_width) % pooled_height
-            c = int(i / pooled_width / pooled_height) % channels
-            n = int(i / pooled_width / pooled_height / channels)
-
-            roi_batch_ind = bottom_roi_indices[n]
-            roi_start_h = bottom_rois[n, 0] * spatial_scale
-            roi_start_w = bottom_rois[n, 1] * spatial_scale
-            roi_end_h = bottom_rois[n, 2] * spatial_scale
-            roi_end_w = bottom_rois[n, 3] * spatial_scale
-
-            roi_width = max(roi_end_w - roi_start_w, 1.)
-            roi_height = max(roi_end_h - roi_start_h, 1.)
-            bin_size_h = roi_height / pooled_height
-            bin_size_w = roi_width / pooled_width
-
-            top_diff_this_bin = top_diff[n, c, ph, pw]
-
-            if self.sampling_ratio[0] is None:
-                roi_bin_grid_h = numpy.ceil(roi_height / pooled_height)
-            else:
-                roi_bin_grid_h = self.sampling_ratio[0]
-            if self.sampling_ratio[1] is None:
-                roi_bin_grid_w = numpy.ceil(roi_width / pooled_width)
-            else:
-                roi_bin_grid_w = self.sampling_ratio[1]
-
-            max_index = self.argmax_data[n, c, ph, pw]
-            iy = int(max_index / roi_bin_grid_w)
-            ix = max_index % roi_bin_grid_w
-
-            y = roi_start_h + ph * bin_size_h + \
-                (iy + .5) * bin_size_h / roi_bin_grid_h
-            x = roi_start_w + pw * bin_size_w + \
-                (ix + .5) * bin_size_w / roi_bin_grid_w
-
-            # bilinear_interpolation_gradient {{
-
-            y_low, x_low, y_high, x_high, w1, w2, w3, w4 = \
-                _get_bilinear_interp_params(y, x, height, width)
-            if y_low is None:
-                continue
-
-            g1 = top_diff_this_bin * w1
-            g2 = top_diff_this_bin * w2
-            g3 = top_diff_this_bin * w3
-            g4 = top_diff_this_bin * w4
-
-            if (x_low >= 0 and x_high >= 0 and
-                    y_low >= 0 and y_high >= 0):
-                bottom_diff[roi_batch_ind, c, y_low, x_low] += g1
-                bottom_diff[roi_batch_ind, c, y_low, x_high] += g2
-                bottom_diff[roi_batch_ind, c, y_high, x_low] += g3
-                bottom_diff[roi_batch_ind, c, y_high, x_high] += g4
-
-            # }}
+        for n, sliceh, slicew, Ah, Aw, valid_h, valid_w in \
+                self._get_interp_matrices(
+                    bottom_rois, height, width, gy[0].dtype):
+            grid_h = valid_h.shape[1]
+            grid_w = valid_w.shape[1]
+            # Scatter the gradients to the maximum sampling points, and
+            # interpolate them back to the input.
+            argmax = self.argmax_data[n].ravel()
+            found = argmax >= 0
+            diff = numpy.zeros((argmax.size, grid_h * grid_w), gy[0].dtype)
+            diff[numpy.arange(argmax.size)[found], argmax[found]] = \
+                gy[0][n].ravel()[found]
+            diff = diff.reshape(
+                channels, self.outh, self.outw, grid_h, grid_w)
+            diff = diff.transpose(1, 3, 0, 2, 4).reshape(
+                self.outh * grid_h, channels, self.outw * grid_w)
+            # (roi_height, channels, roi_width)
+            diff = numpy.tensordot(
+                Ah, numpy.tensordot(diff, Aw, (2, 0)), (0, 0))
+            bottom_diff[int(bottom_roi_indices[n]), :, sliceh, slicew] += \
+                diff.transpose(1, 0, 2)
 
         return bottom_diff, None, None
 
@@ -29,14 +29,14 @@
 # -----------------------------------------------------------------------------
 
 import numpy
-import six
 
 import chainer
 from chainer.backends import cuda
 from chainer import function
 from chainer.utils import type_check
 
-from chainer.functions.pooling.roi_pooling_2d import _roi_pooling_slice
+from chainer.functions.pooling.roi_pooling_2d import _roi_max_pooling_backward_cpu  # NOQA
+from chainer.functions.pooling.roi_pooling_2d import _roi_max_pooling_cpu
 
 
 def _pair(x):
@@ -88,48 +88,15 @@ class ROIMaxPooling2D(function.Function):
         self._bottom_data_shape = inputs[0].shape
 
         bottom_data, bottom_rois, bottom_roi_indices = inputs
-        channels, height, width = bottom_data.shape[1:]
-        n_rois = bottom_rois.shape[0]
-        # `numpy.zeros` needs to be used because the arrays can be
-        # returned without having some of its values updated.
-        top_data = numpy.zeros((n_rois, channels, self.outh, self.outw),
-                               dtype=bottom_data.dtype)
-        self.argmax_data = numpy.zeros(top_data.shape, numpy.int32)
-
-        for i_roi in six.moves.range(n_rois):
-            idx = bottom_roi_indices[i_roi]
-            ymin, xmin, ymax, xmax = bottom_rois[i_roi]
-            ymin = int(round(ymin * self.spatial_scale))
-            xmin = int(round(xmin * self.spatial_scale))
-            ymax = int(round(ymax * self.spatial_scale))
-            xmax = int(round(xmax * self.spatial_scale))
-            roi_height = max(ymax - ymin, 1)
-            roi_width = max(xmax - xmin, 1)
-            strideh = 1. * roi_height / self.outh
-            stridew = 1. * roi_width / self.outw
-
-            for outh in six.moves.range(self.outh):
-                sliceh, lenh = _roi_pooling_slice(
-                    outh, strideh, height, ymin)
-                if sliceh.stop <= sliceh.start:
-                    continue
-                for outw in six.moves.range(self.outw):
-                    slicew, lenw = _roi_pooling_slice(
-                        outw, stridew, width, xmin)
-                    if slicew.stop <= slicew.start:
-                        continue
-                    roi_data = bottom_data[int(idx), :, sliceh, slicew]\
-                        .reshape(channels, -1)
-                    top_data[i_roi, :, outh, outw] =\
-                        numpy.max(roi_data, axis=1)
-
-                    # get the max idx respect to feature_maps coordinates
-                    max_idx_slice = numpy.unravel_index(
-                        numpy.argmax(roi_data, axis=1), (lenh, lenw))
-                    max_idx_slice_h = max_idx_slice[0] + sliceh.start
-                    max_idx_slice_w = max_idx_slice[1] + slicew.start
-                    max_idx_slice = max_idx_slice_h * width + max_idx_slice_w
-                    self.argmax_data[i_roi, :, outh, outw] = max_idx_slice
+        ymin, xmin, ymax, xmax = numpy.round(
+            bottom_rois.astype(numpy.float64) * self.spatial_scale
+        ).astype(numpy.int64).T
+        roi_height = numpy.maximum(ymax - ymin, 1)
+        roi_width = numpy.maximum(xmax - xmin, 1)
+        top_data, self.argmax_data = _roi_max_pooling_cpu(
+            bottom_data, bottom_roi_indices, ymin, xmin,
+            roi_height / self.outh, roi_width / self.outw,
+            self.outh, self.outw)
         return top_data,
 
     def forward_gpu(self, inputs):
@@ -211,28 +178,10 @@ class ROIMaxPooling2D(function.Function):
 
     def backward_cpu(self, inputs, gy):
         bottom_rois, bottom_roi_indices = inputs[1:]
-        channels, height, width = self._bottom_data_shape[1:]
-        bottom_diff = numpy.zeros(self._bottom_data_shape, bottom_rois.dtype)
-
-        pooled_height = self.outh
-        pooled_width = self.outw
-        top_diff = gy[0]
-
-        for i in six.moves.range(top_diff.size):
-            pw = i % pooled_width
-            ph = int(i / pooled_width) % pooled_height
-            c = int(i / pooled_width / pooled_height) % channels
-            n = int(i / pooled_width / pooled_height / channels)
-
-            roi_batch_ind = int(bottom_roi_indices[n])
-
-            max_idx = self.argmax_data[n, c, ph, pw]
-            h = int(max_idx / width)
-            w = max_idx % width
-            if max_idx != -1:
-                bottom_diff[roi_batch_ind, c, h, w] += top_diff[
-                    n, c, ph, pw]
-        return bottom_diff, None, None
+        bottom_diff = _roi_max_pooling_backward_cpu(
+            self._bottom_data_shape, bottom_roi_indices, self.argmax_data,
+            gy[0])
+        return bottom_diff.astype(bottom_rois.dtype, copy=False), None, None
 
     def backward_gpu(self, inputs, gy):
         bottom_rois, bottom_roi_indices = inputs[1:]
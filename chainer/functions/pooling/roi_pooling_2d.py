@@ -36,14 +36,94 @@ from chainer import function
 from chainer.utils import type_check
 
 
-def _roi_pooling_slice(size, stride, max_size, roi_offset):
-    start = int(numpy.floor(size * stride))
-    end = int(numpy.ceil((size + 1) * stride))
+def _roi_pooling_bins(n_bins, stride, max_size, roi_offset):
+    # Returns the start and end indices of all the bins of a RoI.
+    bins = numpy.arange(n_bins)
+    start = numpy.floor(bins * stride).astype(numpy.int64)
+    end = numpy.ceil((bins + 1) * stride).astype(numpy.int64)
+    start = numpy.minimum(numpy.maximum(start + roi_offset, 0), max_size)
+    end = numpy.minimum(numpy.maximum(end + roi_offset, 0), max_size)
+    return start, end
+
+
+def _window_max(data, start, end, axis):
+    # Returns the maxima of ``data`` along ``axis`` over the windows
+    # ``[start[i], end[i])`` and their indices. Windows are padded by
+    # repeating their last element, and the running maxima of all the windows
+    # are updated at once for each offset in the windows. Empty windows are
+    # undefined.
+    length = max(int((end - start).max()), 1)
+    last = numpy.minimum(numpy.maximum(end - 1, start), data.shape[axis] - 1)
+    top = numpy.take(data, numpy.minimum(start, last), axis=axis)
+    offset = numpy.zeros(top.shape, numpy.int32)
+    update = numpy.empty(top.shape, bool)
+    for i in six.moves.range(1, length):
+        candidate = numpy.take(data, numpy.minimum(start + i, last), axis=axis)
+        numpy.greater(candidate, top, out=update)
+        numpy.maximum(top, candidate, out=top)
+        numpy.copyto(offset, i, where=update)
+    shape = (-1,) + (1,) * (data.ndim - axis - 1)
+    argmax = numpy.minimum(start.reshape(shape) + offset, last.reshape(shape))
+    return top, argmax
+
+
+def _roi_max_pooling_cpu(bottom_data, roi_indices, ymin, xmin,
+                         strideh, stridew, outh, outw):
+    """Max pooling of RoIs on CPU.
+
+    The maxima are taken over rows and then over columns of each bin, so that
+    each RoI is pooled by a few array operations. The channels are moved to
+    the last axis to make the windows contiguous.
 
-    start = min(max(start + roi_offset, 0), max_size)
-    end = min(max(end + roi_offset, 0), max_size)
-
-    return slice(start, end), end - start
+    """
+    channels, height, width = bottom_data.shape[1:]
+    n_rois = len(roi_indices)
+    top_data = numpy.zeros((n_rois, outh, outw, channels),
+                           dtype=bottom_data.dtype)
+    argmax_data = numpy.full(top_data.shape, -1, numpy.int32)
+    bottom_data = numpy.ascontiguousarray(bottom_data.transpose(0, 2, 3, 1))
+
+    for i_roi in six.moves.range(n_rois):
+        hstart, hend = _roi_pooling_bins(
+            outh, strideh[i_roi], height, ymin[i_roi])
+        wstart, wend = _roi_pooling_bins(
+            outw, stridew[i_roi], width, xmin[i_roi])
+        valid = (hend > hstart)[:, None] & (wend > wstart)[None, :]
+        if not valid.any():
+            continue
+        # Crop the columns covered by the RoI before reducing the rows.
+        wlo = int(wstart.min())
+        roi_data = bottom_data[int(roi_indices[i_roi]), :,
+                               wlo:max(int(wend.max()), wlo + 1)]
+        # (outh, roi_width, channels)
+        max_h, argmax_h = _window_max(roi_data, hstart, hend, 0)
+        # (outh, outw, channels)
+        top, argmax_w = _window_max(max_h, wstart - wlo, wend - wlo, 1)
+        argmax_h = argmax_h[numpy.arange(outh)[:, None, None], argmax_w,
+                            numpy.arange(channels)]
+        valid = valid[:, :, None]
+        top_data[i_roi] = numpy.where(valid, top, 0)
+        argmax_data[i_roi] = numpy.where(
+            valid, argmax_h * width + argmax_w + wlo, -1)
+    top_data = numpy.ascontiguousarray(top_data.transpose(0, 3, 1, 2))
+    argmax_data = numpy.ascontiguousarray(argmax_data.transpose(0, 3, 1, 2))
+    return top_data, argmax_data
+
+
+def _roi_max_pooling_backward_cpu(bottom_data_shape, roi_indices,
+                                  argmax_data, top_diff):
+    # Scatters the gradients to the maxima with a single bincount.
+    n, channels, height, width = bottom_data_shape
+    c_index = numpy.arange(channels).reshape(1, -1, 1, 1)
+    offset = (roi_indices.astype(numpy.int64).reshape(-1, 1, 1, 1)
+              * channels + c_index) * (height * width)
+    mask = argmax_data >= 0
+    index = (offset + argmax_data)[mask]
+    bottom_diff = numpy.bincount(
+        index, weights=top_diff[mask],
+        minlength=n * channels * height * width)
+    return bottom_diff.reshape(bottom_data_shape).astype(
+        top_diff.dtype, copy=False)
 
 
 class ROIPooling2D(function.Function):
@@ -71,47 +151,15 @@ class ROIPooling2D(function.Function):
         self._bottom_data_shape = inputs[0].shape
 
         bottom_data, bottom_rois = inputs
-        channels, height, width = bottom_data.shape[1:]
-        n_rois = bottom_rois.shape[0]
-        # `numpy.zeros` needs to be used because the arrays can be
-        # returned without having some of its values updated.
-        top_data = numpy.zeros((n_rois, channels, self.outh, self.outw),
-                               dtype=bottom_data.dtype)
-        self.argmax_data = numpy.zeros(top_data.shape, numpy.int32)
-
-        for i_roi in six.moves.range(n_rois):
-            idx, xmin, ymin, xmax, ymax = bottom_rois[i_roi]
-            xmin = int(round(xmin * self.spatial_scale))
-            xmax = int(round(xmax * self.spatial_scale))
-            ymin = int(round(ymin * self.spatial_scale))
-            ymax = int(round(ymax * self.spatial_scale))
-            roi_width = max(xmax - xmin + 1, 1)
-            roi_height = max(ymax - ymin + 1, 1)
-            strideh = 1. * roi_height / self.outh
-            stridew = 1. * roi_width / self.outw
-
-            for outh in six.moves.range(self.outh):
-                sliceh, lenh = _roi_pooling_slice(
-                    outh, strideh, height, ymin)
-                if sliceh.stop <= sliceh.start:
-                    continue
-                for outw in six.moves.range(self.outw):
-                    slicew, lenw = _roi_pooling_slice(
-                        outw, stridew, width, xmin)
-                    if slicew.stop <= slicew.start:
-                        continue
-                    roi_data = bottom_data[int(idx), :, sliceh, slicew]\
-                        .reshape(channels, -1)
-                    top_data[i_roi, :, outh, outw] =\
-                        numpy.max(roi_data, axis=1)
-
-                    # get the max idx respect to feature_maps coordinates
-                    max_idx_slice = numpy.unravel_index(
-                        numpy.argmax(roi_data, axis=1), (lenh, lenw))
-                    max_idx_slice_h = max_idx_slice[0] + sliceh.start
-                    max_idx_slice_w = max_idx_slice[1] + slicew.start
-                    max_idx_slice = max_idx_slice_h * width + max_idx_slice_w
-                    self.argmax_data[i_roi, :, outh, outw] = max_idx_slice
+        xmin, ymin, xmax, ymax = numpy.round(
+            bottom_rois[:, 1:].astype(numpy.float64) * self.spatial_scale
+        ).astype(numpy.int64).T
+        roi_width = numpy.maximum(xmax - xmin + 1, 1)
+        roi_height = numpy.maximum(ymax - ymin + 1, 1)
+        top_data, self.argmax_data = _roi_max_pooling_cpu(
+            bottom_data, bottom_rois[:, 0].astype(numpy.int64), ymin, xmin,
+            roi_height / self.outh, roi_width / self.outw,
+            self.outh, self.outw)
         return top_data,
 
     def forward_gpu(self, inputs):
@@ -193,44 +241,10 @@ class ROIPooling2D(function.Function):
 
     def backward_cpu(self, inputs, gy):
         bottom_rois = inputs[1]
-        channels, height, width = self._bottom_data_shape[1:]
-        n_rois = bottom_rois.shape[0]
-        bottom_delta = numpy.zeros(self._bottom_data_shape, bottom_rois.dtype)
-
-        for i_roi in six.moves.range(n_rois):
-            idx, xmin, ymin, xmax, ymax = bottom_rois[i_roi]
-            idx = int(idx)
-            xmin = int(round(xmin * self.spatial_scale))
-            xmax = int(round(xmax * self.spatial_scale))
-            ymin = int(round(ymin * self.spatial_scale))
-            ymax = int(round(ymax * self.spatial_scale))
-            roi_width = max(xmax - xmin + 1, 1)
-            roi_height = max(ymax - ymin + 1, 1)
-
-            strideh = float(roi_height) / float(self.outh)
-            stridew = float(roi_width) / float(self.outw)
-
-            # iterate all the w, h (from feature map) that fall into this ROIs
-            for w in six.moves.range(xmin, xmax + 1):
-                for h in six.moves.range(ymin, ymax + 1):
-                    phstart = int(numpy.floor(float(h - ymin) / strideh))
-                    phend = int(numpy.ceil(float(h - ymin + 1) / strideh))
-                    pwstart = int(numpy.floor(float(w - xmin) / stridew))
-                    pwend = int(numpy.ceil(float(w - xmin + 1) / stridew))
-
-                    phstart = min(max(phstart, 0), self.outh)
-                    phend = min(max(phend, 0), self.outh)
-                    pwstart = min(max(pwstart, 0), self.outw)
-                    pwend = min(max(pwend, 0), self.outw)
-
-                    for ph in six.moves.range(phstart, phend):
-                        for pw in six.moves.range(pwstart, pwend):
-                            max_idx_tmp = self.argmax_data[i_roi, :, ph, pw]
-                            for c in six.moves.range(channels):
-                                if max_idx_tmp[c] == (h * width + w):
-                                    bottom_delta[idx, c, h, w] += \
-                                        gy[0][i_roi, c, ph, pw]
-        return bottom_delta, None
+        bottom_delta = _roi_max_pooling_backward_cpu(
+            self._bottom_data_shape, bottom_rois[:, 0].astype(numpy.int64),
+            self.argmax_data, gy[0])
+        return bottom_delta.astype(bottom_rois.dtype, copy=False), None
 
     def backward_gpu(self, inputs, gy):
         bottom_rois = inputs[1]
@@ -0,0 +1,556 @@
+import functools
+
+import numpy
+import six
+
+import chainer
+from chainer.backends import cuda
+from chainer import function_node
+from chainer.functions.activation import leaky_relu
+from chainer.functions.activation import relu
+from chainer.functions.activation import sigmoid
+from chainer.functions.activation import tanh
+from chainer.functions.math import basic_math
+from chainer.functions.math import exponential
+from chainer.functions.math import sqrt
+from chainer.functions.math import square
+from chainer.utils import type_check
+
+
+# The number of elements that are processed at a time on CPU. The
+# intermediate arrays of one block are small enough to stay in cache.
+_block_size = 8192
+
+
+def _get_op(node):
+    # Return the (op, constant) pair that corresponds to a function node, or
+    # None if the function node cannot be fused.
+    if isinstance(node, basic_math.Neg):
+        return 'neg', None
+    if isinstance(node, basic_math.Absolute):
+        return 'abs', None
+    if isinstance(node, basic_math.Add):
+        return 'add', None
+    if isinstance(node, basic_math.Sub):
+        return 'sub', None
+    if isinstance(node, basic_math.Mul):
+        return 'mul', None
+    if isinstance(node, basic_math.Div):
+        return 'div', None
+    if isinstance(node, (basic_math.AddConstant, basic_math.SubFromConstant,
+                         basic_math.MulConstant, basic_math.DivFromConstant)):
+        if not numpy.isscalar(node.value):
+            return None
+        op = {
+            basic_math.AddConstant: 'add_const',
+            basic_math.SubFromConstant: 'rsub_const',
+            basic_math.MulConstant: 'mul_const',
+            basic_math.DivFromConstant: 'rdiv_const',
+        }[type(node)]
+        return op, node.value
+    if isinstance(node, exponential.Exp):
+        return 'exp', None
+    if isinstance(node, exponential.Log):
+        return 'log', None
+    if isinstance(node, sqrt.Sqrt):
+        return 'sqrt', None
+    if isinstance(node, square.Square):
+        return 'square', None
+    if isinstance(node, tanh.Tanh):
+        return 'tanh', None
+    if isinstance(node, sigmoid.Sigmoid):
+        return 'sigmoid', None
+    if isinstance(node, relu.ReLU):
+        return 'relu', None
+    if isinstance(node, leaky_relu.LeakyReLU):
+        return 'leaky_relu', node.slope
+    return None
+
+
+def _forward_sigmoid(xp, xs, c, out):
+    half = out.dtype.type(0.5)
+    xp.multiply(xs[0], half, out=out)
+    xp.tanh(out, out=out)
+    out *= half
+    out += half
+
+
+def _forward_leaky_relu(xp, xs, c, out):
+    x, = xs
+    out[...] = x
+    out[x < 0] *= c
+
+
+# Each forward kernel computes the result of an operation on one block into
+# `out`.
+_forward_kernels = {
+    'neg': lambda xp, xs, c, out: xp.negative(xs[0], out=out),
+    'abs': lambda xp, xs, c, out: xp.absolute(xs[0], out=out),
+    'add': lambda xp, xs, c, out: xp.add(xs[0], xs[1], out=out),
+    'sub': lambda xp, xs, c, out: xp.subtract(xs[0], xs[1], out=out),
+    'mul': lambda xp, xs, c, out: xp.multiply(xs[0], xs[1], out=out),
+    'div': lambda xp, xs, c, out: xp.true_divide(xs[0], xs[1], out=out),
+    'add_const': lambda xp, xs, c, out: xp.add(xs[0], c, out=out),
+    'rsub_const': lambda xp, xs, c, out: xp.subtract(c, xs[0], out=out),
+    'mul_const': lambda xp, xs, c, out: xp.multiply(xs[0], c, out=out),
+    'rdiv_const': lambda xp, xs, c, out: xp.true_divide(c, xs[0], out=out),
+    'exp': lambda xp, xs, c, out: xp.exp(xs[0], out=out),
+    'log': lambda xp, xs, c, out: xp.log(xs[0], out=out),
+    'sqrt': lambda xp, xs, c, out: xp.sqrt(xs[0], out=out),
+    'square': lambda xp, xs, c, out: xp.square(xs[0], out=out),
+    'tanh': lambda xp, xs, c, out: xp.tanh(xs[0], out=out),
+    'sigmoid': _forward_sigmoid,
+    'relu': lambda xp, xs, c, out: xp.maximum(xs[0], 0, out=out),
+    'leaky_relu': _forward_leaky_relu,
+}
+
+
+def _backward_neg(xp, xs, y, gy, c, tmp, acc):
+    acc(0, xp.negative(gy, out=tmp))
+
+
+def _backward_abs(xp, xs, y, gy, c, tmp, acc):
+    xp.sign(xs[0], out=tmp)
+    tmp *= gy
+    acc(0, tmp)
+
+
+def _backward_add(xp, xs, y, gy, c, tmp, acc):
+    acc(0, gy)
+    acc(1, gy)
+
+
+def _backward_sub(xp, xs, y, gy, c, tmp, acc):
+    acc(0, gy)
+    acc(1, xp.negative(gy, out=tmp))
+
+
+def _backward_mul(xp, xs, y, gy, c, tmp, acc):
+    acc(0, xp.multiply(gy, xs[1], out=tmp))
+    acc(1, xp.multiply(gy, xs[0], out=tmp))
+
+
+def _backward_div(xp, xs, y, gy, c, tmp, acc):
+    xp.true_divide(gy, xs[1], out=tmp)
+    acc(0, tmp)
+    tmp *= y
+    acc(1, xp.negative(tmp, out=tmp))
+
+
+def _backward_add_const(xp, xs, y, gy, c, tmp, acc):
+    acc(0, gy)
+
+
+def _backward_mul_const(xp, xs, y, gy, c, tmp, acc):
+    acc(0, xp.multiply(gy, c, out=tmp))
+
+
+def _backward_rdiv_const(xp, xs, y, gy, c, tmp, acc):
+    xp.true_divide(y, xs[0], out=tmp)
+    tmp *= gy
+    acc(0, xp.negative(tmp, out=tmp))
+
+
+def _backward_exp(xp, xs, y, gy, c, tmp, acc):
+    acc(0, xp.multiply(gy, y, out=tmp))
+
+
+def _backward_log(xp, xs, y, gy, c, tmp, acc):
+    acc(0, xp.true_divide(gy, xs[0], out=tmp))
+
+
+def _backward_sqrt(xp, xs, y, gy, c, tmp, acc):
+    xp.true_divide(gy, y, out=tmp)
+    tmp *= tmp.dtype.type(0.5)
+    acc(0, tmp)
+
+
+def _backward_square(xp, xs, y, gy, c, tmp, acc):
+    xp.multiply(xs[0], gy, out=tmp)
+    tmp *= tmp.dtype.type(2)
+    acc(0, tmp)
+
+
+def _backward_tanh(xp, xs, y, gy, c, tmp, acc):
+    xp.multiply(y, y, out=tmp)
+    xp.subtract(tmp.dtype.type(1), tmp, out=tmp)
+    tmp *= gy
+    acc(0, tmp)
+
+
+def _backward_sigmoid(xp, xs, y, gy, c, tmp, acc):
+    xp.subtract(tmp.dtype.type(1), y, out=tmp)
+    tmp *= y
+    tmp *= gy
+    acc(0, tmp)
+
+
+def _backward_relu(xp, xs, y, gy, c, tmp, acc):
+    acc(0, xp.multiply(gy, y > 0, out=tmp))
+
+
+def _backward_leaky_relu(xp, xs, y, gy, c, tmp, acc):
+    tmp[...] = gy
+    # This follows the gradient of LeakyReLU.
+    if c >= 0:
+        tmp[y < 0] *= c
+    else:
+        tmp[xs[0] < 0] *= c
+    acc(0, tmp)
+
+
+# Each backward kernel computes the gradient of an operation on one block
+# and passes the contribution to the gradient of each argument to `acc`.
+_backward_kernels = {
+    'neg': _backward_neg,
+    'abs': _backward_abs,
+    'add': _backward_add,
+    'sub': _backward_sub,
+    'mul': _backward_mul,
+    'div': _backward_div,
+    'add_const': _backward_add_const,
+    'rsub_const': _backward_neg,
+    'mul_const': _backward_mul_const,
+    'rdiv_const': _backward_rdiv_const,
+    'exp': _backward_exp,
+    'log': _backward_log,
+    'sqrt': _backward_sqrt,
+    'square': _backward_square,
+    'tanh': _backward_tanh,
+    'sigmoid': _backward_sigmoid,
+    'relu': _backward_relu,
+    'leaky_relu': _backward_leaky_relu,
+}
+
+
+# Each function applies an operation to variables. These are used to
+# compute differentiable gradients.
+_variable_functions = {
+    'neg': lambda xs, c: -xs[0],
+    'abs': lambda xs, c: chainer.functions.absolute(xs[0]),
+    'add': lambda xs, c: xs[0] + xs[1],
+    'sub': lambda xs, c: xs[0] - xs[1],
+    'mul': lambda xs, c: xs[0] * xs[1],
+    'div': lambda xs, c: xs[0] / xs[1],
+    'add_const': lambda xs, c: xs[0] + c,
+    'rsub_const': lambda xs, c: c - xs[0],
+    'mul_const': lambda xs, c: xs[0] * c,
+    'rdiv_const': lambda xs, c: c / xs[0],
+    'exp': lambda xs, c: chainer.functions.exp(xs[0]),
+    'log': lambda xs, c: chainer.functions.log(xs[0]),
+    'sqrt': lambda xs, c: chainer.functions.sqrt(xs[0]),
+    'square': lambda xs, c: chainer.functions.square(xs[0]),
+    'tanh': lambda xs, c: chainer.functions.tanh(xs[0]),
+    'sigmoid': lambda xs, c: chainer.functions.sigmoid(xs[0]),
+    'relu': lambda xs, c: chainer.functions.relu(xs[0]),
+    'leaky_relu': lambda xs, c: chainer.functions.leaky_relu(xs[0], c),
+}
+
+
+def _trace(func, in_vars):
+    """Trace a function into a program of elementwise operations.
+
+    Args:
+        func: The function to trace.
+        in_vars (tuple of ~chainer.Variable): The input variables.
+
+    Returns:
+        tuple: The program, the output slots and a flag that is ``True`` if
+        ``func`` returns a single variable. The program is ``None`` if
+        ``func`` cannot be fused.
+
+    """
+    # The traced computations must not be added to a static schedule.
+    with chainer.using_config('enable_backprop', True), \
+            chainer.using_config('schedule_func', None):
+        outputs = func(*in_vars)
+    single = isinstance(outputs, chainer.Variable)
+    if single:
+        outputs = outputs,
+    if (not isinstance(outputs, (list, tuple)) or not outputs or
+            not all(isinstance(y, chainer.Variable) for y in outputs)):
+        return None, None, single
+
+    shape = in_vars[0].shape
+    dtype = in_vars[0].dtype
+    # Maps id(VariableNode) of an input and id(FunctionNode) of an
+    # operation to its slot.
+    slots = dict((id(x.node), i) for i, x in enumerate(in_vars))
+    program = []
+
+    def visit(var_node):
+        if id(var_node) in slots:
+            return slots[id(var_node)]
+        node = var_node.creator_node
+        if node is None:
+            # A variable that is not an input.
+            return None
+        if id(node) in slots:
+            return slots[id(node)]
+        op = _get_op(node)
+        if op is None:
+            return None
+        args = []
+        for x in node.inputs:
+            if x.shape != shape or x.dtype != dtype:
+                return None
+            slot = visit(x)
+            if slot is None:
+                return None
+            args.append(slot)
+        program.append((op[0], tuple(args), op[1]))
+        slot = len(in_vars) + len(program) - 1
+        slots[id(node)] = slot
+        return slot
+
+    out_slots = []
+    for y in outputs:
+        if y.creator_node is None:
+            return None, None, single
+        slot = visit(y.node)
+        if slot is None or slot in out_slots:
+            return None, None, single
+        out_slots.append(slot)
+    return tuple(program), tuple(out_slots), single
+
+
+def _as_flat(xp, x):
+    return xp.ascontiguousarray(x).reshape(-1)
+
+
+class FusedElementwise(function_node.FunctionNode):
+
+    """Elementwise operations fused into a single function node.
+
+    The operations are evaluated in a single pass over the inputs. On CPU,
+    the arrays are processed in blocks so that the intermediate results of
+    a block stay in cache.
+
+    Args:
+        program (tuple): The operations. Each operation is a tuple of the
+            name of the operation, the slots of its arguments and a scalar
+            constant (or ``None``). The first slots are the inputs and the
+            ``k``-th operation writes the slot ``n_inputs + k``.
+        out_slots (tuple of int): The slots of the outputs.
+
+    """
+
+    def __init__(self, program, out_slots):
+        self.program = program
+        self.out_slots = out_slots
+
+    @property
+    def label(self):
+        return 'FusedElementwise'
+
+    def check_type_forward(self, in_types):
+        type_check.expect(in_types.size() > 0)
+        x_type = in_types[0]
+        type_check.expect(x_type.dtype.kind == 'f')
+        for t in in_types[1:]:
+            type_check.expect(
+                t.dtype == x_type.dtype,
+                t.shape == x_type.shape,
+            )
+
+    def forward(self, inputs):
+        self.retain_inputs(tuple(six.moves.range(len(inputs))))
+        xp = chainer.backend.get_array_module(*inputs)
+        x = inputs[0]
+        outputs = [xp.empty(x.shape, dtype=x.dtype) for _ in self.out_slots]
+        out_views = dict(
+            (slot, y.reshape(-1)) for slot, y in zip(self.out_slots, outputs))
+        xs = [_as_flat(xp, x) for x in inputs]
+        for _ in self._run_blocks(xp, xs, out_views):
+            pass
+        return tuple(outputs)
+
+    def _run_blocks(self, xp, xs, out_views=None):
+        # Evaluate the program block by block. For each block, yield the
+        # slice of the block and the values of all slots.
+        n_in = len(xs)
+        size = xs[0].size
+        dtype = xs[0].dtype
+        block = max(size, 1)
+        if xp is numpy:
+            block = min(block, _block_size)
+        consts = [None if c is None else dtype.type(c)
+                  for _, _, c in self.program]
+        bufs = [xp.empty((block,), dtype=dtype) for _ in self.program]
+        for start in six.moves.range(0, size, block):
+            stop = min(start + block, size)
+            vals = [x[start:stop] for x in xs]
+            for k, (op, args, _) in enumerate(self.program):
+                slot = n_in + k
+                if out_views is not None and slot in out_views:
+                    out = out_views[slot][start:stop]
+                else:
+                    out = bufs[k][:stop - start]
+                _forward_kernels[op](
+                    xp, [vals[a] for a in args], consts[k], out)
+                vals.append(out)
+            yield slice(start, stop), vals
+
+    def backward(self, indexes, grad_outputs):
+        inputs = self.get_retained_inputs()
+        if chainer.config.enable_backprop:
+            return self._backward_unfused(indexes, inputs, grad_outputs)
+        out_indexes = [i for i, gy in enumerate(grad_outputs)
+                       if gy is not None]
+        gys = [grad_outputs[i] for i in out_indexes]
+        return FusedElementwiseGrad(self, indexes, out_indexes).apply(
+            inputs + tuple(gys))
+
+    def _backward_unfused(self, indexes, inputs, grad_outputs):
+        # Recompute the outputs with the original functions so that the
+        # gradients can be differentiated again.
+        vals = list(inputs)
+        for op, args, c in self.program:
+            vals.append(_variable_functions[op]([vals[a] for a in args], c))
+        ys = []
+        gys = []
+        for slot, gy in zip(self.out_slots, grad_outputs):
+            if gy is not None:
+                ys.append(vals[slot])
+                gys.append(gy)
+        return chainer.grad(ys, [inputs[i] for i in indexes],
+                            grad_outputs=gys, enable_double_backprop=True)
+
+
+class FusedElementwiseGrad(function_node.FunctionNode):
+
+    """Gradient of :class:`FusedElementwise`.
+
+    The forward values of a block are recomputed and the gradients are
+    backpropagated through the operations in reverse order within the same
+    block. This function is only used when the gradients do not need to be
+    differentiated.
+
+    """
+
+    def __init__(self, func, indexes, out_indexes):
+        self.func = func
+        self.indexes = indexes
+        self.out_indexes = out_indexes
+
+    def forward(self, inputs):
+        n_in = len(self.func.inputs)
+        xp = chainer.backend.get_array_module(*inputs)
+        xs = [_as_flat(xp, x) for x in inputs[:n_in]]
+        gys = [_as_flat(xp, gy) for gy in inputs[n_in:]]
+        x = inputs[0]
+        gxs = [xp.zeros(x.shape, dtype=x.dtype) for _ in self.indexes]
+        gx_views = [gx.reshape(-1) for gx in gxs]
+
+        program = self.func.program
+        dtype = x.dtype
+        consts = [None if c is None else dtype.type(c)
+                  for _, _, c in program]
+        n_slots = n_in + len(program)
+        gbufs = None
+        tmp = None
+        for block, vals in self.func._run_blocks(xp, xs):
+            n = block.stop - block.start
+            if gbufs is None:
+                gbufs = [xp.empty((n,), dtype=dtype)
+                         for _ in six.moves.range(n_slots)]
+                tmp = xp.empty((n,), dtype=dtype)
+            grads = [None] * n_slots
+
+            def acc(slot, value):
+                if grads[slot] is None:
+                    grads[slot] = gbufs[slot][:n]
+                    grads[slot][...] = value
+                else:
+                    grads[slot] += value
+
+            for i, gy in zip(self.out_indexes, gys):
+                acc(self.func.out_slots[i], gy[block])
+            for k in six.moves.range(len(program) - 1, -1, -1):
+                slot = n_in + k
+                if grads[slot] is None:
+                    continue
+                op, args, _ = program[k]
+                _backward_kernels[op](
+                    xp, [vals[a] for a in args], vals[slot], grads[slot],
+                    consts[k], tmp[:n],
+                    lambda i, value: acc(args[i], value))
+            for gx, i in zip(gx_views, self.indexes):
+                if grads[i] is not None:
+                    gx[block] = grads[i]
+        return tuple(gxs)
+
+
+def fuse_elementwise(func):
+    """Decorator to fuse the elementwise operations of a function.
+
+    The decorated function is traced once for each combination of the
+    shapes, dtypes and array types of its arguments. If the traced
+    computational graph from the inputs to the outputs only consists of the
+    supported elementwise functions applied to arrays of the same shape, it
+    is replaced by a single :class:`FusedElementwise` function node for the
+    following calls. This avoids creating an intermediate variable and
+    function node for each operation, and on CPU the operations are
+    evaluated block by block so that the intermediate arrays stay in cache.
+    The gradient is computed in the same way, unless it needs to be
+    differentiated again.
+
+    The supported functions are arithmetic operators between variables of
+    the same shape and with scalars (except for powers),
+    :func:`~chainer.functions.absolute`, :func:`~chainer.functions.exp`,
+    :func:`~chainer.functions.log`, :func:`~chainer.functions.sqrt`,
+    :func:`~chainer.functions.square`, :func:`~chainer.functions.tanh`,
+    :func:`~chainer.functions.sigmoid`, :func:`~chainer.functions.relu` and
+    :func:`~chainer.functions.leaky_relu`. If the function uses anything
+    else, it is called as usual.
+
+    The function must only take variables or arrays as positional
+    arguments, and return a variable or a tuple of variables. Like a static
+    graph, it must perform the same computations on each call, since the
+    scalar constants are recorded when it is traced. The fused function
+    node can also be used inside a chain decorated with
+    :func:`~chainer.graph_optimizations.static_graph.static_graph`.
+
+    .. admonition:: Example
+
+       >>> from chainer.graph_optimizations.elementwise_fusion import \\
+       ...     fuse_elementwise
+       >>> @fuse_elementwise
+       ... def f(a, x, b):
+       ...     return F.tanh(a * x + b)
+       >>> a, x, b = (np.full((2, 3), v, np.float32) for v in (1, 2, 3))
+       >>> f(a, x, b).array
+       array([[0.9999092, 0.9999092, 0.9999092],
+              [0.9999092, 0.9999092, 0.9999092]], dtype=float32)
+
+    """
+    # Maps a key of the arguments to (program, out_slots, single).
+    programs = {}
+
+    @functools.wraps(func)
+    def wrapped_func(*args):
+        if not args or not all(
+                isinstance(x, (chainer.Variable, numpy.ndarray,
+                               cuda.ndarray)) for x in args):
+            return func(*args)
+        arrays = [x.array if isinstance(x, chainer.Variable) else x
+                  for x in args]
+        if not all(isinstance(x, (numpy.ndarray, cuda.ndarray))
+                   for x in arrays):
+            return func(*args)
+        key = tuple((type(x), x.shape, x.dtype) for x in arrays)
+        if key not in programs:
+            if arrays[0].dtype.kind != 'f' or len(set(key)) != 1:
+                programs[key] = None, None, False
+            else:
+                in_vars = tuple(chainer.Variable(x) for x in arrays)
+                programs[key] = _trace(func, in_vars)
+        program, out_slots, single = programs[key]
+        if program is None:
+            return func(*args)
+        ys = FusedElementwise(program, out_slots).apply(args)
+        if single:
+            return ys[0]
+        return ys
+
+    return wrapped_func
@@ -1,3 +1,4 @@
+import collections
 import sys
 import weakref
 
@@ -6,12 +7,46 @@ from chainer.backends import cuda
 import chainer.function_node
 
 import numpy as np
+import six
 
 
 def _is_xp(x):
     return isinstance(x, np.ndarray) or isinstance(x, cuda.ndarray)
 
 
+def _get_signature(in_vars):
+    return tuple((x.shape, x.dtype) for x in in_vars)
+
+
+def _get_pinned_nbytes(sched_list):
+    # Return the total size of the arrays referenced by the schedules,
+    # excluding the parameter arrays, which are shared by all schedules.
+    # Arrays placed in shared buffers by the memory planner are counted
+    # through their buffers.
+    nbytes = 0
+    for sched in sched_list:
+        param_inds = set(ind for ind, _ in sched.param_hooks)
+        for ind, ar in enumerate(sched.unique_arrays):
+            if (ar is not None and ind not in param_inds and
+                    ind not in sched.memory_plan):
+                nbytes += ar.nbytes
+        nbytes += sum(buf.nbytes for buf in sched.memory_buffers)
+    return nbytes
+
+
+def _iter_arrays(obj):
+    # Yield the arrays directly contained in an object, list, tuple or dict.
+    if isinstance(obj, (list, tuple)):
+        items = obj
+    elif isinstance(obj, dict):
+        items = obj.values()
+    else:
+        items = (obj,)
+    for item in items:
+        if _is_xp(item):
+            yield item
+
+
 class ScheduleInfo(object):
 
     """A callable wrapper for a function in the static schedule.
@@ -367,6 +402,15 @@ class StaticScheduleFunction(chainer.function_node.FunctionNode):
         # output variables, if the index corresponds to an output
         # variable.
         self.unique_ind_to_out_var_ind = dict()
+        # Maps an index in unique_arrays to the index in memory_buffers
+        # of the shared buffer that backs it. This is set by plan_memory().
+        self.memory_plan = dict()
+        # The shared backing buffers allocated by plan_memory().
+        self.memory_buffers = []
+        # Statistics of the memory plan. See plan_memory().
+        self.memory_plan_info = None
+        # True if the memory plan only covers the forward schedule.
+        self.forward_only_plan = False
 
     def get_unique_index_from_array(self, array):
         """Return the array index if it exists.
@@ -839,14 +883,166 @@ class StaticScheduleFunction(chainer.function_node.FunctionNode):
             print('self.param_hooks: ', self.param_hooks)
             self.debug_print_unique_arrays_info()
 
-        # todo: We can potentially reduce memory usage by freeing memory
-        # of intermediate arrays in self.unique_arrays
-        # once they are no longer needed in the schedule or by
-        # parameters.
+        # Note: The statically allocated intermediate arrays in
+        # self.unique_arrays can share memory once the schedule has been
+        # built. See plan_memory().
 
         print('end of build_schedule()')
         self.schedule_built = True
 
+    def plan_memory(self):
+        """Assign intermediate arrays to shared backing buffers.
+
+        This must be called after `build_schedule()` of this schedule and,
+        if a backward schedule exists, after `build_schedule()` of the
+        backward schedule as well. It should only be called on the forward
+        schedule.
+
+        The forward schedule and backward schedule (if any) are treated as
+        a single sequence of functions. For each statically allocated
+        array in `unique_arrays` (that is, an array supplied in the
+        'outputs' argument of a `@static_code` function), the lifetime is
+        the range from the function that first writes it to the last
+        function that uses it. Arrays whose lifetimes do not overlap are
+        then assigned to the same backing buffer, so that the memory pinned
+        by the schedule is close to the maximum live set of these arrays
+        instead of their sum.
+
+        Only arrays that are referenced exclusively through the 'inputs' and
+        'outputs' arguments of the schedule functions are planned. Arrays
+        corresponding to parameters, input and output variables, retained
+        arrays, views and dynamically allocated arrays keep their own
+        memory.
+
+        After this method is called, `memory_plan_info` is a dictionary
+        with the number of planned arrays (``arrays``), the number of
+        backing buffers (``buffers``), the total size in bytes of the
+        planned arrays when each one has its own memory (``naive_nbytes``)
+        and the total size in bytes of the backing buffers
+        (``planned_nbytes``).
+
+        """
+        if not self.schedule_built:
+            raise RuntimeError('plan_memory() was called before '
+                               'build_schedule()!')
+        if self.memory_plan_info is not None:
+            # The memory has already been planned.
+            return
+        scheds = [self]
+        if self.backward_schedule_func is not None:
+            scheds.append(self.backward_schedule_func)
+        self.forward_only_plan = len(scheds) == 1
+
+        # Indices that must keep their own memory.
+        excluded = set(ind for ind, _ in self.param_hooks)
+        # Ids of arrays that are referenced outside of the hooks.
+        excluded_ids = set()
+        for sched in scheds:
+            excluded.update(ind for ind, _ in sched.in_var_hooks)
+            excluded.update(sched.unique_ind_to_out_var_ind)
+            excluded.update(sched.dynamically_allocated_unique_index)
+            for sched_info in sched.schedule_info_list:
+                for arg in sched_info.args:
+                    excluded_ids.update(id(x) for x in _iter_arrays(arg))
+                for key, arg in six.iteritems(sched_info.kwargs):
+                    if key not in ('inputs', 'outputs'):
+                        excluded_ids.update(
+                            id(x) for x in _iter_arrays(arg))
+                node = sched_info.function_node
+                if node is not None:
+                    excluded_ids.update(
+                        id(x) for x in node._get_retained_arrays())
+                    excluded_ids.update(
+                        id(x) for x in _iter_arrays(
+                            getattr(node, '__dict__', {})))
+
+        for ind, ar in enumerate(self.unique_arrays):
+            if ar is None:
+                continue
+            if ar.base is not None:
+                excluded.add(ind)
+                excluded_ids.add(id(ar.base))
+
+        # Compute the lifetime of each array written through 'outputs' as
+        # the (first, last) position in the combined schedule.
+        first_use = dict()
+        last_use = dict()
+        read_first = set()
+        pos = 0
+        for sched in scheds:
+            for sched_info in sched.schedule_info_list:
+                out_inds = [ind for _, ind in sched_info.outputs_hooks]
+                in_inds = [ind for _, ind in sched_info.inputs_hooks]
+                ret_inds = [ind for _, ind in sched_info.return_hooks]
+                for ind in in_inds + ret_inds + out_inds:
+                    if ind not in first_use:
+                        first_use[ind] = pos
+                        if ind not in out_inds or ind in in_inds:
+                            read_first.add(ind)
+                    last_use[ind] = pos
+                pos += 1
+
+        candidates = []
+        for ind, info in enumerate(self.unique_array_infos):
+            ar = self.unique_arrays[ind]
+            if (ar is None or ind in excluded or ind in read_first or
+                    ind not in first_use or info.retain or
+                    id(ar) in excluded_ids or not _is_xp(ar) or
+                    not ar.flags.c_contiguous):
+                continue
+            candidates.append(ind)
+        candidates.sort(key=lambda ind: (first_use[ind],
+                                         -self.unique_arrays[ind].nbytes))
+
+        # Greedily assign each array to the smallest free buffer that is
+        # large enough, or else to the largest free buffer, which then
+        # grows. A buffer is free once the last use of its current array
+        # precedes the first use of the new array.
+        # Each buffer is a list [device_key, nbytes, last_use].
+        buffers = []
+        plan = dict()
+        for ind in candidates:
+            ar = self.unique_arrays[ind]
+            device_key = (cuda.get_array_module(ar),
+                          cuda.get_device_from_array(ar).id)
+            free = [b for b, buf in enumerate(buffers)
+                    if buf[0] == device_key and buf[2] < first_use[ind]]
+            fits = [b for b in free if buffers[b][1] >= ar.nbytes]
+            if fits:
+                b = min(fits, key=lambda b: buffers[b][1])
+            elif free:
+                b = max(free, key=lambda b: buffers[b][1])
+                buffers[b][1] = ar.nbytes
+            else:
+                buffers.append([device_key, ar.nbytes, None])
+                b = len(buffers) - 1
+            buffers[b][2] = last_use[ind]
+            plan[ind] = b
+
+        # Allocate the backing buffers and replace the arrays with views.
+        memory_buffers = []
+        for device_key, nbytes, _ in buffers:
+            xp, device_id = device_key
+            with cuda.get_device_from_id(device_id):
+                memory_buffers.append(xp.empty((nbytes,), dtype=np.uint8))
+        naive_nbytes = 0
+        for ind, b in six.iteritems(plan):
+            ar = self.unique_arrays[ind]
+            naive_nbytes += ar.nbytes
+            view = memory_buffers[b][:ar.nbytes].view(ar.dtype)
+            self.unique_arrays[ind] = view.reshape(ar.shape)
+
+        self.memory_plan = plan
+        self.memory_buffers = memory_buffers
+        self.memory_plan_info = {
+            'arrays': len(plan),
+            'buffers': len(memory_buffers),
+            'naive_nbytes': naive_nbytes,
+            'planned_nbytes': sum(buf.nbytes for buf in memory_buffers),
+        }
+        if self.verbosity_level >= 1:
+            print('Memory plan: ', self.memory_plan_info)
+
     def forward(self, inputs):
         if self.verbosity_level >= 2:
             print('Calling StaticScheduleFunction.forward()...')
@@ -890,6 +1086,12 @@ class StaticScheduleFunction(chainer.function_node.FunctionNode):
         # executed in order to create a static schedule.
         self.schedule_manager.end_forward()
         if self.backward_schedule_func is None:
+            if self.forward_only_plan:
+                raise RuntimeError('Cannot backpropagate through a static '
+                                   'schedule whose memory was planned for '
+                                   'the forward pass only. Disable '
+                                   'enable_backprop in test mode when '
+                                   'plan_memory is used.')
             print('Creating new backward schedule...')
             # Create backward schedule and run define-by-run backward code.
             self.backward_schedule_func = self.get_contained_schedule()
@@ -934,6 +1136,15 @@ class StaticScheduleFunction(chainer.function_node.FunctionNode):
                 print('building backward schedule.')
             self.backward_schedule_func.build_schedule(self.chain,
                                                        new_grad_outputs)
+            ret = self.backward_schedule_func.apply(grad_outputs)
+            # The memory is planned after the first run of the backward
+            # schedule, since planning does not preserve the contents of
+            # the intermediate arrays of the current iteration.
+            if (self.schedule_manager.plan_memory and
+                    not self.enable_double_backprop):
+                self.plan_memory()
+            self.schedule_manager._evict_filled(self)
+            return ret
 
         return self.backward_schedule_func.apply(grad_outputs)
 
@@ -945,18 +1156,46 @@ class ScheduleManager(object):
     This is a container of the static schedules that are used by a static
     chain.
 
+    The cached schedules are kept in least-recently-used order. If
+    ``max_schedules`` or ``max_cache_bytes`` is given, the least recently
+    used schedules are evicted whenever a new schedule is created or has
+    been run for the first time and the cache would otherwise exceed one of
+    these limits. The number of cache hits, misses and evictions can be
+    obtained with :meth:`cache_info`.
+
     Args:
         minimize_cache_size (bool): If `True`, attempt to reduce memory
         usage by clearing the cached schedules whenever the training
         mode changes (that is, whenever `chainer.config.train` changes
         value) or whenever the mini-batch size changes.
-
+        verbosity_level (int): The verbosity level of the schedules.
+        max_schedules (int): The maximum number of cached schedules.
+            If ``None``, the number of schedules is not bounded.
+        max_cache_bytes (int): The maximum total size in bytes of the
+            arrays that are pinned by the cached schedules, not counting
+            the parameter arrays of the chain. If ``None``, the size is not
+            bounded.
+        pad_to_bucket (bool): If ``True``, inputs in test mode whose
+            mini-batch size has no cached schedule are padded to the
+            smallest larger mini-batch size that has one. See
+            :meth:`find_bucket`.
+        plan_memory (bool): If ``True``, the statically allocated
+            intermediate arrays of each new schedule are assigned to shared
+            buffers once the schedule has been built. See
+            :meth:`StaticScheduleFunction.plan_memory`.
 
     """
 
-    def __init__(self, minimize_cache_size=True, verbosity_level=0):
-        # Maps a key string to a list of schedule functions.
-        self.schedules = dict()
+    def __init__(self, minimize_cache_size=True, verbosity_level=0,
+                 max_schedules=None, max_cache_bytes=None,
+                 pad_to_bucket=False, plan_memory=False):
+        if max_schedules is not None and max_schedules < 1:
+            raise ValueError('max_schedules must be positive')
+        if max_cache_bytes is not None and max_cache_bytes < 0:
+            raise ValueError('max_cache_bytes must not be negative')
+        # Maps a key string to a list of schedule functions, ordered from
+        # the least recently used key to the most recently used one.
+        self.schedules = collections.OrderedDict()
         self.minimize_cache_size = minimize_cache_size
         self.in_use_count = dict()
         self.forward_over = False
@@ -964,6 +1203,16 @@ class ScheduleManager(object):
         self.max_in_use_train = 0
         self.train_count = 0
         self.verbosity_level = verbosity_level
+        self.max_schedules = max_schedules
+        self.max_cache_bytes = max_cache_bytes
+        self.pad_to_bucket = pad_to_bucket
+        self.plan_memory = plan_memory
+        # Maps a test-mode key string to the (shape, dtype) tuples of the
+        # input arrays, used to look up buckets.
+        self.key_signatures = dict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
 
     def get_schedule(self, in_vars, enable_double_backprop=False):
         """Get a static schedule.
@@ -1011,18 +1260,22 @@ class ScheduleManager(object):
                     print("Clearing schedule cache...")
                 self.schedules.clear()
                 self.in_use_count.clear()
+                self.key_signatures.clear()
 
         if (chainer.config.train is False or
                 chainer.config.enable_backprop is False):
+            signature = _get_signature(in_vars)
             key_str = 'test:' + \
-                      ''.join(str(x.shape) + str(x.dtype) for x in in_vars)
+                      ''.join(str(s) + str(d) for s, d in signature)
             # If the maximum number of in-use schedules in any iteration
             # during training mode was exactly 1, assume it should also
             # be 1 for test mode.
             if key_str in self.schedules:
-                sched_list = self.schedules[key_str]
+                self.hits += 1
+                sched_list = self._touch(key_str)
                 sched = sched_list[0]
             else:
+                self.misses += 1
                 # avoid "line too long":
                 vb = self.verbosity_level
                 edb = enable_double_backprop
@@ -1030,6 +1283,8 @@ class ScheduleManager(object):
                                                verbosity_level=vb,
                                                enable_double_backprop=edb)
                 self.schedules[key_str] = [sched]
+                self.key_signatures[key_str] = signature
+                self._evict(key_str)
             return sched
         else:
             key_str = 'train:' + \
@@ -1037,9 +1292,10 @@ class ScheduleManager(object):
             self.train_count += 1
 
             if key_str in self.schedules:
-                sched_list = self.schedules[key_str]
+                sched_list = self._touch(key_str)
                 available_index = self.in_use_count[key_str]
                 if available_index >= len(sched_list):
+                    self.misses += 1
                     # avoid "line too long":
                     vb = self.verbosity_level
                     edb = enable_double_backprop
@@ -1047,10 +1303,14 @@ class ScheduleManager(object):
                                                    verbosity_level=vb,
                                                    enable_double_backprop=edb)
                     sched_list.append(sched)
+                    self._evict(key_str)
+                else:
+                    self.hits += 1
 
                 sched = sched_list[available_index]
                 self.in_use_count[key_str] = available_index + 1
             else:
+                self.misses += 1
                 # avoid "line too long":
                 vb = self.verbosity_level
                 edb = enable_double_backprop
@@ -1059,9 +1319,123 @@ class ScheduleManager(object):
                                                enable_double_backprop=edb)
                 self.schedules[key_str] = [sched]
                 self.in_use_count[key_str] = 1
+                self._evict(key_str)
 
         return sched
 
+    def find_bucket(self, in_vars):
+        """Find a cached mini-batch size that the inputs can be padded to.
+
+        This is only used in test mode (that is, when either
+        `chainer.config.train` or `chainer.config.enable_backprop` is
+        `False`). If there is no cached schedule for ``in_vars``, look for
+        a built schedule whose inputs differ from ``in_vars`` only by
+        a larger size of the first axis, which must be the same for all
+        inputs.
+
+        Args:
+            in_vars (tuple of :class:`~chainer.Variable`): The input
+                variables to the chain.
+
+        Returns:
+            int: The smallest such mini-batch size, or ``None`` if there is
+            no such schedule or a schedule for ``in_vars`` is already
+            cached.
+
+        """
+        if (chainer.config.train is not False and
+                chainer.config.enable_backprop is not False):
+            return None
+        signature = _get_signature(in_vars)
+        if not signature or any(len(s) == 0 for s, _ in signature):
+            return None
+        batch_size = signature[0][0][0]
+        if any(s[0] != batch_size for s, _ in signature):
+            return None
+        key_str = 'test:' + ''.join(str(s) + str(d) for s, d in signature)
+        if key_str in self.schedules:
+            return None
+
+        bucket = None
+        for key, cached in six.iteritems(self.key_signatures):
+            if len(cached) != len(signature):
+                continue
+            cached_size = cached[0][0][0]
+            if cached_size <= batch_size:
+                continue
+            if bucket is not None and cached_size >= bucket:
+                continue
+            if all(cs[0] == cached_size and cs[1:] == s[1:] and cd == d
+                   for (cs, cd), (s, d) in zip(cached, signature)):
+                if not self.schedules[key][0].is_empty():
+                    bucket = cached_size
+        return bucket
+
+    def cache_info(self):
+        """Return the statistics of the schedule cache.
+
+        Returns:
+            dict: A dictionary with the number of cache ``hits``,
+            ``misses`` and ``evictions``, the number of cached schedules
+            (``schedules``) and the total size in bytes of the arrays
+            pinned by them (``nbytes``).
+
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'schedules': sum(len(s) for s in self.schedules.values()),
+            'nbytes': sum(_get_pinned_nbytes(s)
+                          for s in self.schedules.values()),
+        }
+
+    def _touch(self, key_str):
+        # Mark the key as the most recently used one.
+        sched_list = self.schedules.pop(key_str)
+        self.schedules[key_str] = sched_list
+        return sched_list
+
+    def _evict(self, key_str):
+        # Evict the least recently used schedules, other than the ones for
+        # ``key_str`` and the ones in use in the current iteration, while
+        # the cache exceeds its limits.
+        if self.max_schedules is None and self.max_cache_bytes is None:
+            return
+        n_schedules = sum(len(s) for s in self.schedules.values())
+        nbytes = None
+        if self.max_cache_bytes is not None:
+            nbytes = sum(_get_pinned_nbytes(s)
+                         for s in self.schedules.values())
+        for key in list(self.schedules.keys()):
+            over_count = (self.max_schedules is not None and
+                          n_schedules > self.max_schedules)
+            over_bytes = nbytes is not None and nbytes > self.max_cache_bytes
+            if not (over_count or over_bytes):
+                break
+            if key == key_str or self.in_use_count.get(key, 0) > 0:
+                continue
+            sched_list = self.schedules.pop(key)
+            self.in_use_count.pop(key, None)
+            self.key_signatures.pop(key, None)
+            n_schedules -= len(sched_list)
+            if nbytes is not None:
+                nbytes -= _get_pinned_nbytes(sched_list)
+            self.evictions += len(sched_list)
+            if self.verbosity_level >= 2:
+                print('Evicting schedules for key: ', key)
+
+    def _evict_filled(self, sched):
+        # Evict schedules again once the arrays of a new schedule have been
+        # allocated in its first iteration, since the schedule is still
+        # empty when _evict() is called on its creation.
+        if self.max_cache_bytes is None:
+            return
+        for key, sched_list in six.iteritems(self.schedules):
+            if any(s is sched for s in sched_list):
+                self._evict(key)
+                return
+
     def end_forward(self):
         """Make in-use schedules available for use in next iteration.
 
@@ -1246,6 +1620,47 @@ def static_graph(*args, **kwargs):
         enable_double_backprop (bool): If `True`, enable double-backprop.
             The default value is `False` (not enabled).
 
+        max_schedules (int): The maximum number of static schedules that
+            are cached. When a new schedule is created and this number is
+            exceeded, the least recently used schedules that are not in use
+            in the current iteration are evicted. This bounds the memory
+            usage when the chain is called with many different input
+            shapes, such as variable-length mini-batches.
+            The default value is `None` (not bounded).
+
+        max_cache_bytes (int): The maximum total size in bytes of the
+            arrays that are pinned by the cached schedules, not counting
+            the parameters of the chain. Schedules are evicted in the same
+            way as for ``max_schedules``.
+            The default value is `None` (not bounded).
+
+        pad_to_bucket (bool): If `True`, in test mode, inputs whose shapes
+            have no cached schedule are padded with zeros along the first
+            axis to the smallest larger mini-batch size that already has a
+            cached schedule, and the outputs are sliced back to the
+            original mini-batch size. This keeps the last partial
+            mini-batch on the static schedule instead of creating a new
+            one. It must only be used when the examples in a mini-batch are
+            computed independently of each other and every output has the
+            mini-batch on its first axis.
+            The default value is `False`.
+
+        plan_memory (bool): If `True`, reduce the memory pinned by each
+            static schedule by assigning statically allocated intermediate
+            arrays with non-overlapping lifetimes to shared buffers. In
+            training mode, the memory is planned after the first backward
+            pass through the schedule, over the forward and backward
+            schedules together. It is not planned if double-backprop is
+            enabled. In test mode, the memory is planned after the first
+            forward pass and the schedule must not be backpropagated
+            through, so `chainer.config.enable_backprop` should be
+            disabled as well. The statistics of the plan are available in
+            the ``memory_plan_info`` attribute of each schedule.
+            The default value is `False`.
+
+    The statistics of the schedule cache can be obtained by calling
+    ``chain.schedule_manager.cache_info()`` on the decorated chain.
+
     Returns:
         Wrapped ``__call__()`` method with static chain support.
 
@@ -1257,6 +1672,10 @@ def static_graph(*args, **kwargs):
     minimize_cache_size = False
     verbosity_level = 0
     enable_double_backprop = False
+    max_schedules = None
+    max_cache_bytes = None
+    pad_to_bucket = False
+    plan_memory = False
     zero_args = False
     if len(args) == 1 and not kwargs and callable(args[0]):
         callable_arg = args[0]
@@ -1270,6 +1689,14 @@ def static_graph(*args, **kwargs):
             verbosity_level = kwargs['verbosity_level']
         if 'enable_double_backprop' in kwargs:
             enable_double_backprop = kwargs['enable_double_backprop']
+        if 'max_schedules' in kwargs:
+            max_schedules = kwargs['max_schedules']
+        if 'max_cache_bytes' in kwargs:
+            max_cache_bytes = kwargs['max_cache_bytes']
+        if 'pad_to_bucket' in kwargs:
+            pad_to_bucket = kwargs['pad_to_bucket']
+        if 'plan_memory' in kwargs:
+            plan_memory = kwargs['plan_memory']
 
     def wrap(func):
         def wrapped_func(*inner_args, **inner_kwargs):
@@ -1302,9 +1729,24 @@ def static_graph(*args, **kwargs):
             if not hasattr(chain, 'schedule_manager'):
                 chain.schedule_manager = ScheduleManager(
                     minimize_cache_size=minimize_cache_size,
-                    verbosity_level=verbosity_level)
+                    verbosity_level=verbosity_level,
+                    max_schedules=max_schedules,
+                    max_cache_bytes=max_cache_bytes,
+                    pad_to_bucket=pad_to_bucket,
+                    plan_memory=plan_memory)
 
             schedule_manager = chain.schedule_manager
+            batch_size = None
+            bucket = None
+            if schedule_manager.pad_to_bucket:
+                bucket = schedule_manager.find_bucket(flat_vars)
+                if bucket is not None:
+                    batch_size = len(flat_vars[0])
+                    if verbosity_level >= 2:
+                        print('Padding mini-batch of size {} to {}.'.format(
+                            batch_size, bucket))
+                    flat_vars = tuple(_pad_batch(x, bucket)
+                                      for x in flat_vars)
             # To prevent "line too long" error
             edb = enable_double_backprop
             chain.static_schedule = \
@@ -1320,6 +1762,9 @@ def static_graph(*args, **kwargs):
                           'the existing static schedule...')
                     chain.static_schedule.debug_print_ref_counts()
                 out_vars_flat = chain.static_schedule.apply(flat_vars)
+                if bucket is not None:
+                    out_vars_flat = tuple(_unpad_batch(y, bucket, batch_size)
+                                          for y in out_vars_flat)
                 out_vars = _unflatten_args(out_vars_flat,
                                            chain._out_vars_unflatten_inds)
             else:
@@ -1371,6 +1816,14 @@ def static_graph(*args, **kwargs):
                 # computational graph.
                 out_vars_flat = chain.static_schedule.apply(flat_vars)
 
+                # In test mode there is no backward schedule, so the memory
+                # can be planned now.
+                if (schedule_manager.plan_memory and
+                        (chainer.config.train is False or
+                         chainer.config.enable_backprop is False)):
+                    chain.static_schedule.plan_memory()
+                schedule_manager._evict_filled(chain.static_schedule)
+
                 out_vars = _unflatten_args(out_vars_flat,
                                            chain._out_vars_unflatten_inds)
 
@@ -1387,6 +1840,21 @@ def static_graph(*args, **kwargs):
         return wrap
 
 
+def _pad_batch(x, size):
+    # Pad the first axis of the variable with zeros to the given size.
+    from chainer import functions
+    pad_width = [(0, size - len(x))] + [(0, 0)] * (x.ndim - 1)
+    return functions.pad(x, pad_width, 'constant')
+
+
+def _unpad_batch(y, size, batch_size):
+    # Slice the padded mini-batch from the output variable.
+    if y is None or y.ndim == 0 or len(y) != size:
+        return y
+    from chainer import functions
+    return functions.get_item(y, slice(0, batch_size))
+
+
 def _flatten_args(xs):
     """Flatten the input into a tuple of variables.
 
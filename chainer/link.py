@@ -264,6 +264,34 @@ class Link(object):
 
         return out
 
+    def inference(self, *args, **kwargs):
+        """Computes the forward propagation on raw arrays for inference.
+
+        This method calls the link in :func:`chainer.inference_mode`, where
+        functions run directly on arrays without creating variables and
+        graph objects, and converts the outputs to arrays. Variables in
+        tuples, lists and dicts of the outputs are also converted.
+
+        .. admonition:: Example
+
+           >>> model = chainer.Sequential(L.Linear(3, 2), F.relu)
+           >>> x = np.ones((1, 3), np.float32)
+           >>> y = model.inference(x)
+           >>> isinstance(y, np.ndarray)
+           True
+
+        Args:
+            args, kwargs: Arguments of the forward method.
+
+        Returns:
+            The outputs of the forward method with variables replaced by
+            their arrays.
+
+        """
+        with chainer.inference_mode():
+            out = self(*args, **kwargs)
+        return _as_arrays(out)
+
     def __setattr__(self, name, value):
         if self.within_init_scope and isinstance(value, variable.Parameter):
             value.name = name
@@ -383,6 +411,7 @@ class Link(object):
             for name in ret._params:
                 d[name] = copy.copy(d[name])
                 d[name].grad = None
+                d[name].sparse_grad = None
             return ret
         elif mode == 'copy':
             return copy.deepcopy(self)
@@ -715,7 +744,7 @@ device.
         for name in self._persistent:
             d[name] = serializer(name, d[name])
 
-    def repeat(self, n_repeat, mode='init'):
+    def repeat(self, n_repeat, mode='init', memory_budget=None):
         """Repeats this link multiple times to make a :class:`~chainer.Sequential`.
 
         This method returns a :class:`~chainer.Sequential` object which has
@@ -766,9 +795,14 @@ device.
                 :class:`~chainer.Sequential` object are same object because
                 they are shallow-copied, so that all parameters of elements
                 are shared with each other.
+            memory_budget (int): Memory budget in bytes for recomputation
+                set to the returned :class:`~chainer.Sequential` object. See
+                :meth:`Sequential.set_memory_budget()
+                <chainer.Sequential.set_memory_budget>`.
 
         """
         ret = chainer.Sequential()
+        ret.set_memory_budget(memory_budget)
         if n_repeat <= 0:
             return ret
         if mode not in ['init', 'copy', 'share']:
@@ -1235,3 +1269,13 @@ class ChainList(Link, collections_abc.MutableSequence):
         super(ChainList, self).serialize(serializer)
         for idx, child in enumerate(self._children):
             child.serialize(serializer['%d' % idx])
+
+
+def _as_arrays(obj):
+    if isinstance(obj, variable.Variable):
+        return obj.array
+    if type(obj) in (tuple, list):
+        return type(obj)([_as_arrays(x) for x in obj])
+    if isinstance(obj, dict):
+        return type(obj)([(k, _as_arrays(v)) for k, v in six.iteritems(obj)])
+    return obj
@@ -20,6 +20,9 @@ class EmbedID(link.Link):
             its ``ndim`` should be 2.
         ignore_label (int or None): If ``ignore_label`` is an int value,
             ``i``-th column of return value is filled with ``0``.
+        sparse_grad (bool): If ``True``, the gradient of ``W`` is computed as
+            a row-sparse gradient. See :func:`~chainer.functions.embed_id`
+            for details.
 
     .. seealso:: :func:`~chainer.functions.embed_id`
 
@@ -47,10 +50,13 @@ class EmbedID(link.Link):
     """
 
     ignore_label = None
+    sparse_grad = False
 
-    def __init__(self, in_size, out_size, initialW=None, ignore_label=None):
+    def __init__(self, in_size, out_size, initialW=None, ignore_label=None,
+                 sparse_grad=False):
         super(EmbedID, self).__init__()
         self.ignore_label = ignore_label
+        self.sparse_grad = sparse_grad
 
         with self.init_scope():
             if initialW is None:
@@ -67,4 +73,5 @@ class EmbedID(link.Link):
             ~chainer.Variable: Batch of corresponding embeddings.
 
         """
-        return embed_id.embed_id(x, self.W, ignore_label=self.ignore_label)
+        return embed_id.embed_id(x, self.W, ignore_label=self.ignore_label,
+                                 sparse_grad=self.sparse_grad)
@@ -68,8 +68,8 @@ class NStepGRU(NStepGRUBase):
 
     use_bi_direction = False
 
-    def rnn(self, *args):
-        return rnn.n_step_gru(*args)
+    def rnn(self, *args, **kwargs):
+        return rnn.n_step_gru(*args, **kwargs)
 
     @property
     def n_cells(self):
@@ -110,8 +110,8 @@ class NStepBiGRU(NStepGRUBase):
 
     use_bi_direction = True
 
-    def rnn(self, *args):
-        return rnn.n_step_bigru(*args)
+    def rnn(self, *args, **kwargs):
+        return rnn.n_step_bigru(*args, **kwargs)
 
     @property
     def n_cells(self):
@@ -26,7 +26,7 @@ class NStepLSTMBase(n_step_rnn.NStepRNNBase):
     n_weights = 8
 
     def forward(self, hx, cx, xs, **kwargs):
-        """forward(self, hx, cx, xs)
+        """forward(self, hx, cx, xs, *, enable_double_backprop=False)
 
         Calculate all hidden states and cell states.
 
@@ -51,6 +51,9 @@ class NStepLSTMBase(n_step_rnn.NStepRNNBase):
                 a sequence. Its shape is ``(L_t, I)``, where ``L_t`` is the
                 length of a sequence for time ``t``, and ``I`` is the size of
                 the input and is equal to ``in_size``.
+            enable_double_backprop (bool): If ``True``, the RNN function
+                keeps the graph of each time step to support higher order
+                differentiation. See :func:`chainer.functions.n_step_rnn`.
 
         Returns:
             tuple: This function returns a tuple containing three elements,
@@ -104,8 +107,8 @@ class NStepLSTM(NStepLSTMBase):
 
     use_bi_direction = False
 
-    def rnn(self, *args):
-        return rnn.n_step_lstm(*args)
+    def rnn(self, *args, **kwargs):
+        return rnn.n_step_lstm(*args, **kwargs)
 
     @property
     def n_cells(self):
@@ -145,8 +148,8 @@ class NStepBiLSTM(NStepLSTMBase):
 
     use_bi_direction = True
 
-    def rnn(self, *args):
-        return rnn.n_step_bilstm(*args)
+    def rnn(self, *args, **kwargs):
+        return rnn.n_step_bilstm(*args, **kwargs)
 
     @property
     def n_cells(self):
@@ -111,7 +111,7 @@ class NStepRNNBase(link.ChainList):
             hx = variable.Variable(self.xp.zeros(shape, dtype=xs[0].dtype))
         return hx
 
-    def rnn(self, *args):
+    def rnn(self, *args, **kwargs):
         """Calls RNN function.
 
         This function must be implemented in a child class.
@@ -127,7 +127,7 @@ class NStepRNNBase(link.ChainList):
         return NotImplementedError
 
     def forward(self, hx, xs, **kwargs):
-        """forward(self, hx, xs)
+        """forward(self, hx, xs, *, enable_double_backprop=False)
 
         Calculate all hidden states and cell states.
 
@@ -149,6 +149,9 @@ class NStepRNNBase(link.ChainList):
                 a sequence. Its shape is ``(L_t, I)``, where ``L_t`` is the
                 length of a sequence for time ``t``, and ``I`` is the size of
                 the input and is equal to ``in_size``.
+            enable_double_backprop (bool): If ``True``, the RNN function
+                keeps the graph of each time step to support higher order
+                differentiation. See :func:`chainer.functions.n_step_rnn`.
 
         Returns:
             tuple: This function returns a tuple containing three elements,
@@ -175,15 +178,17 @@ class NStepRNNBase(link.ChainList):
             xs (list of ~chainer.Variable): List of input sequences.
                 Each element ``xs[i]`` is a :class:`chainer.Variable` holding
                 a sequence.
+            enable_double_backprop (bool): If ``True``, the RNN function
+                keeps the graph of each time step to support higher order
+                differentiation.
 
         Returns:
             tuple: hs
         """
-        if kwargs:
-            argument.check_unexpected_kwargs(
-                kwargs, train='train argument is not supported anymore. '
-                'Use chainer.using_config')
-            argument.assert_kwargs_empty(kwargs)
+        enable_double_backprop, = argument.parse_kwargs(
+            kwargs, ('enable_double_backprop', False),
+            train='train argument is not supported anymore. '
+            'Use chainer.using_config')
 
         assert isinstance(xs, (list, tuple))
         indices = argsort_list_descent(xs)
@@ -201,7 +206,10 @@ class NStepRNNBase(link.ChainList):
 
         args = [self.n_layers, self.dropout] + hxs + \
                [self.ws, self.bs, trans_x]
-        result = self.rnn(*args)
+        if enable_double_backprop:
+            result = self.rnn(*args, enable_double_backprop=True)
+        else:
+            result = self.rnn(*args)
 
         hys = [permutate.permutate(h, indices, axis=1, inv=True)
                for h in result[:-1]]
@@ -247,8 +255,8 @@ class NStepRNNTanh(NStepRNNBase):
     n_weights = 2
     use_bi_direction = False
 
-    def rnn(self, *args):
-        return rnn.n_step_rnn(*args, activation='tanh')
+    def rnn(self, *args, **kwargs):
+        return rnn.n_step_rnn(*args, activation='tanh', **kwargs)
 
     @property
     def n_cells(self):
@@ -290,8 +298,8 @@ class NStepRNNReLU(NStepRNNBase):
     n_weights = 2
     use_bi_direction = False
 
-    def rnn(self, *args):
-        return rnn.n_step_rnn(*args, activation='relu')
+    def rnn(self, *args, **kwargs):
+        return rnn.n_step_rnn(*args, activation='relu', **kwargs)
 
     @property
     def n_cells(self):
@@ -333,8 +341,8 @@ class NStepBiRNNTanh(NStepRNNBase):
     n_weights = 2
     use_bi_direction = True
 
-    def rnn(self, *args):
-        return rnn.n_step_birnn(*args, activation='tanh')
+    def rnn(self, *args, **kwargs):
+        return rnn.n_step_birnn(*args, activation='tanh', **kwargs)
 
     @property
     def n_cells(self):
@@ -376,8 +384,8 @@ class NStepBiRNNReLU(NStepRNNBase):
     n_weights = 2
     use_bi_direction = True
 
-    def rnn(self, *args):
-        return rnn.n_step_birnn(*args, activation='relu')
+    def rnn(self, *args, **kwargs):
+        return rnn.n_step_birnn(*args, activation='relu', **kwargs)
 
     @property
     def n_cells(self):
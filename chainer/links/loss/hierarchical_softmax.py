@@ -1,3 +1,4 @@
+import collections
 import copy
 
 import numpy
@@ -8,6 +9,7 @@ from chainer.backends import cuda
 from chainer import function
 from chainer.initializers import uniform
 from chainer import link
+from chainer import utils
 from chainer.utils import type_check
 from chainer import variable
 
@@ -22,45 +24,94 @@ class TreeParser(object):
         return self.next_id
 
     def get_paths(self):
-        return self.paths
+        return {leaf: self.paths[leaf, :self.lengths[leaf]]
+                for leaf in self.leaves}
 
     def get_codes(self):
-        return self.codes
+        return {leaf: self.codes[leaf, :self.lengths[leaf]]
+                for leaf in self.leaves}
+
+    def get_matrices(self):
+        """Returns the paths and the codes of all leaves as matrices.
+
+        Returns:
+            tuple: A tuple of the path matrix, the code matrix and the
+            lengths of the paths. The ``i``-th rows of the matrices hold the
+            path and the code of the leaf ``i`` padded with zeros.
+
+        """
+        return self.paths, self.codes, self.lengths
 
     def parse(self, tree):
         self.next_id = 0
-        self.path = []
-        self.code = []
-        self.paths = {}
-        self.codes = {}
-        self._parse(tree)
-
-        assert(len(self.path) == 0)
-        assert(len(self.code) == 0)
-        assert(len(self.paths) == len(self.codes))
-
-    def _parse(self, node):
-        if isinstance(node, tuple):
-            # internal node
-            if len(node) != 2:
-                raise ValueError(
-                    'All internal nodes must have two child nodes')
-            left, right = node
-            self.path.append(self.next_id)
-            self.next_id += 1
-            self.code.append(1.0)
-            self._parse(left)
-
-            self.code[-1] = -1.0
-            self._parse(right)
-
-            self.path.pop()
-            self.code.pop()
-
-        else:
-            # leaf node
-            self.paths[node] = numpy.array(self.path, dtype=numpy.int32)
-            self.codes[node] = numpy.array(self.code, dtype=self.dtype)
+        self.leaves = []
+        # The parent internal node of each node and the direction from the
+        # parent to the node.
+        leaf_parents = []
+        leaf_codes = []
+        node_parents = []
+        node_codes = []
+
+        # Traverses the tree in the pre-order without recursion.
+        stack = [(tree, -1, 0.0)]
+        while stack:
+            node, parent, code = stack.pop()
+            if isinstance(node, tuple):
+                # internal node
+                if len(node) != 2:
+                    raise ValueError(
+                        'All internal nodes must have two child nodes')
+                left, right = node
+                node_id = self.next_id
+                self.next_id += 1
+                node_parents.append(parent)
+                node_codes.append(code)
+                stack.append((right, node_id, -1.0))
+                stack.append((left, node_id, 1.0))
+            else:
+                # leaf node
+                self.leaves.append(node)
+                leaf_parents.append(parent)
+                leaf_codes.append(code)
+
+        # Follows the parents from all leaves at once to build the paths
+        # from the leaves to the root, which are reversed afterwards.
+        node_parents = numpy.array(node_parents, dtype=numpy.int32)
+        node_codes = numpy.array(node_codes, dtype=self.dtype)
+        nodes = numpy.array(leaf_parents, dtype=numpy.int32)
+        codes = numpy.array(leaf_codes, dtype=self.dtype)
+        reversed_paths = []
+        reversed_codes = []
+        while len(nodes) > 0 and nodes.max() >= 0:
+            reversed_paths.append(nodes)
+            reversed_codes.append(codes)
+            valid = nodes >= 0
+            codes = numpy.where(valid, node_codes[nodes], 0).astype(
+                self.dtype, copy=False)
+            nodes = numpy.where(valid, node_parents[nodes], -1)
+
+        n_leaves = len(self.leaves)
+        n_vocab = max(self.leaves) + 1
+        max_length = max(len(reversed_paths), 1)
+        paths = numpy.zeros((n_leaves, max_length), dtype=numpy.int32)
+        codes = numpy.zeros((n_leaves, max_length), dtype=self.dtype)
+        lengths = numpy.zeros((n_leaves,), dtype=numpy.int32)
+        for nodes in reversed_paths:
+            lengths += nodes >= 0
+        index = numpy.arange(n_leaves)
+        for i, (nodes, node_codes) in enumerate(
+                six.moves.zip(reversed_paths, reversed_codes)):
+            valid = nodes >= 0
+            depth = lengths[valid] - 1 - i
+            paths[index[valid], depth] = nodes[valid]
+            codes[index[valid], depth] = node_codes[valid]
+
+        self.paths = numpy.zeros((n_vocab, max_length), dtype=numpy.int32)
+        self.codes = numpy.zeros((n_vocab, max_length), dtype=self.dtype)
+        self.lengths = numpy.zeros((n_vocab,), dtype=numpy.int32)
+        self.paths[self.leaves] = paths
+        self.codes[self.leaves] = codes
+        self.lengths[self.leaves] = lengths
 
 
 class BinaryHierarchicalSoftmaxFunction(function.Function):
@@ -82,21 +133,9 @@ class BinaryHierarchicalSoftmaxFunction(function.Function):
     def __init__(self, tree, dtype):
         parser = TreeParser(dtype)
         parser.parse(tree)
-        paths = parser.get_paths()
-        codes = parser.get_codes()
-        n_vocab = max(paths.keys()) + 1
-
-        self.paths = numpy.concatenate(
-            [paths[i] for i in range(n_vocab) if i in paths])
-        self.codes = numpy.concatenate(
-            [codes[i] for i in range(n_vocab) if i in codes])
-        begins = numpy.empty((n_vocab + 1,), dtype=numpy.int32)
-        begins[0] = 0
-        for i in range(0, n_vocab):
-            length = len(paths[i]) if i in paths else 0
-            begins[i + 1] = begins[i] + length
-        self.begins = begins
-
+        # The paths and the codes are padded to the length of the longest
+        # path. The codes of the padded elements are zero.
+        self.paths, self.codes, self.lengths = parser.get_matrices()
         self.parser_size = parser.size()
 
     def check_type_forward(self, in_types):
@@ -124,54 +163,45 @@ class BinaryHierarchicalSoftmaxFunction(function.Function):
                 and isinstance(self.paths, cuda.ndarray)):
             self.paths = device.send(self.paths)
             self.codes = device.send(self.codes)
-            self.begins = device.send(self.begins)
+            self.lengths = device.send(self.lengths)
 
     def forward_cpu(self, inputs):
         x, t, W = inputs
-
-        loss = x.dtype.type(0.0)
-        for ix, it in six.moves.zip(x, t):
-            loss += self._forward_cpu_one(ix, it, W)
-        return numpy.array(loss),
-
-    def _forward_cpu_one(self, x, t, W):
-        begin = self.begins[t]
-        end = self.begins[t + 1]
-
-        w = W[self.paths[begin:end]]
-        wxy = w.dot(x) * self.codes[begin:end]
+        if self.parser_size == 0:
+            # The tree is a single leaf, whose path is empty.
+            self.wxy = None
+            return numpy.array(0, dtype=x.dtype),
+
+        w = W[self.paths[t]]
+        wxy = numpy.matmul(w, x[:, :, None])[:, :, 0]
+        wxy *= self.codes[t]
         loss = numpy.logaddexp(0.0, -wxy)  # == log(1 + exp(-wxy))
-        return numpy.sum(loss)
+        loss *= self.codes[t] != 0
+        self.wxy = wxy
+        return numpy.array(loss.sum(), dtype=x.dtype),
 
     def backward_cpu(self, inputs, grad_outputs):
         x, t, W = inputs
         gloss, = grad_outputs
-        gx = numpy.empty_like(x)
-        gW = numpy.zeros_like(W)
-        for i, (ix, it) in enumerate(six.moves.zip(x, t)):
-            gx[i] = self._backward_cpu_one(ix, it, W, gloss, gW)
-        return gx, None, gW
+        if self.parser_size == 0:
+            return numpy.zeros_like(x), None, numpy.zeros_like(W)
 
-    def _backward_cpu_one(self, x, t, W, gloss, gW):
-        begin = self.begins[t]
-        end = self.begins[t + 1]
+        paths = self.paths[t]
+        codes = self.codes[t]
+        # g is zero at the padded elements as their codes are zero.
+        g = -gloss * codes / (1.0 + numpy.exp(self.wxy))
+        g = g.astype(x.dtype, copy=False)
+        gx = numpy.matmul(g[:, None, :], W[paths])[:, 0, :]
 
-        path = self.paths[begin:end]
-        w = W[path]
-        wxy = w.dot(x) * self.codes[begin:end]
-        g = -gloss * self.codes[begin:end] / (1.0 + numpy.exp(wxy))
-        gx = g.dot(w)
-        gw = g.reshape((g.shape[0], 1)).dot(x.reshape(1, x.shape[0]))
-        gW[path] += gw
-        return gx
+        gW = numpy.zeros_like(W)
+        index, depth = numpy.nonzero(codes)
+        utils.scatter_add(
+            gW, paths[index, depth], g[index, depth, None] * x[index])
+        return gx, None, gW
 
     def forward_gpu(self, inputs):
         x, t, W = inputs
-        max_length = cuda.reduce(
-            'T t, raw T begins', 'T out', 'begins[t + 1] - begins[t]',
-            'max(a, b)', 'out = a', '0',
-            'binary_hierarchical_softmax_max_length')(t, self.begins)
-        max_length = cuda.to_cpu(max_length)[()]
+        max_length = self.paths.shape[1]
 
         length = max_length * x.shape[0]
         ls = cuda.cupy.empty((length,), dtype=x.dtype)
@@ -179,18 +209,15 @@ class BinaryHierarchicalSoftmaxFunction(function.Function):
         wxy = cuda.cupy.empty_like(ls)
         cuda.elementwise(
             '''raw T x, raw T w, raw int32 ts, raw int32 paths,
-            raw T codes, raw int32 begins, int32 c, int32 max_length''',
+            raw T codes, raw int32 lengths, int32 c, int32 max_length''',
             'T ls, T wxy',
             '''
             int ind = i / max_length;
             int offset = i - ind * max_length;
             int t = ts[ind];
 
-            int begin = begins[t];
-            int length = begins[t + 1] - begins[t];
-
-            if (offset < length) {
-              int p = begin + offset;
+            if (offset < lengths[t]) {
+              int p = t * max_length + offset;
               int node = paths[p];
 
               T wx = 0;
@@ -206,8 +233,8 @@ class BinaryHierarchicalSoftmaxFunction(function.Function):
             }
             ''',
             'binary_hierarchical_softmax_forward'
-        )(x, W, t, self.paths, self.codes, self.begins, n_in, max_length, ls,
-          wxy)
+        )(x, W, t, self.paths, self.codes, self.lengths, n_in, max_length,
+          ls, wxy)
         self.max_length = max_length
         self.wxy = wxy
         return ls.sum(),
@@ -221,7 +248,7 @@ class BinaryHierarchicalSoftmaxFunction(function.Function):
         gW = cuda.cupy.zeros_like(W)
         cuda.elementwise(
             '''T wxy, raw T x, raw T w, raw int32 ts, raw int32 paths,
-            raw T codes, raw int32 begins, raw T gloss,
+            raw T codes, raw int32 lengths, raw T gloss,
             int32 c, int32 max_length''',
             'raw T gx, raw T gw',
             '''
@@ -229,11 +256,8 @@ class BinaryHierarchicalSoftmaxFunction(function.Function):
             int offset = i - ind * max_length;
             int t = ts[ind];
 
-            int begin = begins[t];
-            int length = begins[t + 1] - begins[t];
-
-            if (offset < length) {
-              int p = begin + offset;
+            if (offset < lengths[t]) {
+              int p = t * max_length + offset;
               int node = paths[p];
               T code = codes[p];
 
@@ -247,11 +271,35 @@ class BinaryHierarchicalSoftmaxFunction(function.Function):
             }
             ''',
             'binary_hierarchical_softmax_bwd'
-        )(self.wxy, x, W, t, self.paths, self.codes, self.begins, gloss, n_in,
-          self.max_length, gx, gW)
+        )(self.wxy, x, W, t, self.paths, self.codes, self.lengths, gloss,
+          n_in, self.max_length, gx, gW)
         return gx, None, gW
 
 
+def _create_min_variance_huffman_tree(word_counts):
+    # Sort the words by their counts. The sort is stable, so that words
+    # with the same counts are kept in the order of ``word_counts``.
+    items = sorted(six.iteritems(word_counts), key=lambda item: item[1])
+    leaves = collections.deque((c, w) for w, c in items)
+    # Merged subtrees are created in ascending order of their counts.
+    # Therefore, the two subtrees with the smallest counts are always at
+    # the heads of the two queues. Leaves are merged first if the counts
+    # are the same, which balances the depths of the leaves.
+    subtrees = collections.deque()
+
+    def pop():
+        if subtrees and (not leaves or subtrees[0][0] < leaves[0][0]):
+            return subtrees.popleft()
+        return leaves.popleft()
+
+    while len(leaves) + len(subtrees) >= 2:
+        (count1, word1) = pop()
+        (count2, word2) = pop()
+        subtrees.append((count1 + count2, (word1, word2)))
+
+    return pop()[1]
+
+
 class BinaryHierarchicalSoftmax(link.Link):
 
     """Hierarchical softmax layer over binary tree.
@@ -318,7 +366,7 @@ class BinaryHierarchicalSoftmax(link.Link):
             device, skip_between_cupy_devices=skip_between_cupy_devices)
 
     @staticmethod
-    def create_huffman_tree(word_counts):
+    def create_huffman_tree(word_counts, min_variance=False):
         """Makes a Huffman tree from a dictionary containing word counts.
 
         This method creates a binary Huffman tree, that is required for
@@ -329,6 +377,11 @@ class BinaryHierarchicalSoftmax(link.Link):
         Args:
             word_counts (dict of int key and int or float values):
                 Dictionary representing counts of words.
+            min_variance (bool): If ``True``, it makes the Huffman tree
+                whose depths of the leaves vary the least among the Huffman
+                trees, which shortens the longest path in the tree when many
+                words have the same counts. Note that the tree can differ
+                from the one made with ``False``.
 
         Returns:
             Binary Huffman tree with tuples and keys of ``word_coutns``.
@@ -337,6 +390,9 @@ class BinaryHierarchicalSoftmax(link.Link):
         if len(word_counts) == 0:
             raise ValueError('Empty vocabulary')
 
+        if min_variance:
+            return _create_min_variance_huffman_tree(word_counts)
+
         q = six.moves.queue.PriorityQueue()
         # Add unique id to each entry so that we can compare two entries with
         # same counts.
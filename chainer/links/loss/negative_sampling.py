@@ -22,6 +22,8 @@ class NegativeSampling(link.Link):
         counts (int list): Number of each identifiers.
         sample_size (int): Number of negative samples.
         power (float): Power factor :math:`\\alpha`.
+        sampler_buffer_size (int): Number of negative samples the sampler
+            draws at once. See :class:`~chainer.utils.WalkerAlias`.
 
     .. seealso:: :func:`~chainer.functions.negative_sampling` for more detail.
 
@@ -30,14 +32,16 @@ class NegativeSampling(link.Link):
 
     """
 
-    def __init__(self, in_size, counts, sample_size, power=0.75):
+    def __init__(self, in_size, counts, sample_size, power=0.75,
+                 sampler_buffer_size=0):
         super(NegativeSampling, self).__init__()
         vocab_size = len(counts)
         self.sample_size = sample_size
         power = numpy.float32(power)
         p = numpy.array(counts, power.dtype)
         numpy.power(p, power, p)
-        self.sampler = walker_alias.WalkerAlias(p)
+        self.sampler = walker_alias.WalkerAlias(
+            p, buffer_size=sampler_buffer_size)
 
         with self.init_scope():
             self.W = variable.Parameter(0, (vocab_size, in_size))
@@ -54,7 +58,8 @@ class NegativeSampling(link.Link):
             device, skip_between_cupy_devices=skip_between_cupy_devices)
 
     def forward(self, x, t, reduce='sum', **kwargs):
-        """forward(x, t, reduce='sum', *, return_samples=False)
+        """forward(x, t, reduce='sum', *, return_samples=False, \
+shared_negatives=False)
 
         Computes the loss value for given input and ground truth labels.
 
@@ -71,6 +76,10 @@ class NegativeSampling(link.Link):
                 integers whose first column is fixed to the ground truth labels
                 and the other columns are drawn from the
                 :class:`chainer.utils.WalkerAlias` sampler.
+            shared_negatives (bool):
+                If ``True``, all examples in the mini-batch share the same
+                negative samples. See
+                :func:`~chainer.functions.negative_sampling`.
 
         Returns:
             ~chainer.Variable or tuple:
@@ -82,11 +91,14 @@ class NegativeSampling(link.Link):
 
         """
         return_samples = False
+        shared_negatives = False
         if kwargs:
-            return_samples, = argument.parse_kwargs(
-                kwargs, ('return_samples', return_samples))
+            return_samples, shared_negatives = argument.parse_kwargs(
+                kwargs, ('return_samples', return_samples),
+                ('shared_negatives', shared_negatives))
 
         ret = negative_sampling.negative_sampling(
             x, t, self.W, self.sampler.sample, self.sample_size,
-            reduce=reduce, return_samples=return_samples)
+            reduce=reduce, return_samples=return_samples,
+            shared_negatives=shared_negatives)
         return ret
@@ -7,9 +7,12 @@ import six
 
 import chainer
 from chainer import backend
+from chainer.backends import cuda
+from chainer.function_hooks import trace
 from chainer import link as link_module
 from chainer import optimizer_hooks
 from chainer import serializer as serializer_module
+from chainer import utils
 from chainer import variable
 import chainerx
 
@@ -190,7 +193,27 @@ class UpdateRule(object):
 
         self.t += 1
 
-        if self._use_fp32_update and param.dtype == numpy.float16:
+        use_fp32_update = (
+            self._use_fp32_update and param.dtype == numpy.float16)
+        sparse_grad = getattr(param, 'sparse_grad', None)
+        if sparse_grad is not None:
+            if (param.grad is None and not use_fp32_update
+                    and not self._pre_update_hooks
+                    and not self._post_update_hooks
+                    and isinstance(param.array,
+                                   (numpy.ndarray, cuda.ndarray))):
+                self._prepare(param)
+                if param._loss_scale is not None:
+                    sparse_grad = utils.RowSparseArray(
+                        sparse_grad.indices,
+                        sparse_grad.rows / param._loss_scale,
+                        sparse_grad.shape)
+                with chainer.using_device(param.device):
+                    self.update_core_sparse(param, sparse_grad)
+                return
+            param.densify_sparse_grad()
+
+        if use_fp32_update:
             if self._fp32_param is None:
                 self._fp32_param = variable.Variable(
                     param.array.astype(numpy.float32),
@@ -240,6 +263,26 @@ class UpdateRule(object):
             else:
                 self.update_core_gpu(param)
 
+    def update_core_sparse(self, param, grad):
+        """Updates the parameter with a row-sparse gradient.
+
+        This method is called instead of :meth:`update_core` if the parameter
+        only has a row-sparse gradient, i.e.
+        :attr:`~chainer.Parameter.sparse_grad`, and no hooks are registered
+        to this update rule. Implementations can override it to only update
+        the rows referenced by the gradient. The default implementation
+        converts the gradient to a dense array and calls :meth:`update_core`.
+
+        Args:
+            param (~chainer.Parameter): Parameter to be updated.
+            grad (~chainer.utils.RowSparseArray): Gradient of the parameter,
+                which is already divided by the loss scale.
+
+        """
+        param.sparse_grad = None
+        param.grad = grad.to_dense()
+        self.update_core(param)
+
     def update_core_cpu(self, param):
         """Updates the parameter on CPU.
 
@@ -698,8 +741,14 @@ class GradientMethod(Optimizer):
         the optimizer can override this method with a blank function.
 
         """
+        has_hooks = self._pre_update_hooks or self._post_update_hooks
         for name, param in self.target.namedparams(False):
             if param.grad is None:
+                if getattr(param, 'sparse_grad', None) is not None:
+                    # Optimizer hooks work on dense gradients.
+                    if has_hooks:
+                        param.densify_sparse_grad()
+                    continue
                 device = param.device
                 with chainer.using_device(device):
                     param.grad = device.xp.zeros_like(param.data)
@@ -733,25 +782,28 @@ class GradientMethod(Optimizer):
         """
         if lossfun is not None:
             use_cleargrads = getattr(self, '_use_cleargrads', True)
-            loss = lossfun(*args, **kwds)
-            if use_cleargrads:
-                self.target.cleargrads()
-            else:
-                self.target.zerograds()
-            loss.backward(loss_scale=self._loss_scale)
+            with trace.phase('forward'):
+                loss = lossfun(*args, **kwds)
+            with trace.phase('backward'):
+                if use_cleargrads:
+                    self.target.cleargrads()
+                else:
+                    self.target.zerograds()
+                loss.backward(loss_scale=self._loss_scale)
             del loss
 
-        self.reallocate_cleared_grads()
+        with trace.phase('optimizer'):
+            self.reallocate_cleared_grads()
 
-        self.call_hooks('pre')
+            self.call_hooks('pre')
 
-        self.t += 1
-        for param in self.target.params():
-            param.update()
+            self.t += 1
+            for param in self.target.params():
+                param.update()
 
-        self.reallocate_cleared_grads()
+            self.reallocate_cleared_grads()
 
-        self.call_hooks('post')
+            self.call_hooks('post')
 
     def use_cleargrads(self, use=True):
         """Enables or disables use of :func:`~chainer.Link.cleargrads` in `update`.
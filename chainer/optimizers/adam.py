@@ -137,6 +137,32 @@ class AdamRule(optimizer.UpdateRule):
                 self.alpha_t * m / (numpy.sqrt(vhat) + hp.eps) +
                 hp.weight_decay_rate * param.data)
 
+    def update_core_sparse(self, param, grad):
+        hp = self.hyperparam
+        eps = grad.dtype.type(hp.eps)
+        if hp.eps != 0 and eps == 0:
+            raise ValueError(
+                'eps of Adam optimizer is too small for {} ({})'.format(
+                    grad.dtype.name, hp.eps))
+        grad = grad.coalesce()
+        indices, g = grad.indices, grad.rows
+        xp = backend.get_array_module(g)
+        m = self.state['m'][indices]
+        v = self.state['v'][indices]
+        m += (1 - hp.beta1) * (g - m)
+        v += (1 - hp.beta2) * (g * g - v)
+        self.state['m'][indices] = m
+        self.state['v'][indices] = v
+        if hp.amsgrad:
+            vhat = xp.maximum(self.state['vhat'][indices], v)
+            self.state['vhat'][indices] = vhat
+        else:
+            vhat = v
+        data = param.data[indices]
+        data -= hp.eta * (self.alpha_t * m / (xp.sqrt(vhat) + hp.eps) +
+                          hp.weight_decay_rate * data)
+        param.data[indices] = data
+
     def update_core_gpu(self, param):
         grad = param.grad
         if grad is None:
@@ -212,6 +238,10 @@ class Adam(optimizer.GradientMethod):
     ``weight_decay_rate = 0``, this implementation is identical to
     the standard Adam method.
 
+    Row-sparse gradients (see :attr:`chainer.Parameter.sparse_grad`) are
+    applied lazily as in LazyAdam, i.e., the moments are only updated and
+    applied for the referenced rows, and the other rows are left unchanged.
+
     See: `Fixing Weight Decay Regularization in Adam \
           <https://openreview.net/forum?id=rk6qdGgCZ>`_
 
@@ -58,6 +58,15 @@ class MomentumSGDRule(optimizer.UpdateRule):
             v -= self.hyperparam.lr * grad
             param.data += v
 
+    def update_core_sparse(self, param, grad):
+        grad = grad.coalesce()
+        indices = grad.indices
+        v = self.state['v'][indices]
+        v *= self.hyperparam.momentum
+        v -= self.hyperparam.lr * grad.rows
+        self.state['v'][indices] = v
+        param.data[indices] += v
+
     def update_core_gpu(self, param):
         grad = param.grad
         if grad is None:
@@ -78,6 +87,11 @@ class MomentumSGD(optimizer.GradientMethod):
 
     """Momentum SGD optimizer.
 
+    Row-sparse gradients (see :attr:`chainer.Parameter.sparse_grad`) are
+    applied lazily, i.e., the momentum is only updated and applied for the
+    referenced rows. The other rows are left unchanged, unlike the dense
+    update which keeps moving them by the decaying momentum.
+
     Args:
         lr (float): Learning rate.
         momentum (float): Exponential decay rate of the first order moment.
@@ -37,6 +37,10 @@ class SGDRule(optimizer.UpdateRule):
         else:
             param.data -= self.hyperparam.lr * grad
 
+    def update_core_sparse(self, param, grad):
+        grad = grad.coalesce()
+        param.data[grad.indices] -= self.hyperparam.lr * grad.rows
+
     def update_core_gpu(self, param):
         grad = param.grad
         if grad is None:
@@ -52,6 +56,10 @@ class SGD(optimizer.GradientMethod):
 
     """Vanilla Stochastic Gradient Descent.
 
+    Row-sparse gradients (see :attr:`chainer.Parameter.sparse_grad`) only
+    update the referenced rows, which gives the same result as the dense
+    update.
+
     Args:
         lr (float): Learning rate.
 
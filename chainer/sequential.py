@@ -1,9 +1,236 @@
+import collections
 import copy
 import functools
 import inspect
+import math
+import threading
+import warnings
+import weakref
 
+import chainer
 from chainer import function
+from chainer import function_hook
+from chainer.functions.util import forget
 from chainer import link
+from chainer import variable
+
+
+_max_memory_profiles = 16
+
+
+def _nbytes(xs):
+    return sum(variable.as_array(x).nbytes for x in xs)
+
+
+def _get_graph_retained_bytes(xs, ys, excluded_arrays):
+    # Returns the bytes of arrays retained for backprop by the function nodes
+    # between the input variables ``xs`` and the outputs ``ys``. The input
+    # arrays and ``excluded_arrays`` are not counted.
+    if not isinstance(ys, tuple):
+        ys = ys,
+    input_nodes = set(id(x.node) for x in xs)
+    seen_arrays = set(id(x.array) for x in xs)
+    seen_arrays.update(id(array) for array in excluded_arrays)
+    seen_funcs = set()
+    nbytes = 0
+    stack = [y.creator_node for y in ys if y.creator_node is not None]
+    while stack:
+        func = stack.pop()
+        if func in seen_funcs:
+            continue
+        seen_funcs.add(func)
+        for array in func._get_retained_arrays():
+            if id(array) not in seen_arrays:
+                seen_arrays.add(id(array))
+                nbytes += array.nbytes
+        for node in func.inputs:
+            if id(node) not in input_nodes and node.creator_node is not None:
+                stack.append(node.creator_node)
+    return nbytes
+
+
+def _estimate_peak_bytes(segments, input_bytes, segment_bytes):
+    # The inputs of all segments and the graph of the last segment are kept
+    # until the end of the backward, since the graph is referenced by the
+    # output. The graph of each other segment is rebuilt in its backward and
+    # released afterwards.
+    return (sum(input_bytes) + segment_bytes[-1]
+            + max([0] + segment_bytes[:-1]))
+
+
+class _MemoryProfile(object):
+
+    # Memory consumption of each layer for a fixed input signature.
+
+    def __init__(self, n_layers):
+        self.input_bytes = [None] * n_layers
+        self.retained_bytes = [None] * n_layers
+        self.segments = None
+        self.estimated_peak_bytes = None
+
+    def is_complete(self):
+        return (None not in self.input_bytes
+                and None not in self.retained_bytes)
+
+    def get_segment_bytes(self, start, stop):
+        # The inputs of the layers inside the segment are retained by the
+        # layers in addition to the arrays they retain internally.
+        return (sum(self.retained_bytes[start:stop])
+                + sum(self.input_bytes[start + 1:stop]))
+
+    def estimate(self, segments):
+        return _estimate_peak_bytes(
+            segments,
+            [self.input_bytes[start] for start, _ in segments],
+            [self.get_segment_bytes(start, stop)
+             for start, stop in segments])
+
+    def _split(self, max_segment_bytes):
+        # Splits the layers into segments greedily from the last layer so
+        # that the graph of each segment fits in ``max_segment_bytes``. The
+        # last segment, which is not recomputed, becomes the largest.
+        segments = []
+        stop = len(self.input_bytes)
+        while stop > 0:
+            start = stop - 1
+            while (start > 0 and self.get_segment_bytes(start - 1, stop)
+                   <= max_segment_bytes):
+                start -= 1
+            segments.append((start, stop))
+            stop = start
+        return segments[::-1]
+
+    def plan(self, memory_budget):
+        n_layers = len(self.input_bytes)
+        segments = [(0, n_layers)]
+        peak = self.estimate(segments)
+        if peak > memory_budget:
+            # Search the largest segment size satisfying the budget.
+            low = max(self.retained_bytes + [1])
+            high = max(self.get_segment_bytes(0, n_layers), low)
+            n_trials = 64
+            ratio = math.pow(float(high) / low, 1. / n_trials)
+            best = None
+            for i in range(n_trials + 1):
+                candidate = self._split(low * ratio ** i)
+                candidate_peak = self.estimate(candidate)
+                if candidate_peak <= memory_budget:
+                    segments, peak = candidate, candidate_peak
+                elif best is None or candidate_peak < best[1]:
+                    best = candidate, candidate_peak
+            if peak > memory_budget:
+                segments, peak = best
+                warnings.warn(
+                    'The memory budget of {} bytes cannot be satisfied. The '
+                    'estimated peak memory is {} bytes.'.format(
+                        memory_budget, peak))
+        self.segments = segments
+        self.estimated_peak_bytes = peak
+
+
+class _RetainedBytesHook(function_hook.FunctionHook):
+
+    # Measures the bytes of arrays retained for backprop by the function
+    # nodes applied while the hook is registered until the nodes are
+    # released, as NumpyMemoryProfileHook does, and their peak. The peak is
+    # updated when the hook is unregistered. ``excluded_arrays`` are not
+    # counted.
+
+    def __init__(self, excluded_arrays):
+        # The hook may be registered by nested links at the same time.
+        self.name = 'RetainedBytesHook-{}'.format(id(self))
+        self.excluded_ids = set(id(array) for array in excluded_arrays)
+        self.retained_bytes = 0
+        self.peak_bytes = 0
+        # The graph may be rebuilt in worker threads of parallel backprop.
+        self._lock = threading.RLock()
+        self._pending = []
+        # Maps the ids of retained arrays to their bytes and reference counts.
+        self._retained = {}
+        self._node_refs = {}
+
+    def forward_postprocess(self, function, in_data):
+        # The graph is connected after this callback.
+        with self._lock:
+            self._pending.append(weakref.ref(function))
+
+    def deleted(self, function=None):
+        self.flush()
+
+    def flush(self):
+        with self._lock:
+            pending = self._pending
+            self._pending = []
+            for node_ref in pending:
+                node = node_ref()
+                if node is None or node.inputs is None:
+                    continue
+                ids = []
+                for array in node._get_retained_arrays():
+                    key = id(array)
+                    if key in self.excluded_ids:
+                        continue
+                    entry = self._retained.get(key)
+                    if entry is None:
+                        entry = [array.nbytes, 0]
+                        self._retained[key] = entry
+                        self.retained_bytes += array.nbytes
+                    entry[1] += 1
+                    ids.append(key)
+                if ids:
+                    self._node_refs[weakref.ref(node, self._release)] = ids
+            self.peak_bytes = max(self.peak_bytes, self.retained_bytes)
+
+    def _release(self, node_ref):
+        with self._lock:
+            for key in self._node_refs.pop(node_ref, ()):
+                entry = self._retained[key]
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._retained[key]
+                    self.retained_bytes -= entry[0]
+
+
+class _CheckpointedPass(object):
+
+    # Sizes of the segment inputs and graphs of a forward and backward pass
+    # with recomputation.
+
+    def __init__(self, sequential, profile, segments):
+        self.sequential = sequential
+        self.profile = profile
+        self.segments = segments
+        self.input_bytes = [None] * len(segments)
+        self.segment_bytes = [None] * len(segments)
+        # Parameters are not counted since they are kept regardless of the
+        # graph.
+        self.hook = _RetainedBytesHook(
+            [param.array for param in sequential.params()])
+
+    def record_inputs(self, index, xs):
+        nbytes = _nbytes(xs)
+        self.input_bytes[index] = nbytes
+        start, stop = self.segments[index]
+        if stop - start == 1:
+            self.profile.input_bytes[start] = nbytes
+
+    def record_graph(self, index, xs, ys):
+        # Parameters are not counted since they are kept regardless of the
+        # graph.
+        nbytes = _get_graph_retained_bytes(
+            xs, ys, [param.array for param in self.sequential.params()])
+        self.segment_bytes[index] = nbytes
+        start, stop = self.segments[index]
+        if stop - start == 1:
+            self.profile.retained_bytes[start] = nbytes
+        if None not in self.segment_bytes:
+            # The graph does not grow after the last segment is recorded.
+            self.hook.flush()
+            self.sequential.memory_report = {
+                'segments': list(self.segments),
+                'estimated_peak_bytes': self.profile.estimated_peak_bytes,
+                'actual_peak_bytes': self.hook.peak_bytes,
+            }
 
 
 class Sequential(link.ChainList):
@@ -116,14 +343,90 @@ class Sequential(link.ChainList):
             functions defined under the :mod:`chainer.functions`, e.g.,
             :func:`~chainer.functions.relu`, etc.
 
+    Attributes:
+        memory_budget (int): Memory budget in bytes for the arrays retained
+            by the computational graph. See :meth:`set_memory_budget`.
+        memory_report (dict): Memory consumption of the last forward and
+            backward computation with recomputation. See
+            :meth:`set_memory_budget`.
+
     """
 
     def __init__(self, *layers):
         super(Sequential, self).__init__()
         self._layers = []
+        self.memory_budget = None
+        self.memory_report = None
+        self._memory_profiles = collections.OrderedDict()
         for layer in layers:
             self.append(layer)
 
+    def set_memory_budget(self, memory_budget):
+        """Sets a memory budget to automatically recompute activations.
+
+        When a memory budget is set, this link splits its layers into
+        segments while backprop is enabled. Only the inputs of the segments
+        and the graph of the last segment are kept during the forward
+        computation. The graphs of the other segments are rebuilt by calling
+        the layers again during the backward computation, as
+        :func:`~chainer.functions.forget` does. The segments are chosen to
+        keep the estimated peak bytes of the arrays retained by the graph
+        within the budget while recomputing as few layers as possible.
+
+        The consumption of each layer is measured for each input shape. In
+        the first iteration for an input shape, every layer except the last
+        one is recomputed to measure it with the least memory. The segments
+        are planned from the second iteration. A warning is raised if the
+        budget cannot be satisfied.
+
+        After the backward computation, :attr:`memory_report` is set to a
+        dictionary of ``segments`` (the list of ranges of layer indexes),
+        ``estimated_peak_bytes`` (the peak bytes estimated by the planner
+        from the per-layer profile, or ``None`` in the first iteration) and
+        ``actual_peak_bytes`` (the peak bytes measured in the iteration by
+        tracking the arrays retained by the function nodes of the layers
+        until the nodes are released, as
+        :class:`~chainer.function_hooks.NumpyMemoryProfileHook` does). Both
+        count only the arrays retained by the computational graph except for
+        the parameters. They do not include gradients and temporary arrays.
+
+        .. note::
+
+            As with :func:`~chainer.functions.forget`, the layers must take
+            and return variables, and layers that behave differently in
+            multiple calls with the same inputs, such as
+            :func:`~chainer.functions.dropout`, are not supported. The
+            statistics of :class:`~chainer.links.BatchNormalization` are
+            updated in the recomputation as well.
+
+        .. admonition:: Example
+
+            >>> model = L.Linear(100, 100).repeat(10)
+            >>> model = model.set_memory_budget(30000)
+            >>> x = np.ones((8, 100), np.float32)
+            >>> for _ in range(2):
+            ...     model.cleargrads()
+            ...     F.sum(model(x)).backward()
+            >>> model.memory_report['segments']
+            [(0, 2), (2, 6), (6, 10)]
+            >>> model.memory_report['actual_peak_bytes']
+            28800
+
+        Args:
+            memory_budget (int): Memory budget in bytes. If it is ``None``,
+                recomputation is disabled.
+
+        Returns:
+            This link itself.
+
+        """
+        if memory_budget is not None and memory_budget <= 0:
+            raise ValueError('memory_budget must be positive')
+        self.memory_budget = memory_budget
+        self.memory_report = None
+        self._memory_profiles.clear()
+        return self
+
     def __len__(self):
         return len(self._layers)
 
@@ -205,13 +508,69 @@ class Sequential(link.ChainList):
             The output of the final layer in the given layers.
 
         """
-        for layer in self._layers:
+        if self.memory_budget is not None and chainer.config.enable_backprop:
+            return self._forward_with_recomputation(x)
+        return self._call_layers(self._layers, x)
+
+    def _call_layers(self, layers, x):
+        for layer in layers:
             if isinstance(x, tuple):
                 x = layer(*x)
             else:
                 x = layer(x)
         return x
 
+    def _forward_with_recomputation(self, xs):
+        key = (tuple([id(layer) for layer in self._layers]),
+               tuple([(getattr(x, 'shape', None), getattr(x, 'dtype', None))
+                      for x in xs]))
+        profile = self._memory_profiles.get(key)
+        if profile is None:
+            profile = _MemoryProfile(len(self._layers))
+            self._memory_profiles[key] = profile
+            if len(self._memory_profiles) > _max_memory_profiles:
+                self._memory_profiles.popitem(last=False)
+        if profile.segments is None and profile.is_complete():
+            profile.plan(self.memory_budget)
+
+        segments = profile.segments
+        if segments is None:
+            segments = [(i, i + 1) for i in range(len(self._layers))]
+        checkpointed_pass = _CheckpointedPass(self, profile, segments)
+
+        h = xs
+        with checkpointed_pass.hook:
+            for index, (start, stop) in enumerate(segments):
+                if not isinstance(h, tuple):
+                    h = h,
+                # Inputs must require grad for the backward to reach the
+                # parameters in the recomputed segments.
+                h = tuple([
+                    x if isinstance(x, variable.Variable) and x.requires_grad
+                    else variable.Variable(variable.as_array(x),
+                                           requires_grad=True)
+                    for x in h])
+                checkpointed_pass.record_inputs(index, h)
+                if index == len(segments) - 1:
+                    y = self._call_layers(self._layers[start:stop], h)
+                else:
+                    segment = functools.partial(
+                        self._call_segment, checkpointed_pass, index)
+                    y = forget.forget(segment, *h)
+                    h = y
+        checkpointed_pass.record_graph(len(segments) - 1, h, y)
+        return y
+
+    def _call_segment(self, checkpointed_pass, index, *xs):
+        start, stop = checkpointed_pass.segments[index]
+        if not chainer.config.enable_backprop:
+            return self._call_layers(self._layers[start:stop], xs)
+        # Called for the recomputation in backward
+        with checkpointed_pass.hook:
+            ys = self._call_layers(self._layers[start:stop], xs)
+        checkpointed_pass.record_graph(index, xs, ys)
+        return ys
+
     def __reduce__(self):
         n_lambda = 0
         for layer in self._layers:
@@ -379,6 +738,7 @@ class Sequential(link.ChainList):
                 ret.append(layer.copy(mode))
             else:
                 ret.append(copy.copy(layer))
+        ret.set_memory_budget(self.memory_budget)
         return ret
 
     def flatten(self):
@@ -6,6 +6,7 @@ import traceback
 
 import six
 
+from chainer.function_hooks import trace
 from chainer import reporter as reporter_module
 from chainer import serializer as serializer_module
 from chainer.training import extension as extension_module
@@ -315,7 +316,8 @@ class Trainer(object):
                     update()
                     for name, entry in extensions:
                         if entry.trigger(self):
-                            entry.extension(self)
+                            with trace.phase(name):
+                                entry.extension(self)
         except Exception as e:
             if show_loop_exception_msg:
                 # Show the exception here, as it will appear as if chainer
@@ -5,6 +5,7 @@ from chainer import backend
 from chainer.backends import cuda
 from chainer.dataset import convert
 from chainer.dataset import iterator as iterator_module
+from chainer.function_hooks import trace
 from chainer.training import _updater
 
 
@@ -192,22 +193,25 @@ class StandardUpdater(_updater.Updater):
                 'Currently only `concat_examples` supports ChainerX.')
 
     def update_core(self):
-        iterator = self._iterators['main']
-        batch = iterator.next()
-        in_arrays = self._call_converter(batch, self.device)
-
-        optimizer = self._optimizers['main']
-        loss_func = self.loss_func or optimizer.target
-
-        if isinstance(in_arrays, tuple):
-            optimizer.update(loss_func, *in_arrays)
-        elif isinstance(in_arrays, dict):
-            optimizer.update(loss_func, **in_arrays)
-        else:
-            optimizer.update(loss_func, in_arrays)
-
-        if self.auto_new_epoch and iterator.is_new_epoch:
-            optimizer.new_epoch(auto=True)
+        with trace.phase('update', self.iteration):
+            iterator = self._iterators['main']
+            with trace.phase('iterator'):
+                batch = iterator.next()
+            with trace.phase('converter'):
+                in_arrays = self._call_converter(batch, self.device)
+
+            optimizer = self._optimizers['main']
+            loss_func = self.loss_func or optimizer.target
+
+            if isinstance(in_arrays, tuple):
+                optimizer.update(loss_func, *in_arrays)
+            elif isinstance(in_arrays, dict):
+                optimizer.update(loss_func, **in_arrays)
+            else:
+                optimizer.update(loss_func, in_arrays)
+
+            if self.auto_new_epoch and iterator.is_new_epoch:
+                optimizer.new_epoch(auto=True)
 
     def serialize(self, serializer):
         """Serializes the current state of the updater object."""
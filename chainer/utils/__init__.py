@@ -10,13 +10,17 @@ import chainer
 # import classes and functions
 from chainer.utils.array import _getitem  # NOQA
 from chainer.utils.array import _setitem  # NOQA
+from chainer.utils.array import scatter_add  # NOQA
 from chainer.utils.array import size_of_shape  # NOQA
 from chainer.utils.array import sum_to  # NOQA
 from chainer.utils.conv import get_conv_outsize  # NOQA
 from chainer.utils.conv import get_deconv_outsize  # NOQA
+from chainer.utils.conv import get_im2col_workspace_size  # NOQA
+from chainer.utils.conv import set_im2col_workspace_size  # NOQA
 from chainer.utils.experimental import experimental  # NOQA
 from chainer.utils.sparse import CooMatrix  # NOQA
 from chainer.utils.sparse import get_order  # NOQA
+from chainer.utils.sparse import RowSparseArray  # NOQA
 from chainer.utils.sparse import to_coo  # NOQA
 from chainer.utils.walker_alias import WalkerAlias  # NOQA
 
@@ -67,6 +67,155 @@ def sum_to(x, shape):
     return y
 
 
+def _is_basic_index(index):
+    if isinstance(index, bool):
+        return False
+    return (index is None or index is Ellipsis or isinstance(index, slice)
+            or isinstance(index, six.integer_types + (numpy.integer,)))
+
+
+def _is_full_slice(index):
+    return (isinstance(index, slice) and index.start is None
+            and index.stop is None and index.step in (None, 1))
+
+
+# Maximum number of duplicates of a row for which scatter_add adds the
+# values of unique rows in rounds instead of reducing the duplicates.
+_scatter_add_max_rounds = 8
+
+
+def scatter_add(a, slices, value):
+    """Adds given values to specified elements of an array on CPU.
+
+    This function is equivalent to ``numpy.add.at(a, slices, value)``, i.e.,
+    it adds ``value`` to ``a[slices]`` in place and accumulates the values of
+    elements referenced multiple times by advanced indexing. It avoids
+    :func:`numpy.add.at`, which is slow, as follows.
+
+    * If ``slices`` consists of basic indexing, the elements are unique and
+      ``value`` is added to them directly.
+    * Otherwise, the slices are converted to the indices of the rows of
+      ``a``, where the trailing axes not indexed by ``slices`` form a row.
+      Single elements of floating point arrays scattered densely are
+      accumulated by :func:`numpy.bincount` with weights. In other cases, the
+      rows are sorted. The values of rows referenced many times are
+      accumulated by :meth:`numpy.ufunc.reduceat`, and the values of the
+      other rows are added to unique rows directly in a few rounds.
+
+    Args:
+        a (numpy.ndarray): Array to which the values are added. It is
+            modified in place.
+        slices (int, slice, Ellipsis, None, integer array-like, boolean\
+        array-like or tuple of them): An object to specify the elements.
+        value (numpy.ndarray or scalar): Values to add. It is broadcast to
+            the shape of ``a[slices]``.
+
+    """
+    if not isinstance(slices, tuple):
+        slices = slices,
+    if all(_is_basic_index(s) for s in slices):
+        a[slices] += value
+        return
+    if not a.flags.c_contiguous:
+        numpy.add.at(a, slices, value)
+        return
+
+    # Drop the trailing axes taken as a whole, which form the rows.
+    slices = list(slices)
+    while slices and (slices[-1] is Ellipsis or _is_full_slice(slices[-1])):
+        slices.pop()
+    if any(s is Ellipsis for s in slices):
+        n_axes = a.ndim
+    else:
+        n_axes = 0
+        for s in slices:
+            if s is not None:
+                s = numpy.asarray(s) if not _is_basic_index(s) else s
+                n_axes += s.ndim if getattr(s, 'dtype', None) == bool else 1
+    if n_axes == 0 or a.size == 0:
+        numpy.add.at(a, tuple(slices), value)
+        return
+    slices = tuple(slices)
+    shape = a.shape[:n_axes]
+    row_size = size_of_shape(a.shape[n_axes:])
+
+    # Compute the row indices from zero-strided views of the offsets along
+    # the axes, which do not allocate arrays of the size of ``a``.
+    dtype = numpy.int32 if a.size // row_size < 2 ** 31 else numpy.int64
+    rows = None
+    for axis, stride in enumerate(
+            numpy.cumprod((1,) + shape[:0:-1])[::-1]):
+        offset = numpy.lib.stride_tricks.as_strided(
+            numpy.arange(shape[axis], dtype=dtype) * dtype(stride), shape,
+            [0] * axis + [numpy.dtype(dtype).itemsize]
+            + [0] * (n_axes - axis - 1))[slices]
+        if rows is None:
+            rows = numpy.array(offset, copy=True)
+        else:
+            rows += offset
+    if rows.size == 0:
+        return
+    value = numpy.broadcast_to(value, rows.shape + a.shape[n_axes:])
+    value = value.reshape(rows.size, row_size)
+    rows = rows.ravel()
+    a = a.reshape(-1, row_size)
+
+    if row_size == 1 and a.dtype.kind == 'f' and 4 * rows.size >= len(a):
+        a[:, 0] += numpy.bincount(
+            rows, weights=value[:, 0], minlength=len(a)).astype(
+                a.dtype, copy=False)
+        return
+    order = numpy.argsort(rows, kind='mergesort')
+    rows = rows[order]
+    is_new = numpy.empty(rows.shape, bool)
+    is_new[:1] = True
+    numpy.not_equal(rows[1:], rows[:-1], out=is_new[1:])
+    starts = numpy.flatnonzero(is_new)
+    lengths = numpy.diff(numpy.append(starts, len(rows)))
+    # The rank of each index among the indices of the same row.
+    rank = numpy.arange(len(rows)) - numpy.repeat(starts, lengths)
+
+    # The values of rows referenced many times are summed up by reduceat.
+    heavy = lengths > _scatter_add_max_rounds
+    if heavy.any():
+        is_heavy = numpy.repeat(heavy, lengths)
+        heavy_lengths = lengths[heavy]
+        heavy_starts = numpy.cumsum(heavy_lengths) - heavy_lengths
+        heavy_value = value[order[is_heavy]]
+        if row_size >= 32:
+            # Reducing along the contiguous axis is faster for long rows.
+            summed = numpy.add.reduceat(
+                numpy.ascontiguousarray(heavy_value.T), heavy_starts,
+                axis=1).T
+        else:
+            summed = numpy.add.reduceat(heavy_value, heavy_starts, axis=0)
+        a[rows[starts[heavy]]] += summed
+        is_light = ~is_heavy
+        order = order[is_light]
+        rows = rows[is_light]
+        rank = rank[is_light]
+
+    # Each round adds the values of the other rows, which are unique in the
+    # round, directly.
+    n_rounds = int(rank.max()) + 1 if len(rank) else 0
+    for i in six.moves.range(n_rounds):
+        mask = rank == i
+        a[rows[mask]] += value[order[mask]]
+
+
+def _pack_mask(mask):
+    # Packs a boolean NumPy array into bits. Returns a tuple to be passed to
+    # _unpack_mask.
+    return numpy.packbits(mask, axis=None), mask.shape
+
+
+def _unpack_mask(packed):
+    # Unpacks a boolean array packed by _pack_mask.
+    bits, shape = packed
+    size = size_of_shape(shape)
+    return numpy.unpackbits(bits)[:size].view(numpy.bool_).reshape(shape)
+
+
 # Workaround for chainerx.ndarray advanced indexing.
 # This function is not differentiable.
 # TODO(hvy): Remove this function when chainerx.ndarray.__getitem__ supports
@@ -62,9 +62,77 @@ def get_deconv_outsize(size, k, s, p, cover_all=False, d=1):
         return s * (size - 1) + dk - 2 * p
 
 
+# Maximum size in bytes of the columns that CPU convolutions expand at once.
+_im2col_workspace_size = 256 * 1024 * 1024
+
+
+def get_im2col_workspace_size():
+    """Gets the workspace size of CPU convolutions.
+
+    Returns:
+        int or None: The maximum size in bytes of the columns that CPU
+        convolutions expand with im2col at once, or ``None`` if it is
+        unlimited.
+
+    .. seealso:: :func:`~chainer.utils.set_im2col_workspace_size`
+
+    """
+    return _im2col_workspace_size
+
+
+def set_im2col_workspace_size(size):
+    """Sets the workspace size of CPU convolutions.
+
+    Convolutions on CPU expand their inputs into columns of
+    :math:`c_I h_K w_K` times as many elements as the outputs. If the
+    columns are larger than the workspace, they are expanded and reduced
+    in chunks of samples, or of output rows if a single sample does not fit
+    in the workspace. A smaller workspace bounds the memory usage at the
+    cost of smaller matrix products.
+
+    Args:
+        size (int or None): The maximum size in bytes of the columns expanded
+            at once. ``None`` means unlimited.
+
+    """
+    global _im2col_workspace_size
+    if size is not None and size <= 0:
+        raise ValueError('workspace size must be positive')
+    _im2col_workspace_size = size
+
+
+def iter_im2col_chunks(n, out_h, row_size):
+    """Splits the columns of a convolution into chunks fitting the workspace.
+
+    Args:
+        n (int): Batch size.
+        out_h (int): Size of the first spatial axis of the output.
+        row_size (int): Size in bytes of the columns of a single row of the
+            output of a single sample.
+
+    Yields:
+        tuple of slices: Slices of the batch and of the first spatial axis of
+        the output.
+
+    """
+    size = _im2col_workspace_size
+    if size is None or n * out_h * row_size <= size:
+        yield slice(None), slice(None)
+        return
+    rows = max(size // row_size, 1)
+    if rows >= out_h:
+        batch = rows // out_h
+        for i in six.moves.range(0, n, batch):
+            yield slice(i, i + batch), slice(None)
+    else:
+        for i in six.moves.range(n):
+            for j in six.moves.range(0, out_h, rows):
+                yield slice(i, i + 1), slice(j, j + rows)
+
+
 def im2col_cpu(
         img, kh, kw, sy, sx, ph, pw, pval=0, cover_all=False, dy=1, dx=1,
-        out_h=None, out_w=None):
+        out_h=None, out_w=None, copy=True):
     n, c, h, w = img.shape
     if out_h is None:
         out_h = get_conv_outsize(h, kh, sy, ph, cover_all, dy)
@@ -73,9 +141,22 @@ def im2col_cpu(
         out_w = get_conv_outsize(w, kw, sx, pw, cover_all, dx)
     assert out_w > 0, 'Width in the output should be positive.'
 
-    img = numpy.pad(img,
-                    ((0, 0), (0, 0), (ph, ph + sy - 1), (pw, pw + sx - 1)),
-                    mode='constant', constant_values=(pval,))
+    if ph != 0 or pw != 0 or sy != 1 or sx != 1:
+        img = numpy.pad(
+            img, ((0, 0), (0, 0), (ph, ph + sy - 1), (pw, pw + sx - 1)),
+            mode='constant', constant_values=(pval,))
+
+    if not copy:
+        # Read-only view of the padded image without copying the patches.
+        assert (kh - 1) * dy + (out_h - 1) * sy < img.shape[2]
+        assert (kw - 1) * dx + (out_w - 1) * sx < img.shape[3]
+        s0, s1, s2, s3 = img.strides
+        col = numpy.lib.stride_tricks.as_strided(
+            img, (n, c, kh, kw, out_h, out_w),
+            (s0, s1, s2 * dy, s3 * dx, s2 * sy, s3 * sx))
+        col.flags.writeable = False
+        return col
+
     col = numpy.ndarray((n, c, kh, kw, out_h, out_w), dtype=img.dtype)
 
     for j in six.moves.range(kh):
@@ -0,0 +1,338 @@
+"""Alternative algorithms of two-dimensional convolution on CPU.
+
+The default CPU implementation of convolution expands the input with
+:func:`~chainer.utils.conv.im2col_cpu` and reduces it with a matrix product.
+This module provides the Winograd minimal filtering algorithm F(2x2, 3x3) and
+an FFT-based algorithm for convolutions with unit stride and dilation, which
+need fewer operations for 3x3 kernels and large kernels, respectively.
+
+The algorithm is chosen for each shape by a heuristic. If
+``chainer.config.autotune`` is ``True``, all applicable algorithms are run
+the first time a shape is seen and the fastest one is cached instead.
+
+"""
+
+import threading
+import time
+
+import numpy
+
+from chainer import configuration
+
+
+_clock = getattr(time, 'perf_counter', time.time)
+
+# Transformation matrices of Winograd F(2x2, 3x3) for correlation.
+_winograd_G = numpy.array([
+    [1., 0., 0.],
+    [.5, .5, .5],
+    [.5, -.5, .5],
+    [0., 0., 1.]])
+
+# Autotuned algorithms keyed by the kind of computation and shapes.
+_algorithms = {}
+_algorithms_lock = threading.Lock()
+
+
+def is_supported(dtypes, stride, dilate):
+    """Checks if the algorithms of this module can compute the convolution.
+
+    Args:
+        dtypes (tuple of numpy.dtype): Dtypes of the input arrays.
+        stride (tuple of ints): Stride of filter applications.
+        dilate (tuple of ints): Dilation factor of filter applications.
+
+    Returns:
+        bool: ``True`` if the convolution has unit stride and dilation and
+        all the arrays have the same dtype of single or double precision.
+
+    """
+    return (tuple(stride) == (1, 1) and tuple(dilate) == (1, 1)
+            and len(set(dtypes)) == 1
+            and dtypes[0] in (numpy.float32, numpy.float64))
+
+
+def _pad(x, ph, pw, h, w):
+    # Pads (..., H, W) array so that its spatial size becomes (h, w).
+    H, W = x.shape[-2:]
+    if (ph, pw) == (0, 0) and (H, W) == (h, w):
+        return x
+    y = numpy.zeros(x.shape[:-2] + (h, w), dtype=x.dtype)
+    y[..., ph:ph + H, pw:pw + W] = x[..., :h - ph, :w - pw]
+    return y
+
+
+def _fft_size(n):
+    # Returns the smallest 5-smooth number not less than n, for which
+    # numpy.fft runs fast.
+    best = 1
+    while best < n:
+        best *= 2
+    p5 = 1
+    while p5 < best:
+        p35 = p5
+        while p35 < best:
+            m = p35
+            while m < n:
+                m *= 2
+            best = min(best, m)
+            p35 *= 3
+        p5 *= 5
+    return best
+
+
+def _winograd_input_transform(x, ph, pw, th, tw):
+    # Computes B^T d B of all the 4x4 tiles d of the padded input.
+    # x: (n, c, h, w) -> V: (4, 4, c, n * th * tw)
+    n, c = x.shape[:2]
+    xp = _pad(x.transpose(1, 0, 2, 3), ph, pw, th * 2 + 2, tw * 2 + 2)
+    rows = [xp[:, :, k:k + th * 2:2] for k in range(4)]
+    rows = (rows[0] - rows[2], rows[1] + rows[2],
+            rows[2] - rows[1], rows[1] - rows[3])
+    V = numpy.empty((4, 4, c, n, th, tw), dtype=x.dtype)
+    for a, r in enumerate(rows):
+        cols = [r[..., k:k + tw * 2:2] for k in range(4)]
+        numpy.subtract(cols[0], cols[2], out=V[a, 0])
+        numpy.add(cols[1], cols[2], out=V[a, 1])
+        numpy.subtract(cols[2], cols[1], out=V[a, 2])
+        numpy.subtract(cols[1], cols[3], out=V[a, 3])
+    return V.reshape(4, 4, c, n * th * tw)
+
+
+def winograd_forward(x, W, ph, pw):
+    """Computes convolution with 3x3 filters by Winograd F(2x2, 3x3).
+
+    Args:
+        x (numpy.ndarray): Input array of shape :math:`(n, c_I, h_I, w_I)`.
+        W (numpy.ndarray): Filter array of shape :math:`(c_O, c_I, 3, 3)`.
+        ph (int): Padding height.
+        pw (int): Padding width.
+
+    Returns:
+        numpy.ndarray: Output array of shape :math:`(n, c_O, h_O, w_O)`
+        computed with unit stride.
+
+    """
+    n, _, h, w = x.shape
+    out_c = W.shape[0]
+    out_h = h + ph * 2 - 2
+    out_w = w + pw * 2 - 2
+    th = (out_h + 1) // 2
+    tw = (out_w + 1) // 2
+
+    G = _winograd_G.astype(x.dtype)
+    # Computes G W G^T of shape (4, 4, c_O, c_I).
+    U = numpy.tensordot(numpy.tensordot(G, W, (1, 2)), G, (3, 1))
+    U = numpy.ascontiguousarray(U.transpose(0, 3, 1, 2))
+    V = _winograd_input_transform(x, ph, pw, th, tw)
+    M = numpy.matmul(U, V).reshape(4, 4, out_c, n, th, tw)
+
+    # Computes A^T M A.
+    rows = (M[0] + M[1] + M[2], M[1] - M[2] - M[3])
+    y = numpy.empty((n, out_c, th, 2, tw, 2), dtype=x.dtype)
+    for i, r in enumerate(rows):
+        y[:, :, :, i, :, 0] = (r[0] + r[1] + r[2]).transpose(1, 0, 2, 3)
+        y[:, :, :, i, :, 1] = (r[1] - r[2] - r[3]).transpose(1, 0, 2, 3)
+    y = y.reshape(n, out_c, th * 2, tw * 2)
+    return y[:, :, :out_h, :out_w]
+
+
+def winograd_backward_filter(x, gy, ph, pw):
+    """Computes the gradient of 3x3 filters by Winograd F(2x2, 3x3).
+
+    Args:
+        x (numpy.ndarray): Input array of shape :math:`(n, c_I, h_I, w_I)`.
+        gy (numpy.ndarray): Gradient of the output of shape
+            :math:`(n, c_O, h_O, w_O)`.
+        ph (int): Padding height.
+        pw (int): Padding width.
+
+    Returns:
+        numpy.ndarray: Gradient of the filter of shape
+        :math:`(c_O, c_I, 3, 3)`.
+
+    """
+    n, out_c, out_h, out_w = gy.shape
+    th = (out_h + 1) // 2
+    tw = (out_w + 1) // 2
+
+    V = _winograd_input_transform(x, ph, pw, th, tw)
+
+    # Computes A gy A^T of all the 2x2 tiles of the output gradient.
+    gyp = _pad(gy.transpose(1, 0, 2, 3), 0, 0, th * 2, tw * 2)
+    g0 = gyp[:, :, 0::2]
+    g1 = gyp[:, :, 1::2]
+    rows = (g0, g0 + g1, g0 - g1, -g1)
+    gM = numpy.empty((4, 4, out_c, n, th, tw), dtype=gy.dtype)
+    for a, r in enumerate(rows):
+        c0 = r[..., 0::2]
+        c1 = r[..., 1::2]
+        gM[a, 0] = c0
+        numpy.add(c0, c1, out=gM[a, 1])
+        numpy.subtract(c0, c1, out=gM[a, 2])
+        numpy.negative(c1, out=gM[a, 3])
+    gM = gM.reshape(4, 4, out_c, n * th * tw)
+
+    gU = numpy.matmul(gM, V.transpose(0, 1, 3, 2))
+    G = _winograd_G.astype(x.dtype)
+    # Computes G^T gU G of shape (c_O, c_I, 3, 3).
+    gW = numpy.tensordot(numpy.tensordot(G, gU, (0, 0)), G, (1, 0))
+    return gW.transpose(1, 2, 0, 3)
+
+
+def fft_forward(x, W, ph, pw):
+    """Computes convolution by the fast Fourier transform.
+
+    Args:
+        x (numpy.ndarray): Input array of shape :math:`(n, c_I, h_I, w_I)`.
+        W (numpy.ndarray): Filter array of shape :math:`(c_O, c_I, h_K, w_K)`.
+        ph (int): Padding height.
+        pw (int): Padding width.
+
+    Returns:
+        numpy.ndarray: Output array of shape :math:`(n, c_O, h_O, w_O)`
+        computed with unit stride.
+
+    """
+    n, c, h, w = x.shape
+    out_c, _, kh, kw = W.shape
+    out_h = h + ph * 2 - kh + 1
+    out_w = w + pw * 2 - kw + 1
+    s = (_fft_size(h + ph * 2), _fft_size(w + pw * 2))
+    ctype = numpy.result_type(x.dtype, numpy.complex64)
+
+    xf = numpy.fft.rfft2(_pad(x, ph, pw, h + ph * 2, w + pw * 2), s)
+    xf = xf.astype(ctype, copy=False).reshape(n, c, -1).transpose(2, 0, 1)
+    Wf = numpy.fft.rfft2(W, s).astype(ctype, copy=False)
+    Wf = Wf.reshape(out_c, c, -1).transpose(2, 1, 0).conj()
+    # (F, n, c_O) = (F, n, c_I) @ (F, c_I, c_O)
+    yf = numpy.matmul(xf, Wf).transpose(1, 2, 0)
+    yf = yf.reshape((n, out_c, s[0], s[1] // 2 + 1))
+    y = numpy.fft.irfft2(yf, s)[:, :, :out_h, :out_w]
+    return y.astype(x.dtype, copy=False)
+
+
+def fft_backward_filter(x, gy, kh, kw, ph, pw):
+    """Computes the gradient of filters by the fast Fourier transform.
+
+    Args:
+        x (numpy.ndarray): Input array of shape :math:`(n, c_I, h_I, w_I)`.
+        gy (numpy.ndarray): Gradient of the output of shape
+            :math:`(n, c_O, h_O, w_O)`.
+        kh (int): Height of filters.
+        kw (int): Width of filters.
+        ph (int): Padding height.
+        pw (int): Padding width.
+
+    Returns:
+        numpy.ndarray: Gradient of the filter of shape
+        :math:`(c_O, c_I, h_K, w_K)`.
+
+    """
+    n, c, h, w = x.shape
+    out_c = gy.shape[1]
+    s = (_fft_size(h + ph * 2), _fft_size(w + pw * 2))
+    ctype = numpy.result_type(x.dtype, numpy.complex64)
+
+    xf = numpy.fft.rfft2(_pad(x, ph, pw, h + ph * 2, w + pw * 2), s)
+    xf = xf.astype(ctype, copy=False).reshape(n, c, -1).transpose(2, 0, 1)
+    gyf = numpy.fft.rfft2(gy, s).astype(ctype, copy=False)
+    gyf = gyf.reshape(n, out_c, -1).transpose(2, 1, 0).conj()
+    # (F, c_O, c_I) = (F, c_O, n) @ (F, n, c_I)
+    gWf = numpy.matmul(gyf, xf).transpose(1, 2, 0)
+    gWf = gWf.reshape((out_c, c, s[0], s[1] // 2 + 1))
+    gW = numpy.fft.irfft2(gWf, s)[:, :, :kh, :kw]
+    return gW.astype(x.dtype, copy=False)
+
+
+def _choose_algorithm(n, c, h, w, out_c, kh, kw, ph, pw):
+    # The thresholds are measured on NumPy with OpenBLAS. Winograd pays for
+    # transforming the filters, which is amortized only over many tiles.
+    # FFT pays for complex products over the whole padded image, which is
+    # cheaper than im2col only for large filters.
+    if kh == 3 and kw == 3 and min(c, out_c) >= 16:
+        out_h = h + ph * 2 - 2
+        out_w = w + pw * 2 - 2
+        tiles = n * ((out_h + 1) // 2) * ((out_w + 1) // 2)
+        if tiles >= 4 * max(c, out_c):
+            return 'winograd'
+    if kh >= 7 and kw >= 7:
+        return 'fft'
+    return 'im2col'
+
+
+def _run(kind, candidates, x, y, kh, kw, ph, pw):
+    if not configuration.config.autotune:
+        n, c, h, w = x.shape
+        out_c = y.shape[1 if kind == 'backward_filter' else 0]
+        name = _choose_algorithm(n, c, h, w, out_c, kh, kw, ph, pw)
+        return dict(candidates)[name](x, y)
+
+    key = kind, x.shape, y.shape, x.dtype, ph, pw
+    with _algorithms_lock:
+        name = _algorithms.get(key)
+    if name is not None:
+        return dict(candidates)[name](x, y)
+
+    best = None
+    for name, func in candidates:
+        start = _clock()
+        out = func(x, y)
+        elapsed = _clock() - start
+        if best is None or elapsed < best[0]:
+            best = elapsed, name, out
+    with _algorithms_lock:
+        _algorithms[key] = best[1]
+    return best[2]
+
+
+def convolution_forward(x, W, ph, pw, im2col):
+    """Computes unit-stride convolution with the fastest algorithm.
+
+    Args:
+        x (numpy.ndarray): Input array of shape :math:`(n, c_I, h_I, w_I)`.
+        W (numpy.ndarray): Filter array of shape :math:`(c_O, c_I, h_K, w_K)`.
+        ph (int): Padding height.
+        pw (int): Padding width.
+        im2col (callable): Function computing the output from ``x`` and
+            ``W`` with :func:`~chainer.utils.conv.im2col_cpu`.
+
+    Returns:
+        numpy.ndarray: Output array of shape :math:`(n, c_O, h_O, w_O)`.
+
+    """
+    kh, kw = W.shape[2:]
+    candidates = [('im2col', im2col),
+                  ('fft', lambda x, W: fft_forward(x, W, ph, pw))]
+    if kh == 3 and kw == 3:
+        candidates.append(
+            ('winograd', lambda x, W: winograd_forward(x, W, ph, pw)))
+    return _run('forward', candidates, x, W, kh, kw, ph, pw)
+
+
+def convolution_backward_filter(x, gy, kh, kw, ph, pw, im2col):
+    """Computes the gradient of filters with the fastest algorithm.
+
+    Args:
+        x (numpy.ndarray): Input array of shape :math:`(n, c_I, h_I, w_I)`.
+        gy (numpy.ndarray): Gradient of the output of shape
+            :math:`(n, c_O, h_O, w_O)` computed with unit stride.
+        kh (int): Height of filters.
+        kw (int): Width of filters.
+        ph (int): Padding height.
+        pw (int): Padding width.
+        im2col (callable): Function computing the gradient from ``x`` and
+            ``gy`` with :func:`~chainer.utils.conv.im2col_cpu`.
+
+    Returns:
+        numpy.ndarray: Gradient of the filter of shape
+        :math:`(c_O, c_I, h_K, w_K)`.
+
+    """
+    candidates = [
+        ('im2col', im2col),
+        ('fft', lambda x, gy: fft_backward_filter(x, gy, kh, kw, ph, pw))]
+    if kh == 3 and kw == 3:
+        candidates.append(('winograd', lambda x, gy:
+                           winograd_backward_filter(x, gy, ph, pw)))
+    return _run('backward_filter', candidates, x, gy, kh, kw, ph, pw)
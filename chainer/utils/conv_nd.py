@@ -15,7 +15,8 @@ def as_tuple(x, n):
     return (x,) * n
 
 
-def im2col_nd_cpu(img, ksize, stride, pad, pval=0, cover_all=False, dilate=1):
+def im2col_nd_cpu(img, ksize, stride, pad, pval=0, cover_all=False, dilate=1,
+                  copy=True):
     n, c = img.shape[0:2]       # (n, c, d_1, d_2, ..., d_N)
     dims = img.shape[2:]
     ndim = len(dims)
@@ -29,7 +30,23 @@ def im2col_nd_cpu(img, ksize, stride, pad, pval=0, cover_all=False, dilate=1):
     # Pad around image.
     pad_width = ((0, 0), (0, 0)) + tuple(
         (p, p + s - 1) for (s, p) in zip(stride, pad))
-    img = numpy.pad(img, pad_width, mode='constant', constant_values=(pval,))
+    if any(p != 0 for p in itertools.chain(*pad_width)):
+        img = numpy.pad(
+            img, pad_width, mode='constant', constant_values=(pval,))
+
+    if not copy:
+        # Read-only view of the padded image without copying the patches.
+        for k, s, di, out, d in zip(
+                ksize, stride, dilate, outs, img.shape[2:]):
+            assert (k - 1) * di + (out - 1) * s < d
+        strides = img.strides[2:]
+        col = numpy.lib.stride_tricks.as_strided(
+            img, (n, c) + tuple(ksize) + outs,
+            img.strides[:2]
+            + tuple(st * di for (st, di) in zip(strides, dilate))
+            + tuple(st * s for (st, s) in zip(strides, stride)))
+        col.flags.writeable = False
+        return col
 
     # Make patch array with which we will compute correlation with filter.
     # shape: (n, c, k_1, k_2, ..., k_N, out_1, out_2, ..., out_N)
@@ -1,5 +1,8 @@
+import numpy
+
 import chainer
 from chainer import backend
+from chainer.utils import array
 
 
 class CooMatrix(object):
@@ -71,6 +74,98 @@ class CooMatrix(object):
             return x
 
 
+class RowSparseArray(object):
+
+    """An array whose elements are zero except for some rows.
+
+    The array is represented by the indices of the rows (i.e. the sub-arrays
+    along the first axis) which may be non-zero and the values of them.
+    Indices may be duplicated, in which case the corresponding rows are
+    summed up. It is typically used as a gradient of an embedding matrix,
+    which only has non-zero rows referenced in a mini-batch.
+
+    Args:
+        indices (numpy.ndarray or cupy.ndarray): The 1-D integer array of row
+            indices.
+        rows (numpy.ndarray or cupy.ndarray): The values of the rows. Its
+            shape must be ``(len(indices),) + shape[1:]``.
+        shape (tuple of int): The shape of the array in dense format.
+
+    .. seealso::
+        :func:`~chainer.functions.embed_id` produces row-sparse gradients
+        with ``sparse_grad=True``.
+
+    """
+
+    def __init__(self, indices, rows, shape):
+        shape = tuple(shape)
+        if indices.ndim != 1:
+            raise ValueError('ndim of indices must be 1.')
+        if len(shape) == 0:
+            raise ValueError('shape must have at least one dimension.')
+        if rows.shape != indices.shape + shape[1:]:
+            raise ValueError(
+                'shape of rows must be {}, but it is {}.'.format(
+                    indices.shape + shape[1:], rows.shape))
+        self.indices = indices
+        self.rows = rows
+        self.shape = shape
+
+    @property
+    def dtype(self):
+        return self.rows.dtype
+
+    def __add__(self, other):
+        if not isinstance(other, RowSparseArray):
+            return NotImplemented
+        if self.shape != other.shape:
+            raise ValueError('shapes of row-sparse arrays must be the same.')
+        xp = backend.get_array_module(self.rows)
+        return RowSparseArray(
+            xp.concatenate((self.indices, other.indices)),
+            xp.concatenate((self.rows, other.rows)), self.shape)
+
+    def add_to(self, x):
+        """Adds the rows to a dense array in place.
+
+        Args:
+            x (numpy.ndarray or cupy.ndarray): The dense array of the same
+                shape as this array.
+
+        """
+        if x.shape != self.shape:
+            raise ValueError('shape of x must be {}.'.format(self.shape))
+        if isinstance(x, numpy.ndarray):
+            array.scatter_add(x, self.indices, self.rows)
+        else:
+            x.scatter_add(self.indices, self.rows)
+
+    def to_dense(self):
+        """Returns a dense array format of this array."""
+        xp = backend.get_array_module(self.rows)
+        x = xp.zeros(self.shape, dtype=self.dtype)
+        self.add_to(x)
+        return x
+
+    def coalesce(self):
+        """Returns an equivalent array without duplicate indices.
+
+        Returns:
+            ~chainer.utils.RowSparseArray: A row-sparse array whose indices
+            are sorted and unique.
+
+        """
+        xp = backend.get_array_module(self.rows)
+        indices = xp.unique(self.indices)
+        if len(indices) == len(self.indices):
+            order = xp.argsort(self.indices)
+            return RowSparseArray(indices, self.rows[order], self.shape)
+        inverse = xp.searchsorted(indices, self.indices)
+        rows = RowSparseArray(
+            inverse, self.rows, (len(indices),) + self.shape[1:]).to_dense()
+        return RowSparseArray(indices, rows, self.shape)
+
+
 def to_coo(x, ldnz=None, requires_grad=False):
     """Returns a single or a batch of matrices in COO format.
 
@@ -1,8 +1,10 @@
+import collections
 import contextlib
 import functools
 import operator
 import sys
 import threading
+import weakref
 
 import numpy
 import six
@@ -626,3 +628,114 @@ def expect_broadcast_shapes(*shape_types):
         error = InvalidType('', '', msg='\n'.join(msgs))
     if error is not None:
         raise error
+
+
+class _Uncacheable(Exception):
+    pass
+
+
+def _get_value_key(value):
+    # Return a hashable key of an attribute value. Arrays are represented
+    # by their types, shapes and dtypes, since type checks do not depend
+    # on their contents.
+    if value is None or isinstance(
+            value, (bool, float, complex, str, bytes, numpy.generic,
+                    numpy.dtype, type) + six.integer_types):
+        return value
+    if isinstance(value, six.text_type):
+        return value
+    if isinstance(value, (tuple, list)):
+        return type(value), tuple([_get_value_key(v) for v in value])
+    if isinstance(value, chainer.get_array_types()):
+        return type(value), value.shape, value.dtype
+    if isinstance(value, chainer.Function):
+        # Old-style function wrapped by FunctionAdapter. It holds a strong
+        # reference to the adapter, which is not a hyperparameter.
+        return type(value), _get_attributes_key(value, ('_owned_node',))
+    raise _Uncacheable
+
+
+def _get_attributes_key(obj, ignore=()):
+    items = []
+    for name, value in six.iteritems(getattr(obj, '__dict__', {})):
+        if name in ignore or isinstance(value, weakref.ref):
+            # References to graph objects are not hyperparameters.
+            continue
+        items.append((name, _get_value_key(value)))
+    items.sort(key=lambda item: item[0])
+    return tuple(items)
+
+
+class SignatureCache(object):
+
+    """Cache of input signatures that passed the forward type check.
+
+    A signature consists of the types, shapes and dtypes of the input arrays
+    and the attributes of the function, which hold its hyperparameters.
+    Attributes that are arrays are represented by their types, shapes and
+    dtypes. If an attribute has any other type, the signature is not
+    cached and the type check is always performed.
+
+    The signatures are stored separately for each function class. When the
+    number of signatures of a class exceeds ``max_size``, the oldest one is
+    discarded.
+
+    Args:
+        max_size (int): The maximum number of signatures for each function
+            class.
+
+    """
+
+    def __init__(self, max_size=256):
+        if max_size < 0:
+            raise ValueError('max_size must not be negative')
+        self.max_size = max_size
+        # Maps a function class to an ordered dict of its signatures.
+        self._signatures = {}
+        self._lock = threading.Lock()
+
+    def get_key(self, func, in_data):
+        """Returns the signature of a function call.
+
+        Args:
+            func (~chainer.FunctionNode): The function.
+            in_data (tuple of arrays): The input arrays.
+
+        Returns:
+            The hashable signature, or ``None`` if it cannot be cached.
+
+        """
+        try:
+            attributes = _get_attributes_key(func)
+        except _Uncacheable:
+            return None
+        return (tuple([None if x is None else (type(x), x.shape, x.dtype)
+                       for x in in_data]),
+                attributes)
+
+    def is_verified(self, func, key):
+        """Returns ``True`` if the signature passed the type check."""
+        signatures = self._signatures.get(type(func))
+        return signatures is not None and key in signatures
+
+    def add(self, func, key):
+        """Records a signature that passed the type check."""
+        if self.max_size == 0:
+            return
+        with self._lock:
+            signatures = self._signatures.get(type(func))
+            if signatures is None:
+                signatures = collections.OrderedDict()
+                self._signatures[type(func)] = signatures
+            signatures[key] = True
+            while len(signatures) > self.max_size:
+                signatures.popitem(last=False)
+
+    def clear(self):
+        """Discards all signatures."""
+        with self._lock:
+            self._signatures.clear()
+
+
+signature_cache = SignatureCache()
+"""The :class:`SignatureCache` used by :class:`~chainer.FunctionNode`."""
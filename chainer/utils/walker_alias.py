@@ -13,15 +13,25 @@ class WalkerAlias(object):
     It is more efficient than :func:`~numpy.random.choice`.
     This class works on both CPU and GPU.
 
+    Drawing a sample has a fixed overhead per call, which dominates when
+    small samples are drawn many times, e.g., negative samples for each
+    mini-batch. If ``buffer_size`` is given, :meth:`sample` draws
+    ``buffer_size`` samples at once and serves the following calls from them
+    until they are used up.
+
     Args:
         probs (float list): Probabilities of entries. They are normalized with
                             `sum(probs)`.
+        buffer_size (int): Number of samples drawn at once. If it is ``0``,
+                           samples are drawn on each call.
 
     See: `Wikipedia article <https://en.wikipedia.org/wiki/Alias_method>`_
 
     """
 
-    def __init__(self, probs):
+    def __init__(self, probs, buffer_size=0):
+        if buffer_size < 0:
+            raise ValueError('buffer_size must be non-negative')
         prob = numpy.array(probs, numpy.float32)
         prob /= numpy.sum(prob)
         threshold = numpy.ndarray(len(probs), numpy.float32)
@@ -45,6 +55,9 @@ class WalkerAlias(object):
         assert((values < len(threshold)).all())
         self.threshold = threshold
         self.values = values
+        self.buffer_size = buffer_size
+        self._buffer = None
+        self._buffer_pos = 0
         self._device = backend.CpuDevice()
 
     @property
@@ -69,6 +82,7 @@ class WalkerAlias(object):
         self.threshold = device.send(self.threshold)
         self.values = device.send(self.values)
         self._device = device
+        self._buffer = None
         return self
 
     def to_gpu(self):
@@ -95,6 +109,19 @@ class WalkerAlias(object):
             if it is in GPU mode the return value is a :class:`cupy.ndarray`
             object.
         """
+        size = int(numpy.prod(shape))
+        if size > self.buffer_size:
+            return self._sample(shape)
+
+        if self._buffer is None or self._buffer_pos + size > self.buffer_size:
+            self._buffer = self._sample((self.buffer_size,))
+            self._buffer_pos = 0
+        pos = self._buffer_pos
+        self._buffer_pos += size
+        # The served samples are never served again, so a view is returned.
+        return self._buffer[pos:pos + size].reshape(shape)
+
+    def _sample(self, shape):
         xp = self._device.xp
         with chainer.using_device(self._device):
             if xp is cuda.cupy:
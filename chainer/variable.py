@@ -148,12 +148,17 @@ class VariableNode(object):
 
     """
 
-    _creator_node = None
-    _data = None
-    _rank = 0
-    # Name of the Function is assigned if this variable is a gradient generated
-    # by an old-style Function
-    _old_style_grad_generator = None
+    # Attributes are stored in slots to keep the memory footprint of the
+    # computational graph small. Subclasses that do not define ``__slots__``
+    # get a ``__dict__`` as usual.
+    __slots__ = (
+        '_variable', 'name', '_requires_grad', 'dtype', 'shape',
+        '_creator_node', '_data', '_rank',
+        # Name of the Function is assigned if this variable is a gradient
+        # generated by an old-style Function
+        '_old_style_grad_generator',
+        '__weakref__',
+    )
 
     def __init__(self, variable, name, **kwargs):
         if kwargs:
@@ -165,6 +170,10 @@ class VariableNode(object):
         self._variable = weakref.ref(variable)
         self.name = name
         self._requires_grad = variable.requires_grad
+        self._creator_node = None
+        self._data = None
+        self._rank = 0
+        self._old_style_grad_generator = None
 
         vdata = variable.data
         self._update_data_info(vdata)
@@ -468,27 +477,31 @@ class Variable(object):
 
     """  # NOQA
 
-    # Cached grad-stopped view of chainerx array. This is the return value
-    # of `array` and `data` properties.
-    _chainerx_nobp_array_cache = None
-
-    # Cached grad-stopped view of the array returned by `grad` property.
-    # It's a 2-element tuple, where the first is the original grad array and
-    # the second is a grad-stopped view of the first. `grad` property returns
-    # the second element.
-    _chainerx_grad_cache = None
-
-    _chainerx_name = None
-
-    # A NumPy, CuPy array cache to avoid redundant conversions between
-    # NumPy/CuPy and ChainerX.
-    # TODO(hvy): Avoid modifying this variable from outside this class.
-    _chainerx_fallback_array = None
-
-    # Used in non-ChainerX variables. The gradient array is stored in
-    # this attribute on Variable.grad setter to delay creation of grad_var
-    # instance.
-    _grad = None
+    # Attributes are stored in slots (see :class:`VariableNode`).
+    # Subclasses including :class:`Parameter` have ``__dict__`` unless they
+    # define ``__slots__`` by themselves.
+    __slots__ = (
+        '_data', '_node', '_requires_grad', '_loss_scale', '_grad_var',
+        '_device',
+        # Used in non-ChainerX variables. The gradient array is stored in
+        # this attribute on Variable.grad setter to delay creation of
+        # grad_var instance.
+        '_grad',
+        # Cached grad-stopped view of chainerx array. This is the return
+        # value of `array` and `data` properties.
+        '_chainerx_nobp_array_cache',
+        # Cached grad-stopped view of the array returned by `grad` property.
+        # It's a 2-element tuple, where the first is the original grad array
+        # and the second is a grad-stopped view of the first. `grad` property
+        # returns the second element.
+        '_chainerx_grad_cache',
+        '_chainerx_name',
+        # A NumPy, CuPy array cache to avoid redundant conversions between
+        # NumPy/CuPy and ChainerX.
+        # TODO(hvy): Avoid modifying this variable from outside this class.
+        '_chainerx_fallback_array',
+        '__weakref__',
+    )
 
     def __init__(self, data=None, **kwargs):
         name, grad, requires_grad = argument.parse_kwargs(
@@ -511,6 +524,11 @@ class Variable(object):
         self._loss_scale = None
         self._grad_var = None
         self._device = None
+        self._grad = None
+        self._chainerx_nobp_array_cache = None
+        self._chainerx_grad_cache = None
+        self._chainerx_name = None
+        self._chainerx_fallback_array = None
 
         if isinstance(data, chainerx.ndarray):
             if not requires_grad and grad is not None:
@@ -531,7 +549,10 @@ class Variable(object):
         return self._copy_to(Variable())
 
     def _copy_to(self, target):
-        target.__dict__ = copy.copy(self.__dict__)
+        for name in _variable_slots:
+            setattr(target, name, getattr(self, name))
+        if hasattr(self, '__dict__'):
+            target.__dict__ = copy.copy(self.__dict__)
         target._node = VariableNode(target, self.name)
         return target
 
@@ -1310,7 +1331,9 @@ class Variable(object):
                 arr, enable_double_backprop=enable_double_backprop)
             return
 
-        with chainer.using_config('enable_backprop', enable_double_backprop):
+        with chainer.using_config('enable_backprop', enable_double_backprop), \
+                _backprop_utils.sparse_grad_mode(
+                    not enable_double_backprop, loss_scale):
             self._backward_main(retain_grad, loss_scale)
 
     def _backward_main(self, retain_grad, loss_scale):
@@ -1323,7 +1346,11 @@ class Variable(object):
 
         cand_funcs = []
         seen_set = set()
-        grads = _backprop_utils.GradTable(load_if_new=True)
+        # Gradients can be summed up in place unless the backprop is
+        # differentiable.
+        grads = _backprop_utils.GradTable(
+            load_if_new=True,
+            inplace=not chainer.config.enable_backprop)
 
         # Initialize error by 1, if this is a loss variable
         if self.array.size == 1 and self.grad_var is None:
@@ -1345,11 +1372,31 @@ class Variable(object):
                 self.grad *= loss_scale
         grads[self._node] = self.grad_var
 
+        def prepare(func):
+            target_input_indexes = tuple([
+                i for i, x in enumerate(func.inputs) if x.requires_grad
+            ])
+            outputs = [y() for y in func.outputs]  # access via weak ref
+            out_grad = tuple([grads.pop(y) for y in outputs])
+            return target_input_indexes, out_grad, outputs
+
+        parallel = None
+        n_workers = chainer.config.backward_workers
+        if (n_workers > 1
+                and not chainer.config.enable_backprop
+                and not chainer.is_debug()
+                and not chainer.get_function_hooks()):
+            parallel = _backprop_utils.ParallelBackward(
+                n_workers, [self.creator_node], lambda x: x.requires_grad,
+                prepare)
+
         def add_cand(cand):
             if cand not in seen_set:
                 # Negate since heapq is min-heap
                 heapq.heappush(cand_funcs, (-cand.rank, len(seen_set), cand))
                 seen_set.add(cand)
+                if parallel is not None:
+                    parallel.push(cand)
 
         add_cand(self.creator_node)
         leaf_nodes = set()
@@ -1357,12 +1404,15 @@ class Variable(object):
         while cand_funcs:
             _, _, func = heapq.heappop(cand_funcs)
             inputs = func.inputs
-            target_input_indexes = tuple([
-                i for i, x in enumerate(inputs) if x.requires_grad
-            ])
-            outputs = [y() for y in func.outputs]  # access via weak ref
-            out_grad = tuple([grads.pop(y) for y in outputs])
+            if parallel is None:
+                target_input_indexes, out_grad, outputs = prepare(func)
+                gxs = None
+            else:
+                target_input_indexes, out_grad, outputs, gxs = (
+                    parallel.get(func))
             if not target_input_indexes:
+                if parallel is not None:
+                    parallel.done(func)
                 continue
 
             in_data = tuple([x.data for x in inputs])
@@ -1390,8 +1440,13 @@ class Variable(object):
                         # to reduce memory usage
                         x._set_grad_var_if_available(None)
 
-                _backprop_utils.backprop_step(
-                    func, target_input_indexes, out_grad, in_grad)
+                if gxs is None:
+                    _backprop_utils.backprop_step(
+                        func, target_input_indexes, out_grad, in_grad)
+                else:
+                    _backprop_utils._accumulate_grads(
+                        func, target_input_indexes, gxs, in_grad, False)
+                    del gxs  # to reduce memory usage
 
                 for hook in hooks:
                     hook.backward_postprocess(func, in_data, out_grad_array)
@@ -1416,6 +1471,9 @@ class Variable(object):
                     add_cand(x.creator_node)
             del gx, in_grad  # to reduce memory usage
 
+            if parallel is not None:
+                parallel.done(func)
+
         for x in leaf_nodes:
             x_var = x.get_variable_or_none()
             gx = grads.pop(x)
@@ -1423,6 +1481,7 @@ class Variable(object):
                 x_var._set_grad_var_without_check(gx)
                 x_var._loss_scale = loss_scale
         grads.assert_no_grads()
+        grads.record_stats()
 
     def reshape(self, *shape):
         """Returns a variable of a different shape and the same content.
@@ -1539,6 +1598,11 @@ class Variable(object):
     __hash__ = None
 
 
+# Slots copied by Variable.__copy__. __weakref__ is excluded.
+_variable_slots = tuple(
+    name for name in Variable.__slots__ if name != '__weakref__')
+
+
 class Parameter(Variable):
 
     """Parameter variable that can be registered to a link.
@@ -1611,6 +1675,7 @@ class Parameter(Variable):
             super(Parameter, self).__init__(data, name=name, grad=grad)
 
         self._initial_device = backend.CpuDevice()
+        self._sparse_grad = None
         self.update_rule = None
         self.initializer = initializer
 
@@ -1675,13 +1740,76 @@ class Parameter(Variable):
         self._initial_device = device
         super(Parameter, self)._to_device(device, allow_unchaining=True)
 
+    @property
+    def sparse_grad(self):
+        """Row-sparse gradient accumulated separately from :attr:`grad`.
+
+        It is a :class:`~chainer.utils.RowSparseArray` or ``None``. Functions
+        such as :func:`~chainer.functions.embed_id` with ``sparse_grad=True``
+        accumulate gradients to it instead of :attr:`grad`, so that update
+        rules can only update the referenced rows. The gradient of the
+        parameter is the sum of :attr:`grad` and this gradient.
+
+        """
+        return self._sparse_grad
+
+    @sparse_grad.setter
+    def sparse_grad(self, g):
+        if g is not None and g.shape != self.shape:
+            raise ValueError(
+                'Shape of data and sparse grad mismatch\n'
+                'sparse grad: %s != data: %s' % (g.shape, self.shape))
+        self._sparse_grad = g
+
+    def add_sparse_grad(self, g):
+        """Accumulates a row-sparse gradient.
+
+        Args:
+            g (~chainer.utils.RowSparseArray): Gradient to accumulate.
+
+        """
+        if self._sparse_grad is not None:
+            g = self._sparse_grad + g
+        self.sparse_grad = g
+
+    def densify_sparse_grad(self):
+        """Merges :attr:`sparse_grad` into :attr:`grad`.
+
+        It is used where dense gradients are required, e.g. by optimizer
+        hooks and communicators reducing gradients across processes. After
+        the call, :attr:`sparse_grad` is ``None``.
+
+        """
+        sparse_grad = self._sparse_grad
+        if sparse_grad is None:
+            return
+        self._sparse_grad = None
+        if self.grad is None:
+            self.grad = sparse_grad.to_dense()
+        else:
+            sparse_grad.add_to(self.grad)
+
+    def addgrad(self, var):
+        super(Parameter, self).addgrad(var)
+        sparse_grad = getattr(var, 'sparse_grad', None)
+        if sparse_grad is None:
+            return
+        if self.array is None:
+            self.initialize(var.shape)
+        device = self.device
+        self.add_sparse_grad(chainer.utils.RowSparseArray(
+            device.send(sparse_grad.indices), device.send(sparse_grad.rows),
+            sparse_grad.shape))
+
     def cleargrad(self):
         super(Parameter, self).cleargrad()
+        self._sparse_grad = None
         if self.array is None:
             self._grad_initializer = None
 
     def zerograd(self):
         super(Parameter, self).zerograd()
+        self._sparse_grad = None
         if self.array is None:
             dtype = getattr(self.initializer, 'dtype', None)
             self._grad_initializer = initializers.Zero(dtype)
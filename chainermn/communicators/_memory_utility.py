@@ -90,8 +90,13 @@ def extract_params_set_data(model):
 
 
 def extract_params_set_grad(model):
-    return [param for _, param in sorted(model.namedparams())
-            if param.grad is not None]
+    params = []
+    for _, param in sorted(model.namedparams()):
+        # Row-sparse gradients are reduced as dense arrays.
+        param.densify_sparse_grad()
+        if param.grad is not None:
+            params.append(param)
+    return params
 
 
 def pack_params(params, itemsize, attr_name, buffer, stream=None):
@@ -116,6 +116,7 @@ class _DoubleBufferingOptimizer(object):
         for param1, param2 in zip(target1_params, target2_params):
             _, var1 = param1
             _, var2 = param2
+            var1.densify_sparse_grad()
             var1.grad, var2.grad = var2.grad, var1.grad
 
     def wait(self):
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+"""Benchmark of scaled dot-product attention on CPU.
+
+This script compares the time and the peak host memory of the forward and
+backward computation of the attention composed of :func:`F.matmul` and
+:func:`F.softmax` with those of :func:`F.scaled_dot_product_attention`.
+"""
+import argparse
+import time
+import tracemalloc
+
+import numpy
+
+import chainer
+import chainer.functions as F
+
+
+def naive_attention(q, k, v, causal):
+    s = F.matmul(q, k, transb=True) * (1. / numpy.sqrt(q.shape[-1]))
+    if causal:
+        lq, lk = s.shape[-2:]
+        mask = numpy.arange(lq)[:, None] >= numpy.arange(lk)
+        s = F.where(mask, s, numpy.full(s.shape, -numpy.inf, s.dtype))
+    return F.matmul(F.softmax(s, axis=-1), v)
+
+
+def fused_attention(q, k, v, causal, block_size):
+    return F.scaled_dot_product_attention(
+        q, k, v, causal=causal, block_size=block_size)
+
+
+def measure(attention, inputs, gy, n_repeat):
+    times = []
+    peak = 0
+    for _ in range(n_repeat):
+        q, k, v = [chainer.Variable(x) for x in inputs]
+        tracemalloc.start()
+        start = time.time()
+        y = attention(q, k, v)
+        y.grad = gy
+        y.backward()
+        times.append(time.time() - start)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        del q, k, v, y
+    return numpy.mean(times) * 1000, peak / 2. ** 20
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Chainer example: scaled dot-product attention benchmark')
+    parser.add_argument('--lengths', '-l', type=int, nargs='+',
+                        default=[512, 1024, 2048, 4096, 8192],
+                        help='Sequence lengths to benchmark')
+    parser.add_argument('--batchsize', '-b', type=int, default=1,
+                        help='Number of sequences in a mini-batch')
+    parser.add_argument('--heads', type=int, default=4,
+                        help='Number of attention heads')
+    parser.add_argument('--dim', '-d', type=int, default=64,
+                        help='Dimension of each head')
+    parser.add_argument('--block-size', type=int, default=256,
+                        help='Block size of the fused attention')
+    parser.add_argument('--causal', action='store_true',
+                        help='Use the causal mask')
+    parser.add_argument('--naive-max-length', type=int, default=4096,
+                        help='Maximum length to run the naive attention, '
+                        'whose memory usage is quadratic in the length')
+    parser.add_argument('--repeat', '-r', type=int, default=3,
+                        help='Number of iterations to measure')
+    args = parser.parse_args()
+
+    print('batchsize: {}, heads: {}, dim: {}, causal: {}'.format(
+        args.batchsize, args.heads, args.dim, args.causal))
+    print('{:>8}  {:>6}  {:>10}  {:>12}'.format(
+        'length', 'mode', 'time(ms)', 'memory(MiB)'))
+    for length in args.lengths:
+        shape = (args.batchsize, args.heads, length, args.dim)
+        inputs = [numpy.random.uniform(-1, 1, shape).astype(numpy.float32)
+                  for _ in range(3)]
+        gy = numpy.random.uniform(-1, 1, shape).astype(numpy.float32)
+
+        modes = [('fused', lambda q, k, v: fused_attention(
+            q, k, v, args.causal, args.block_size))]
+        if length <= args.naive_max_length:
+            modes.insert(0, ('naive', lambda q, k, v: naive_attention(
+                q, k, v, args.causal)))
+        for name, attention in modes:
+            elapsed, memory = measure(attention, inputs, gy, args.repeat)
+            print('{:>8}  {:>6}  {:>10.1f}  {:>12.1f}'.format(
+                length, name, elapsed, memory))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+"""Benchmark of the computational graph construction on CPU.
+
+This script builds a chain of small functions and reports the host memory
+held by the computational graph per function node and the number of
+functions applied per second, i.e., the overhead of
+:class:`chainer.Variable`, :class:`chainer.variable.VariableNode` and
+:class:`chainer.FunctionNode` that dominates models with many small
+operations.
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+import numpy
+
+import chainer
+import chainer.functions as F
+
+
+def build(x, n_nodes):
+    h = x
+    for _ in range(n_nodes):
+        h = F.identity(h)
+    return h
+
+
+def measure_memory(x, n_nodes):
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    y = build(chainer.Variable(x), n_nodes)
+    retained = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    del y
+    return retained / float(n_nodes)
+
+
+def measure_speed(x, n_nodes, n_repeat):
+    times = []
+    for _ in range(n_repeat):
+        v = chainer.Variable(x)
+        start = time.time()
+        y = build(v, n_nodes)
+        times.append(time.time() - start)
+        del v, y
+    return n_nodes / min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Chainer example: graph construction benchmark')
+    parser.add_argument('--nodes', '-n', type=int, default=10000,
+                        help='Number of function nodes in the graph')
+    parser.add_argument('--repeat', '-r', type=int, default=5,
+                        help='Number of iterations to measure the speed')
+    args = parser.parse_args()
+
+    x = numpy.zeros((1,), numpy.float32)
+    bytes_per_node = measure_memory(x, args.nodes)
+    ops_per_sec = measure_speed(x, args.nodes, args.repeat)
+    print('nodes: {}'.format(args.nodes))
+    print('bytes/node: {:.0f}'.format(bytes_per_node))
+    print('ops/sec: {:.0f}'.format(ops_per_sec))
+
+
+if __name__ == '__main__':
+    main()
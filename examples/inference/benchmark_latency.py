@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+"""Benchmark of per-request inference latency on CPU.
+
+This script compares the latency of the usual inference, which runs a model
+under ``no_backprop_mode`` with ``train`` set to ``False``, with that of
+:meth:`chainer.Link.inference`, which runs functions directly on arrays.
+"""
+import argparse
+import time
+
+import numpy
+
+import chainer
+import chainer.functions as F
+import chainer.links as L
+
+
+class MLP(chainer.Chain):
+
+    def __init__(self, n_units, n_out):
+        super(MLP, self).__init__()
+        with self.init_scope():
+            self.l1 = L.Linear(784, n_units)
+            self.l2 = L.Linear(n_units, n_units)
+            self.l3 = L.Linear(n_units, n_out)
+
+    def forward(self, x):
+        h1 = F.relu(self.l1(x))
+        h2 = F.relu(self.l2(h1))
+        return self.l3(h2)
+
+
+class ResNet50(chainer.Chain):
+
+    def __init__(self):
+        super(ResNet50, self).__init__()
+        with self.init_scope():
+            self.resnet = L.ResNet50Layers(pretrained_model=None)
+
+    def forward(self, x):
+        return self.resnet(x, layers=['prob'])['prob']
+
+
+def measure(predict, x, n_warmup, n_repeat):
+    for _ in range(n_warmup):
+        predict(x)
+    latencies = []
+    for _ in range(n_repeat):
+        start = time.time()
+        predict(x)
+        latencies.append(time.time() - start)
+    return numpy.array(latencies) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Chainer example: inference latency benchmark')
+    parser.add_argument('--model', '-m', choices=('mlp', 'resnet50'),
+                        default='mlp', help='Model to benchmark')
+    parser.add_argument('--batchsize', '-b', type=int, default=1,
+                        help='Number of examples in each request')
+    parser.add_argument('--repeat', '-r', type=int, default=None,
+                        help='Number of requests to measure')
+    parser.add_argument('--warmup', '-w', type=int, default=10,
+                        help='Number of requests before measurement')
+    parser.add_argument('--unit', '-u', type=int, default=1000,
+                        help='Number of units of the MLP')
+    args = parser.parse_args()
+
+    if args.model == 'mlp':
+        model = MLP(args.unit, 10)
+        x = numpy.random.uniform(
+            0, 1, (args.batchsize, 784)).astype(numpy.float32)
+        repeat = args.repeat or 1000
+    else:
+        model = ResNet50()
+        x = numpy.random.uniform(
+            0, 255, (args.batchsize, 3, 224, 224)).astype(numpy.float32)
+        repeat = args.repeat or 20
+
+    def predict_variable(x):
+        with chainer.using_config('train', False), \
+                chainer.no_backprop_mode():
+            return model(x).array
+
+    def predict_array(x):
+        return model.inference(x)
+
+    numpy.testing.assert_allclose(
+        predict_variable(x), predict_array(x), rtol=1e-5, atol=1e-6)
+
+    print('model: {}, batchsize: {}, requests: {}'.format(
+        args.model, args.batchsize, repeat))
+    print('{:>10}  {:>10}  {:>10}  {:>10}'.format(
+        'mode', 'mean(ms)', 'p50(ms)', 'p99(ms)'))
+    for name, predict in (('variable', predict_variable),
+                          ('array', predict_array)):
+        latencies = measure(predict, x, args.warmup, repeat)
+        print('{:>10}  {:>10.3f}  {:>10.3f}  {:>10.3f}'.format(
+            name, latencies.mean(), numpy.percentile(latencies, 50),
+            numpy.percentile(latencies, 99)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+"""Report of the host memory held by the computational graph.
+
+This script measures the bytes allocated by the forward computation of a
+model that are still held when the loss is computed, i.e., the memory kept
+by the computational graph for backpropagation, with and without
+``chainer.config.pack_masks``.
+"""
+import argparse
+import tracemalloc
+
+import numpy
+
+import chainer
+import chainer.functions as F
+import chainer.links as L
+
+
+class MLP(chainer.Chain):
+
+    def __init__(self, n_units, n_out):
+        super(MLP, self).__init__()
+        with self.init_scope():
+            self.l1 = L.Linear(784, n_units)
+            self.l2 = L.Linear(n_units, n_units)
+            self.l3 = L.Linear(n_units, n_out)
+
+    def forward(self, x):
+        h1 = F.dropout(F.relu(self.l1(x)))
+        h2 = F.dropout(F.relu(self.l2(h1)))
+        return self.l3(h2)
+
+
+class ResNet50(chainer.Chain):
+
+    def __init__(self):
+        super(ResNet50, self).__init__()
+        with self.init_scope():
+            self.resnet = L.ResNet50Layers(pretrained_model=None)
+
+    def forward(self, x):
+        return self.resnet(x, layers=['fc6'])['fc6']
+
+
+def measure(model, x, t, pack_masks):
+    with chainer.using_config('pack_masks', pack_masks):
+        tracemalloc.start()
+        loss = F.softmax_cross_entropy(model(x), t)
+        retained = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        loss.backward()
+    model.cleargrads()
+    return retained / 2. ** 20
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Chainer example: retained memory report')
+    parser.add_argument('--model', '-m', choices=('mlp', 'resnet50'),
+                        default='resnet50', help='Model to measure')
+    parser.add_argument('--batchsize', '-b', type=int, default=8,
+                        help='Number of examples in each mini-batch')
+    parser.add_argument('--unit', '-u', type=int, default=1000,
+                        help='Number of units of the MLP')
+    args = parser.parse_args()
+
+    if args.model == 'mlp':
+        model = MLP(args.unit, 10)
+        x = numpy.random.uniform(
+            0, 1, (args.batchsize, 784)).astype(numpy.float32)
+    else:
+        model = ResNet50()
+        x = numpy.random.uniform(
+            0, 255, (args.batchsize, 3, 224, 224)).astype(numpy.float32)
+    t = numpy.random.randint(0, 10, args.batchsize).astype(numpy.int32)
+
+    print('model: {}, batchsize: {}'.format(args.model, args.batchsize))
+    print('{:>10}  {:>14}'.format('pack_masks', 'retained(MiB)'))
+    for pack_masks in (False, True):
+        retained = measure(model, x, t, pack_masks)
+        print('{:>10}  {:>14.1f}'.format(str(pack_masks), retained))
+
+
+if __name__ == '__main__':
+    main()
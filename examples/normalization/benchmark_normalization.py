@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+"""Benchmark of batch and layer normalization on CPU.
+
+This script compares the time and the peak host memory of the forward and
+backward computation of :func:`F.batch_normalization` and
+:func:`F.layer_normalization` with those of the same normalization composed
+of basic functions such as :func:`F.mean` and :func:`F.broadcast_to`.
+"""
+import argparse
+import time
+import tracemalloc
+
+import numpy
+
+import chainer
+import chainer.functions as F
+
+
+def composed_batch_normalization(x, gamma, beta, eps=2e-5):
+    axis = (0,) + tuple(range(2, x.ndim))
+    shape = (1, x.shape[1]) + (1,) * (x.ndim - 2)
+    mean = F.broadcast_to(F.reshape(F.mean(x, axis=axis), shape), x.shape)
+    x_mu = x - mean
+    var = F.mean(F.square(x_mu), axis=axis)
+    inv_std = F.broadcast_to(
+        F.reshape((var + eps) ** -0.5, shape), x.shape)
+    gamma = F.broadcast_to(F.reshape(gamma, shape), x.shape)
+    beta = F.broadcast_to(F.reshape(beta, shape), x.shape)
+    return gamma * x_mu * inv_std + beta
+
+
+def composed_layer_normalization(x, gamma, beta, eps=1e-5):
+    mean = F.broadcast_to(F.mean(x, axis=1, keepdims=True), x.shape)
+    x_mu = x - mean
+    var = F.mean(F.square(x_mu), axis=1, keepdims=True)
+    inv_std = F.broadcast_to((var + eps) ** -0.5, x.shape)
+    gamma = F.broadcast_to(gamma, x.shape)
+    beta = F.broadcast_to(beta, x.shape)
+    return gamma * x_mu * inv_std + beta
+
+
+def measure(normalization, inputs, gy, n_repeat):
+    times = []
+    peak = 0
+    for _ in range(n_repeat):
+        x, gamma, beta = [chainer.Variable(a) for a in inputs]
+        tracemalloc.start()
+        start = time.time()
+        y = normalization(x, gamma, beta)
+        y.grad = gy
+        y.backward()
+        times.append(time.time() - start)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        del x, gamma, beta, y
+    return numpy.mean(times) * 1000, peak / 2. ** 20
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Chainer example: normalization benchmark')
+    parser.add_argument('--batchsize', '-b', type=int, default=32,
+                        help='Number of examples in each mini-batch')
+    parser.add_argument('--channels', '-c', type=int, default=64,
+                        help='Number of channels of batch normalization')
+    parser.add_argument('--size', '-s', type=int, default=56,
+                        help='Height and width of batch normalization')
+    parser.add_argument('--rows', type=int, default=4096,
+                        help='Number of rows of layer normalization')
+    parser.add_argument('--units', '-u', type=int, default=1024,
+                        help='Number of units of layer normalization')
+    parser.add_argument('--repeat', '-r', type=int, default=3,
+                        help='Number of iterations to measure')
+    args = parser.parse_args()
+
+    benchmarks = [
+        ('batch', (args.batchsize, args.channels, args.size, args.size),
+         F.batch_normalization, composed_batch_normalization),
+        ('layer', (args.rows, args.units),
+         F.layer_normalization, composed_layer_normalization),
+    ]
+    print('{:>6}  {:>9}  {:>10}  {:>12}'.format(
+        'norm', 'mode', 'time(ms)', 'memory(MiB)'))
+    for name, shape, fused, composed in benchmarks:
+        x = numpy.random.uniform(-1, 1, shape).astype(numpy.float32)
+        gamma = numpy.random.uniform(.5, 1, shape[1]).astype(numpy.float32)
+        beta = numpy.random.uniform(-1, 1, shape[1]).astype(numpy.float32)
+        gy = numpy.random.uniform(-1, 1, shape).astype(numpy.float32)
+        for mode, normalization in (('composed', composed),
+                                    ('function', fused)):
+            elapsed, memory = measure(
+                normalization, (x, gamma, beta), gy, args.repeat)
+            print('{:>6}  {:>9}  {:>10.1f}  {:>12.1f}'.format(
+                name, mode, elapsed, memory))
+
+
+if __name__ == '__main__':
+    main()
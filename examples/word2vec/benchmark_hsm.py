@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+"""Benchmark of the hierarchical softmax on CPU.
+
+This script measures the time to make a Huffman tree of a large vocabulary
+and to build :class:`chainer.links.BinaryHierarchicalSoftmax` from it, and
+the time and the peak host memory of the forward and backward computation
+of the loss.
+"""
+import argparse
+import time
+import tracemalloc
+
+import numpy
+
+import chainer
+import chainer.links as L
+
+
+def make_counts(n_vocab):
+    # Word counts following Zipf's law. Many rare words have the same
+    # counts as in real corpora.
+    counts = 1000000 // numpy.arange(1, n_vocab + 1) + 1
+    return {i: int(c) for i, c in enumerate(counts)}
+
+
+def measure(hsm, x, t, n_repeat):
+    times = []
+    peak = 0
+    for _ in range(n_repeat):
+        hsm.cleargrads()
+        v = chainer.Variable(x)
+        tracemalloc.start()
+        start = time.time()
+        loss = hsm(v, t)
+        loss.backward()
+        times.append(time.time() - start)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        del v, loss
+    return numpy.mean(times) * 1000, peak / 2. ** 20
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Chainer example: hierarchical softmax benchmark')
+    parser.add_argument('--vocab', '-v', type=int, default=1000000,
+                        help='Number of words in the vocabulary')
+    parser.add_argument('--batchsize', '-b', type=int, default=1000,
+                        help='Number of examples in each mini-batch')
+    parser.add_argument('--unit', '-u', type=int, default=100,
+                        help='Number of units')
+    parser.add_argument('--repeat', '-r', type=int, default=5,
+                        help='Number of iterations to measure')
+    parser.add_argument('--min-variance', action='store_true',
+                        help='Make the minimum-variance Huffman tree')
+    args = parser.parse_args()
+
+    counts = make_counts(args.vocab)
+    start = time.time()
+    if args.min_variance:
+        tree = L.BinaryHierarchicalSoftmax.create_huffman_tree(
+            counts, min_variance=True)
+    else:
+        tree = L.BinaryHierarchicalSoftmax.create_huffman_tree(counts)
+    tree_time = time.time() - start
+
+    start = time.time()
+    hsm = L.BinaryHierarchicalSoftmax(args.unit, tree)
+    build_time = time.time() - start
+
+    x = numpy.random.uniform(
+        -1, 1, (args.batchsize, args.unit)).astype(numpy.float32)
+    # Samples the words by their counts.
+    p = numpy.array([counts[i] for i in range(args.vocab)], numpy.float64)
+    t = numpy.random.choice(
+        args.vocab, args.batchsize, p=p / p.sum()).astype(numpy.int32)
+    elapsed, memory = measure(hsm, x, t, args.repeat)
+
+    print('vocab: {}'.format(args.vocab))
+    print('huffman tree: {:.2f} sec'.format(tree_time))
+    print('link construction: {:.2f} sec'.format(build_time))
+    print('forward and backward: {:.1f} ms, {:.1f} MiB'.format(
+        elapsed, memory))
+
+
+if __name__ == '__main__':
+    main()
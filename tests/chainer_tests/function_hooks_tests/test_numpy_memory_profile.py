@@ -0,0 +1,119 @@
+import gc
+import unittest
+
+import numpy
+import six
+
+import chainer
+from chainer import function_hooks
+from chainer import functions
+from chainer.functions.math import basic_math
+from chainer import testing
+
+
+class SimpleLink(chainer.Link):
+
+    def __init__(self):
+        super(SimpleLink, self).__init__()
+        with self.init_scope():
+            init_w = numpy.random.uniform(-1, 1, (300, 500)).astype(
+                numpy.float32)
+            self.w = chainer.Parameter(init_w)
+
+    def forward(self, x):
+        return self.w * x
+
+
+class TestNumpyMemoryProfileHook(unittest.TestCase):
+
+    def setUp(self):
+        self.h = function_hooks.NumpyMemoryProfileHook()
+        self.l = SimpleLink()
+        self.x = numpy.random.uniform(
+            -0.1, 0.1, (300, 500)).astype(numpy.float32)
+        self.gy = numpy.random.uniform(
+            -0.1, 0.1, (300, 500)).astype(numpy.float32)
+
+    def test_name(self):
+        self.assertEqual(self.h.name, 'NumpyMemoryProfileHook')
+
+    def test_forward(self):
+        with self.h:
+            y = self.l(chainer.Variable(self.x))
+        self.assertEqual(1, len(self.h.call_history))
+        name, used_bytes, retained_bytes, depth = self.h.call_history[0]
+        self.assertEqual(name, basic_math.Mul.__name__)
+        # The output is allocated in forward.
+        self.assertGreaterEqual(used_bytes, self.x.nbytes)
+        # Mul retains both inputs.
+        self.assertEqual(retained_bytes, self.x.nbytes * 2)
+        self.assertEqual(depth, 0)
+        self.assertEqual(self.h.retained_bytes(), self.x.nbytes * 2)
+
+        del y
+        gc.collect()
+        self.assertEqual(self.h.retained_bytes(), 0)
+        self.assertEqual(self.h.peak_retained_bytes(), self.x.nbytes * 2)
+
+    def test_forward_no_backprop(self):
+        with self.h, chainer.no_backprop_mode():
+            self.l(chainer.Variable(self.x))
+        self.assertEqual(self.h.call_history[0][2], 0)
+        self.assertEqual(self.h.retained_bytes(), 0)
+
+    def test_shared_retained_array(self):
+        x = chainer.Variable(self.x)
+        with self.h:
+            h = functions.relu(x)
+            y = h * h
+        # The output of ReLU is retained by ReLU and twice by Mul.
+        self.assertEqual(self.h.retained_bytes(), self.x.nbytes)
+        self.assertEqual(self.h.call_history[1][2], 0)
+        del h, y
+        gc.collect()
+        self.assertEqual(self.h.retained_bytes(), 0)
+
+    def test_backward(self):
+        x = chainer.Variable(self.x)
+        y = self.l(x)
+        y.grad = self.gy
+        with self.h:
+            y.backward()
+        self.assertTrue(self.h.call_history)
+        for _, used_bytes, retained_bytes, _ in self.h.call_history:
+            self.assertGreaterEqual(used_bytes, 0)
+            self.assertEqual(retained_bytes, 0)
+
+    def test_total_used_bytes(self):
+        with self.h:
+            self.l(chainer.Variable(self.x))
+            self.l(chainer.Variable(self.x))
+        total = sum(used for _, used, _, _ in self.h.call_history)
+        self.assertEqual(self.h.total_used_bytes(), total)
+
+    def test_summary(self):
+        with self.h:
+            y1 = self.l(chainer.Variable(self.x))
+            y2 = self.l(chainer.Variable(self.x))
+        summary = self.h.summary()
+        del y1, y2
+        self.assertEqual(list(summary.keys()), ['Mul'])
+        self.assertEqual(summary['Mul']['occurrence'], 2)
+        # The weight and the input are shared by both calls.
+        self.assertEqual(summary['Mul']['retained_bytes'],
+                         self.x.nbytes * 2)
+
+    def test_print_report(self):
+        with self.h:
+            self.l(chainer.Variable(self.x))
+        f = six.StringIO()
+        self.h.print_report(file=f)
+        lines = f.getvalue().splitlines()
+        self.assertEqual(
+            lines[0].split(),
+            ['FunctionName', 'UsedBytes', 'RetainedBytes', 'Occurrence'])
+        self.assertEqual(lines[1].split()[0], 'Mul')
+        self.assertTrue(lines[2].startswith('Retained bytes:'))
+
+
+testing.run_module(__name__, __file__)
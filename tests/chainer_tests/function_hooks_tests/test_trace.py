@@ -0,0 +1,179 @@
+import json
+import threading
+import unittest
+
+import numpy
+import six
+
+import chainer
+from chainer.backends import cuda
+from chainer import function_hooks
+from chainer.function_hooks import trace
+from chainer import functions
+from chainer import links
+from chainer import testing
+from chainer.testing import attr
+from chainer import training
+
+
+class SimpleChain(chainer.Chain):
+
+    def __init__(self):
+        super(SimpleChain, self).__init__()
+        with self.init_scope():
+            self.l1 = links.Linear(5, 4)
+            self.l2 = links.Linear(4, 3)
+
+    def forward(self, x):
+        return self.l2(functions.relu(self.l1(x)))
+
+
+class TestTraceHook(unittest.TestCase):
+
+    def setUp(self):
+        self.h = function_hooks.TraceHook()
+        self.model = SimpleChain()
+        self.x = numpy.random.uniform(-1, 1, (2, 5)).astype(numpy.float32)
+
+    def test_name(self):
+        self.assertEqual(self.h.name, 'TraceHook')
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            function_hooks.TraceHook(max_events=0)
+        with self.assertRaises(ValueError):
+            function_hooks.TraceHook(sample_interval=0)
+
+    def check_forward(self, x):
+        with self.h:
+            self.model(x)
+        events = list(self.h.events)
+        names = [event[0] for event in events]
+        self.assertEqual(names, [
+            'LinearFunction', 'Linear(l1)', 'ReLU', 'LinearFunction',
+            'Linear(l2)', 'SimpleChain'])
+        paths = [event[5] for event in events]
+        self.assertEqual(paths[0], ('SimpleChain', 'Linear(l1)',
+                                    'LinearFunction'))
+        self.assertEqual(paths[2], ('SimpleChain', 'ReLU'))
+        tid = threading.current_thread().ident
+        for name, category, thread, begin, end, _ in events:
+            self.assertEqual(thread, tid)
+            self.assertLessEqual(begin, end)
+        self.assertEqual(events[0][1], 'forward')
+        self.assertEqual(events[1][1], 'link')
+
+    def test_forward_cpu(self):
+        self.check_forward(self.x)
+
+    @attr.gpu
+    def test_forward_gpu(self):
+        self.model.to_gpu()
+        self.check_forward(cuda.to_gpu(self.x))
+
+    def test_backward(self):
+        y = functions.sum(self.model(self.x))
+        with self.h:
+            y.backward()
+        backward_names = [event[0] for event in self.h.events
+                          if event[1] == 'backward']
+        self.assertIn('LinearFunction', backward_names)
+        # Functions called in backward are nested under the backward record.
+        for event in self.h.events:
+            if event[1] == 'forward':
+                self.assertGreater(len(event[5]), 1)
+
+    def test_ring_buffer(self):
+        h = function_hooks.TraceHook(max_events=2)
+        with h:
+            self.model(self.x)
+        self.assertEqual([event[0] for event in h.events],
+                         ['Linear(l2)', 'SimpleChain'])
+        h.clear()
+        self.assertEqual(len(h.events), 0)
+
+    def test_phase(self):
+        with self.h:
+            with trace.phase('outer'):
+                with trace.phase('inner'):
+                    self.model(self.x)
+        self.assertEqual(self.h.events[-1][:2], ('outer', 'phase'))
+        self.assertEqual(self.h.events[-2][5], ('outer', 'inner'))
+        self.assertEqual(self.h.events[0][5][:3],
+                         ('outer', 'inner', 'SimpleChain'))
+
+    def test_phase_without_hook(self):
+        with trace.phase('outer'):
+            self.model(self.x)
+        self.assertEqual(len(self.h.events), 0)
+
+    def test_sample_interval(self):
+        h = function_hooks.TraceHook(sample_interval=2)
+        with h:
+            for i in six.moves.range(4):
+                with trace.phase('update', i):
+                    self.model(self.x)
+                with trace.phase('extension'):
+                    pass
+        self.assertEqual(
+            sum(1 for event in h.events if event[0] == 'update'), 2)
+        self.assertEqual(
+            sum(1 for event in h.events if event[0] == 'extension'), 2)
+        self.assertEqual(
+            sum(1 for event in h.events if event[0] == 'ReLU'), 2)
+
+    def test_chrome_trace(self):
+        with self.h:
+            self.model(self.x)
+        f = six.StringIO()
+        self.h.save_chrome_trace(f)
+        data = json.loads(f.getvalue())
+        events = [event for event in data['traceEvents']
+                  if event['ph'] == 'X']
+        self.assertEqual(len(events), 6)
+        for event in events:
+            self.assertGreaterEqual(event['ts'], 0)
+            self.assertGreaterEqual(event['dur'], 0)
+        metadata = [event for event in data['traceEvents']
+                    if event['ph'] == 'M']
+        self.assertEqual(metadata[0]['args']['name'],
+                         threading.current_thread().name)
+
+    def test_folded_stacks(self):
+        self.h.events.extend([
+            ('f', 'forward', 0, 1.0, 1.25, ('a', 'f')),
+            ('g', 'forward', 0, 1.5, 1.625, ('a', 'g')),
+            ('a', 'phase', 0, 0.5, 2.0, ('a',)),
+        ])
+        f = six.StringIO()
+        self.h.save_folded_stacks(f)
+        self.assertEqual(f.getvalue().splitlines(),
+                         ['a;f 250000', 'a;g 125000', 'a 1125000'])
+
+
+class TestTraceHookTrainer(unittest.TestCase):
+
+    def test_phases(self):
+        model = links.Classifier(SimpleChain())
+        optimizer = chainer.optimizers.SGD()
+        optimizer.setup(model)
+        x = numpy.random.uniform(-1, 1, (6, 5)).astype(numpy.float32)
+        t = numpy.random.randint(0, 3, (6,)).astype(numpy.int32)
+        iterator = chainer.iterators.SerialIterator(
+            chainer.datasets.TupleDataset(x, t), 3)
+        updater = training.updaters.StandardUpdater(iterator, optimizer)
+        trainer = training.Trainer(updater, (2, 'iteration'))
+        trainer.extend(lambda trainer: None, name='ext')
+
+        hook = function_hooks.TraceHook()
+        with hook:
+            trainer.run()
+        phases = [event[5] for event in hook.events
+                  if event[1] == 'phase']
+        self.assertEqual(phases, [
+            ('update', 'iterator'), ('update', 'converter'),
+            ('update', 'forward'), ('update', 'backward'),
+            ('update', 'optimizer'), ('update',), ('ext',)] * 2)
+
+
+testing.run_module(__name__, __file__)
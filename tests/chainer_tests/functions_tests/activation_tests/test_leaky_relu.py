@@ -97,4 +97,43 @@ class TestLeakyReLU(unittest.TestCase):
         self.check_double_backward(self.x, self.gy, self.ggx, backend_config)
 
 
+@testing.parameterize(*testing.product({
+    'slope': [0.2, -0.2],
+    'dtype': [numpy.float16, numpy.float32, numpy.float64],
+}))
+@testing.fix_random()
+class TestLeakyReLUPackMasks(unittest.TestCase):
+
+    def setUp(self):
+        self.x = numpy.random.uniform(-1, 1, (3, 5)).astype(self.dtype)
+        # Avoid unstability of numerical grad
+        self.x[(-0.05 < self.x) & (self.x < 0.05)] = 0.5
+        self.gy = numpy.random.uniform(-1, 1, (3, 5)).astype(self.dtype)
+        self.ggx = numpy.random.uniform(-1, 1, (3, 5)).astype(self.dtype)
+        self.check_backward_options = {}
+        self.check_double_backward_options = {}
+        if self.dtype == numpy.float16:
+            self.check_backward_options = {'atol': 5e-4, 'rtol': 5e-3}
+            self.check_double_backward_options = {'atol': 5e-3, 'rtol': 5e-2}
+
+    def f(self, x):
+        return functions.leaky_relu(x, self.slope)
+
+    def test_forward(self):
+        with chainer.using_config('pack_masks', True):
+            y = self.f(self.x)
+        assert y.creator._get_retained_arrays() == []
+        y_expect = numpy.where(self.x >= 0, self.x, self.x * self.slope)
+        testing.assert_allclose(y.array, y_expect)
+
+    def test_backward(self):
+        with chainer.using_config('pack_masks', True):
+            gradient_check.check_backward(
+                self.f, self.x, self.gy, dtype=numpy.float64,
+                **self.check_backward_options)
+            gradient_check.check_double_backward(
+                self.f, self.x, self.gy, self.ggx, dtype=numpy.float64,
+                **self.check_double_backward_options)
+
+
 testing.run_module(__name__, __file__)
@@ -161,4 +161,32 @@ class TestReLUCudnnCall(unittest.TestCase):
                 self.assertEqual(func.called, self.expect)
 
 
+@testing.parameterize(*testing.product({
+    'dtype': [numpy.float16, numpy.float32, numpy.float64],
+}))
+class TestReLUPackMasks(unittest.TestCase):
+
+    def setUp(self):
+        self.x = numpy.random.uniform(-1, 1, (3, 5)).astype(self.dtype)
+        # Avoid unstability of numerical grad
+        self.x[(-0.1 < self.x) & (self.x < 0.1)] = 0.5
+        self.gy = numpy.random.uniform(-1, 1, (3, 5)).astype(self.dtype)
+        self.ggx = numpy.random.uniform(-1, 1, (3, 5)).astype(self.dtype)
+
+    def test_forward(self):
+        with chainer.using_config('pack_masks', True):
+            y = functions.relu(self.x)
+        assert y.creator._get_retained_arrays() == []
+        assert y.creator._packed_mask[0].nbytes == 2
+        testing.assert_allclose(y.array, numpy.maximum(self.x, 0))
+
+    def test_backward(self):
+        with chainer.using_config('pack_masks', True):
+            gradient_check.check_backward(
+                functions.relu, self.x, self.gy, dtype=numpy.float64)
+            gradient_check.check_double_backward(
+                functions.relu, self.x, self.gy, self.ggx,
+                dtype=numpy.float64)
+
+
 testing.run_module(__name__, __file__)
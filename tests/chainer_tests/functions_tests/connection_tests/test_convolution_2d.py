@@ -10,6 +10,7 @@ from chainer import testing
 from chainer.testing import attr
 from chainer.testing import backend
 from chainer.testing import condition
+from chainer.utils import conv
 
 
 @testing.parameterize(*(testing.product({
@@ -370,4 +371,52 @@ class TestConvolution2DBackwardNoncontiguousGradOutputs(unittest.TestCase):
         z.backward()
 
 
+@testing.parameterize(*testing.product({
+    'workspace_size': [None, 1, 1000, 10000],
+    'dtype': [numpy.float16, numpy.float32],
+}))
+class TestConvolution2DWorkspace(unittest.TestCase):
+
+    def setUp(self):
+        self.x = numpy.random.uniform(-1, 1, (3, 4, 9, 8)).astype(self.dtype)
+        self.W = numpy.random.uniform(
+            -1, 1, (5, 4, 3, 2)).astype(self.dtype)
+        self.gy = numpy.random.uniform(
+            -1, 1, (3, 5, 5, 3)).astype(self.dtype)
+        self.original_size = conv.get_im2col_workspace_size()
+        self.check_options = {'atol': 1e-3, 'rtol': 1e-3}
+        if self.dtype == numpy.float16:
+            self.check_options = {'atol': 1e-2, 'rtol': 1e-2}
+
+    def tearDown(self):
+        conv.set_im2col_workspace_size(self.original_size)
+
+    def forward_backward(self, func, inputs, gy):
+        inputs = [chainer.Variable(x) for x in inputs]
+        y = func(*inputs)
+        y.grad = gy
+        y.backward()
+        return [y.array] + [x.grad for x in inputs]
+
+    def check(self, func, inputs, gy):
+        conv.set_im2col_workspace_size(None)
+        expect = self.forward_backward(func, inputs, gy)
+        conv.set_im2col_workspace_size(self.workspace_size)
+        actual = self.forward_backward(func, inputs, gy)
+        for e, a in zip(expect, actual):
+            testing.assert_allclose(e, a, **self.check_options)
+
+    def test_convolution_2d(self):
+        self.check(
+            lambda x, W: F.convolution_2d(
+                x, W, stride=(2, 3), pad=1, dilate=(1, 2)),
+            (self.x, self.W), self.gy)
+
+    def test_deconvolution_2d(self):
+        self.check(
+            lambda gy, W: F.deconvolution_2d(
+                gy, W, stride=(2, 3), pad=1, outsize=(9, 8)),
+            (self.gy, self.W), self.x)
+
+
 testing.run_module(__name__, __file__)
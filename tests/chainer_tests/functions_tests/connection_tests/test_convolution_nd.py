@@ -531,4 +531,39 @@ class TestConvolutionNDWrappers(unittest.TestCase):
             F.convolution_3d(x, W, b)
 
 
+@testing.parameterize(*testing.product({
+    'workspace_size': [None, 1, 1000, 10000],
+    'dims': [(7,), (7, 6), (7, 6, 5)],
+}))
+class TestConvolutionNDWorkspace(unittest.TestCase):
+
+    def setUp(self):
+        ndim = len(self.dims)
+        self.x = numpy.random.uniform(
+            -1, 1, (3, 4) + self.dims).astype(numpy.float32)
+        self.W = numpy.random.uniform(
+            -1, 1, (5, 4) + (3, 2, 2)[:ndim]).astype(numpy.float32)
+        self.stride = (2, 1, 3)[:ndim]
+        self.original_size = conv.get_im2col_workspace_size()
+
+    def tearDown(self):
+        conv.set_im2col_workspace_size(self.original_size)
+
+    def forward_backward(self):
+        x = chainer.Variable(self.x)
+        W = chainer.Variable(self.W)
+        y = F.convolution_nd(x, W, stride=self.stride, pad=1)
+        y.grad = numpy.ones_like(y.array)
+        y.backward()
+        return y.array, x.grad, W.grad
+
+    def test_workspace(self):
+        conv.set_im2col_workspace_size(None)
+        expect = self.forward_backward()
+        conv.set_im2col_workspace_size(self.workspace_size)
+        actual = self.forward_backward()
+        for e, a in zip(expect, actual):
+            testing.assert_allclose(e, a, atol=1e-4, rtol=1e-4)
+
+
 testing.run_module(__name__, __file__)
@@ -93,6 +93,117 @@ class TestEmbedID(unittest.TestCase):
             cuda.to_gpu(self.ggW))
 
 
+@testing.parameterize(
+    {'x_data': [0, 1, 0], 'ignore_label': None},
+    {'x_data': [[0, 1, 0], [1, 0, 1]], 'ignore_label': None},
+    {'x_data': [0, 1, -1], 'ignore_label': -1},
+    {'x_data': [[0, 1, -1], [-1, 0, 1]], 'ignore_label': -1},
+)
+class TestEmbedIDSparseGrad(unittest.TestCase):
+
+    def setUp(self):
+        self.x = numpy.array(self.x_data, dtype='i')
+        self.W = numpy.random.uniform(-1, 1, (3, 2)).astype('f')
+        self.gy = numpy.random.uniform(
+            -1, 1, self.x.shape + (2,)).astype('f')
+
+    def check_sparse_grad(self, x_data, W_data, gy_data):
+        W = chainer.Parameter(W_data)
+        y = chainer.functions.embed_id(
+            x_data, W, self.ignore_label, sparse_grad=True)
+        y.grad = gy_data
+        y.backward()
+        assert W.grad is None
+        assert isinstance(W.sparse_grad, chainer.utils.RowSparseArray)
+
+        W_dense = chainer.Parameter(W_data)
+        y = chainer.functions.embed_id(x_data, W_dense, self.ignore_label)
+        y.grad = gy_data
+        y.backward()
+        testing.assert_allclose(W_dense.grad, W.sparse_grad.to_dense())
+
+    def test_sparse_grad_cpu(self):
+        self.check_sparse_grad(self.x, self.W, self.gy)
+
+    @attr.gpu
+    def test_sparse_grad_gpu(self):
+        self.check_sparse_grad(
+            cuda.to_gpu(self.x), cuda.to_gpu(self.W), cuda.to_gpu(self.gy))
+
+    def test_sparse_grad_accumulate(self):
+        W = chainer.Parameter(self.W)
+        for _ in range(2):
+            y = chainer.functions.embed_id(
+                self.x, W, self.ignore_label, sparse_grad=True)
+            y.grad = self.gy
+            y.backward()
+        W_dense = chainer.Parameter(self.W)
+        W_dense.cleargrad()
+        for _ in range(2):
+            y = chainer.functions.embed_id(self.x, W_dense, self.ignore_label)
+            y.grad = self.gy
+            y.backward()
+        testing.assert_allclose(W_dense.grad, W.sparse_grad.to_dense())
+
+        W.cleargrad()
+        assert W.sparse_grad is None
+
+    def test_non_parameter(self):
+        W = chainer.Variable(self.W)
+        y = chainer.functions.embed_id(
+            self.x, W, self.ignore_label, sparse_grad=True)
+        y.grad = self.gy
+        y.backward()
+        assert W.grad is not None
+
+    def test_grad(self):
+        # chainer.grad returns the dense gradient without side effects.
+        W = chainer.Parameter(self.W)
+        y = chainer.functions.embed_id(
+            self.x, W, self.ignore_label, sparse_grad=True)
+        gW, = chainer.grad([y], [W], [self.gy])
+        assert W.sparse_grad is None
+
+        W_dense = chainer.Parameter(self.W)
+        y = chainer.functions.embed_id(self.x, W_dense, self.ignore_label)
+        y.grad = self.gy
+        y.backward()
+        testing.assert_allclose(W_dense.grad, gW.array)
+
+    def test_backward_workers(self):
+        W = chainer.Parameter(self.W)
+        y = chainer.functions.embed_id(
+            self.x, W, self.ignore_label, sparse_grad=True)
+        loss = chainer.functions.sum(y * self.gy)
+        with chainer.using_config('backward_workers', 2):
+            loss.backward()
+        assert W.grad is None
+
+        W_dense = chainer.Parameter(self.W)
+        y = chainer.functions.embed_id(self.x, W_dense, self.ignore_label)
+        y.grad = self.gy
+        y.backward()
+        testing.assert_allclose(W_dense.grad, W.sparse_grad.to_dense())
+
+    def test_backward_workers_shared(self):
+        # Many backward computations accumulating to the same parameter on
+        # the worker threads give the same gradient as the serial backprop.
+        def backward(n_workers):
+            W = chainer.Parameter(self.W)
+            ys = [chainer.functions.embed_id(
+                self.x, W, self.ignore_label, sparse_grad=True)
+                for _ in range(200)]
+            loss = chainer.functions.sum(chainer.functions.stack(ys))
+            with chainer.using_config('backward_workers', n_workers):
+                loss.backward()
+            return W.sparse_grad
+
+        expected = backward(1)
+        actual = backward(4)
+        numpy.testing.assert_array_equal(expected.indices, actual.indices)
+        numpy.testing.assert_array_equal(expected.rows, actual.rows)
+
+
 @testing.parameterize(
     {'x_data': [0, 1, 0], 'ignore_label': None},
     {'x_data': [[0, 1, 0], [1, 0, 1]], 'ignore_label': None},
@@ -1,10 +1,14 @@
 import unittest
 
 import numpy
+import pytest
 
 import chainer
 from chainer.backends import cuda
 from chainer import functions
+from chainer.functions.connection import n_step_gru
+from chainer.functions.connection import n_step_lstm
+from chainer.functions.connection import n_step_rnn
 from chainer import gradient_check
 from chainer import testing
 from chainer.testing import attr
@@ -471,4 +475,204 @@ class TestNStepBiRNN(unittest.TestCase):
         self.check_call_cudnn_backward('auto')
 
 
+def _one_directional_rnn_reference(rnn_mode, lengths, reverse, x, h, c,
+                                   ws, bs):
+    # Applies the per-step implementation used on GPU without cuDNN.
+    if rnn_mode == 'lstm':
+        f = n_step_lstm._lstm
+    elif rnn_mode == 'gru':
+        f = n_step_gru._gru
+    else:
+        def f(x, h, c, w, b):
+            a = functions.linear(x, w[0], b[0]) + \
+                functions.linear(h, w[1], b[1])
+            if rnn_mode == 'rnn_tanh':
+                return functions.tanh(a), None
+            return functions.relu(a), None
+    xs = functions.split_axis(x, numpy.cumsum(lengths[:-1]), 0)
+    if reverse:
+        xs = xs[::-1]
+    h, c, ys = n_step_rnn._one_directional_loop(f, xs, h, c, ws, bs)
+    if reverse:
+        ys.reverse()
+    return (functions.concat(ys, axis=0), h) + ((c,) if c is not None else ())
+
+
+@testing.parameterize(*testing.product({
+    'rnn_mode': ['rnn_tanh', 'rnn_relu', 'gru', 'lstm'],
+    'reverse': [False, True],
+}))
+class TestOneDirectionalRNN(unittest.TestCase):
+
+    lengths = [3, 3, 2, 1]
+    in_size = 3
+    out_size = 4
+
+    def setUp(self):
+        n_W = {'rnn_tanh': 2, 'rnn_relu': 2, 'gru': 6, 'lstm': 8}
+        n_W = n_W[self.rnn_mode]
+        self.x = _shaped_random((sum(self.lengths), self.in_size), 'd')
+        h_shape = (self.lengths[0], self.out_size)
+        self.states = [_shaped_random(h_shape, 'd')]
+        if self.rnn_mode == 'lstm':
+            self.states.append(_shaped_random(h_shape, 'd'))
+        self.ws = [
+            _shaped_random((self.out_size, self.in_size if j < n_W // 2
+                            else self.out_size), 'd')
+            for j in range(n_W)]
+        self.bs = [_shaped_random((self.out_size,), 'd') for _ in range(n_W)]
+        self.inputs = [self.x] + self.states + self.ws + self.bs
+        self.gys = [_shaped_random((sum(self.lengths), self.out_size), 'd')]
+        self.gys += [_shaped_random(h_shape, 'd') for _ in self.states]
+
+    def rnn(self, *inputs):
+        return n_step_rnn.OneDirectionalRNN(
+            self.rnn_mode, self.lengths, self.reverse)(*inputs)
+
+    def reference(self, *inputs):
+        n_states = len(self.states)
+        x, states = inputs[0], inputs[1:1 + n_states]
+        n_W = len(self.ws)
+        ws = inputs[1 + n_states:1 + n_states + n_W]
+        bs = inputs[1 + n_states + n_W:]
+        c = states[1] if n_states == 2 else None
+        return _one_directional_rnn_reference(
+            self.rnn_mode, self.lengths, self.reverse, x, states[0], c,
+            ws, bs)
+
+    def test_forward(self):
+        ys = self.rnn(*self.inputs)
+        ys_expect = self.reference(*self.inputs)
+        assert len(ys) == len(ys_expect)
+        for y, y_expect in zip(ys, ys_expect):
+            testing.assert_allclose(y.array, y_expect.array)
+
+    def backward(self, ys):
+        loss = sum(functions.sum(y * gy) for y, gy in zip(ys, self.gys))
+        loss.backward()
+
+    def test_backward(self):
+        inputs = [chainer.Variable(x) for x in self.inputs]
+        self.backward(self.rnn(*inputs))
+
+        inputs_expect = [chainer.Variable(x) for x in self.inputs]
+        self.backward(self.reference(*inputs_expect))
+        for x, x_expect in zip(inputs, inputs_expect):
+            testing.assert_allclose(x.grad, x_expect.grad)
+
+    def test_backward_gradient_check(self):
+        gradient_check.check_backward(
+            self.rnn, self.inputs, self.gys, dtype=numpy.float64,
+            atol=1e-4, rtol=1e-4)
+
+
+@testing.parameterize(*testing.product({
+    'rnn_mode': ['rnn_tanh', 'rnn_relu', 'gru', 'lstm'],
+    'use_bi_direction': [False, True],
+}))
+class TestNStepRNNDoubleBackprop(unittest.TestCase):
+
+    batches = [2, 2, 1]
+    n_layers = 2
+    in_size = 2
+    out_size = 2
+
+    def setUp(self):
+        n_W = {'rnn_tanh': 2, 'rnn_relu': 2, 'gru': 6, 'lstm': 8}
+        n_W = n_W[self.rnn_mode]
+        direction = 2 if self.use_bi_direction else 1
+        self.xs = [_shaped_random((b, self.in_size), 'd')
+                   for b in self.batches]
+        h_shape = (self.n_layers * direction, self.batches[0], self.out_size)
+        self.states = [_shaped_random(h_shape, 'd')]
+        if self.rnn_mode == 'lstm':
+            self.states.append(_shaped_random(h_shape, 'd'))
+        self.ws = []
+        self.bs = []
+        for layer in range(self.n_layers):
+            for _ in range(direction):
+                if layer == 0:
+                    in_size = self.in_size
+                else:
+                    in_size = self.out_size * direction
+                self.ws.append([
+                    _shaped_random((self.out_size, in_size if j < n_W // 2
+                                    else self.out_size), 'd')
+                    for j in range(n_W)])
+                self.bs.append([_shaped_random((self.out_size,), 'd')
+                                for _ in range(n_W)])
+        self.inputs = self.states + sum(self.ws, []) + sum(self.bs, []) + \
+            self.xs
+        self.gys = [_shaped_random(h.shape, 'd') for h in self.states] + \
+            [_shaped_random((b, self.out_size * direction), 'd')
+             for b in self.batches]
+        self.ggs = [_shaped_random(x.shape, 'd') for x in self.inputs]
+
+    def rnn(self, *inputs, **kwargs):
+        n_states = len(self.states)
+        states, inputs = _split(inputs, n_states)
+        n_W = len(self.ws[0])
+        ws = []
+        for _ in self.ws:
+            w, inputs = _split(inputs, n_W)
+            ws.append(w)
+        bs = []
+        for _ in self.bs:
+            b, inputs = _split(inputs, n_W)
+            bs.append(b)
+        xs = inputs
+        args = (self.n_layers, 0.0) + tuple(states) + (ws, bs, xs)
+        if self.rnn_mode == 'lstm':
+            if self.use_bi_direction:
+                outputs = functions.n_step_bilstm(*args, **kwargs)
+            else:
+                outputs = functions.n_step_lstm(*args, **kwargs)
+        elif self.rnn_mode == 'gru':
+            if self.use_bi_direction:
+                outputs = functions.n_step_bigru(*args, **kwargs)
+            else:
+                outputs = functions.n_step_gru(*args, **kwargs)
+        else:
+            activation = self.rnn_mode[4:]
+            if self.use_bi_direction:
+                outputs = functions.n_step_birnn(
+                    *args, activation=activation, **kwargs)
+            else:
+                outputs = functions.n_step_rnn(
+                    *args, activation=activation, **kwargs)
+        return outputs[:-1] + tuple(outputs[-1])
+
+    def test_double_backward(self):
+        def f(*inputs):
+            return self.rnn(*inputs, enable_double_backprop=True)
+
+        gradient_check.check_double_backward(
+            f, self.inputs, self.gys, self.ggs, dtype=numpy.float64,
+            atol=1e-4, rtol=1e-4)
+
+    def test_no_double_backprop(self):
+        inputs = [chainer.Variable(x) for x in self.inputs]
+        ys = self.rnn(*inputs)
+        gx, = chainer.grad(ys[:1], inputs[:1], self.gys[:1],
+                           enable_double_backprop=True)
+        with pytest.raises(RuntimeError):
+            gx.grad = numpy.ones_like(gx.array)
+            gx.backward()
+
+    def test_consistency(self):
+        # The fused and per-step implementations compute the same outputs
+        # and gradients.
+        inputs = [chainer.Variable(x) for x in self.inputs]
+        results = []
+        for enable_double_backprop in (False, True):
+            ys = self.rnn(
+                *inputs, enable_double_backprop=enable_double_backprop)
+            results.append(
+                [y.array for y in ys] +
+                [g.array for g in chainer.grad(
+                    ys, inputs, [chainer.Variable(gy) for gy in self.gys])])
+        for a, b in zip(*results):
+            testing.assert_allclose(a, b)
+
+
 testing.run_module(__name__, __file__)
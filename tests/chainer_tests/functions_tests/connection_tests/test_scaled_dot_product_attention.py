@@ -0,0 +1,183 @@
+import unittest
+
+import numpy
+import pytest
+
+import chainer
+from chainer.backends import cuda
+from chainer import functions
+from chainer import gradient_check
+from chainer import testing
+from chainer.testing import attr
+
+
+def _attention(q, k, v, mask, causal, scale):
+    s = numpy.matmul(q, k.swapaxes(-1, -2)).astype(numpy.float64) * scale
+    lq, lk = s.shape[-2:]
+    if mask is None:
+        mask = numpy.ones(s.shape, bool)
+    mask = numpy.broadcast_to(mask, s.shape)
+    if causal:
+        mask = mask & (numpy.arange(lq)[:, None] >= numpy.arange(lk))
+    s = numpy.where(mask, s, -numpy.inf)
+    y = numpy.zeros(q.shape[:-1] + v.shape[-1:])
+    for i in numpy.ndindex(*s.shape[:-1]):
+        if mask[i].any():
+            p = numpy.exp(s[i] - s[i].max())
+            y[i] = (p / p.sum()).dot(v[i[:-1]])
+    return y.astype(q.dtype)
+
+
+@testing.parameterize(*testing.product({
+    'shape': [
+        # (batch shape, Lq, Lk, d, dv)
+        ((2,), 5, 7, 3, 4),
+        ((2, 3), 6, 6, 4, 4),
+        ((), 9, 4, 2, 3),
+    ],
+    'mask': [None, 'keys', 'full'],
+    'causal': [False, True],
+    'block_size': [2, 256],
+    'dtype': [numpy.float16, numpy.float32, numpy.float64],
+}))
+class TestScaledDotProductAttention(unittest.TestCase):
+
+    def setUp(self):
+        batch, lq, lk, d, dv = self.shape
+        self.q = numpy.random.uniform(
+            -1, 1, batch + (lq, d)).astype(self.dtype)
+        self.k = numpy.random.uniform(
+            -1, 1, batch + (lk, d)).astype(self.dtype)
+        self.v = numpy.random.uniform(
+            -1, 1, batch + (lk, dv)).astype(self.dtype)
+        self.gy = numpy.random.uniform(
+            -1, 1, batch + (lq, dv)).astype(self.dtype)
+        if self.mask == 'keys':
+            # Masks keys with the same pattern for all queries. The first
+            # query attends to no keys if it is combined with the causal mask.
+            self.mask = numpy.ones(batch + (1, lk), bool)
+            self.mask[..., 0] = False
+        elif self.mask == 'full':
+            self.mask = numpy.random.uniform(size=batch + (lq, lk)) > 0.3
+        self.scale = 1. / numpy.sqrt(d)
+
+        self.check_forward_options = {}
+        self.check_backward_options = {'dtype': numpy.float64}
+        if self.dtype == numpy.float16:
+            self.check_forward_options = {'atol': 5e-3, 'rtol': 5e-3}
+            self.check_backward_options = {
+                'dtype': numpy.float64, 'atol': 5e-3, 'rtol': 5e-2}
+
+    def check_forward(self, q, k, v, mask):
+        y = functions.scaled_dot_product_attention(
+            q, k, v, mask=mask, causal=self.causal,
+            block_size=self.block_size)
+        assert y.dtype == self.dtype
+        y_expect = _attention(
+            self.q, self.k, self.v, self.mask, self.causal, self.scale)
+        testing.assert_allclose(
+            y_expect, y.array, **self.check_forward_options)
+
+    def test_forward_cpu(self):
+        self.check_forward(self.q, self.k, self.v, self.mask)
+
+    @attr.gpu
+    def test_forward_gpu(self):
+        mask = None if self.mask is None else cuda.to_gpu(self.mask)
+        self.check_forward(
+            cuda.to_gpu(self.q), cuda.to_gpu(self.k), cuda.to_gpu(self.v),
+            mask)
+
+    def check_backward(self, q, k, v, mask, gy, enable_double_backprop):
+        def f(q, k, v):
+            return functions.scaled_dot_product_attention(
+                q, k, v, mask=mask, causal=self.causal,
+                block_size=self.block_size,
+                enable_double_backprop=enable_double_backprop)
+
+        gradient_check.check_backward(
+            f, (q, k, v), gy, **self.check_backward_options)
+
+    def test_backward_cpu(self):
+        self.check_backward(
+            self.q, self.k, self.v, self.mask, self.gy, False)
+
+    def test_backward_double_backprop_cpu(self):
+        self.check_backward(
+            self.q, self.k, self.v, self.mask, self.gy, True)
+
+    @attr.gpu
+    def test_backward_gpu(self):
+        mask = None if self.mask is None else cuda.to_gpu(self.mask)
+        self.check_backward(
+            cuda.to_gpu(self.q), cuda.to_gpu(self.k), cuda.to_gpu(self.v),
+            mask, cuda.to_gpu(self.gy), False)
+
+    def test_consistency_cpu(self):
+        # The blocked and graph implementations compute the same gradients.
+        q, k, v = [chainer.Variable(x) for x in (self.q, self.k, self.v)]
+        grads = []
+        for enable_double_backprop in (False, True):
+            y = functions.scaled_dot_product_attention(
+                q, k, v, mask=self.mask, causal=self.causal,
+                block_size=self.block_size,
+                enable_double_backprop=enable_double_backprop)
+            grads.append(chainer.grad([y], [q, k, v], [self.gy]))
+        for g1, g2 in zip(*grads):
+            testing.assert_allclose(
+                g1.array, g2.array, **self.check_forward_options)
+
+
+class TestScaledDotProductAttentionDoubleBackprop(unittest.TestCase):
+
+    def setUp(self):
+        self.q = numpy.random.uniform(-1, 1, (2, 3, 4)).astype(numpy.float64)
+        self.k = numpy.random.uniform(-1, 1, (2, 5, 4)).astype(numpy.float64)
+        self.v = numpy.random.uniform(-1, 1, (2, 5, 2)).astype(numpy.float64)
+        self.gy = numpy.random.uniform(-1, 1, (2, 3, 2)).astype(numpy.float64)
+        self.ggq = numpy.random.uniform(-1, 1, self.q.shape)
+        self.ggk = numpy.random.uniform(-1, 1, self.k.shape)
+        self.ggv = numpy.random.uniform(-1, 1, self.v.shape)
+
+    def test_double_backward(self):
+        def f(q, k, v):
+            return functions.scaled_dot_product_attention(
+                q, k, v, causal=True, enable_double_backprop=True)
+
+        gradient_check.check_double_backward(
+            f, (self.q, self.k, self.v), self.gy,
+            (self.ggq, self.ggk, self.ggv))
+
+    def test_no_double_backprop(self):
+        q, k, v = [chainer.Variable(x) for x in (self.q, self.k, self.v)]
+        y = functions.scaled_dot_product_attention(q, k, v)
+        gq, = chainer.grad([y], [q], [self.gy], enable_double_backprop=True)
+        with pytest.raises(RuntimeError):
+            gq.grad = numpy.ones_like(gq.array)
+            gq.backward()
+
+
+class TestScaledDotProductAttentionInvalid(unittest.TestCase):
+
+    def setUp(self):
+        self.q = numpy.zeros((2, 3, 4), numpy.float32)
+        self.k = numpy.zeros((2, 5, 4), numpy.float32)
+        self.v = numpy.zeros((2, 5, 2), numpy.float32)
+
+    def test_invalid_block_size(self):
+        with pytest.raises(ValueError):
+            functions.scaled_dot_product_attention(
+                self.q, self.k, self.v, block_size=0)
+
+    def test_invalid_key_size(self):
+        with pytest.raises(chainer.utils.type_check.InvalidType):
+            functions.scaled_dot_product_attention(
+                self.q, self.k[:, :, :3], self.v)
+
+    def test_invalid_value_length(self):
+        with pytest.raises(chainer.utils.type_check.InvalidType):
+            functions.scaled_dot_product_attention(
+                self.q, self.k, self.v[:, :4])
+
+
+testing.run_module(__name__, __file__)
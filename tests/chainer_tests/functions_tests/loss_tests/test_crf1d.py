@@ -21,6 +21,10 @@ from chainer.testing import attr
     [
         {'reduce': 'mean'},
         {'reduce': 'no'},
+    ],
+    [
+        {'enable_double_backprop': False},
+        {'enable_double_backprop': True},
     ]
 ))
 class TestCRF1d(unittest.TestCase):
@@ -46,7 +50,9 @@ class TestCRF1d(unittest.TestCase):
         cost = chainer.Variable(cost_data)
         xs = [chainer.Variable(x) for x in xs_data]
         ys = [chainer.Variable(y) for y in ys_data]
-        actual = functions.crf1d(cost, xs, ys, reduce=self.reduce)
+        actual = functions.crf1d(
+            cost, xs, ys, reduce=self.reduce,
+            enable_double_backprop=self.enable_double_backprop)
 
         z = numpy.zeros((self.batches[0],), numpy.float32)
         for b, length in enumerate(self.lengths):
@@ -79,7 +85,9 @@ class TestCRF1d(unittest.TestCase):
         def f(cost, *args):
             xs = args[:len(args) // 2]
             ys = args[len(args) // 2:]
-            return functions.crf1d(cost, xs, ys, reduce=self.reduce)
+            return functions.crf1d(
+                cost, xs, ys, reduce=self.reduce,
+                enable_double_backprop=self.enable_double_backprop)
 
         args = [cost_data] + xs_data + ys_data
         if self.reduce == 'mean':
@@ -99,6 +107,36 @@ class TestCRF1d(unittest.TestCase):
                             [cuda.to_gpu(y) for y in self.ys],
                             cuda.to_gpu(self.g))
 
+    def check_double_backward(self, cost_data, xs_data, ys_data, g_data):
+        # The transition cost is not used when the length of the sequences
+        # is one.
+        if not self.enable_double_backprop or len(xs_data) == 1:
+            return
+
+        def f(cost, *xs):
+            loss = functions.crf1d(
+                cost, xs, ys_data, reduce='no', enable_double_backprop=True)
+            return loss * loss
+
+        args = [cost_data] + xs_data
+        ggs = [numpy.random.uniform(-1, 1, a.shape).astype(a.dtype)
+               for a in args]
+        gradient_check.check_double_backward(
+            f, args, g_data, ggs, rtol=1e-3, atol=1e-3)
+
+    def test_double_backward_cpu(self):
+        self.check_double_backward(self.cost, self.xs, self.ys, self.g)
+
+    def test_no_double_backward(self):
+        if self.enable_double_backprop:
+            return
+        cost = chainer.Variable(self.cost)
+        xs = [chainer.Variable(x) for x in self.xs]
+        loss = functions.crf1d(cost, xs, self.ys)
+        gcost, = chainer.grad([loss], [cost], enable_double_backprop=True)
+        with self.assertRaises(RuntimeError):
+            chainer.grad([functions.sum(gcost * gcost)], [cost])
+
     def check_argmax(self, cost_data, xs_data):
         cost = chainer.Variable(cost_data)
         xs = [chainer.Variable(x) for x in xs_data]
@@ -229,6 +229,56 @@ class TestCTCBlankSymbol(unittest.TestCase, CTCTestBase):
         self.blank_symbol = 3
 
 
+@testing.parameterize(*testing.product({
+    'dtype': [numpy.float16, numpy.float32, numpy.float64],
+    'reduce': ['mean', 'no'],
+}))
+class TestCTCMemoryEfficient(unittest.TestCase):
+
+    def setUp(self):
+        self.x = numpy.random.uniform(-1, 1, (10, 3, 5)).astype(self.dtype)
+        self.t = numpy.array([[0, 1, 1], [1, 3, 0], [2, 2, 0]], numpy.int32)
+        self.x_length = numpy.array([10, 7, 9], numpy.int32)
+        self.l_length = numpy.array([3, 2, 1], numpy.int32)
+        if self.reduce == 'mean':
+            self.gy = numpy.random.uniform(-1, 1, ()).astype(self.dtype)
+        else:
+            self.gy = numpy.random.uniform(-1, 1, (3,)).astype(self.dtype)
+        if self.dtype == numpy.float16:
+            self.check_options = {'atol': 5e-3, 'rtol': 5e-3}
+        else:
+            self.check_options = {'atol': 1e-5, 'rtol': 1e-5}
+
+    def forward(self, memory_efficient):
+        xs = [chainer.Variable(x) for x in self.x]
+        loss = functions.connectionist_temporal_classification(
+            xs, self.t, 4, self.x_length, self.l_length, reduce=self.reduce,
+            memory_efficient=memory_efficient)
+        loss.grad = self.gy
+        loss.backward()
+        return loss.array, [x.grad for x in xs]
+
+    def test_memory_efficient(self):
+        loss_expect, gxs_expect = self.forward(False)
+        loss, gxs = self.forward(True)
+        testing.assert_allclose(loss_expect, loss, **self.check_options)
+        for gx_expect, gx in zip(gxs_expect, gxs):
+            testing.assert_allclose(gx_expect, gx, **self.check_options)
+
+    @condition.retry(3)
+    def test_backward(self):
+        def f(*x):
+            return functions.connectionist_temporal_classification(
+                x, self.t, 4, self.x_length, self.l_length,
+                reduce=self.reduce, memory_efficient=True)
+
+        options = {'atol': 1e-4}
+        if self.dtype == numpy.float16:
+            options = {'atol': 1e-3, 'dtype': numpy.float64}
+        gradient_check.check_backward(
+            f, tuple(self.x), self.gy, eps=1e-2, **options)
+
+
 class TestCTCUseNoBackpropMode(unittest.TestCase):
 
     def test_no_backprop_mode(self):
@@ -24,6 +24,7 @@ def make_sampler(xp, high):
     'dtype': [numpy.float16, numpy.float32, numpy.float64],
     't': [[0, 2], [-1, 1, 2]],
     'reduce': ['sum', 'no'],
+    'shared_negatives': [False, True],
 }))
 class TestNegativeSamplingFunction(unittest.TestCase):
 
@@ -68,13 +69,14 @@ class TestNegativeSamplingFunction(unittest.TestCase):
 
         # return_samples=False
         y = functions.negative_sampling(
-            x, t, w, sampler, self.sample_size, reduce=self.reduce)
+            x, t, w, sampler, self.sample_size, reduce=self.reduce,
+            shared_negatives=self.shared_negatives)
         assert y.dtype == self.dtype
 
         # return_samples=True
         y_, samples = functions.negative_sampling(
             x, t, w, sampler, self.sample_size, reduce=self.reduce,
-            return_samples=True)
+            return_samples=True, shared_negatives=self.shared_negatives)
 
         xp = chainer.backend.get_array_module(x)
         assert isinstance(samples, xp.ndarray)
@@ -89,6 +91,11 @@ class TestNegativeSamplingFunction(unittest.TestCase):
         assert y.shape == self.gy.shape
 
         samples = cuda.to_cpu(samples)
+        numpy.testing.assert_array_equal(samples[:, 0], self.t)
+        if self.shared_negatives:
+            numpy.testing.assert_array_equal(
+                samples[:, 1:], numpy.broadcast_to(
+                    samples[0, 1:], (batch_size, self.sample_size)))
 
         loss = numpy.empty((len(self.x),), self.dtype)
         for i in six.moves.range(len(self.x)):
@@ -123,7 +130,8 @@ class TestNegativeSamplingFunction(unittest.TestCase):
     def check_backward(self, x_data, t_data, w_data, y_grad, sampler):
         def f(x, w):
             return functions.negative_sampling(
-                x, t_data, w, sampler, self.sample_size, reduce=self.reduce)
+                x, t_data, w, sampler, self.sample_size, reduce=self.reduce,
+                shared_negatives=self.shared_negatives)
 
         gradient_check.check_backward(
             f, (x_data, w_data), y_grad, **self.check_backward_options)
@@ -145,7 +153,8 @@ class TestNegativeSamplingFunction(unittest.TestCase):
 
         def f(x, w):
             return functions.negative_sampling(
-                x, t_data, w, sampler, self.sample_size, reduce=self.reduce)
+                x, t_data, w, sampler, self.sample_size, reduce=self.reduce,
+                shared_negatives=self.shared_negatives)
 
         gradient_check.check_double_backward(
             f, (x_data, w_data), y_grad, (x_grad_grad, w_grad_grad),
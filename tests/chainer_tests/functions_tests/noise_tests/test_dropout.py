@@ -186,4 +186,57 @@ class TestDropoutMask(unittest.TestCase):
         self._check()
 
 
+@testing.parameterize(
+    {'dtype': numpy.float16, 'ratio': 0.1},
+    {'dtype': numpy.float32, 'ratio': 0.3},
+    {'dtype': numpy.float64, 'ratio': 0.5},
+)
+class TestDropoutPackMasks(unittest.TestCase):
+
+    def setUp(self):
+        self.x = numpy.random.uniform(-1, 1, (3, 7)).astype(self.dtype)
+        self.gy = numpy.random.uniform(-1, 1, (3, 7)).astype(self.dtype)
+        self.ggx = numpy.random.uniform(-1, 1, (3, 7)).astype(self.dtype)
+        self.check_backward_options = {'dtype': numpy.float64}
+        if self.dtype == numpy.float16:
+            self.check_backward_options = {
+                'dtype': numpy.float64, 'atol': 1e-3, 'rtol': 1e-2}
+
+    def test_packed(self):
+        dropout = functions.noise.dropout.Dropout(self.ratio)
+        with chainer.using_config('pack_masks', True):
+            y, = dropout.apply((self.x,))
+        assert dropout.mask is None
+        (bits, shape), dtype = dropout._packed_mask
+        assert bits.dtype == numpy.uint8
+        assert bits.size == 3
+
+        mask = dropout._get_mask()
+        assert mask.dtype == self.dtype
+        assert mask.shape == self.x.shape
+        testing.assert_allclose(self.x * mask, y.array)
+
+        # The mask is reused by the following calls.
+        y2, = dropout.apply((self.x,))
+        testing.assert_allclose(y.array, y2.array)
+
+    def test_backward(self):
+        dropout = functions.noise.dropout.Dropout(self.ratio)
+
+        def f(x):
+            return dropout.apply((x,))
+
+        with chainer.using_config('pack_masks', True):
+            gradient_check.check_backward(
+                f, self.x, self.gy, **self.check_backward_options)
+            gradient_check.check_double_backward(
+                f, self.x, self.gy, self.ggx, **self.check_backward_options)
+
+    def test_return_mask(self):
+        with chainer.using_config('pack_masks', True):
+            y, mask = functions.dropout(self.x, self.ratio, return_mask=True)
+        assert mask.dtype == self.dtype
+        testing.assert_allclose(self.x * mask, y.array)
+
+
 testing.run_module(__name__, __file__)
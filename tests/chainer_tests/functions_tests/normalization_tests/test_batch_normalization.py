@@ -507,6 +507,54 @@ class TestFixedBatchNormalizationCudnnEps(unittest.TestCase):
             functions.fixed_batch_normalization(*self.args, eps=2e-6)
 
 
+@testing.parameterize(*testing.product({
+    'shape': [(5, 3), (4, 3, 6, 5)],
+    'dtype': [numpy.float32, numpy.float64],
+}))
+class TestBatchNormalizationFusedCPU(unittest.TestCase):
+
+    def setUp(self):
+        # A large offset checks the stability of the variance.
+        self.x = (numpy.random.uniform(-1, 1, self.shape) + 1000).astype(
+            self.dtype)
+        self.gamma = numpy.random.uniform(.5, 1, (3,)).astype(self.dtype)
+        self.beta = numpy.random.uniform(-1, 1, (3,)).astype(self.dtype)
+        self.gy = numpy.random.uniform(-1, 1, self.shape).astype(self.dtype)
+        self.axis = (0,) + tuple(range(2, len(self.shape)))
+
+    def test_forward_backward(self):
+        args = [chainer.Variable(a) for a in (self.x, self.gamma, self.beta)]
+        y = functions.batch_normalization(*args, eps=1e-5)
+        y.grad = self.gy
+        y.backward()
+
+        x, gamma, beta, gy = [
+            a.astype(numpy.float64)
+            for a in (self.x, self.gamma, self.beta, self.gy)]
+        expander = (None, slice(None)) + (None,) * (len(self.shape) - 2)
+        mean = x.mean(axis=self.axis)[expander]
+        inv_std = 1. / numpy.sqrt(x.var(axis=self.axis)[expander] + 1e-5)
+        x_hat = (x - mean) * inv_std
+        y_expect = gamma[expander] * x_hat + beta[expander]
+        gbeta = gy.sum(axis=self.axis)
+        ggamma = (gy * x_hat).sum(axis=self.axis)
+        m = x.size // 3
+        gx = gamma[expander] * inv_std * (
+            gy - (x_hat * ggamma[expander] + gbeta[expander]) / m)
+
+        options = {'atol': 1e-2, 'rtol': 1e-2}
+        testing.assert_allclose(y_expect, y.array, **options)
+        testing.assert_allclose(gx, args[0].grad, **options)
+        testing.assert_allclose(ggamma, args[1].grad, **options)
+        testing.assert_allclose(gbeta, args[2].grad, **options)
+
+    def test_large_reduction_keeps_dtype(self):
+        # The reduction size exceeds the range of uint16.
+        x = numpy.random.uniform(-1, 1, (1, 3, 300, 300)).astype(self.dtype)
+        y = functions.batch_normalization(x, self.gamma, self.beta)
+        assert y.dtype == self.dtype
+
+
 class TestBatchNormalizationWarning(unittest.TestCase):
     def setUp(self):
         pass
@@ -2,6 +2,7 @@ import unittest
 
 import numpy
 
+import chainer
 from chainer.backends import cuda
 from chainer import functions
 from chainer import gradient_check
@@ -12,7 +13,7 @@ from chainer.testing import attr
 @testing.parameterize(*(testing.product({
     'batchsize': [1, 5],
     'size': [10, 20],
-    'dtype': [numpy.float32],
+    'dtype': [numpy.float32, numpy.float64],
     'eps': [1e-5, 1e-1],
 })))
 class TestLayerNormalization(unittest.TestCase):
@@ -97,5 +98,17 @@ class TestLayerNormalization(unittest.TestCase):
             [cuda.to_gpu(_) for _ in self.args],
             cuda.to_gpu(self.gy), [cuda.to_gpu(_) for _ in self.ggx])
 
+    def test_backward_consistency_cpu(self):
+        # The fused gradient used without double backprop equals the
+        # gradient computed by the graph.
+        args = [chainer.Variable(_) for _ in self.args]
+        y = functions.layer_normalization(*args, eps=self.eps)
+        grads1 = chainer.grad([y], args, [self.gy])
+        grads2 = chainer.grad(
+            [y], args, [self.gy], enable_double_backprop=True)
+        for g1, g2 in zip(grads1, grads2):
+            testing.assert_allclose(
+                g1.array, g2.array, **self.check_forward_options)
+
 
 testing.run_module(__name__, __file__)
@@ -119,4 +119,32 @@ class TestROIMaxAlign2D(unittest.TestCase):
             cuda.to_gpu(self.roi_indices), cuda.to_gpu(self.gy))
 
 
+class TestROIMaxAlign2DOutOfImage(unittest.TestCase):
+
+    def setUp(self):
+        self.x = numpy.random.uniform(-1, 1, (2, 3, 6, 5)).astype('f')
+        self.rois = numpy.array([
+            [-3, -4, 2, 3],
+            [4, 3, 12, 10],
+            [20, 20, 30, 30],
+        ], dtype=numpy.float32)
+        self.roi_indices = numpy.array([0, 1, 0], dtype=numpy.int32)
+        self.gy = numpy.random.uniform(-1, 1, (3, 3, 2, 2)).astype('f')
+
+    def f(self, x):
+        return functions.roi_max_align_2d(
+            x, self.rois, self.roi_indices, outsize=2, spatial_scale=1.,
+            sampling_ratio=2)
+
+    def test_forward_cpu(self):
+        y = self.f(self.x)
+        assert numpy.isfinite(y.array[:2]).all()
+        testing.assert_allclose(
+            y.array[2], numpy.full((3, 2, 2), -1E20, 'f'))
+
+    def test_backward_cpu(self):
+        gradient_check.check_backward(
+            self.f, self.x, self.gy, atol=5e-4, rtol=5e-3)
+
+
 testing.run_module(__name__, __file__)
@@ -109,4 +109,51 @@ class TestROIMaxPooling2D(unittest.TestCase):
             cuda.to_gpu(self.roi_indices), cuda.to_gpu(self.gy))
 
 
+class TestROIMaxPooling2DValues(unittest.TestCase):
+
+    def setUp(self):
+        self.x = numpy.random.uniform(-1, 1, (2, 3, 9, 7)).astype('f')
+        self.rois = numpy.array([
+            [1, 1, 7, 5],
+            [-3, -2, 4, 3],
+            [6, 4, 20, 9],
+            [30, 30, 40, 40],
+            [5, 5, 2, 2],
+        ], dtype=numpy.float32)
+        self.roi_indices = numpy.array([0, 1, 1, 0, 1], dtype=numpy.int32)
+
+    def test_forward_cpu(self):
+        y = functions.roi_max_pooling_2d(
+            self.x, self.rois, self.roi_indices, outsize=(3, 4),
+            spatial_scale=1.)
+        y_expect = numpy.zeros_like(y.array)
+        for i, (ymin, xmin, ymax, xmax) in enumerate(self.rois):
+            roi_height = max(ymax - ymin, 1) / 3.
+            roi_width = max(xmax - xmin, 1) / 4.
+            for ph in range(3):
+                hstart = min(max(int(ph * roi_height) + int(ymin), 0), 9)
+                hend = min(max(int(numpy.ceil((ph + 1) * roi_height))
+                               + int(ymin), 0), 9)
+                for pw in range(4):
+                    wstart = min(max(int(pw * roi_width) + int(xmin), 0), 7)
+                    wend = min(max(int(numpy.ceil((pw + 1) * roi_width))
+                                   + int(xmin), 0), 7)
+                    if hstart < hend and wstart < wend:
+                        y_expect[i, :, ph, pw] = self.x[
+                            self.roi_indices[i], :, hstart:hend,
+                            wstart:wend].max(axis=(1, 2))
+        testing.assert_allclose(y_expect, y.array)
+
+    def test_backward_cpu(self):
+        gy = numpy.random.uniform(-1, 1, (5, 3, 3, 4)).astype('f')
+
+        def f(x):
+            return functions.roi_max_pooling_2d(
+                x, self.rois, self.roi_indices, outsize=(3, 4),
+                spatial_scale=1.)
+
+        gradient_check.check_backward(
+            f, self.x, gy, atol=1e-3, rtol=1e-2)
+
+
 testing.run_module(__name__, __file__)
@@ -0,0 +1,150 @@
+import unittest
+
+import numpy
+
+import chainer
+from chainer.backends import cuda
+from chainer import functions
+from chainer import gradient_check
+from chainer.graph_optimizations import elementwise_fusion
+from chainer import testing
+from chainer.testing import attr
+
+
+def _elementwise(a, x, b):
+    h = functions.tanh(a * x + b)
+    y = functions.sigmoid(h) * 2 - functions.relu(x) / (b * b + 1)
+    y = y + functions.leaky_relu(-h, 0.1) + functions.exp(a - 1)
+    y = y + functions.log(abs(b) + 1) + functions.sqrt(functions.square(x) + 1)
+    return y, 1 - h
+
+
+@testing.parameterize(*testing.product({
+    'shape': [(3, 2), (5, 7), ()],
+    'dtype': [numpy.float16, numpy.float32, numpy.float64],
+    'block_size': [4, 8192],
+}))
+@testing.fix_random()
+class TestFuseElementwise(unittest.TestCase):
+
+    def setUp(self):
+        self.inputs = [
+            numpy.asarray(numpy.random.uniform(-1, 1, self.shape),
+                          dtype=self.dtype)
+            for _ in range(3)]
+        self.grad_outputs = [
+            numpy.random.uniform(-1, 1, self.shape).astype(self.dtype)
+            for _ in range(2)]
+        self.grad_grad_inputs = [
+            numpy.random.uniform(-1, 1, self.shape).astype(self.dtype)
+            for _ in range(3)]
+        self.func = elementwise_fusion.fuse_elementwise(_elementwise)
+
+        self.check_forward_options = {}
+        self.check_backward_options = {'dtype': numpy.float64}
+        if self.dtype == numpy.float16:
+            self.check_forward_options = {'atol': 1e-3, 'rtol': 1e-3}
+            self.check_backward_options.update({'atol': 5e-3, 'rtol': 5e-2})
+
+        self.original_block_size = elementwise_fusion._block_size
+        elementwise_fusion._block_size = self.block_size
+
+    def tearDown(self):
+        elementwise_fusion._block_size = self.original_block_size
+
+    def check_forward(self, inputs):
+        for _ in range(2):
+            ys = self.func(*inputs)
+            for y in ys:
+                assert isinstance(
+                    y.creator, elementwise_fusion.FusedElementwise)
+                assert y.dtype == self.dtype
+        ys_expect = _elementwise(
+            *[chainer.Variable(x) for x in self.inputs])
+        for y, y_expect in zip(ys, ys_expect):
+            testing.assert_allclose(
+                y_expect.array, y.array, **self.check_forward_options)
+
+    def test_forward_cpu(self):
+        self.check_forward(self.inputs)
+
+    @attr.gpu
+    def test_forward_gpu(self):
+        self.check_forward([cuda.to_gpu(x) for x in self.inputs])
+
+    def check_backward(self, inputs, grad_outputs):
+        gradient_check.check_backward(
+            self.func, inputs, grad_outputs, **self.check_backward_options)
+
+    def test_backward_cpu(self):
+        self.check_backward(self.inputs, self.grad_outputs)
+
+    @attr.gpu
+    def test_backward_gpu(self):
+        self.check_backward([cuda.to_gpu(x) for x in self.inputs],
+                            [cuda.to_gpu(gy) for gy in self.grad_outputs])
+
+    def check_double_backward(self, inputs, grad_outputs, grad_grad_inputs):
+        gradient_check.check_double_backward(
+            self.func, inputs, grad_outputs, grad_grad_inputs,
+            **self.check_backward_options)
+
+    def test_double_backward_cpu(self):
+        self.check_double_backward(
+            self.inputs, self.grad_outputs, self.grad_grad_inputs)
+
+    @attr.gpu
+    def test_double_backward_gpu(self):
+        self.check_double_backward(
+            [cuda.to_gpu(x) for x in self.inputs],
+            [cuda.to_gpu(gy) for gy in self.grad_outputs],
+            [cuda.to_gpu(ggx) for ggx in self.grad_grad_inputs])
+
+    def test_backward_unused_output_cpu(self):
+        a, x, b = [chainer.Variable(x) for x in self.inputs]
+        y, _ = self.func(a, x, b)
+        y.grad = self.grad_outputs[0]
+        y.backward()
+
+        a_expect, x_expect, b_expect = [
+            chainer.Variable(x) for x in self.inputs]
+        y_expect, _ = _elementwise(a_expect, x_expect, b_expect)
+        y_expect.grad = self.grad_outputs[0]
+        y_expect.backward()
+        for v, v_expect in zip((a, x, b), (a_expect, x_expect, b_expect)):
+            testing.assert_allclose(
+                v_expect.grad, v.grad, **self.check_forward_options)
+
+
+class TestFuseElementwiseFallback(unittest.TestCase):
+
+    def check_not_fused(self, func, *inputs):
+        fused = elementwise_fusion.fuse_elementwise(func)
+        for _ in range(2):
+            y = fused(*inputs)
+            assert not isinstance(
+                y.creator, elementwise_fusion.FusedElementwise)
+        testing.assert_allclose(func(*inputs).array, y.array)
+
+    def test_unsupported_function(self):
+        x = numpy.random.uniform(-1, 1, (3, 2)).astype(numpy.float32)
+        self.check_not_fused(
+            lambda x: functions.tanh(functions.sum(x, axis=0)), x)
+
+    def test_broadcast(self):
+        x = numpy.random.uniform(-1, 1, (3, 2)).astype(numpy.float32)
+        b = numpy.random.uniform(-1, 1, (2,)).astype(numpy.float32)
+        self.check_not_fused(lambda x, b: functions.tanh(x + b), x, b)
+
+    def test_captured_variable(self):
+        x = numpy.random.uniform(-1, 1, (3, 2)).astype(numpy.float32)
+        c = chainer.Variable(
+            numpy.random.uniform(-1, 1, (3, 2)).astype(numpy.float32))
+        self.check_not_fused(lambda x: functions.tanh(x * c), x)
+
+    def test_integer_inputs(self):
+        x = chainer.Variable(numpy.arange(6, dtype=numpy.int32))
+        self.check_not_fused(lambda x: x * 2, x)
+
+
+testing.run_module(__name__, __file__)
@@ -7,6 +7,7 @@ from chainer import configuration
 from chainer import cuda
 import chainer.functions as F
 from chainer import gradient_check
+from chainer.graph_optimizations import static_graph as static_graph_module
 from chainer.graph_optimizations.static_graph import static_graph
 import chainer.links as L
 from chainer import links
@@ -348,6 +349,239 @@ class TestMultiLayerChain(unittest.TestCase):
         chainer.testing.assert_allclose(x_var_dyn.grad, x_var_static.grad)
 
 
+class CachedStaticMLP(chainer.Chain):
+
+    def __init__(self, in_size, n_out, **kwargs):
+        super(CachedStaticMLP, self).__init__()
+        with self.init_scope():
+            self.l1 = links.Linear(in_size, n_out)
+        self.static_call = static_graph(**kwargs)(
+            CachedStaticMLP.dynamic_call)
+
+    def __call__(self, x):
+        return self.static_call(self, x)
+
+    def dynamic_call(self, x):
+        return F.relu(self.l1(x))
+
+
+class TestScheduleCache(unittest.TestCase):
+
+    def setUp(self):
+        self.in_units = 3
+        self.out_units = 4
+
+    def make_x(self, batch_size):
+        return numpy.random.uniform(
+            size=(batch_size, self.in_units)).astype(numpy.float32)
+
+    def check_forward(self, chain, x):
+        with chainer.using_config('train', False):
+            y = chain(x)
+        y_expect = chain.dynamic_call(x)
+        chainer.testing.assert_allclose(y_expect.array, y.array)
+        return y
+
+    def test_cache_info(self):
+        chain = CachedStaticMLP(self.in_units, self.out_units)
+        for batch_size in (2, 2, 3, 2):
+            self.check_forward(chain, self.make_x(batch_size))
+        info = chain.schedule_manager.cache_info()
+        assert info['hits'] == 2
+        assert info['misses'] == 2
+        assert info['evictions'] == 0
+        assert info['schedules'] == 2
+        assert info['nbytes'] > 0
+
+    def test_max_schedules(self):
+        chain = CachedStaticMLP(self.in_units, self.out_units,
+                                max_schedules=2)
+        for batch_size in (1, 2, 3, 1, 3):
+            self.check_forward(chain, self.make_x(batch_size))
+        manager = chain.schedule_manager
+        info = manager.cache_info()
+        assert info['schedules'] == 2
+        assert info['evictions'] == 2
+        assert info['hits'] == 1
+        assert info['misses'] == 4
+        # The least recently used schedules are evicted.
+        assert len(manager.key_signatures) == 2
+        assert all(sig[0][0][0] in (1, 3)
+                   for sig in manager.key_signatures.values())
+
+    def test_max_cache_bytes(self):
+        chain = CachedStaticMLP(self.in_units, self.out_units,
+                                max_cache_bytes=0)
+        for batch_size in (1, 2, 3):
+            self.check_forward(chain, self.make_x(batch_size))
+        info = chain.schedule_manager.cache_info()
+        assert info['schedules'] == 1
+        assert info['evictions'] == 2
+
+    def test_max_cache_bytes_after_first_iteration(self):
+        # The arrays of a new schedule are counted once they are allocated.
+        chain = CachedStaticMLP(self.in_units, self.out_units)
+        self.check_forward(chain, self.make_x(1))
+        max_cache_bytes = chain.schedule_manager.cache_info()['nbytes']
+
+        chain = CachedStaticMLP(self.in_units, self.out_units,
+                                max_cache_bytes=max_cache_bytes)
+        for batch_size in (1, 3):
+            self.check_forward(chain, self.make_x(batch_size))
+        info = chain.schedule_manager.cache_info()
+        assert info['schedules'] == 1
+        assert info['evictions'] == 1
+        # The schedule just built is kept even if it exceeds the limit.
+        assert info['nbytes'] > max_cache_bytes
+
+    def test_max_cache_bytes_after_first_iteration_train(self):
+        def forward_backward(chain, batch_size):
+            x = chainer.Variable(self.make_x(batch_size))
+            F.sum(chain(x)).backward()
+
+        chain = CachedStaticMLP(self.in_units, self.out_units)
+        forward_backward(chain, 1)
+        max_cache_bytes = chain.schedule_manager.cache_info()['nbytes']
+
+        chain = CachedStaticMLP(self.in_units, self.out_units,
+                                max_cache_bytes=max_cache_bytes)
+        for batch_size in (1, 3):
+            forward_backward(chain, batch_size)
+        info = chain.schedule_manager.cache_info()
+        assert info['schedules'] == 1
+        assert info['evictions'] == 1
+
+    def test_invalid_limits(self):
+        with self.assertRaises(ValueError):
+            static_graph_module.ScheduleManager(max_schedules=0)
+        with self.assertRaises(ValueError):
+            static_graph_module.ScheduleManager(max_cache_bytes=-1)
+
+    def test_pad_to_bucket(self):
+        chain = CachedStaticMLP(self.in_units, self.out_units,
+                                pad_to_bucket=True)
+        self.check_forward(chain, self.make_x(4))
+        self.check_forward(chain, self.make_x(8))
+        # Padded to the smallest larger cached mini-batch size.
+        with chainer.using_config('train', False):
+            assert chain.schedule_manager.find_bucket(
+                (chainer.Variable(self.make_x(3)),)) == 4
+        y = self.check_forward(chain, self.make_x(3))
+        assert y.shape == (3, self.out_units)
+        info = chain.schedule_manager.cache_info()
+        assert info['schedules'] == 2
+        assert info['hits'] == 1
+        assert info['misses'] == 2
+
+    def test_pad_to_bucket_no_larger_bucket(self):
+        chain = CachedStaticMLP(self.in_units, self.out_units,
+                                pad_to_bucket=True)
+        self.check_forward(chain, self.make_x(2))
+        self.check_forward(chain, self.make_x(3))
+        assert chain.schedule_manager.cache_info()['schedules'] == 2
+
+    def test_pad_to_bucket_train(self):
+        chain = CachedStaticMLP(self.in_units, self.out_units,
+                                pad_to_bucket=True)
+        x = self.make_x(4)
+        with chainer.using_config('train', False):
+            chain(x)
+            assert chain.schedule_manager.find_bucket(
+                (chainer.Variable(self.make_x(2)),)) == 4
+        with chainer.using_config('train', True):
+            assert chain.schedule_manager.find_bucket(
+                (chainer.Variable(self.make_x(2)),)) is None
+
+
+class PlannedStaticMLP(chainer.Chain):
+
+    def __init__(self, in_size, n_hidden, n_out, **kwargs):
+        super(PlannedStaticMLP, self).__init__()
+        with self.init_scope():
+            self.l1 = links.Linear(in_size, n_hidden)
+            self.l2 = links.Linear(n_hidden, n_hidden)
+            self.l3 = links.Linear(n_hidden, n_out)
+        self.static_call = static_graph(**kwargs)(
+            PlannedStaticMLP.dynamic_call)
+
+    def __call__(self, x):
+        return self.static_call(self, x)
+
+    def dynamic_call(self, x):
+        h = F.relu(self.l1(x))
+        h = F.relu(self.l2(h))
+        return self.l3(h)
+
+
+class TestMemoryPlan(unittest.TestCase):
+
+    def setUp(self):
+        self.batch_size = 4
+        self.in_units = 3
+        self.hidden_units = 5
+        self.out_units = 2
+
+    def make_x(self):
+        return numpy.random.uniform(
+            size=(self.batch_size, self.in_units)).astype(numpy.float32)
+
+    def test_forward(self):
+        chain = PlannedStaticMLP(self.in_units, self.hidden_units,
+                                 self.out_units, plan_memory=True)
+        with chainer.using_config('train', False), \
+                chainer.using_config('enable_backprop', False):
+            for _ in range(3):
+                x = self.make_x()
+                y = chain(x)
+                y_expect = chain.dynamic_call(x)
+                chainer.testing.assert_allclose(y_expect.array, y.array)
+        info = chain.static_schedule.memory_plan_info
+        assert info['arrays'] > info['buffers'] > 0
+        assert info['planned_nbytes'] < info['naive_nbytes']
+
+    def test_forward_no_plan(self):
+        chain = PlannedStaticMLP(self.in_units, self.hidden_units,
+                                 self.out_units)
+        with chainer.using_config('train', False):
+            chain(self.make_x())
+        assert chain.static_schedule.memory_plan_info is None
+
+    def test_backward(self):
+        chain = PlannedStaticMLP(self.in_units, self.hidden_units,
+                                 self.out_units, plan_memory=True)
+        for _ in range(3):
+            x = self.make_x()
+            gy = numpy.random.uniform(
+                size=(self.batch_size, self.out_units)).astype(numpy.float32)
+            chain.cleargrads()
+            x_var = chainer.Variable(x)
+            y = chain(x_var)
+            y.grad = gy
+            y.backward()
+            static_grads = [p.grad.copy() for p in chain.params()]
+            static_gx = x_var.grad
+
+            chain.cleargrads()
+            x_var = chainer.Variable(x)
+            y_expect = chain.dynamic_call(x_var)
+            y_expect.grad = gy
+            y_expect.backward()
+            chainer.testing.assert_allclose(y_expect.array, y.array)
+            chainer.testing.assert_allclose(x_var.grad, static_gx)
+            for p, g in zip(chain.params(), static_grads):
+                chainer.testing.assert_allclose(p.grad, g)
+        info = chain.static_schedule.memory_plan_info
+        assert info['planned_nbytes'] < info['naive_nbytes']
+
+    def test_backward_forward_only_plan(self):
+        chain = PlannedStaticMLP(self.in_units, self.hidden_units,
+                                 self.out_units, plan_memory=True)
+        with chainer.using_config('train', False):
+            y = chain(self.make_x())
+        with self.assertRaises(RuntimeError):
+            F.sum(y).backward()
+
+
 testing.run_module(__name__, __file__)
 
 if __name__ == '__main__':
@@ -180,6 +180,16 @@ class TestNStepLSTM(unittest.TestCase):
                 cuda.to_gpu(self.gc),
                 [cuda.to_gpu(gy) for gy in self.gys])
 
+    def test_double_backprop_cpu(self):
+        xs = [chainer.Variable(x) for x in self.xs]
+        hy, cy, ys = self.rnn(None, None, xs, enable_double_backprop=True)
+        gxs = chainer.grad(
+            ys, xs, [chainer.Variable(gy) for gy in self.gys],
+            enable_double_backprop=True)
+        chainer.functions.sum(chainer.functions.concat(gxs, axis=0)).backward()
+        for p in self.rnn.params():
+            self.assertIsNotNone(p.grad)
+
     def test_n_cells(self):
         self.assertEqual(self.rnn.n_cells, 2)
 
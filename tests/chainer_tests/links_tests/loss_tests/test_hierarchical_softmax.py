@@ -7,6 +7,7 @@ import chainer
 from chainer.backends import cuda
 from chainer import gradient_check
 from chainer import links
+from chainer.links.loss import hierarchical_softmax
 from chainer import testing
 from chainer.testing import attr
 from chainer.testing import condition
@@ -31,6 +32,56 @@ class TestHuffmanTree(unittest.TestCase):
         self.assertTrue((('x', 'y'), 'z') == tree or
                         ('z', ('x', 'y')) == tree)
 
+    def test_same_counts(self):
+        tree = links.BinaryHierarchicalSoftmax.create_huffman_tree(
+            {0: 1, 1: 1, 2: 1, 3: 1, 4: 1, 5: 2})
+        self.assertEqual(tree, ((4, (0, 1)), ((2, 3), 5)))
+
+    def test_min_variance(self):
+        tree = links.BinaryHierarchicalSoftmax.create_huffman_tree(
+            {0: 1, 1: 1, 2: 1, 3: 1, 4: 1, 5: 2}, min_variance=True)
+        self.assertEqual(tree, ((4, 5), ((0, 1), (2, 3))))
+
+    def test_min_variance_balanced(self):
+        tree = links.BinaryHierarchicalSoftmax.create_huffman_tree(
+            {0: 1, 1: 1, 2: 2, 3: 2}, min_variance=True)
+        parser = hierarchical_softmax.TreeParser(numpy.float32)
+        parser.parse(tree)
+        _, _, lengths = parser.get_matrices()
+        numpy.testing.assert_array_equal(lengths, [2, 2, 2, 2])
+
+
+class TestTreeParser(unittest.TestCase):
+
+    def setUp(self):
+        self.parser = hierarchical_softmax.TreeParser(numpy.float32)
+        self.parser.parse(((0, 1), ((2, 3), 4)))
+
+    def test_size(self):
+        self.assertEqual(self.parser.size(), 4)
+
+    def test_matrices(self):
+        paths, codes, lengths = self.parser.get_matrices()
+        numpy.testing.assert_array_equal(
+            paths, [[0, 1, 0], [0, 1, 0], [0, 2, 3], [0, 2, 3], [0, 2, 0]])
+        numpy.testing.assert_array_equal(
+            codes, [[1, 1, 0], [1, -1, 0], [-1, 1, 1], [-1, 1, -1],
+                    [-1, -1, 0]])
+        numpy.testing.assert_array_equal(lengths, [2, 2, 3, 3, 2])
+        self.assertEqual(paths.dtype, numpy.int32)
+        self.assertEqual(codes.dtype, numpy.float32)
+
+    def test_paths_and_codes(self):
+        paths = self.parser.get_paths()
+        codes = self.parser.get_codes()
+        self.assertEqual(sorted(paths.keys()), [0, 1, 2, 3, 4])
+        numpy.testing.assert_array_equal(paths[2], [0, 2, 3])
+        numpy.testing.assert_array_equal(codes[4], [-1, -1])
+
+    def test_invalid_tree(self):
+        with self.assertRaises(ValueError):
+            self.parser.parse(((0, 1, 2), 3))
+
 
 @testing.parameterize(*testing.product({
     'dtype': [numpy.float16, numpy.float32, numpy.float64],
@@ -129,9 +180,34 @@ class TestBinaryHierarchicalSoftmax(unittest.TestCase):
         self.link.to_cpu()
         g = self.link._func
 
-        self.assertTrue((f.begins == g.begins).all())
+        self.assertTrue((f.lengths == g.lengths).all())
         self.assertTrue((f.paths == g.paths).all())
         self.assertTrue((f.codes == g.codes).all())
 
 
+class TestBinaryHierarchicalSoftmaxSingleLeaf(unittest.TestCase):
+
+    def setUp(self):
+        self.link = links.BinaryHierarchicalSoftmax(3, 0)
+        self.x = numpy.random.uniform(-1, 1, (2, 3)).astype(numpy.float32)
+        self.t = numpy.zeros((2,), dtype=numpy.int32)
+
+    def check_forward_backward(self, x_data, t_data):
+        x = chainer.Variable(x_data)
+        loss = self.link(x, t_data)
+        testing.assert_allclose(loss.array, 0)
+
+        loss.backward()
+        testing.assert_allclose(x.grad, numpy.zeros_like(self.x))
+        self.assertEqual(self.link.W.grad.shape, (0, 3))
+
+    def test_forward_backward_cpu(self):
+        self.check_forward_backward(self.x, self.t)
+
+    @attr.gpu
+    def test_forward_backward_gpu(self):
+        self.link.to_gpu()
+        self.check_forward_backward(cuda.to_gpu(self.x), cuda.to_gpu(self.t))
+
+
 testing.run_module(__name__, __file__)
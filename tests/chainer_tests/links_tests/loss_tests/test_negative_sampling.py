@@ -185,4 +185,39 @@ class TestNegativeSampling(unittest.TestCase):
         testing.assert_allclose(gw_cpu, gw_gpu, atol=1.e-4)
 
 
+class TestNegativeSamplingOptions(unittest.TestCase):
+
+    def setUp(self):
+        self.x = numpy.random.uniform(-1, 1, (4, 3)).astype(numpy.float32)
+        self.t = numpy.array([0, 2, -1, 1], numpy.int32)
+
+    def test_sampler_buffer_size(self):
+        link = links.NegativeSampling(
+            3, [10, 5, 2, 5, 2], 2, sampler_buffer_size=100)
+        assert link.sampler.buffer_size == 100
+        link(self.x, self.t)
+        assert link.sampler._buffer is not None
+
+    def test_shared_negatives(self):
+        link = links.NegativeSampling(3, [10, 5, 2, 5, 2], 2)
+        link.W.array[:] = numpy.random.uniform(-1, 1, link.W.shape)
+        y, samples = link(
+            self.x, self.t, reduce='no', return_samples=True,
+            shared_negatives=True)
+        assert samples.shape == (4, 3)
+        numpy.testing.assert_array_equal(samples[:, 0], self.t)
+        for i in range(1, 4):
+            numpy.testing.assert_array_equal(samples[i, 1:], samples[0, 1:])
+
+        W = link.W.array
+        for i in range(4):
+            if self.t[i] == -1:
+                expect = 0
+            else:
+                f = W[samples[i]].dot(self.x[i])
+                f[0] *= -1
+                expect = numpy.logaddexp(f, 0).sum()
+            testing.assert_allclose(y.array[i], expect, atol=1e-5, rtol=1e-4)
+
+
 testing.run_module(__name__, __file__)
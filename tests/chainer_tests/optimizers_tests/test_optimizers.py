@@ -138,4 +138,68 @@ class TestOptimizerHooks(unittest.TestCase):
         self.assertNotEqual(h_pre.value, h_post.value)
 
 
+class EmbedChain(chainer.Chain):
+
+    def __init__(self, sparse_grad):
+        super(EmbedChain, self).__init__()
+        with self.init_scope():
+            self.embed = chainer.links.EmbedID(
+                5, 3, initialW=np.arange(15, dtype='f').reshape(5, 3) / 15,
+                sparse_grad=sparse_grad)
+
+    def __call__(self, x):
+        return chainer.functions.sum(self.embed(x) ** 2)
+
+
+@testing.parameterize(*testing.product({
+    'impl': [
+        optimizers.AdaDelta,
+        optimizers.AdaGrad,
+        optimizers.Adam,
+        optimizers.CorrectedMomentumSGD,
+        optimizers.MomentumSGD,
+        optimizers.MSVAG,
+        optimizers.NesterovAG,
+        optimizers.RMSprop,
+        optimizers.RMSpropGraves,
+        optimizers.SGD,
+        optimizers.SMORMS3,
+    ]
+}))
+class TestOptimizerSparseGrad(unittest.TestCase):
+
+    def train(self, x, sparse_grad, n_iter=3, loss_scale=None):
+        target = EmbedChain(sparse_grad)
+        optimizer = self.impl()
+        optimizer.setup(target)
+        if loss_scale is not None:
+            optimizer.set_loss_scale(loss_scale)
+        for _ in six.moves.range(n_iter):
+            optimizer.update(target, x)
+        return target.embed.W.array
+
+    def test_all_rows(self):
+        # Lazy updates are identical to the dense ones if all rows are
+        # referenced.
+        x = np.array([4, 0, 1, 2, 3, 0, 1], 'i')
+        testing.assert_allclose(
+            self.train(x, False), self.train(x, True), atol=1e-6, rtol=1e-5)
+
+    def test_some_rows(self):
+        x = np.array([3, 1, 3], 'i')
+        W0 = self.train(x, True, n_iter=0)
+        W = self.train(x, True)
+        if self.impl in (optimizers.SGD, optimizers.MomentumSGD,
+                         optimizers.Adam):
+            testing.assert_allclose(W[[0, 2, 4]], W0[[0, 2, 4]], atol=0)
+        testing.assert_allclose(
+            W[[1, 3]], self.train(x, False)[[1, 3]], atol=1e-6, rtol=1e-5)
+
+    def test_loss_scale(self):
+        x = np.array([4, 0, 1, 2, 3, 0, 1], 'i')
+        testing.assert_allclose(
+            self.train(x, False), self.train(x, True, loss_scale=128.),
+            atol=1e-6, rtol=1e-5)
+
+
 testing.run_module(__name__, __file__)
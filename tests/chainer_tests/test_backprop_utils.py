@@ -202,4 +202,92 @@ class TestFunctionNode(unittest.TestCase):
         self.check_backprop_step((self.gx1_orig, self.gx2_orig))
 
 
+class TestGradTableInplace(unittest.TestCase):
+
+    def setUp(self):
+        self.node = chainer.Variable(numpy.zeros((2, 3), 'f')).node
+        self.gs = [
+            chainer.Variable(make_array(i, (2, 3), numpy.float32))
+            for i in range(4)]
+        self.gs_orig = [g.array.copy() for g in self.gs]
+
+    def check_grads_not_modified(self):
+        for g, g_orig in six.moves.zip(self.gs, self.gs_orig):
+            numpy.testing.assert_array_equal(g.array, g_orig)
+
+    def test_accumulate(self):
+        table = _backprop_utils.GradTable(inplace=True)
+        gx_list = table.get_as_list(self.node)
+        gx_list.append(self.gs[0])
+        gx_list.append(self.gs[1])
+        buf = _backprop_utils._reduce(gx_list)
+        assert table.avoided_allocations == 0
+
+        gx_list.append(self.gs[2])
+        gx_list.append(self.gs[3])
+        assert _backprop_utils._reduce(gx_list) is buf
+        assert table.avoided_allocations == 2
+
+        numpy.testing.assert_array_equal(
+            table.pop(self.node).array, sum(self.gs_orig))
+        self.check_grads_not_modified()
+
+    def test_first_grad_not_owned(self):
+        table = _backprop_utils.GradTable(inplace=True)
+        table[self.node] = self.gs[0]
+        gx_list = table.get_as_list(self.node)
+        gx_list.append(self.gs[1])
+        gx_list.append(self.gs[2])
+        gx = _backprop_utils._reduce(gx_list)
+        assert gx is not self.gs[0]
+        assert table.avoided_allocations == 1
+        numpy.testing.assert_array_equal(gx.array, sum(self.gs_orig[:3]))
+        self.check_grads_not_modified()
+
+    def test_shape_mismatch(self):
+        table = _backprop_utils.GradTable(inplace=True)
+        gx_list = table.get_as_list(self.node)
+        gx_list.append(self.gs[0])
+        gx_list.append(chainer.Variable(numpy.ones((3,), 'f')))
+        gx = _backprop_utils._reduce(gx_list)
+        assert table.avoided_allocations == 0
+        numpy.testing.assert_array_equal(gx.array, self.gs_orig[0] + 1)
+
+    def test_not_inplace(self):
+        table = _backprop_utils.GradTable()
+        gx_list = table.get_as_list(self.node)
+        assert type(gx_list) is list
+
+
+class TestBackwardAvoidedAllocations(unittest.TestCase):
+
+    def setUp(self):
+        self.x = chainer.Variable(
+            numpy.random.uniform(-1, 1, (3,)).astype(numpy.float32))
+
+    def forward(self):
+        h = chainer.functions.identity(self.x)
+        ys = [h * i for i in range(1, 5)]
+        return chainer.functions.sum(chainer.functions.stack(ys)), h
+
+    def test_backward(self):
+        loss, h = self.forward()
+        loss.backward(retain_grad=True)
+        numpy.testing.assert_allclose(self.x.grad, numpy.full((3,), 10.))
+        numpy.testing.assert_allclose(h.grad, numpy.full((3,), 10.))
+        assert _backprop_utils.get_avoided_allocations() == 2
+
+    def test_double_backprop(self):
+        loss, _ = self.forward()
+        loss.backward(enable_double_backprop=True)
+        numpy.testing.assert_allclose(self.x.grad, numpy.full((3,), 10.))
+        assert _backprop_utils.get_avoided_allocations() == 0
+
+    def test_grad(self):
+        loss, _ = self.forward()
+        gx, = chainer.grad([loss], [self.x])
+        numpy.testing.assert_allclose(gx.array, numpy.full((3,), 10.))
+        assert _backprop_utils.get_avoided_allocations() == 2
+
+
 testing.run_module(__name__, __file__)
@@ -63,6 +63,25 @@ class TestLocalConfig(unittest.TestCase):
             self.assertEqual(self.global_config.y, 'global y')
         self.assertEqual(self.config.y, 'local y')
 
+    def test_version(self):
+        version = configuration._version
+        self.config.x = 'local x'
+        self.assertGreater(configuration._version, version)
+
+        version = configuration._version
+        del self.config.x
+        self.assertGreater(configuration._version, version)
+
+        version = configuration._version
+        self.global_config.x = 'global x2'
+        self.assertGreater(configuration._version, version)
+
+        version = configuration._version
+        with chainer.using_config('x', 'temporary x', self.config):
+            self.assertGreater(configuration._version, version)
+            version = configuration._version
+        self.assertGreater(configuration._version, version)
+
     def test_print_config(self):
         self.config.abc = 1
         sio = io.StringIO()
@@ -346,6 +346,32 @@ class TestFunctionNode(unittest.TestCase):
         self.assertEqual(self.f.label, 'FunctionNode')
 
 
+class TestFunctionNodeSlots(unittest.TestCase):
+
+    def test_defaults_without_init(self):
+        class NoInitFunction(chainer.FunctionNode):
+
+            def __init__(self, value):
+                self.value = value
+
+        f = NoInitFunction(1)
+        assert f.value == 1
+        assert f.inputs is None
+        assert f.outputs is None
+        assert f.rank == 0
+        assert f.stack is None
+        assert f.lazy_grad_sum is False
+        assert f._n_local_function_hooks == 0
+
+    def test_graph_attributes_not_in_dict(self):
+        x = chainer.Variable(numpy.ones((2,), numpy.float32))
+        y = chainer.functions.identity(x)
+        f = y.creator_node
+        assert f.inputs == (x.node,)
+        assert 'inputs' not in f.__dict__
+        assert 'rank' not in f.__dict__
+
+
 class TestFunctionNodeMixChainerxAndXpArrays(unittest.TestCase):
 
     class SimpleFunctionNode(chainer.FunctionNode):
@@ -467,6 +493,68 @@ class TestFunctionNodeInconsistentBackends(unittest.TestCase):
             f.apply((x1, x2))
 
 
+class TestFunctionNodeApplyFastPath(unittest.TestCase):
+
+    def setUp(self):
+        self.x = numpy.random.uniform(-1, 1, (3,)).astype(numpy.float32)
+        self.f = chainer.FunctionNode()
+        self.f.forward = mock.MagicMock(return_value=(self.x * 2,))
+        self.f.check_type_forward = mock.MagicMock()
+        self.f._apply_fast = mock.MagicMock(
+            side_effect=self.f._apply_fast)
+
+    def check_apply(self, fast):
+        x = chainer.Variable(self.x)
+        y, = self.f.apply((x,))
+        numpy.testing.assert_array_equal(y.array, self.x * 2)
+        assert y.creator_node is self.f
+        assert self.f.inputs == (x.node,)
+        assert self.f._apply_fast.called == fast
+
+    def test_fast(self):
+        with chainer.using_config('type_check', False):
+            self.check_apply(True)
+        self.f.check_type_forward.assert_not_called()
+
+    def test_type_check(self):
+        with chainer.using_config('type_check', True):
+            self.check_apply(False)
+        self.f.check_type_forward.assert_called_once()
+
+    def test_debug(self):
+        with chainer.using_config('type_check', False), \
+                chainer.using_config('debug', True):
+            self.check_apply(False)
+
+    def test_global_hook(self):
+        hook = chainer.FunctionHook()
+        hook.forward_preprocess = mock.MagicMock()
+        with chainer.using_config('type_check', False), hook:
+            self.check_apply(False)
+        hook.forward_preprocess.assert_called_once()
+
+    def test_local_hook(self):
+        hook = mock.MagicMock(spec=chainer.FunctionHook)
+        self.f.add_hook(hook, 'hook')
+        with chainer.using_config('type_check', False):
+            self.check_apply(False)
+        hook.forward_preprocess.assert_called_once()
+
+    def test_config_change(self):
+        with chainer.using_config('type_check', False):
+            self.check_apply(True)
+            self.f.inputs = None
+            with chainer.no_backprop_mode():
+                y, = self.f.apply((chainer.Variable(self.x),))
+            assert y.creator_node is None
+            assert self.f.inputs is None
+
+    def test_invalid_input(self):
+        with chainer.using_config('type_check', False):
+            with self.assertRaises(TypeError):
+                self.f.apply(((self.x,),))
+
+
 @testing.parameterize(
     {'return_value': (numpy.array([float('nan')], numpy.float32),),
      'valid': False},
@@ -678,6 +766,59 @@ class TestNoBackpropMode(unittest.TestCase):
         self.assertTrue(y.creator_node is not None)
 
 
+class TestInferenceMode(unittest.TestCase):
+
+    def setUp(self):
+        self.x = numpy.array([-1., 1.], 'f')
+
+    def test_raw_outputs(self):
+        with chainer.inference_mode():
+            y = chainer.functions.relu(self.x)
+            z = chainer.functions.relu(chainer.Variable(self.x))
+        self.assertIsInstance(y, numpy.ndarray)
+        self.assertIsInstance(z, numpy.ndarray)
+        numpy.testing.assert_array_equal(y, [0., 1.])
+
+    def test_config(self):
+        with chainer.inference_mode():
+            self.assertFalse(chainer.config.enable_backprop)
+            self.assertFalse(chainer.config.train)
+            self.assertTrue(chainer.config.raw_array_mode)
+        self.assertTrue(chainer.config.enable_backprop)
+        self.assertTrue(chainer.config.train)
+        self.assertFalse(chainer.config.raw_array_mode)
+
+    def test_type_check(self):
+        with chainer.inference_mode():
+            with self.assertRaises(type_check.InvalidType):
+                chainer.functions.relu(self.x.astype(numpy.int32))
+
+    def test_force_backprop_mode(self):
+        # Raw arrays are not returned when the graph is required.
+        with chainer.inference_mode():
+            with chainer.force_backprop_mode():
+                y = chainer.functions.relu(chainer.Variable(self.x))
+        self.assertIsInstance(y, chainer.Variable)
+        self.assertIsNotNone(y.creator_node)
+
+    def test_function_hook(self):
+        with chainer.inference_mode(), chainer.function_hooks.TimerHook():
+            y = chainer.functions.relu(self.x)
+        self.assertIsInstance(y, chainer.Variable)
+        self.assertIsNone(y.creator_node)
+
+    def test_old_style_function(self):
+        class Function(chainer.Function):
+
+            def forward(self, inputs):
+                return inputs[0] * 2,
+
+        with chainer.inference_mode():
+            y = Function()(self.x)
+        self.assertIsInstance(y, numpy.ndarray)
+        numpy.testing.assert_array_equal(y, [-2., 2.])
+
+
 class MyThread(threading.Thread):
 
     def run(self):
@@ -514,6 +514,30 @@ class TestLink(LinkTestBase, unittest.TestCase):
         numpy.testing.assert_array_equal(self.link.u.grad, gu_expect)
         self.assertIsNone(self.link.v.grad, None)
 
+    def test_addgrads_sparse_grad(self):
+        def create_link(indices, rows):
+            l = chainer.Link()
+            with l.init_scope():
+                l.x = chainer.Parameter(numpy.zeros((2, 3)))
+            l.x.add_sparse_grad(chainer.utils.RowSparseArray(
+                numpy.array(indices), numpy.array(rows), (2, 3)))
+            return l
+
+        l1 = create_link([0, 1], [[1, 1, 1], [1, 1, 1]])
+        l2 = create_link([1], [[2, 2, 2]])
+        l1.addgrads(l2)
+
+        self.assertIsNone(l1.x.grad)
+        numpy.testing.assert_array_equal(
+            l1.x.sparse_grad.to_dense(), [[1, 1, 1], [3, 3, 3]])
+
+    def test_copy_with_share_mode_sparse_grad(self):
+        self.link.x.add_sparse_grad(chainer.utils.RowSparseArray(
+            numpy.array([1]), numpy.ones((1, 3)), (2, 3)))
+        link = self.link.copy(mode='share')
+        self.assertIsNone(link.x.sparse_grad)
+        self.assertIsNotNone(self.link.x.sparse_grad)
+
     def test_serialize(self):
         serializer = mock.MagicMock(return_value=3)
         l = chainer.Link()
@@ -2253,4 +2277,45 @@ class TestCallMethod(unittest.TestCase):
             self.model(0)
 
 
+class TestInference(unittest.TestCase):
+
+    def setUp(self):
+        self.x = numpy.random.uniform(-1, 1, (2, 3)).astype(numpy.float32)
+
+    def check_inference(self, model, expected_type=numpy.ndarray):
+        y = model.inference(self.x)
+        with chainer.using_config('train', False), \
+                chainer.no_backprop_mode():
+            y_expect = model(self.x)
+        self.assertIsInstance(y, expected_type)
+        return y, y_expect
+
+    def test_sequential(self):
+        model = chainer.Sequential(
+            chainer.links.Linear(3, 4), chainer.functions.relu,
+            chainer.links.BatchNormalization(4),
+            chainer.functions.dropout, chainer.links.Linear(4, 2))
+        y, y_expect = self.check_inference(model)
+        testing.assert_allclose(y, y_expect.array)
+
+    def test_chain_outputs(self):
+        class Model(chainer.Chain):
+
+            def __init__(self):
+                super(Model, self).__init__()
+                with self.init_scope():
+                    self.l1 = chainer.links.Linear(3, 4)
+
+            def forward(self, x):
+                h = self.l1(x)
+                return {'h': h, 'ys': [chainer.as_variable(x), (h * 2,)]}
+
+        y, y_expect = self.check_inference(Model(), dict)
+        testing.assert_allclose(y['h'], y_expect['h'].array)
+        self.assertIsInstance(y['ys'], list)
+        self.assertIsInstance(y['ys'][0], numpy.ndarray)
+        self.assertIsInstance(y['ys'][1], tuple)
+        testing.assert_allclose(y['ys'][1][0], y_expect['ys'][1][0].array)
+
+
 testing.run_module(__name__, __file__)
@@ -303,6 +303,65 @@ class TestUpdateRule(unittest.TestCase):
         self.assertIsNone(self.update_rule.state)
 
 
+class TestUpdateRuleSparseGrad(unittest.TestCase):
+
+    def setUp(self):
+        self.param = chainer.Parameter(np.ones((4, 3), np.float32))
+        self.param.cleargrad()
+        self.sparse_grad = chainer.utils.RowSparseArray(
+            np.array([2, 0, 2], np.int32),
+            np.arange(9, dtype=np.float32).reshape(3, 3), (4, 3))
+        self.param.add_sparse_grad(self.sparse_grad)
+        self.update_rule = optimizer.UpdateRule()
+        self.update_rule.update_core_cpu = mock.MagicMock()
+
+    def test_update_core_sparse(self):
+        self.update_rule.update_core_sparse = mock.MagicMock()
+        self.update_rule.update(self.param)
+        self.update_rule.update_core_sparse.assert_called_once_with(
+            self.param, self.sparse_grad)
+        self.assertEqual(self.update_rule.update_core_cpu.call_count, 0)
+
+    def test_default_update_core_sparse(self):
+        self.update_rule.update(self.param)
+        self.assertEqual(self.update_rule.update_core_cpu.call_count, 1)
+        self.assertIsNone(self.param.sparse_grad)
+        np.testing.assert_array_equal(
+            self.param.grad, self.sparse_grad.to_dense())
+
+    def test_hook(self):
+        hook = mock.MagicMock()
+        self.update_rule.add_hook(hook, name='hook')
+        self.update_rule.update_core_sparse = mock.MagicMock()
+        self.update_rule.update(self.param)
+        self.assertEqual(self.update_rule.update_core_sparse.call_count, 0)
+        self.assertEqual(self.update_rule.update_core_cpu.call_count, 1)
+        np.testing.assert_array_equal(
+            self.param.grad, self.sparse_grad.to_dense())
+
+    def test_dense_and_sparse_grad(self):
+        self.param.grad = np.ones((4, 3), np.float32)
+        self.update_rule.update(self.param)
+        self.assertEqual(self.update_rule.update_core_cpu.call_count, 1)
+        self.assertIsNone(self.param.sparse_grad)
+        np.testing.assert_array_equal(
+            self.param.grad, self.sparse_grad.to_dense() + 1)
+
+    def test_loss_scale(self):
+        self.param._loss_scale = 4.
+        self.update_rule.update_core_sparse = mock.MagicMock()
+        self.update_rule.update(self.param)
+        grad = self.update_rule.update_core_sparse.call_args[0][1]
+        np.testing.assert_array_equal(grad.indices, self.sparse_grad.indices)
+        np.testing.assert_array_equal(grad.rows, self.sparse_grad.rows / 4)
+
+    def test_default_update_core_sparse_loss_scale(self):
+        self.param._loss_scale = 4.
+        self.update_rule.update(self.param)
+        np.testing.assert_array_equal(
+            self.param.grad, self.sparse_grad.to_dense() / 4)
+
+
 class TestOptimizer(unittest.TestCase):
 
     def setUp(self):
@@ -499,6 +558,31 @@ class TestGradientMethod(unittest.TestCase):
         self.check_update()
 
 
+class TestGradientMethodSparseGrad(unittest.TestCase):
+
+    def setUp(self):
+        self.target = SimpleLink(np.ones((4, 3), np.float32), None)
+        self.target.param.cleargrad()
+        self.sparse_grad = chainer.utils.RowSparseArray(
+            np.array([1, 3], np.int32), np.ones((2, 3), np.float32), (4, 3))
+        self.target.param.add_sparse_grad(self.sparse_grad)
+        self.optimizer = chainer.GradientMethod()
+        self.optimizer.create_update_rule = mock.MagicMock
+        self.optimizer.setup(self.target)
+
+    def test_reallocate_cleared_grads(self):
+        self.optimizer.reallocate_cleared_grads()
+        self.assertIsNone(self.target.param.grad)
+        self.assertIs(self.target.param.sparse_grad, self.sparse_grad)
+
+    def test_reallocate_cleared_grads_with_hook(self):
+        self.optimizer.add_hook(mock.MagicMock(), name='hook')
+        self.optimizer.reallocate_cleared_grads()
+        self.assertIsNone(self.target.param.sparse_grad)
+        np.testing.assert_array_equal(
+            self.target.param.grad, self.sparse_grad.to_dense())
+
+
 @testing.parameterize(*testing.product({
     'shape': [(4, 3, 2)],
     'dtype': [np.float16, np.float32, np.float64],
@@ -7,6 +7,7 @@ import mock
 import numpy
 import six
 
+import chainer
 from chainer import cuda
 from chainer import functions
 from chainer import links
@@ -550,4 +551,95 @@ class TestSequential(unittest.TestCase):
         self.assertIs(flattened_s2[2], self.l3)
 
 
+class TestSequentialMemoryBudget(unittest.TestCase):
+
+    def setUp(self):
+        self.model = links.Linear(100, 100).repeat(10)
+        self.x = numpy.random.uniform(-1, 1, (8, 100)).astype(numpy.float32)
+        # Each layer retains its input of 8 * 100 * 4 = 3200 bytes.
+        self.layer_bytes = 3200
+
+    def forward_backward(self, model):
+        model.cleargrads()
+        y = model(self.x)
+        functions.sum(y).backward()
+        return y.array, [param.grad.copy() for param in model.params()]
+
+    def check_budget(self, memory_budget, expected_segments):
+        y_expect, grads_expect = self.forward_backward(self.model)
+        ret = self.model.set_memory_budget(memory_budget)
+        self.assertIs(ret, self.model)
+
+        # The first iteration recomputes every layer to measure them.
+        y, grads = self.forward_backward(self.model)
+        report = self.model.memory_report
+        self.assertEqual(report['segments'],
+                         [(i, i + 1) for i in six.moves.range(10)])
+        self.assertIsNone(report['estimated_peak_bytes'])
+        self.assertEqual(report['actual_peak_bytes'], self.layer_bytes * 10)
+        testing.assert_allclose(y, y_expect)
+        for grad, grad_expect in zip(grads, grads_expect):
+            testing.assert_allclose(grad, grad_expect)
+
+        y, grads = self.forward_backward(self.model)
+        report = self.model.memory_report
+        self.assertEqual(report['segments'], expected_segments)
+        self.assertEqual(report['estimated_peak_bytes'],
+                         report['actual_peak_bytes'])
+        self.assertLessEqual(report['actual_peak_bytes'], memory_budget)
+        testing.assert_allclose(y, y_expect)
+        for grad, grad_expect in zip(grads, grads_expect):
+            testing.assert_allclose(grad, grad_expect)
+
+    def test_no_recomputation(self):
+        self.check_budget(self.layer_bytes * 10, [(0, 10)])
+
+    def test_recomputation(self):
+        self.check_budget(self.layer_bytes * 9, [(0, 2), (2, 6), (6, 10)])
+
+    def test_budget_not_satisfied(self):
+        self.model.set_memory_budget(100)
+        self.forward_backward(self.model)
+        with testing.assert_warns(UserWarning):
+            self.forward_backward(self.model)
+        # The segments with the least estimated peak are used.
+        report = self.model.memory_report
+        self.assertEqual(report['actual_peak_bytes'], self.layer_bytes * 7)
+
+    def test_backward_workers(self):
+        self.model.set_memory_budget(self.layer_bytes * 9)
+        self.forward_backward(self.model)
+        y_expect, grads_expect = self.forward_backward(self.model)
+        report_expect = self.model.memory_report
+        with chainer.using_config('backward_workers', 2):
+            y, grads = self.forward_backward(self.model)
+        self.assertEqual(self.model.memory_report, report_expect)
+        testing.assert_allclose(y, y_expect)
+        for grad, grad_expect in zip(grads, grads_expect):
+            testing.assert_allclose(grad, grad_expect)
+
+    def test_no_backprop(self):
+        self.model.set_memory_budget(100)
+        with chainer.no_backprop_mode():
+            self.model(self.x)
+        self.assertIsNone(self.model.memory_report)
+
+    def test_input_shape_changed(self):
+        self.model.set_memory_budget(self.layer_bytes * 6)
+        self.forward_backward(self.model)
+        self.forward_backward(self.model)
+        self.x = self.x[:4]
+        self.forward_backward(self.model)
+        self.assertIsNone(self.model.memory_report['estimated_peak_bytes'])
+
+    def test_invalid_budget(self):
+        with self.assertRaises(ValueError):
+            self.model.set_memory_budget(0)
+
+    def test_repeat(self):
+        model = links.Linear(3, 3).repeat(2, memory_budget=1000)
+        self.assertEqual(model.memory_budget, 1000)
+        self.assertEqual(model.copy().memory_budget, 1000)
+
+
 testing.run_module(__name__, __file__)
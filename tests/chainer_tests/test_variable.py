@@ -3,6 +3,7 @@ import inspect
 import platform
 import re
 import sys
+import threading
 import unittest
 
 import mock
@@ -12,6 +13,7 @@ import six
 
 import chainer
 from chainer import backend
+from chainer import configuration
 from chainer.backends import cuda
 from chainer.backends import intel64
 import chainer.functions as F
@@ -195,6 +197,22 @@ class TestVariableNode(unittest.TestCase):
         with pytest.raises(ValueError):
             variable.VariableNode(chainer.Variable(), '', grad=None)
 
+    def test_no_dict(self):
+        node = variable.VariableNode(chainer.Variable(), 'x')
+        assert not hasattr(node, '__dict__')
+        with pytest.raises(AttributeError):
+            node.foo = 1
+
+    def test_subclass_dict(self):
+        class MyVariableNode(variable.VariableNode):
+            pass
+
+        node = MyVariableNode(chainer.Variable(), 'x')
+        node.foo = 1
+        assert node.foo == 1
+        assert node.creator_node is None
+        assert node.rank == 0
+
 
 @testing.parameterize(
     {'x_shape': (10,), 'c_shape': (2, 5), 'label': '(2, 5), float32'},
@@ -1330,6 +1348,32 @@ class TestVariableBasic(unittest.TestCase):
             if not a:
                 pass
 
+    def test_no_dict(self):
+        a = chainer.Variable(np.ones((2,)))
+        assert not hasattr(a, '__dict__')
+        with pytest.raises(AttributeError):
+            a.foo = 1
+
+    def test_copy(self):
+        a = chainer.Variable(np.ones((2,)), name='a')
+        a.grad = np.zeros((2,))
+        b = copy.copy(a)
+        assert b.array is a.array
+        assert b.grad is a.grad
+        assert b.name == 'a'
+        assert b.node is not a.node
+        assert b.node.get_variable_or_none() is b
+
+    def test_copy_subclass(self):
+        class MyVariable(chainer.Variable):
+            pass
+
+        a = MyVariable(np.ones((2,)))
+        a.foo = 1
+        b = a._copy_to(MyVariable())
+        assert b.foo == 1
+        assert b.array is a.array
+
 
 class TestVariableDataAssign(unittest.TestCase):
 
@@ -1424,6 +1468,27 @@ class TestParameter(unittest.TestCase):
         x.update()
         assert update_rule.update.call_count == 1
 
+    def test_addgrad_sparse_grad(self):
+        x = chainer.Parameter(self.a)
+        x.grad = np.ones_like(self.a)
+        y = chainer.Parameter(self.a)
+        y.cleargrad()
+        y.add_sparse_grad(chainer.utils.RowSparseArray(
+            np.array([2, 0]), np.ones((2, 2), np.float32), (3, 2)))
+        x.addgrad(y)
+        np.testing.assert_array_equal(x.grad, np.ones_like(self.a))
+        np.testing.assert_array_equal(
+            x.sparse_grad.to_dense(), y.sparse_grad.to_dense())
+
+    def test_densify_sparse_grad(self):
+        x = chainer.Parameter(self.a)
+        x.grad = np.ones_like(self.a)
+        x.add_sparse_grad(chainer.utils.RowSparseArray(
+            np.array([2, 2]), np.ones((2, 2), np.float32), (3, 2)))
+        x.densify_sparse_grad()
+        assert x.sparse_grad is None
+        np.testing.assert_array_equal(x.grad, [[1, 1], [1, 1], [3, 3]])
+
 
 @testing.parameterize(
     {'x_shape': (10,)},
@@ -2887,4 +2952,154 @@ class TestLazyGradSum(unittest.TestCase):
             self.check_backward()
 
 
+class StopGradient(chainer.FunctionNode):
+
+    def forward(self, inputs):
+        return inputs[0].copy(),
+
+    def backward(self, indexes, grad_outputs):
+        return None,
+
+
+@testing.parameterize(*testing.product({
+    'n_workers': [2, 4],
+    'lazy_grad_sum': [False, True],
+}))
+class TestBackwardWorkers(unittest.TestCase):
+
+    def setUp(self):
+        self.x = np.random.uniform(-1, 1, (4, 3)).astype(np.float32)
+        self.ws = [
+            np.random.uniform(-1, 1, (3, 3)).astype(np.float32)
+            for _ in range(3)]
+
+    def forward(self):
+        x = chainer.Variable(self.x)
+        ws = [chainer.Variable(w) for w in self.ws]
+        branches = []
+        for i, w in enumerate(ws):
+            h = x
+            for _ in range(i + 1):
+                h = chainer.functions.tanh(chainer.functions.matmul(h, w))
+            branches.append(h)
+        # The branch through StopGradient does not propagate gradients.
+        branches.append(StopGradient().apply((x * 2,))[0])
+        loss = chainer.functions.sum(chainer.functions.concat(branches))
+        return loss, x, ws
+
+    def backward(self, n_workers):
+        with chainer.using_config('backward_workers', n_workers), \
+                chainer.using_config('lazy_grad_sum', self.lazy_grad_sum):
+            loss, x, ws = self.forward()
+            loss.backward()
+        return [v.grad for v in [x] + ws]
+
+    def grad(self, n_workers):
+        with chainer.using_config('backward_workers', n_workers), \
+                chainer.using_config('lazy_grad_sum', self.lazy_grad_sum):
+            loss, x, ws = self.forward()
+            gxs = chainer.grad([loss], [x] + ws)
+        return [gx.array for gx in gxs]
+
+    def count_config_updates(self, n_workers):
+        loss, _, _ = self.forward()
+        with chainer.using_config('backward_workers', n_workers):
+            version = configuration._version
+            loss.backward()
+            return configuration._version - version
+
+    def test_config_version(self):
+        # Workers do not update the configuration version, which would
+        # invalidate the caches derived from it in all threads.
+        expected = self.count_config_updates(1)
+        assert self.count_config_updates(self.n_workers) == expected
+
+    def test_config_in_workers(self):
+        # Workers see the configuration of the thread starting the backprop.
+        loss, _, _ = self.forward()
+        seen = []
+        func = loss.creator_node
+        original = func.backward
+
+        def backward(*args):
+            seen.append(chainer.config.train)
+            return original(*args)
+
+        func.backward = backward
+        with chainer.using_config('backward_workers', self.n_workers), \
+                chainer.using_config('train', False):
+            loss.backward()
+        assert seen == [False]
+
+    def test_local_function_hook(self):
+        # Local function hooks are called around the backward computation.
+        loss, _, _ = self.forward()
+        events = []
+        func = loss.creator_node
+        original = func.backward
+
+        def backward(*args):
+            events.append('backward')
+            return original(*args)
+
+        class Hook(chainer.FunctionHook):
+
+            def backward_preprocess(self, function, in_data, out_grad):
+                events.append('preprocess')
+
+            def backward_postprocess(self, function, in_data, out_grad):
+                events.append('postprocess')
+
+        func.backward = backward
+        func.add_hook(Hook())
+        with chainer.using_config('backward_workers', self.n_workers):
+            loss.backward()
+        assert events == ['preprocess', 'backward', 'postprocess']
+
+    def test_backward(self):
+        expected = self.backward(1)
+        actual = self.backward(self.n_workers)
+        for e, a in six.moves.zip(expected, actual):
+            np.testing.assert_array_equal(e, a)
+
+    def test_grad(self):
+        expected = self.grad(1)
+        actual = self.grad(self.n_workers)
+        for e, a in six.moves.zip(expected, actual):
+            np.testing.assert_array_equal(e, a)
+
+    def test_forget(self):
+        # F.forget calls Variable.backward in its backward computation,
+        # which runs on a worker thread.
+        def backward(n_workers):
+            x = chainer.Variable(self.x)
+            branches = [
+                chainer.functions.forget(
+                    lambda h: chainer.functions.tanh(h) * 2, x)
+                for _ in range(4)]
+            loss = chainer.functions.sum(
+                chainer.functions.concat(branches))
+            with chainer.using_config('backward_workers', n_workers):
+                loss.backward()
+            return x.grad
+
+        expected = backward(1)
+        actual = []
+        thread = threading.Thread(
+            target=lambda: actual.append(backward(self.n_workers)))
+        thread.daemon = True
+        thread.start()
+        thread.join(60)
+        assert not thread.is_alive(), 'backward deadlocked'
+        np.testing.assert_array_equal(expected, actual[0])
+
+    def test_error(self):
+        loss, x, _ = self.forward()
+        loss.creator_node.backward = mock.MagicMock(
+            side_effect=RuntimeError('error in backward'))
+        with chainer.using_config('backward_workers', self.n_workers):
+            with pytest.raises(RuntimeError):
+                loss.backward()
+
+
 testing.run_module(__name__, __file__)
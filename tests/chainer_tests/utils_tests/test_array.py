@@ -53,4 +53,59 @@ class TestSumTo(unittest.TestCase):
         numpy.testing.assert_array_equal(y_expect, y_actual)
 
 
+@testing.parameterize(*testing.product({
+    'shape_slices': [
+        ((10,), 3),
+        ((10, 3), slice(2, 8, 3)),
+        ((10,), [1, 2, 1, 9]),
+        ((10, 3), [1, 2, 1, 9]),
+        ((10, 3), [1, 2, 3]),
+        ((10, 3), [[1, 2], [1, 9]]),
+        ((10, 3), [-1, 9, 0]),
+        ((10, 3), []),
+        ((4, 5, 6), (slice(None), [0, 1, 1], [2, 2, 2])),
+        ((4, 5, 6), ([0, 1, 1], slice(None), [2, 2, 2])),
+        ((4, 5, 6), (1, [0, 0, 4], slice(None, None, 2))),
+        ((4, 5, 6), (Ellipsis, [0, 5, 5])),
+        ((4, 5, 6), ([0, 3, 3], Ellipsis)),
+        ((4, 5, 6), (None, [0, 3, 3], None, slice(1, 3))),
+        ((4, 5, 6), numpy.array([[1, 0, 0, 1, 1]] * 4, dtype=bool)),
+        ((50,), numpy.arange(200) % 50),
+        ((5, 3), numpy.arange(60) % 5),
+        ((20, 3), numpy.append(numpy.zeros(30, int), numpy.arange(20))),
+        ((20, 40), numpy.append(numpy.zeros(30, int), numpy.arange(20))),
+    ],
+    'dtype': [numpy.float16, numpy.float32, numpy.int32],
+}))
+class TestScatterAdd(unittest.TestCase):
+
+    def setUp(self):
+        shape, self.slices = self.shape_slices
+        self.a = numpy.random.uniform(-1, 1, shape).astype(self.dtype)
+        if self.dtype == numpy.float16:
+            self.check_options = {'atol': 5e-3, 'rtol': 5e-3}
+        else:
+            self.check_options = {}
+
+    def check_scatter_add(self, value):
+        expect = self.a.copy()
+        numpy.add.at(expect, self.slices, value)
+        array.scatter_add(self.a, self.slices, value)
+        testing.assert_allclose(expect, self.a, **self.check_options)
+
+    def test_scatter_add(self):
+        shape = self.a[self.slices].shape
+        self.check_scatter_add(
+            numpy.random.uniform(-1, 1, shape).astype(self.dtype))
+
+    def test_scatter_add_broadcast(self):
+        self.check_scatter_add(self.dtype(2))
+
+    def test_scatter_add_non_contiguous(self):
+        self.a = numpy.asfortranarray(self.a)
+        shape = self.a[self.slices].shape
+        self.check_scatter_add(
+            numpy.random.uniform(-1, 1, shape).astype(self.dtype))
+
+
 testing.run_module(__name__, __file__)
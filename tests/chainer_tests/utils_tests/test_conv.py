@@ -96,6 +96,15 @@ class TestIm2Col(unittest.TestCase):
     def test_im2col_cpu(self):
         self.check_im2col(*self.params, gpu=False)
 
+    def test_im2col_cpu_view(self):
+        kh, kw, sy, sx, ph, pw, dy, dx = self.params
+        col = conv.im2col_cpu(
+            self.img, kh, kw, sy, sx, ph, pw, dy=dy, dx=dx, copy=False)
+        col_expect = conv.im2col_cpu(
+            self.img, kh, kw, sy, sx, ph, pw, dy=dy, dx=dx)
+        assert not col.flags.writeable
+        numpy.testing.assert_array_equal(col_expect, col)
+
     @attr.gpu
     def test_im2col_gpu(self):
         self.check_im2col(*self.params, gpu=True)
@@ -154,4 +163,41 @@ class TestCol2Im(unittest.TestCase):
         self.check_col2im(*self.params, gpu=True)
 
 
+class TestIm2ColWorkspace(unittest.TestCase):
+
+    def setUp(self):
+        self.original_size = conv.get_im2col_workspace_size()
+
+    def tearDown(self):
+        conv.set_im2col_workspace_size(self.original_size)
+
+    def check_chunks(self, size, n, out_h, row_size, expect):
+        conv.set_im2col_workspace_size(size)
+        chunks = list(conv.iter_im2col_chunks(n, out_h, row_size))
+        assert chunks == expect
+
+    def test_unlimited(self):
+        self.check_chunks(None, 4, 3, 100, [(slice(None), slice(None))])
+
+    def test_fit(self):
+        self.check_chunks(1200, 4, 3, 100, [(slice(None), slice(None))])
+
+    def test_batch_chunks(self):
+        self.check_chunks(700, 4, 3, 100, [
+            (slice(0, 2), slice(None)), (slice(2, 4), slice(None))])
+
+    def test_row_chunks(self):
+        self.check_chunks(200, 2, 3, 100, [
+            (slice(0, 1), slice(0, 2)), (slice(0, 1), slice(2, 4)),
+            (slice(1, 2), slice(0, 2)), (slice(1, 2), slice(2, 4))])
+
+    def test_smaller_than_row(self):
+        self.check_chunks(10, 1, 2, 100, [
+            (slice(0, 1), slice(0, 1)), (slice(0, 1), slice(1, 2))])
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError):
+            conv.set_im2col_workspace_size(0)
+
+
 testing.run_module(__name__, __file__)
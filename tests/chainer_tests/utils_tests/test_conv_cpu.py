@@ -0,0 +1,192 @@
+import unittest
+
+import mock
+import numpy
+
+import chainer
+from chainer import testing
+from chainer.utils import conv
+from chainer.utils import conv_cpu
+
+
+def _forward_im2col(x, W, ph, pw):
+    kh, kw = W.shape[2:]
+    col = conv.im2col_cpu(x, kh, kw, 1, 1, ph, pw)
+    y = numpy.tensordot(col, W, ((1, 2, 3), (1, 2, 3)))
+    return numpy.rollaxis(y, 3, 1)
+
+
+def _backward_filter_im2col(x, gy, kh, kw, ph, pw):
+    col = conv.im2col_cpu(x, kh, kw, 1, 1, ph, pw)
+    return numpy.tensordot(gy, col, ((0, 2, 3), (0, 4, 5)))
+
+
+@testing.parameterize(*testing.product({
+    'params': [
+        # (n, c_I, h, w, c_O, kh, kw, ph, pw)
+        (2, 3, 4, 3, 2, 3, 3, 1, 1),
+        (2, 3, 7, 8, 4, 3, 3, 0, 2),
+        (1, 2, 5, 6, 3, 3, 3, 2, 0),
+        (2, 2, 9, 7, 3, 5, 4, 2, 1),
+        (1, 1, 3, 3, 1, 1, 1, 0, 0),
+    ],
+    'dtype': [numpy.float32, numpy.float64],
+}))
+class TestConvolutionAlgorithms(unittest.TestCase):
+
+    def setUp(self):
+        n, c, h, w, out_c, self.kh, self.kw, self.ph, self.pw = self.params
+        self.x = numpy.random.uniform(
+            -1, 1, (n, c, h, w)).astype(self.dtype)
+        self.W = numpy.random.uniform(
+            -1, 1, (out_c, c, self.kh, self.kw)).astype(self.dtype)
+        self.y_expect = _forward_im2col(self.x, self.W, self.ph, self.pw)
+        self.gy = numpy.random.uniform(
+            -1, 1, self.y_expect.shape).astype(self.dtype)
+        self.gW_expect = _backward_filter_im2col(
+            self.x, self.gy, self.kh, self.kw, self.ph, self.pw)
+        if self.dtype == numpy.float32:
+            self.check_options = {'atol': 1e-4, 'rtol': 1e-4}
+        else:
+            self.check_options = {}
+
+    def check(self, expect, actual):
+        assert actual.dtype == self.dtype
+        assert actual.shape == expect.shape
+        testing.assert_allclose(expect, actual, **self.check_options)
+
+    def test_winograd_forward(self):
+        if (self.kh, self.kw) != (3, 3):
+            return
+        y = conv_cpu.winograd_forward(self.x, self.W, self.ph, self.pw)
+        self.check(self.y_expect, y)
+
+    def test_winograd_backward_filter(self):
+        if (self.kh, self.kw) != (3, 3):
+            return
+        gW = conv_cpu.winograd_backward_filter(
+            self.x, self.gy, self.ph, self.pw)
+        self.check(self.gW_expect, gW)
+
+    def test_fft_forward(self):
+        y = conv_cpu.fft_forward(self.x, self.W, self.ph, self.pw)
+        self.check(self.y_expect, y)
+
+    def test_fft_backward_filter(self):
+        gW = conv_cpu.fft_backward_filter(
+            self.x, self.gy, self.kh, self.kw, self.ph, self.pw)
+        self.check(self.gW_expect, gW)
+
+
+class TestIsSupported(unittest.TestCase):
+
+    def test_supported(self):
+        assert conv_cpu.is_supported(
+            (numpy.dtype(numpy.float32),) * 2, (1, 1), (1, 1))
+
+    def test_stride(self):
+        assert not conv_cpu.is_supported(
+            (numpy.dtype(numpy.float32),) * 2, (2, 1), (1, 1))
+
+    def test_dilate(self):
+        assert not conv_cpu.is_supported(
+            (numpy.dtype(numpy.float32),) * 2, (1, 1), (1, 2))
+
+    def test_half(self):
+        assert not conv_cpu.is_supported(
+            (numpy.dtype(numpy.float16),) * 2, (1, 1), (1, 1))
+
+    def test_mixed_dtypes(self):
+        assert not conv_cpu.is_supported(
+            (numpy.dtype(numpy.float32), numpy.dtype(numpy.float64)),
+            (1, 1), (1, 1))
+
+
+class TestChooseAlgorithm(unittest.TestCase):
+
+    def test_winograd(self):
+        assert conv_cpu._choose_algorithm(
+            8, 64, 32, 32, 64, 3, 3, 1, 1) == 'winograd'
+
+    def test_winograd_few_tiles(self):
+        assert conv_cpu._choose_algorithm(
+            1, 256, 14, 14, 256, 3, 3, 1, 1) == 'im2col'
+
+    def test_fft(self):
+        assert conv_cpu._choose_algorithm(
+            4, 3, 64, 64, 16, 11, 11, 5, 5) == 'fft'
+
+    def test_im2col(self):
+        assert conv_cpu._choose_algorithm(
+            4, 64, 32, 32, 64, 5, 5, 2, 2) == 'im2col'
+
+
+class TestAutotune(unittest.TestCase):
+
+    def setUp(self):
+        self.x = numpy.random.uniform(-1, 1, (2, 3, 6, 6)).astype('f')
+        self.W = numpy.random.uniform(-1, 1, (4, 3, 3, 3)).astype('f')
+        self.original_algorithms = conv_cpu._algorithms
+        conv_cpu._algorithms = {}
+
+    def tearDown(self):
+        conv_cpu._algorithms = self.original_algorithms
+
+    def test_autotune(self):
+        im2col = mock.Mock(
+            side_effect=lambda x, W: _forward_im2col(x, W, 1, 1))
+        with chainer.using_config('autotune', True):
+            y1 = conv_cpu.convolution_forward(self.x, self.W, 1, 1, im2col)
+            assert im2col.call_count == 1
+            assert len(conv_cpu._algorithms) == 1
+            name, = conv_cpu._algorithms.values()
+            assert name in ('im2col', 'winograd', 'fft')
+
+            y2 = conv_cpu.convolution_forward(self.x, self.W, 1, 1, im2col)
+            assert im2col.call_count == (2 if name == 'im2col' else 1)
+            assert len(conv_cpu._algorithms) == 1
+
+        y_expect = _forward_im2col(self.x, self.W, 1, 1)
+        testing.assert_allclose(y_expect, y1, atol=1e-4, rtol=1e-4)
+        testing.assert_allclose(y_expect, y2, atol=1e-4, rtol=1e-4)
+
+    def test_no_autotune(self):
+        im2col = mock.Mock(
+            side_effect=lambda x, W: _forward_im2col(x, W, 1, 1))
+        conv_cpu.convolution_forward(self.x, self.W, 1, 1, im2col)
+        assert im2col.call_count == 1
+        assert conv_cpu._algorithms == {}
+
+
+class TestConvolution2DAlgorithms(unittest.TestCase):
+
+    def setUp(self):
+        self.x = numpy.random.uniform(-1, 1, (8, 16, 8, 8)).astype('f')
+        self.W = numpy.random.uniform(-1, 1, (16, 16, 3, 3)).astype('f')
+        self.b = numpy.random.uniform(-1, 1, (16,)).astype('f')
+
+    def test_winograd(self):
+        with mock.patch.object(
+                conv_cpu, 'winograd_forward',
+                side_effect=conv_cpu.winograd_forward) as winograd_forward:
+            y = chainer.functions.convolution_2d(self.x, self.W, self.b, pad=1)
+        assert winograd_forward.call_count == 1
+        y_expect = _forward_im2col(self.x, self.W, 1, 1) + \
+            self.b.reshape(1, -1, 1, 1)
+        testing.assert_allclose(y_expect, y.array, atol=1e-4, rtol=1e-4)
+
+    def test_deconvolution(self):
+        x = numpy.random.uniform(-1, 1, (8, 16, 6, 6)).astype('f')
+        with mock.patch.object(
+                conv_cpu, 'winograd_forward',
+                side_effect=conv_cpu.winograd_forward) as winograd_forward:
+            y = chainer.functions.deconvolution_2d(x, self.W, pad=0)
+        assert winograd_forward.call_count == 1
+        # Deconvolution is the transpose of convolution.
+        y_expect = numpy.tensordot(self.W, x, (0, 1))
+        y_expect = conv.col2im_cpu(
+            numpy.rollaxis(y_expect, 3), 1, 1, 0, 0, 8, 8)
+        testing.assert_allclose(y_expect, y.array, atol=1e-4, rtol=1e-4)
+
+
+testing.run_module(__name__, __file__)
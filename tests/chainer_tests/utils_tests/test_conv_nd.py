@@ -95,6 +95,19 @@ class TestIm2ColND(unittest.TestCase):
         pad = (1, 2, 1)[:ndim]
         self.check_im2col_nd(ksize, stride, pad, gpu=False)
 
+    def test_im2col_nd_cpu_view(self):
+        ndim = len(self.dims)
+        ksize = (2, 3, 1)[:ndim]
+        stride = (2, 1, 3)[:ndim]
+        pad = (1, 0, 2)[:ndim]
+        dilate = (1, 2, 1)[:ndim]
+        col = conv_nd.im2col_nd_cpu(
+            self.img, ksize, stride, pad, dilate=dilate, copy=False)
+        col_expect = conv_nd.im2col_nd_cpu(
+            self.img, ksize, stride, pad, dilate=dilate)
+        assert not col.flags.writeable
+        numpy.testing.assert_array_equal(col_expect, col)
+
     @attr.gpu
     def test_im2col_nd_1_gpu(self):
         ndim = len(self.dims)
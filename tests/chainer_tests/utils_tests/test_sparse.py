@@ -108,4 +108,56 @@ class TestGetOrder2(unittest.TestCase):
             utils.get_order(row, col)
 
 
+class TestRowSparseArray(unittest.TestCase):
+
+    def setUp(self):
+        self.indices = numpy.array([3, 0, 3, 1], numpy.int32)
+        self.rows = numpy.random.uniform(-1, 1, (4, 2, 3)).astype('f')
+        self.shape = (5, 2, 3)
+        self.x = utils.RowSparseArray(self.indices, self.rows, self.shape)
+        self.expect = numpy.zeros(self.shape, 'f')
+        numpy.add.at(self.expect, self.indices, self.rows)
+
+    def test_to_dense(self):
+        assert self.x.dtype == numpy.float32
+        testing.assert_allclose(self.x.to_dense(), self.expect)
+
+    def test_add_to(self):
+        y = numpy.ones(self.shape, 'f')
+        self.x.add_to(y)
+        testing.assert_allclose(y, self.expect + 1)
+
+    def test_coalesce(self):
+        y = self.x.coalesce()
+        numpy.testing.assert_array_equal(y.indices, [0, 1, 3])
+        assert y.rows.shape == (3, 2, 3)
+        testing.assert_allclose(y.to_dense(), self.expect)
+
+    def test_coalesce_unique(self):
+        x = utils.RowSparseArray(
+            self.indices[1:], self.rows[1:], self.shape)
+        y = x.coalesce()
+        numpy.testing.assert_array_equal(y.indices, [0, 1, 3])
+        testing.assert_allclose(y.to_dense(), x.to_dense())
+
+    def test_add(self):
+        y = self.x + self.x
+        assert len(y.indices) == 8
+        testing.assert_allclose(y.to_dense(), self.expect * 2)
+
+    def test_invalid_indices(self):
+        with self.assertRaises(ValueError):
+            utils.RowSparseArray(
+                self.indices.reshape(2, 2), self.rows, self.shape)
+
+    def test_invalid_rows(self):
+        with self.assertRaises(ValueError):
+            utils.RowSparseArray(self.indices, self.rows, (5, 3, 2))
+
+    def test_add_shape_mismatch(self):
+        x = utils.RowSparseArray(self.indices, self.rows, (4, 2, 3))
+        with self.assertRaises(ValueError):
+            self.x + x
+
+
 testing.run_module(__name__, __file__)
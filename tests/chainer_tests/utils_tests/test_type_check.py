@@ -4,6 +4,7 @@ import warnings
 
 import numpy
 
+import chainer
 from chainer.backends import cuda
 from chainer import testing
 from chainer.testing import attr
@@ -396,4 +397,100 @@ class TestSameTypes(unittest.TestCase):
         self.assertFalse(T.same_types(x, y, z))
 
 
+class CountingFunction(chainer.FunctionNode):
+
+    def __init__(self, axis=0, attr=None):
+        self.axis = axis
+        self.attr = attr
+        self.check_count = 0
+
+    def check_type_forward(self, in_types):
+        self.check_count += 1
+        T.expect(
+            in_types.size() == 1,
+            in_types[0].dtype.kind == 'f',
+            in_types[0].ndim > self.axis,
+        )
+
+    def forward(self, inputs):
+        return inputs[0] * 2,
+
+
+class TestSignatureCache(unittest.TestCase):
+
+    def setUp(self):
+        self.original_cache = T.signature_cache
+        T.signature_cache = T.SignatureCache(max_size=2)
+
+    def tearDown(self):
+        T.signature_cache = self.original_cache
+
+    def check_count(self, expected, x, **kwargs):
+        func = CountingFunction(**kwargs)
+        func.apply((x,))
+        self.assertEqual(func.check_count, expected)
+
+    def test_cached(self):
+        x = numpy.zeros((2, 3), numpy.float32)
+        self.check_count(1, x)
+        self.check_count(0, x)
+        self.check_count(0, numpy.ones((2, 3), numpy.float32))
+
+    def test_different_signature(self):
+        self.check_count(1, numpy.zeros((2, 3), numpy.float32))
+        self.check_count(1, numpy.zeros((3, 3), numpy.float32))
+        self.check_count(1, numpy.zeros((3, 3), numpy.float64))
+        self.check_count(1, numpy.zeros((3, 3), numpy.float64), axis=1)
+
+    def test_array_attribute(self):
+        x = numpy.zeros((2, 3), numpy.float32)
+        self.check_count(1, x, attr=numpy.zeros(3))
+        self.check_count(0, x, attr=numpy.ones(3))
+        self.check_count(1, x, attr=numpy.ones(4))
+
+    def test_uncacheable_attribute(self):
+        x = numpy.zeros((2, 3), numpy.float32)
+        self.check_count(1, x, attr=object())
+        self.check_count(1, x, attr=object())
+
+    def test_failure_not_cached(self):
+        x = numpy.zeros((2, 3), numpy.int32)
+        for _ in range(2):
+            with self.assertRaises(T.InvalidType):
+                CountingFunction().apply((x,))
+
+    def test_max_size(self):
+        xs = [numpy.zeros((i + 1,), numpy.float32) for i in range(3)]
+        for x in xs:
+            self.check_count(1, x)
+        self.check_count(0, xs[2])
+        self.check_count(1, xs[0])
+
+    def test_clear(self):
+        x = numpy.zeros((2, 3), numpy.float32)
+        self.check_count(1, x)
+        T.signature_cache.clear()
+        self.check_count(1, x)
+
+    def test_old_style_function(self):
+        class Function(chainer.Function):
+
+            def __init__(self, scale):
+                self.scale = scale
+
+            def check_type_forward(self, in_types):
+                Function.check_count += 1
+
+            def forward(self, inputs):
+                return inputs[0] * self.scale,
+
+        Function.check_count = 0
+        x = numpy.zeros((2, 3), numpy.float32)
+        Function(2)(x)
+        Function(2)(x)
+        self.assertEqual(Function.check_count, 1)
+        Function(3)(x)
+        self.assertEqual(Function.check_count, 2)
+
+
 testing.run_module(__name__, __file__)
@@ -9,16 +9,20 @@ from chainer.testing import attr
 from chainer import utils
 
 
+@testing.parameterize(*testing.product({
+    'buffer_size': [0, 10, 100],
+}))
 class TestWalkerAlias(unittest.TestCase):
 
     def setUp(self):
         self.ps = numpy.array([5, 3, 4, 1, 2], dtype=numpy.int32)
-        self.sampler = utils.WalkerAlias(self.ps)
+        self.sampler = utils.WalkerAlias(self.ps, self.buffer_size)
 
     def check_sample(self):
         counts = numpy.zeros(len(self.ps), numpy.float32)
         for _ in range(1000):
             vs = self.sampler.sample((4, 3))
+            assert vs.shape == (4, 3)
             numpy.add.at(counts, cuda.to_cpu(vs), 1)
         counts /= (1000 * 12)
         counts *= sum(self.ps)
@@ -45,4 +49,35 @@ class TestWalkerAlias(unittest.TestCase):
         self.check_sample()
 
 
+class TestWalkerAliasBuffer(unittest.TestCase):
+
+    def setUp(self):
+        self.ps = numpy.array([5, 3, 4, 1, 2], dtype=numpy.int32)
+        self.sampler = utils.WalkerAlias(self.ps, buffer_size=10)
+
+    def test_serve_from_buffer(self):
+        vs1 = self.sampler.sample((2, 2))
+        buf = self.sampler._buffer
+        vs2 = self.sampler.sample((3,))
+        assert self.sampler._buffer is buf
+        numpy.testing.assert_array_equal(vs1.ravel(), buf[:4])
+        numpy.testing.assert_array_equal(vs2, buf[4:7])
+
+    def test_refill(self):
+        self.sampler.sample((8,))
+        buf = self.sampler._buffer
+        vs = self.sampler.sample((3,))
+        assert self.sampler._buffer is not buf
+        numpy.testing.assert_array_equal(vs, self.sampler._buffer[:3])
+
+    def test_large_sample(self):
+        vs = self.sampler.sample((4, 3))
+        assert vs.shape == (4, 3)
+        assert self.sampler._buffer is None
+
+    def test_invalid_buffer_size(self):
+        with self.assertRaises(ValueError):
+            utils.WalkerAlias(self.ps, buffer_size=-1)
+
+
 testing.run_module(__name__, __file__)